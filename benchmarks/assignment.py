@@ -0,0 +1,152 @@
+"""Solve time of `assign_targets` for large groups with exclusions.
+
+Every case assigns targets to the same participants under a different
+shape of exclusions:
+
+    python -m benchmarks.assignment
+    python -m benchmarks.assignment --participants 10000 --exclusions 100
+
+Prints, per case, the number of exclusions, the median and worst solve
+time over `--repeat` runs and the number of gift cycles of the last
+assignment (1 is a single chain through everybody).
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from loguru import logger
+
+from src.services.assignment import assign_targets
+
+Exclusions = list[tuple[int, int]]
+
+
+def _none(n: int, k: int, rng: random.Random) -> Exclusions:
+    return []
+
+
+def _couples(n: int, k: int, rng: random.Random) -> Exclusions:
+    return [(i, i ^ 1) for i in range(n - n % 2)]
+
+
+def _random(n: int, k: int, rng: random.Random) -> Exclusions:
+    return [(i, rng.randrange(n)) for i in range(n) for _ in range(k)]
+
+
+def _families(n: int, k: int, rng: random.Random) -> Exclusions:
+    """Nobody draws a member of their family of `k`."""
+    return [
+        (i, j)
+        for start in range(0, n, k)
+        for i in range(start, min(start + k, n))
+        for j in range(start, min(start + k, n))
+        if i != j
+    ]
+
+
+def _history(n: int, k: int, rng: random.Random) -> Exclusions:
+    """The targets of `k` past games of everybody."""
+    exclusions: Exclusions = []
+    for _ in range(k):
+        order = list(range(n))
+        rng.shuffle(order)
+        exclusions += zip(order, order[1:] + order[:1])
+    return exclusions
+
+
+CASES: dict[str, Callable[[int, int, random.Random], Exclusions]] = {
+    "no exclusions": _none,
+    "couples": _couples,
+    "random": _random,
+    "families": _families,
+    "past games": _history,
+}
+
+
+@dataclass
+class Result:
+    case: str
+    participants: int
+    exclusions: int
+    median_ms: float
+    max_ms: float
+    cycles: int
+
+
+def _cycles(target: dict[int, int]) -> int:
+    seen: set[int] = set()
+    cycles = 0
+    for start in target:
+        if start not in seen:
+            cycles += 1
+            node = start
+            while node not in seen:
+                seen.add(node)
+                node = target[node]
+    return cycles
+
+
+def run(participants: int, exclusions: int, repeat: int, seed: int = 0) -> list[Result]:
+    results = []
+    for name, make in CASES.items():
+        rng = random.Random(seed)
+        excluded = make(participants, exclusions, rng)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            target = assign_targets(range(participants), excluded, rng=rng)
+            timings.append(time.perf_counter() - started)
+        results.append(
+            Result(
+                case=name,
+                participants=participants,
+                exclusions=len(excluded),
+                median_ms=statistics.median(timings) * 1000,
+                max_ms=max(timings) * 1000,
+                cycles=_cycles(target),
+            )
+        )
+    return results
+
+
+HEADER = (
+    f"{'case':<14} {'participants':>12} {'exclusions':>10} "
+    f"{'median ms':>9} {'max ms':>9} {'cycles':>6}"
+)
+
+
+def _format(result: Result) -> str:
+    return (
+        f"{result.case:<14} {result.participants:>12} {result.exclusions:>10} "
+        f"{result.median_ms:>9.1f} {result.max_ms:>9.1f} {result.cycles:>6}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--participants", type=int, default=10_000)
+    parser.add_argument(
+        "--exclusions",
+        type=int,
+        default=100,
+        help="random exclusions per participant, family size or past games",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run(args.participants, args.exclusions, args.repeat, args.seed)
+    print(HEADER)
+    for result in results:
+        print(_format(result))
+    return 0
+
+
+if __name__ == "__main__":
+    logger.remove()  # logging would dominate the timings
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""Latency, SQL statements and Telegram calls of every bot command.
+
+Each command runs end to end through `CallbacksManager` against a real
+`DatabaseRepository` on a file SQLite database and a fake `TeleBot`
+which only counts calls, for rooms of several sizes:
+
+    python -m benchmarks.commands                      # compare to baseline
+    python -m benchmarks.commands --sizes 4,50 --repeat 5
+    python -m benchmarks.commands --update-baseline
+
+The broadcaster's rate limits are lifted so that the numbers show the
+bot's own cost rather than Telegram's limits. Exits with 1 when a command
+got slower than the baseline by more than `--tolerance` or issues more
+SQL statements or Telegram calls than it did.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+from typing import Any, cast
+
+import telebot
+from loguru import logger
+from sqlalchemy import event, insert, update
+from sqlmodel import col, create_engine
+from telebot import types
+
+from src.applications.bot.broadcast import Broadcaster
+from src.applications.bot.callbacks.management.manage import ManageActions
+from src.applications.bot.callbacks_manager import CallbacksManager
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.database import DatabaseRepository
+from src.services.moroz import Moroz
+from src.shared.cache import TTLCache
+
+DEFAULT_SIZES = [4, 50, 500, 5000]
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+MANAGER_ID = 1
+VISITOR_ID = 2
+FIRST_PLAYER_ID = 1_000
+
+_message_ids = count(1)
+
+
+def _message(chat_id: int, text: str) -> types.Message:
+    return types.Message.de_json(
+        {
+            "message_id": next(_message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private", "first_name": f"U{chat_id}"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": f"U{chat_id}"},
+            "text": text,
+        }
+    )
+
+
+class FakeBot:
+    """Stands in for `telebot.TeleBot`, counting the API calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self._next_steps: dict[int, tuple[Callable[..., Any], tuple, dict]] = {}
+
+    def send_message(self, chat_id: int, text: str, **_kwargs) -> types.Message:
+        self.calls += 1
+        return _message(chat_id, text)
+
+    def register_next_step_handler(
+        self, message: types.Message, callback, *args, **kwargs
+    ):
+        self._next_steps[message.chat.id] = (callback, args, kwargs)
+
+    def reply(self, chat_id: int, text: str):
+        """Send the next message of a conversation."""
+        callback, args, kwargs = self._next_steps.pop(chat_id)
+        callback(_message(chat_id, text), *args, **kwargs)
+
+
+@dataclass
+class Result:
+    command: str
+    size: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    statements: int
+    telegram_calls: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.command}@{self.size}"
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Bench:
+    """A bot with a database seeded with `size` players."""
+
+    def __init__(self, size: int, directory: Path):
+        self.size = size
+        self.engine = create_engine(f"sqlite:///{directory / f'bench_{size}.db'}")
+        self.repo = DatabaseRepository(
+            self.engine, user_cache=TTLCache(max_size=10_000, ttl_seconds=300)
+        )
+        self.moroz = Moroz(
+            database_repository=self.repo,
+            max_rooms_managed_by_user=1_000_000,
+            min_players_to_start_game=2,
+        )
+        self.bot = FakeBot()
+        bot = cast(telebot.TeleBot, self.bot)
+        self.broadcaster = Broadcaster(bot, global_rate=1e9, per_chat_rate=1e9)
+        self.manager = CallbacksManager(bot, self.moroz, self.broadcaster)
+        self._user_ids = count(FIRST_PLAYER_ID + size)
+        self._statements = 0
+        event.listen(self.engine, "before_cursor_execute", self._count_statement)
+
+        self.player_ids = list(range(FIRST_PLAYER_ID, FIRST_PLAYER_ID + size))
+        joined_dt = datetime.now(timezone.utc)
+        with self.engine.begin() as conn:
+            conn.execute(
+                insert(User),
+                [
+                    {
+                        "joined_dt": joined_dt,
+                        "id": user_id,
+                        "name": f"User {user_id}",
+                        "username": f"u{user_id}",
+                    }
+                    for user_id in [MANAGER_ID, VISITOR_ID, *self.player_ids]
+                ],
+            )
+
+    def _count_statement(self, *_args):
+        self._statements += 1
+
+    def close(self):
+        self.broadcaster.shutdown()
+        self.engine.dispose()
+
+    def new_user(self) -> int:
+        user = self.repo.create_user(next(self._user_ids), None, "New")
+        return user.id
+
+    def fresh_room(self) -> Room:
+        """A new room of the manager with all the players in it."""
+        room = self.repo.create_room(created_by_user_id=MANAGER_ID)
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(User)
+                .where(col(User.id).in_(self.player_ids))
+                .values(room_id=room.id)
+            )
+        assert self.repo.user_cache is not None
+        self.repo.user_cache.clear()
+        return room
+
+    def started_room(self) -> Room:
+        """A fresh room with all the players in it and the game started."""
+        room = self.fresh_room()
+        self.moroz.start_game_in_room(room.id)
+        return room
+
+    def send(self, chat_id: int, text: str):
+        self.manager.dispatch(_message(chat_id, text))
+
+    @contextmanager
+    def measured(self, samples: list[tuple[float, int, int]]) -> Iterator[None]:
+        statements, calls = self._statements, self.bot.calls
+        started = time.perf_counter()
+        yield
+        samples.append(
+            (
+                time.perf_counter() - started,
+                self._statements - statements,
+                self.bot.calls - calls,
+            )
+        )
+
+
+# a scenario runs one iteration, measuring the command inside `bench.measured`
+Scenario = Callable[[Bench, list[tuple[float, int, int]]], None]
+
+
+def _start_registered(bench: Bench, samples):
+    with bench.measured(samples):
+        bench.send(bench.player_ids[0], "/start")
+
+
+def _start_new(bench: Bench, samples):
+    with bench.measured(samples):
+        bench.send(next(bench._user_ids), "/start")
+
+
+def _me(bench: Bench, samples):
+    # a player of a started room, shown their room and target
+    bench.started_room()
+    with bench.measured(samples):
+        bench.send(bench.player_ids[0], "/me")
+
+
+def _join(bench: Bench, samples):
+    room = bench.fresh_room()
+    user_id = bench.new_user()
+    with bench.measured(samples):
+        bench.send(user_id, "/join")
+        bench.bot.reply(user_id, str(room.short_code))
+
+
+def _leave(bench: Bench, samples):
+    bench.fresh_room()
+    with bench.measured(samples):
+        bench.send(bench.player_ids[0], "/leave")
+
+
+def _create(bench: Bench, samples):
+    with bench.measured(samples):
+        bench.send(VISITOR_ID, "/create")
+
+
+def _here(bench: Bench, samples):
+    user_id = bench.new_user()
+    bench.repo.create_room(created_by_user_id=user_id)
+    with bench.measured(samples):
+        bench.send(user_id, "/here")
+
+
+def _choose_room(bench: Bench) -> Room:
+    room = bench.fresh_room()
+    bench.send(MANAGER_ID, "/manage")
+    bench.bot.reply(MANAGER_ID, room.display_short_code)
+    return room
+
+
+def _manage(bench: Bench, samples):
+    bench.fresh_room()
+    with bench.measured(samples):
+        bench.send(MANAGER_ID, "/manage")
+    bench.bot._next_steps.clear()
+
+
+def _manage_action(action: ManageActions, *, started: bool = False) -> Scenario:
+    def _scenario(bench: Bench, samples):
+        if started:
+            room = bench.started_room()
+            bench.send(MANAGER_ID, "/manage")
+            bench.bot.reply(MANAGER_ID, room.display_short_code)
+        else:
+            _choose_room(bench)
+        with bench.measured(samples):
+            bench.bot.reply(MANAGER_ID, action.value)
+            if action is ManageActions.KICK_PLAYER:
+                bench.bot.reply(
+                    MANAGER_ID,
+                    f"User {bench.player_ids[-1]} (@u{bench.player_ids[-1]})",
+                )
+
+    return _scenario
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "/start": _start_registered,
+    "/start (new user)": _start_new,
+    "/me": _me,
+    "/join": _join,
+    "/leave": _leave,
+    "/create": _create,
+    "/here": _here,
+    "/manage": _manage,
+    "/manage info": _manage_action(ManageActions.INFO),
+    "/manage kick": _manage_action(ManageActions.KICK_PLAYER),
+    "/manage start": _manage_action(ManageActions.START),
+    "/manage complete": _manage_action(ManageActions.COMPLETE, started=True),
+    "/manage delete": _manage_action(ManageActions.DELETE),
+}
+
+
+def run(
+    sizes: list[int], repeat: int, commands: list[str] | None = None
+) -> list[Result]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            bench = Bench(size, Path(directory))
+            try:
+                for command, scenario in SCENARIOS.items():
+                    if commands and command not in commands:
+                        continue
+                    samples: list[tuple[float, int, int]] = []
+                    for _ in range(repeat):
+                        scenario(bench, samples)
+                    latencies = [s[0] * 1000 for s in samples]
+                    results.append(
+                        Result(
+                            command=command,
+                            size=size,
+                            p50_ms=_percentile(latencies, 0.50),
+                            p95_ms=_percentile(latencies, 0.95),
+                            p99_ms=_percentile(latencies, 0.99),
+                            statements=max(s[1] for s in samples),
+                            telegram_calls=max(s[2] for s in samples),
+                        )
+                    )
+                    print(_format(results[-1]), file=sys.stderr)
+            finally:
+                bench.close()
+    return results
+
+
+def _format(result: Result, note: str = "") -> str:
+    return (
+        f"{result.command:<20} {result.size:>6} {result.p50_ms:>9.2f} "
+        f"{result.p95_ms:>9.2f} {result.p99_ms:>9.2f} {result.statements:>6} "
+        f"{result.telegram_calls:>6}  {note}"
+    ).rstrip()
+
+
+HEADER = (
+    f"{'command':<20} {'size':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+    f"{'SQL':>6} {'API':>6}"
+)
+
+
+def regressions(
+    result: Result, baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Why `result` is worse than its `baseline` entry (if it is)."""
+    found = []
+    if result.statements > baseline["statements"]:
+        found.append(f"SQL {baseline['statements']} -> {result.statements}")
+    if result.telegram_calls > baseline["telegram_calls"]:
+        found.append(f"API {baseline['telegram_calls']} -> {result.telegram_calls}")
+    # ignore sub-millisecond jitter
+    if result.p50_ms > max(
+        baseline["p50_ms"] * (1 + tolerance), baseline["p50_ms"] + 1
+    ):
+        found.append(f"p50 {baseline['p50_ms']:.2f} -> {result.p50_ms:.2f} ms")
+    return found
+
+
+def _rounded(result: dict[str, Any]) -> dict[str, Any]:
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in result.items()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(size) for size in s.split(",")],
+        default=DEFAULT_SIZES,
+        help="comma-separated numbers of players in the room",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--command", action="append", dest="commands", choices=SCENARIOS
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    print(HEADER, file=sys.stderr)
+    results = run(args.sizes, args.repeat, args.commands)
+
+    if args.update_baseline:
+        args.baseline.write_text(
+            json.dumps({r.key: _rounded(asdict(r)) for r in results}, indent=2) + "\n"
+        )
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    failed = False
+    print(HEADER)
+    for result in results:
+        found = (
+            regressions(result, baseline[result.key], args.tolerance)
+            if result.key in baseline
+            else []
+        )
+        failed |= bool(found)
+        print(_format(result, "REGRESSION: " + "; ".join(found) if found else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    logger.remove()  # logging would dominate the timings
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Time to store the start of a game (its targets and `started_dt`) in a
+file SQLite database, for rooms with thousands of members.
+
+Compares the previous two commits (an ORM insert per target, then
+`set_game_started`) with the single transaction of `start_game`:
+
+    python -m benchmarks.game_start
+    python -m benchmarks.game_start --sizes 1000 5000 --repeat 5
+
+Prints, per room size and method, the median and worst time and the
+number of SQL statements of one start.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from loguru import logger
+from pydantic_extra_types.pendulum_dt import DateTime
+from sqlalchemy import event, insert, update
+from sqlmodel import col
+
+from src.models.user import User
+from src.repositories.database import DatabaseRepository
+from src.repositories.engine import create_database_engine
+from src.repositories.sqlite import SQLiteProfile
+from src.services.assignment import assign_targets
+
+MANAGER_ID = 0
+
+
+def _separate_commits(
+    repo: DatabaseRepository, room_id: str, pairs: list[tuple[int, int]]
+):
+    repo.assign_targets(room_id, pairs)
+    repo.set_game_started(room_id, DateTime.utcnow())
+
+
+def _start_game(repo: DatabaseRepository, room_id: str, pairs: list[tuple[int, int]]):
+    repo.start_game(room_id, pairs, DateTime.utcnow())
+
+
+# the first one is the baseline
+METHODS: dict[str, Callable[[DatabaseRepository, str, list[tuple[int, int]]], None]] = {
+    "separate commits": _separate_commits,
+    "start_game": _start_game,
+}
+
+
+@dataclass
+class Result:
+    method: str
+    size: int
+    median_ms: float
+    max_ms: float
+    statements: int
+
+
+def _seed(repo: DatabaseRepository, size: int):
+    joined_dt = datetime.now(timezone.utc)
+    with repo.engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"joined_dt": joined_dt, "id": user_id, "name": f"User {user_id}"}
+                for user_id in range(size + 1)
+            ],
+        )
+
+
+def _room_of(repo: DatabaseRepository, size: int) -> str:
+    """A new room with the users 1 to `size` as its members."""
+    room = repo.create_room(created_by_user_id=MANAGER_ID)
+    with repo.engine.begin() as conn:
+        conn.execute(
+            update(User).where(col(User.id) != MANAGER_ID).values(room_id=room.id)
+        )
+    return room.id
+
+
+def run_size(directory: Path, size: int, repeat: int) -> list[Result]:
+    engine = create_database_engine(
+        f"sqlite:///{directory / f'{size}.db'}", sqlite_profile=SQLiteProfile()
+    )
+    repo = DatabaseRepository(engine, read_retries=0)
+    _seed(repo, size)
+    statements = 0
+
+    def _count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    results = []
+    for name, method in METHODS.items():
+        timings = []
+        for _ in range(repeat):
+            room_id = _room_of(repo, size)
+            pairs = list(assign_targets(range(1, size + 1)).items())
+            statements = 0
+            started = time.perf_counter()
+            method(repo, room_id, pairs)
+            timings.append(time.perf_counter() - started)
+        results.append(
+            Result(
+                method=name,
+                size=size,
+                median_ms=statistics.median(timings) * 1000,
+                max_ms=max(timings) * 1000,
+                statements=statements,
+            )
+        )
+    engine.dispose()
+    return results
+
+
+def run(sizes: list[int], repeat: int) -> list[Result]:
+    with tempfile.TemporaryDirectory() as directory:
+        return [
+            result
+            for size in sizes
+            for result in run_size(Path(directory), size, repeat)
+        ]
+
+
+HEADER = f"{'method':<18} {'size':>6} {'median ms':>9} {'max ms':>9} {'statements':>10}"
+
+
+def _format(result: Result) -> str:
+    return (
+        f"{result.method:<18} {result.size:>6} {result.median_ms:>9.1f} "
+        f"{result.max_ms:>9.1f} {result.statements:>10}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    print(HEADER)
+    for result in results:
+        print(_format(result))
+    return 0
+
+
+if __name__ == "__main__":
+    logger.remove()  # logging would dominate the timings
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Concurrent write throughput of a file SQLite database, with and without
+the production `SQLiteProfile`.
+
+Handler threads share one `DatabaseRepository`, as the bot's dispatcher
+workers do, and each runs a mix of writes (renaming a player) and reads
+(a player), every write in a unit of work:
+
+    python -m benchmarks.sqlite_writes
+    python -m benchmarks.sqlite_writes --threads 16 --operations 500
+
+Prints, per profile, the writes and reads per second, the p95 latency
+of a write and the number of operations failed with "database is locked".
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from src.models.user import User
+from src.repositories.database import DatabaseRepository
+from src.repositories.engine import create_database_engine
+from src.repositories.sqlite import SQLiteProfile
+
+PLAYERS = 200
+# the default of the pysqlite driver, i.e. what the bot used before
+BASELINE = "rollback journal"
+PROFILES: dict[str, SQLiteProfile | None] = {
+    BASELINE: None,
+    "production profile": SQLiteProfile(),
+}
+
+
+@dataclass
+class Result:
+    profile: str
+    threads: int
+    writes_per_second: float
+    reads_per_second: float
+    write_p95_ms: float
+    locked: int
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _seed(repo: DatabaseRepository):
+    joined_dt = datetime.now(timezone.utc)
+    with repo.engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {"joined_dt": joined_dt, "id": user_id, "name": f"User {user_id}"}
+                for user_id in range(PLAYERS)
+            ],
+        )
+
+
+def run_profile(
+    name: str,
+    profile: SQLiteProfile | None,
+    directory: Path,
+    threads: int,
+    operations: int,
+    write_ratio: float,
+) -> Result:
+    path = directory / f"{name.replace(' ', '_')}.db"
+    engine = create_database_engine(
+        f"sqlite:///{path}",
+        sqlite_profile=profile,
+        pool_size=threads,
+    )
+    repo = DatabaseRepository(engine, read_retries=0)
+    _seed(repo)
+    writes_every = max(1, round(1 / write_ratio)) if write_ratio > 0 else 0
+
+    def _work(thread: int) -> tuple[list[float], int, int]:
+        write_latencies: list[float] = []
+        reads = locked = 0
+        for i in range(operations):
+            user_id = (thread * operations + i) % PLAYERS
+            started = time.perf_counter()
+            try:
+                if writes_every and i % writes_every == 0:
+                    with repo.unit_of_work():
+                        repo.set_user_name(user_id, f"Renamed {i}")
+                    write_latencies.append(time.perf_counter() - started)
+                else:
+                    repo.get_user(user_id)
+                    reads += 1
+            except OperationalError as e:
+                if "locked" not in str(e.orig):
+                    raise
+                locked += 1
+        return write_latencies, reads, locked
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        outcomes = list(pool.map(_work, range(threads)))
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    write_latencies = [latency for o in outcomes for latency in o[0]]
+    return Result(
+        profile=name,
+        threads=threads,
+        writes_per_second=len(write_latencies) / elapsed,
+        reads_per_second=sum(o[1] for o in outcomes) / elapsed,
+        write_p95_ms=_percentile(write_latencies, 0.95) * 1000,
+        locked=sum(o[2] for o in outcomes),
+    )
+
+
+def run(threads: int, operations: int, write_ratio: float) -> list[Result]:
+    with tempfile.TemporaryDirectory() as directory:
+        return [
+            run_profile(
+                name, profile, Path(directory), threads, operations, write_ratio
+            )
+            for name, profile in PROFILES.items()
+        ]
+
+
+HEADER = (
+    f"{'profile':<20} {'threads':>7} {'writes/s':>9} {'reads/s':>9} "
+    f"{'write p95 ms':>12} {'locked':>6}"
+)
+
+
+def _format(result: Result) -> str:
+    return (
+        f"{result.profile:<20} {result.threads:>7} "
+        f"{result.writes_per_second:>9.0f} {result.reads_per_second:>9.0f} "
+        f"{result.write_p95_ms:>12.2f} {result.locked:>6}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument(
+        "--operations", type=int, default=200, help="operations per thread"
+    )
+    parser.add_argument(
+        "--write-ratio", type=float, default=0.5, help="share of writes (0 to 1)"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.threads, args.operations, args.write_ratio)
+    print(HEADER)
+    for result in results:
+        print(_format(result))
+    return 0
+
+
+if __name__ == "__main__":
+    logger.remove()  # logging would dominate the timings
+    sys.exit(main())
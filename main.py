@@ -1,18 +1,38 @@
-from dependency_injector.wiring import Provide, inject
+import asyncio
+import inspect
 
-from src.dependencies import ApplicationContainer
-from src.applications.bot.app import BotApp
+from src.shared.log import setup_logging
+from src.shared.startup import StartupReport
 
 
-@inject
-def main(
-    bot_app: BotApp = Provide[ApplicationContainer.bot_app],
-) -> None:
+def main() -> None:
     """Main entry point for the TSO Adapter application."""
-    bot_app.run()
+    # heavy modules are imported here, so that their cost is reported
+    report = StartupReport()
+    with report.phase("imports"):
+        import dotenv
+
+        from src.dependencies import ApplicationContainer
+        from src.settings import Settings
+
+    with report.phase("settings"):
+        dotenv.load_dotenv()
+        settings = Settings()  # type: ignore[call-arg]
+        setup_logging(settings.log_level)
+
+    with report.phase("wiring"):
+        container = ApplicationContainer()
+        container.config.from_pydantic(settings)
+
+    with report.phase("application"):
+        bot_app = container.app()
+    report.log()
+
+    if inspect.iscoroutinefunction(bot_app.run):
+        asyncio.run(bot_app.run())
+    else:
+        bot_app.run()
 
 
 if __name__ == "__main__":
-    container = ApplicationContainer()
-    container.wire(modules=[__name__])
     main()
@@ -0,0 +1,132 @@
+import asyncio
+
+from loguru import logger
+
+from src.applications.async_bot.bot import OrderedAsyncTeleBot
+from src.applications.async_bot.broadcast import AsyncBroadcaster
+from src.applications.async_bot.callbacks_manager import CallbacksManager
+from src.applications.bot.conversation import ConversationStore
+from src.applications.bot.metrics import register_runtime_gauges
+from src.applications.bot.utils import get_build_info
+from src.repositories.sqlite import SQLiteMaintenance
+from src.services.async_moroz import AsyncMoroz
+from src.shared.metrics import REGISTRY, MetricsServer
+from src.shared.rate_limit import UserRateLimiter
+
+
+class AsyncBotApp:
+    """The bot on asyncio: updates, database calls and notifications
+    are awaited concurrently on one event loop. Polling only."""
+
+    def __init__(
+        self,
+        api_token: str,
+        moroz: AsyncMoroz,
+        broadcast_max_concurrency: int = 100,
+        broadcast_global_rate: float = 30,
+        broadcast_per_chat_rate: float = 1,
+        broadcast_max_retries: int = 3,
+        command_rate: float | None = 1,
+        command_burst: float = 10,
+        command_costs: dict[str, float] | None = None,
+        command_rate_limit_max_users: int = 100_000,
+        conversation_max_entries: int = 10_000,
+        conversation_ttl_seconds: float = 3600,
+        conversation_state_path: str | None = None,
+        metrics_host: str = "127.0.0.1",
+        metrics_port: int | None = None,
+        database_maintenance: SQLiteMaintenance | None = None,
+    ):
+        self.api_token = api_token
+        self.moroz = moroz
+
+        self.conversations = ConversationStore(
+            max_entries=conversation_max_entries,
+            ttl_seconds=conversation_ttl_seconds,
+            path=conversation_state_path,
+        )
+        self.bot = OrderedAsyncTeleBot(self.api_token, self.conversations)
+        self.broadcaster = AsyncBroadcaster(
+            self.bot,
+            max_concurrency=broadcast_max_concurrency,
+            global_rate=broadcast_global_rate,
+            per_chat_rate=broadcast_per_chat_rate,
+            max_retries=broadcast_max_retries,
+        )
+        self.rate_limiter = (
+            UserRateLimiter(
+                command_rate, command_burst, max_users=command_rate_limit_max_users
+            )
+            if command_rate is not None
+            else None
+        )
+        self.callbacks_manager = CallbacksManager(
+            self.bot,
+            self.moroz,
+            self.broadcaster,
+            rate_limiter=self.rate_limiter,
+            command_costs=command_costs or {},
+        )
+        self.callbacks_manager.register_callbacks(self.bot)
+        self.conversations.load(self.callbacks_manager.callback_instance)
+        register_runtime_gauges(
+            self.moroz.database_repository.engine.pool,
+            updates_pending=lambda: self.bot.pending,
+            conversations_pending=lambda: self.conversations.size,
+            user_cache=self.moroz.database_repository.repository.user_cache,
+        )
+        self.metrics_server = (
+            MetricsServer(REGISTRY, metrics_host, metrics_port)
+            if metrics_port is not None
+            else None
+        )
+        self.database_maintenance = database_maintenance
+        self._stopped = asyncio.Event()
+
+    async def _notify_admin_with(self, message: str):
+        if self.moroz.admin_user_id is not None:
+            await self.bot.send_message(
+                self.moroz.admin_user_id,
+                message,
+            )
+
+    async def run(self):
+        await self.moroz.database_repository.migrate()
+        logger.info("Bot started")
+        build_info = get_build_info()
+        await self._notify_admin_with(
+            f"Bot has just started.\n\n{build_info}"
+            if build_info
+            else "Bot has just started."
+        )
+
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+        if self.database_maintenance is not None:
+            self.database_maintenance.start()
+        try:
+            # polling is refused while a webhook is set
+            await self.bot.remove_webhook()
+            polling = asyncio.create_task(self.bot.infinity_polling())
+            stopped = asyncio.create_task(self._stopped.wait())
+            try:
+                await asyncio.wait(
+                    [polling, stopped], return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                polling.cancel()
+                stopped.cancel()
+        finally:
+            self.conversations.close()
+            if self.metrics_server is not None:
+                self.metrics_server.shutdown()
+            if self.database_maintenance is not None:
+                self.database_maintenance.shutdown()
+
+        logger.info("Bot stopped")
+        await self._notify_admin_with("Bot has just stopped.")
+        await self.bot.close_session()
+
+    def stop(self):
+        """Make a running `run` return (e.g. from a signal handler or a test)."""
+        self._stopped.set()
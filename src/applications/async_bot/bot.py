@@ -0,0 +1,107 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable, Hashable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from loguru import logger
+from telebot import Handler, types
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_helper import ApiTelegramException
+
+from src.applications.bot.broadcast import TOO_MANY_REQUESTS
+from src.applications.bot.conversation import ConversationStore
+from src.applications.bot.dispatcher import chat_key, describe_update
+from src.applications.bot.metrics import (
+    TELEGRAM_ERRORS,
+    TELEGRAM_RATE_LIMITED,
+    TELEGRAM_REQUEST_DURATION,
+)
+from src.applications.bot.utils import count_sent_message
+from src.repositories.query_stats import track_queries
+
+
+class OrderedAsyncTeleBot(AsyncTeleBot):
+    """An AsyncTeleBot handling updates of different chats concurrently
+    and those of one chat in order, with next-step handlers (which
+    AsyncTeleBot lacks) kept in a `ConversationStore`.
+    """
+
+    def __init__(self, token: str, conversations: ConversationStore, **kwargs):
+        super().__init__(token, **kwargs)
+        self.conversations = conversations
+        # per chat: its lock and the number of updates holding or awaiting it
+        self._chats: dict[Hashable, tuple[asyncio.Lock, int]] = {}
+
+    def register_next_step_handler(
+        self,
+        message: types.Message,
+        callback: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ):
+        """Handle the next message of the chat with `callback`
+        (a coroutine function) instead of the message handlers."""
+        self.conversations.register_handler(
+            message.chat.id, Handler(callback, *args, **kwargs)
+        )
+
+    def clear_step_handler_by_chat_id(self, chat_id: int):
+        self.conversations.clear_handlers(chat_id)
+
+    @property
+    def pending(self) -> int:
+        """Number of updates being handled or waiting for their chat."""
+        return sum(users for _, users in self._chats.values())
+
+    @asynccontextmanager
+    async def _chat_turn(self, key: Hashable) -> AsyncIterator[None]:
+        # asyncio.Lock wakes up waiters in FIFO order
+        lock, users = self._chats.get(key) or (asyncio.Lock(), 0)
+        self._chats[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._chats[key]
+            if users == 1:
+                del self._chats[key]
+            else:
+                self._chats[key] = (lock, users - 1)
+
+    async def _handle(self, update: types.Update):
+        async with self._chat_turn(chat_key(update)):
+            with track_queries(describe_update(update)):
+                message = update.message
+                handlers = (
+                    self.conversations.get_handlers(message.chat.id)
+                    if message is not None
+                    else None
+                )
+                if not handlers:
+                    await super().process_new_updates([update])
+                    return
+                for handler in handlers:
+                    try:
+                        await handler.callback(message, *handler.args, **handler.kwargs)
+                    except Exception:  # noqa: BLE001 - run the next steps anyway
+                        logger.exception(f"Next step of {describe_update(update)}")
+
+    async def process_new_updates(self, updates: list[types.Update]):
+        # the handling of each update starts (and queues up for its chat)
+        # in the order of the updates
+        await asyncio.gather(*(self._handle(update) for update in updates))
+
+    async def send_message(self, chat_id: int | str, text: str, *args, **kwargs):
+        # even a failed request may have been delivered
+        count_sent_message()
+        with TELEGRAM_REQUEST_DURATION.time(method="sendMessage"):
+            try:
+                return await super().send_message(chat_id, text, *args, **kwargs)
+            except ApiTelegramException as e:
+                TELEGRAM_ERRORS.inc(method="sendMessage", code=str(e.error_code))
+                if e.error_code == TOO_MANY_REQUESTS:
+                    TELEGRAM_RATE_LIMITED.inc(method="sendMessage")
+                raise
+            except Exception:
+                TELEGRAM_ERRORS.inc(method="sendMessage", code="network")
+                raise
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+
+from loguru import logger
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_helper import ApiException, ApiTelegramException, RequestTimeout
+
+from src.applications.bot.broadcast import (
+    DeliveryResult,
+    Notification,
+    failed_delivery,
+    retry_after,
+)
+from src.shared.cache import TTLCache
+from src.shared.rate_limit import TokenBucket
+
+
+class AsyncBroadcaster:
+    """The `Broadcaster` of the asyncio application: deliveries are awaited
+    concurrently (at most `max_concurrency` at a time) instead of running
+    on worker threads, under the same rate limits and retries."""
+
+    def __init__(
+        self,
+        bot: AsyncTeleBot,
+        *,
+        max_concurrency: int = 100,
+        global_rate: float = 30,
+        per_chat_rate: float = 1,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.bot = bot
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._global_bucket = TokenBucket(global_rate, clock=clock)
+        # idle buckets are full again after a second, so forgetting them is safe
+        self._chat_buckets: TTLCache[int, TokenBucket] = TTLCache(
+            max_size=10_000, ttl_seconds=60, clock=clock
+        )
+        self._in_flight = asyncio.Semaphore(max_concurrency)
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        if (bucket := self._chat_buckets.get(chat_id)) is None:
+            bucket = TokenBucket(self.per_chat_rate, clock=self._clock)
+        # refresh the entry's TTL on every use
+        self._chat_buckets.put(chat_id, bucket)
+        return bucket
+
+    async def _wait_for(self, bucket: TokenBucket):
+        if (delay := bucket.reserve()) > 0:
+            await self._sleep(delay)
+
+    async def _deliver(self, notification: Notification) -> DeliveryResult:
+        chat_bucket = self._chat_bucket(notification.chat_id)
+        attempts = 0
+        while True:
+            attempts += 1
+            await self._wait_for(chat_bucket)
+            await self._wait_for(self._global_bucket)
+            try:
+                async with self._in_flight:
+                    await self.bot.send_message(
+                        notification.chat_id, notification.text, **notification.kwargs
+                    )
+                return DeliveryResult(notification.chat_id, True, attempts)
+            except ApiTelegramException as e:
+                delay = retry_after(e)
+                if delay is None or attempts > self.max_retries:
+                    logger.warning(
+                        f"Failed to deliver to {notification.chat_id} "
+                        f"after {attempts} attempts: {e.description}"
+                    )
+                    return DeliveryResult(
+                        notification.chat_id, False, attempts, e.description
+                    )
+                logger.warning(
+                    f"Rate limited delivering to {notification.chat_id}; "
+                    f"retrying after {delay}s"
+                )
+                self._global_bucket.pause(delay)
+                chat_bucket.pause(delay)
+            except (ApiException, RequestTimeout) as e:
+                logger.warning(f"Failed to deliver to {notification.chat_id}: {e}")
+                return DeliveryResult(notification.chat_id, False, attempts, str(e))
+
+    async def broadcast(
+        self, notifications: Iterable[Notification]
+    ) -> list[DeliveryResult]:
+        """Deliver all notifications and return their results in order."""
+        notifications = list(notifications)
+        outcomes = await asyncio.gather(
+            *(self._deliver(n) for n in notifications), return_exceptions=True
+        )
+        results = [
+            (
+                outcome
+                if isinstance(outcome, DeliveryResult)
+                else failed_delivery(notification, outcome)
+            )
+            for notification, outcome in zip(notifications, outcomes)
+        ]
+        failed = sum(not result.delivered for result in results)
+        logger.info(f"Broadcast {len(results)} messages, {failed} failed")
+        return results
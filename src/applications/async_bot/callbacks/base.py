@@ -0,0 +1,111 @@
+import functools
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Coroutine
+from typing import Any, cast
+
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.bot import OrderedAsyncTeleBot
+from src.applications.bot.metrics import COMMANDS_RATE_LIMITED, HANDLER_DURATION
+from src.applications.bot.utils import (
+    RATE_LIMITED_MESSAGE,
+    ROOM_BUSY_MESSAGE,
+    nothing_sent_since_now,
+    user_from_message,
+)
+from src.models.user import User
+from src.services.async_moroz import AsyncMoroz
+from src.shared.exceptions import RoomBusy, UserNotFound
+from src.shared.rate_limit import Admission, UserRateLimiter
+
+
+def in_unit_of_work[F: Callable[..., Coroutine[Any, Any, Any]]](method: F) -> F:
+    """Run a handler (e.g. a next-step handler) in one database transaction,
+    run again after a transient database error if it has sent nothing yet."""
+
+    @functools.wraps(method)
+    async def wrapper(self, message: types.Message, *args, **kwargs):
+        handler = f"{type(self).__name__}.{method.__name__}"
+        try:
+            with HANDLER_DURATION.time(handler=handler):
+                return await self.moroz.run_in_unit_of_work(
+                    lambda: method(self, message, *args, **kwargs),
+                    retryable=nothing_sent_since_now(),
+                )
+        except RoomBusy:
+            await self.bot.send_message(message.chat.id, ROOM_BUSY_MESSAGE)
+            logger.info(f"{handler} gave up on a busy room")
+
+    return cast(F, wrapper)
+
+
+class Callback(ABC):
+    # stateless commands set this to False to skip the user lookup
+    requires_registered_user: bool = True
+    # set by the CallbacksManager: the command takes `cost` tokens of
+    # its user's bucket, and is not limited without a `rate_limiter`
+    rate_limiter: UserRateLimiter | None = None
+    cost: float = 1
+
+    def __init__(self, bot: OrderedAsyncTeleBot, moroz: AsyncMoroz):
+        self.bot = bot
+        self.moroz = moroz
+
+    async def process_wrap(self, message: types.Message):
+        """Wrapper to process message with user lookup and error handling.
+        Override if user existence is not required."""
+        if message.from_user is None:
+            logger.warning(f"Message {message} has no from_user; cannot identify user")
+            return
+        if message.from_user.is_bot:
+            logger.info(f"Ignoring message from bot user {message.from_user}")
+            return
+        if await self._rate_limited(message):
+            return
+
+        usr = user_from_message(message)
+
+        if not self.requires_registered_user:
+            logger.info(f"{self.__class__.__name__} from {usr}: {message.text}")
+            return await self.process(usr, message=message)
+
+        async def _process():
+            user_actual = await self.moroz.get_user(usr.id)
+            logger.info(f"{self.__class__.__name__} from {user_actual}: {message.text}")
+            return await self.process(user_actual, message=message)
+
+        try:
+            # replies are sent after the commit, so a transient database
+            # error can usually be recovered from by running it all again
+            return await self.moroz.run_in_unit_of_work(
+                _process, retryable=nothing_sent_since_now()
+            )
+        except UserNotFound:
+            await self.bot.send_message(
+                message.chat.id,
+                "You are not registered yet. Please /start to register.",
+            )
+            logger.info(f"User {usr} is not registered")
+            return
+        except RoomBusy:
+            await self.bot.send_message(message.chat.id, ROOM_BUSY_MESSAGE)
+            logger.info(f"{self.__class__.__name__} from {usr} gave up on a busy room")
+            return
+
+    async def _rate_limited(self, message: types.Message) -> bool:
+        """Whether the message is over its user's rate limit, in which case
+        it is not processed and the user is only told once per flood."""
+        if self.rate_limiter is None:
+            return False
+        admission = self.rate_limiter.admit(message.chat.id, self.cost)
+        if admission is Admission.ALLOWED:
+            return False
+        COMMANDS_RATE_LIMITED.inc(admission=admission.value)
+        if admission is Admission.REFUSED:
+            await self.bot.send_message(message.chat.id, RATE_LIMITED_MESSAGE)
+            logger.info("User {} is rate limited", message.chat.id)
+        return True
+
+    @abstractmethod
+    async def process(self, user: User, *, message: types.Message): ...
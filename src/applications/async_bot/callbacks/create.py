@@ -0,0 +1,41 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback
+from src.models.user import User
+from src.shared.exceptions import MaxNumberOfRoomsReached, ShortCodesExhausted
+
+
+class CreateCallback(Callback):
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/create from {user}")
+        try:
+            room = await self.moroz.create_room(created_by_user_id=user.id)
+        except MaxNumberOfRoomsReached:
+            await self.bot.send_message(
+                user.id,
+                "You have reached the maximum number of rooms you can create. "
+                "Please /manage and delete an existing room before creating a new one.",
+            )
+            return
+        except ShortCodesExhausted as e:
+            logger.warning(f"No room created for {user}: {e}")
+            await self.bot.send_message(
+                user.id,
+                "Could not allocate an ID for a new room right now. "
+                "Please try to /create it again later.",
+            )
+            return
+
+        _here_part = "; please click /here to enter" if user.room_id is None else ""
+
+        await self.moroz.after_commit(
+            lambda: self.bot.send_message(
+                user.id,
+                rf"""Room created successfully\! 🎉
+This room ID: `{room.display_short_code}` \(share this with your friends\)\.
+Note that you are not automatically joined to the room{_here_part}\.
+Use /manage to view info, manage, or delete your rooms\.""",
+                parse_mode="MarkdownV2",
+            )
+        )
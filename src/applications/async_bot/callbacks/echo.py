@@ -0,0 +1,15 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback
+from src.models.user import User
+
+
+class EchoCallback(Callback):
+    requires_registered_user = False
+
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/echo from {user}")
+        await self.bot.reply_to(
+            message, f"Unknown command {message.text!r}. Try /help."
+        )
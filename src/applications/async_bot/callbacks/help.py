@@ -0,0 +1,28 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback
+from src.applications.bot.callbacks.help import HELP_MESSAGE
+from src.models.user import User
+
+
+class HelpCallback(Callback):
+    requires_registered_user = False
+
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/help from {user}")
+        _admin_contact = (
+            f"{self.moroz.admin_name} (@{self.moroz.admin_username})"
+            if self.moroz.admin_name and self.moroz.admin_username
+            else (f"@{self.moroz.admin_username}" if self.moroz.admin_username else "")
+        )
+        await self.bot.send_message(
+            user.id,
+            HELP_MESSAGE.format(
+                admin_info=(
+                    f"\n\nFeel free to share feedback with me: {_admin_contact}."
+                    if _admin_contact
+                    else ""
+                ),
+            ),
+        )
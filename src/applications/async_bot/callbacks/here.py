@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback
+from src.applications.bot.callbacks.here import ALLOW_HERE_CONTEXT_SECONDS
+from src.models.user import User
+from src.shared.exceptions import (
+    GameAlreadyCompleted,
+    GameAlreadyStarted,
+    RoomNotFound,
+    UserNotFound,
+)
+
+
+class HereCallback(Callback):
+    """Callback for guessing the action from
+    the context when user sends /here command."""
+
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/here from {user}")
+        if await self._option_join_just_created_room(user):
+            logger.info(f"User {user} joined just created room")
+            msg = "You have joined the room you just created."
+        else:
+            msg = "Couldn't determine what to do with the /here command."
+            logger.info(msg)
+        # the room is locked until the commit, so nothing is sent before it
+        await self.moroz.after_commit(lambda: self.bot.send_message(user.id, msg))
+
+    async def _option_join_just_created_room(self, user: User) -> bool:
+        """
+        Context:
+            User has just created a room and is not in any room yet.
+        Action:
+            Join the user to the room they just created.
+        """
+        if user.room_id is not None:
+            logger.debug(f"User {user} is already in a room {user.room_id}")
+            return False
+        managed_rooms = await self.moroz.get_rooms_managed_by_user(user.id)
+        active_managed_rooms = [room for room in managed_rooms if room.is_active]
+        if not active_managed_rooms:
+            logger.warning(f"User {user} does not manage any active rooms")
+            return False
+        latest_room = max(active_managed_rooms, key=lambda r: r.created_dt)
+        now = datetime.now(timezone.utc)
+        if (
+            this_long := (now - latest_room.created_dt).total_seconds()
+        ) > ALLOW_HERE_CONTEXT_SECONDS:
+            logger.debug(
+                f"Latest room {latest_room} for user {user} was created "
+                f"{this_long} seconds ago (more than {ALLOW_HERE_CONTEXT_SECONDS} seconds)"
+            )
+            return False
+        try:
+            await self.moroz.join_room_by_short_code(user.id, latest_room.short_code)
+        except (
+            RoomNotFound,
+            UserNotFound,
+            GameAlreadyStarted,
+            GameAlreadyCompleted,
+        ) as e:
+            logger.error(f"Failed to join user {user} to room {latest_room}: {e}")
+            return False
+
+        return True
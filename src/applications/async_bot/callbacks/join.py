@@ -0,0 +1,82 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback, in_unit_of_work
+from src.applications.bot.utils import text
+from src.models.room import Room, format_short_code, parse_short_code
+from src.models.user import User
+from src.shared.exceptions import GameAlreadyCompleted, GameAlreadyStarted, RoomNotFound
+
+
+class JoinCallback(Callback):
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/join from {user}")
+        if user.room_id is not None:
+            room = await self.moroz.get_room(user.room_id)
+            await self.bot.send_message(
+                user.id,
+                f"You have already joined the room {room.display_short_code}. Please /leave it first.",
+            )
+            return
+
+        answer = await self.bot.send_message(
+            user.id,
+            "Please enter the room ID you want to join:",
+        )
+        self.bot.register_next_step_handler(
+            answer,
+            self._handle_room_code_entered,
+            user=user,
+        )
+
+    @in_unit_of_work
+    async def _handle_room_code_entered(
+        self,
+        message: types.Message,
+        user: User,
+    ):
+        chosen_text = text(message)
+        try:
+            room_short_code = parse_short_code(chosen_text)
+        except ValueError:
+            await self.bot.send_message(
+                user.id,
+                "Invalid room ID format. Please enter a numeric room ID.",
+            )
+            logger.info(f"Invalid room ID format entered by {user}: {chosen_text!r}")
+            return
+
+        room_short_code_str = format_short_code(room_short_code)
+        logger.info(f"User {user} joining room with code {room_short_code_str}")
+
+        # the room is locked until the commit, so nothing is sent before it
+        try:
+            joined_room = await self.moroz.join_room_by_short_code(
+                user_id=user.id, room_short_code=room_short_code
+            )
+        except RoomNotFound:
+            reply = f"Room with ID {room_short_code_str} not found."
+        except GameAlreadyStarted:
+            reply = f"The game in room {room_short_code_str} has already started. You cannot join now."
+        except GameAlreadyCompleted:
+            reply = f"The game in room {room_short_code_str} has already completed. You cannot join now."
+        else:
+            await self.moroz.after_commit(
+                lambda: self._notify_joined(user, joined_room)
+            )
+            return
+        await self.moroz.after_commit(lambda: self.bot.send_message(user.id, reply))
+
+    async def _notify_joined(self, user: User, room: Room):
+        await self.bot.send_message(
+            user.id,
+            f"You have successfully joined the room {room.display_short_code}! 🎉",
+        )
+        await self._notify_manager(user, room)
+
+    async def _notify_manager(self, user: User, room: Room):
+        logger.info(f"Notifying manager about {user} joining {room}")
+        await self.bot.send_message(
+            room.manager_user_id,
+            f"User {user.formal_display_name} has joined your room {room.display_short_code}",
+        )
@@ -0,0 +1,36 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback
+from src.models.room import Room
+from src.models.user import User
+from src.shared.exceptions import NotInRoom
+
+
+class LeaveCallback(Callback):
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/leave from {user}")
+        # the room is locked until the commit, so nothing is sent before it
+        try:
+            left_room = await self.moroz.leave_room(user_id=user.id)
+        except NotInRoom:
+            await self.moroz.after_commit(
+                lambda: self.bot.send_message(
+                    user.id,
+                    "You are not currently in any room.",
+                )
+            )
+            return
+
+        await self.moroz.after_commit(lambda: self._notify_left(user, left_room))
+
+    async def _notify_left(self, user: User, room: Room):
+        await self.bot.send_message(
+            user.id,
+            "You have successfully left the room! 🎉",
+        )
+        logger.debug(f"Notifying manager about {user} leaving {room}")
+        await self.bot.send_message(
+            room.manager_user_id,
+            f"User {user.formal_display_name} has left your room {room.display_short_code}",
+        )
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+from src.applications.async_bot.bot import OrderedAsyncTeleBot
+from src.applications.async_bot.broadcast import AsyncBroadcaster
+from src.models.room import Room
+from src.models.user import User
+from src.services.async_moroz import AsyncMoroz
+
+
+class ManagementCallback(ABC):
+    def __init__(
+        self,
+        bot: OrderedAsyncTeleBot,
+        moroz: AsyncMoroz,
+        broadcaster: AsyncBroadcaster | None = None,
+    ):
+        self.bot = bot
+        self.moroz = moroz
+        self.broadcaster = broadcaster or AsyncBroadcaster(bot)
+
+    @abstractmethod
+    async def process_management(self, user: User, room: Room): ...
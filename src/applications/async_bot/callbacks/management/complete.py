@@ -0,0 +1,56 @@
+from loguru import logger
+
+from src.applications.async_bot.callbacks.management.base import ManagementCallback
+from src.applications.bot.broadcast import Notification, delivery_report
+from src.applications.bot.utils import remove_keyboard
+from src.models.room import Room
+from src.models.user import User
+from src.shared.exceptions import GameAlreadyCompleted
+
+
+class CompleteCallback(ManagementCallback):
+    async def process_management(self, user: User, room: Room):
+        logger.info(f"Complete action chosen by {user} in {room}")
+        try:
+            users_in_just_completed_room = await self.moroz.complete_game_in_room(
+                room.id
+            )
+        except GameAlreadyCompleted:
+            # e.g. "Complete" chosen twice before the first one went through
+            logger.info(f"Game in {room.id=} already completed; ignoring {user}")
+            await self.moroz.after_commit(
+                lambda: self.bot.send_message(
+                    user.id,
+                    f"The game in room {room.display_short_code} has already completed.",
+                    reply_markup=remove_keyboard(),
+                )
+            )
+            return
+
+        await self.moroz.after_commit(
+            lambda: self._notify_participants(user, room, users_in_just_completed_room)
+        )
+
+    async def _notify_participants(
+        self, user: User, room: Room, participants: list[User]
+    ):
+        notifications = []
+        for participant in participants:
+            logger.debug(
+                "Notifying user {} about game completion in {}", participant, room
+            )
+            notifications.append(
+                Notification(
+                    participant.id,
+                    f"The game in room {room.display_short_code} has been completed by its manager. Thank you for participating!",
+                )
+            )
+        results = await self.broadcaster.broadcast(notifications)
+
+        await self.bot.send_message(
+            user.id,
+            f"The game in room {room.display_short_code} has been completed successfully. 🎉"
+            + delivery_report(results, {u.id: u for u in participants}),
+            reply_markup=remove_keyboard(),
+        )
+        logger.debug(f"Game in room {room} completed by {user}")
@@ -0,0 +1,44 @@
+from loguru import logger
+
+from src.applications.async_bot.callbacks.management.base import ManagementCallback
+from src.applications.bot.broadcast import Notification, delivery_report
+from src.applications.bot.utils import remove_keyboard
+from src.models.room import Room
+from src.models.user import User
+
+
+class DeleteCallback(ManagementCallback):
+    async def process_management(self, user: User, room: Room):
+        logger.info(f"Delete action chosen by {user} in {room}")
+        users_in_just_deleted_room = await self.moroz.delete_room(
+            room_id=room.id,
+        )
+        await self.moroz.after_commit(
+            lambda: self._notify_ex_members(room, user, users_in_just_deleted_room)
+        )
+
+    async def _notify_ex_members(
+        self,
+        room: Room,
+        manager_user: User,
+        users_in_room: list[User],
+    ):
+        notifications = []
+        for user in users_in_room:
+            logger.debug("Notifying user {} about {} deletion", user, room)
+            notifications.append(
+                Notification(
+                    user.id,
+                    f"The room {room.display_short_code} you were in has been deleted by its manager {manager_user.formal_display_name}. "
+                    "You have been removed from the room.",
+                )
+            )
+        results = await self.broadcaster.broadcast(notifications)
+
+        await self.bot.send_message(
+            manager_user.id,
+            f"Room {room.display_short_code} ({len(users_in_room)} players) deleted successfully. 🎉"
+            + delivery_report(results, {u.id: u for u in users_in_room}),
+            reply_markup=remove_keyboard(),
+        )
+        logger.debug(f"Room {room} deleted by {manager_user}")
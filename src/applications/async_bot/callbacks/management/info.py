@@ -0,0 +1,17 @@
+from loguru import logger
+
+from src.applications.async_bot.callbacks.management.base import ManagementCallback
+from src.applications.bot.utils import remove_keyboard
+from src.models.room import Room
+from src.models.user import User
+
+
+class InfoCallback(ManagementCallback):
+    async def process_management(self, user: User, room: Room):
+        logger.info(f"Info action chosen by {user} in {room}")
+        msg = await self.moroz.get_room_information(room.id)
+        await self.bot.send_message(
+            user.id,
+            msg,
+            reply_markup=remove_keyboard(),
+        )
@@ -0,0 +1,114 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import in_unit_of_work
+from src.applications.async_bot.callbacks.management.base import ManagementCallback
+from src.applications.bot.utils import get_keyboard, remove_keyboard, text
+from src.models.room import Room
+from src.models.user import User
+from src.shared.exceptions import NotInRoom
+
+
+class KickCallback(ManagementCallback):
+    async def process_management(self, user: User, room: Room):
+        logger.info(f"Kick action chosen by {user} in {room}")
+
+        if not (players := await self.moroz.get_users_in_room(room.id)):
+            await self.bot.send_message(
+                user.id,
+                "There are no players in the room to kick.",
+                reply_markup=remove_keyboard(),
+            )
+            logger.debug(f"No players to kick in {room} for {user}")
+            return
+
+        player_repr_to_id = {
+            player.formal_display_name: player.id for player in players
+        }
+        keyboard = get_keyboard(
+            list(player_repr_to_id.keys()) + ["Cancel"],
+            row_width=2,
+        )
+
+        msg = await self.bot.send_message(
+            user.id,
+            "Select a player to kick:",
+            reply_markup=keyboard,
+        )
+
+        self.bot.register_next_step_handler(
+            msg,
+            self._handle_player_selected,
+            user=user,
+            room=room,
+            player_repr_to_id=player_repr_to_id,
+        )
+
+    @in_unit_of_work
+    async def _handle_player_selected(
+        self,
+        message: types.Message,
+        user: User,
+        room: Room,
+        player_repr_to_id: dict[str, int],
+    ):
+        if (chosen_text := text(message)) == "Cancel":
+            await self.bot.send_message(
+                user.id,
+                "Kick action cancelled.",
+                reply_markup=remove_keyboard(),
+            )
+            logger.debug(f"Kick action cancelled by {user}")
+            return
+
+        if (player_to_kick_id := player_repr_to_id.get(chosen_text)) is None:
+            await self.bot.send_message(
+                user.id,
+                "Invalid selection. Please try the kick command again.",
+                reply_markup=remove_keyboard(),
+            )
+            logger.debug(f"Invalid player selection by {user}: {chosen_text!r}")
+            return
+
+        # the room is locked until the commit, so nothing is sent before it
+        try:
+            player_to_kick = await self.moroz.get_user(player_to_kick_id)
+            room = await self.moroz.kick_from_room(room.id, player_to_kick.id)
+        except NotInRoom:
+            logger.warning(f"Player {chosen_text=} was not in room (why?)")
+            await self.moroz.after_commit(
+                lambda: self.bot.send_message(
+                    user.id,
+                    f"Player {chosen_text} is already not in the room. "
+                    "Perhaps they left while you were choosing?",
+                    reply_markup=remove_keyboard(),
+                )
+            )
+            return
+
+        logger.debug(f"User manager {user} kicking {player_to_kick=} from {room=}")
+        await self.moroz.after_commit(
+            lambda: self._notify_kicked(player_to_kick, room, user)
+        )
+
+    async def _notify_kicked(self, kicked_user: User, room: Room, manager_user: User):
+        await self.bot.send_message(
+            manager_user.id,
+            f"Player {kicked_user.formal_display_name} has been kicked from the room {room.display_short_code}.",
+            reply_markup=remove_keyboard(),
+        )
+        await self._notify_kicked_player(kicked_user, room, manager_user)
+
+    async def _notify_kicked_player(
+        self,
+        kicked_user: User,
+        room: Room,
+        manager_user: User,
+    ):
+        logger.info(
+            f"Notifying kicked user {kicked_user} about being kicked from {room}"
+        )
+        await self.bot.send_message(
+            kicked_user.id,
+            f"You have been kicked from the room {room.display_short_code} by its manager {manager_user.formal_display_name}.",
+        )
@@ -0,0 +1,148 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.bot import OrderedAsyncTeleBot
+from src.applications.async_bot.broadcast import AsyncBroadcaster
+from src.applications.async_bot.callbacks.base import Callback, in_unit_of_work
+from src.applications.async_bot.callbacks.management.base import ManagementCallback
+from src.applications.async_bot.callbacks.management.complete import CompleteCallback
+from src.applications.async_bot.callbacks.management.delete import DeleteCallback
+from src.applications.async_bot.callbacks.management.info import InfoCallback
+from src.applications.async_bot.callbacks.management.kick import KickCallback
+from src.applications.async_bot.callbacks.management.play import PlayCallback
+from src.applications.bot.callbacks.management.manage import (
+    ManageActions,
+)
+from src.applications.bot.callbacks.management.manage import (
+    ManageCallback as SyncManageCallback,
+)
+from src.applications.bot.utils import get_keyboard, remove_keyboard, text
+from src.models.room import Room
+from src.models.user import User
+from src.services.async_moroz import AsyncMoroz
+
+ACTION_CALLBACKS: dict[str, type[ManagementCallback]] = {
+    ManageActions.INFO.value: InfoCallback,
+    ManageActions.DELETE.value: DeleteCallback,
+    ManageActions.KICK_PLAYER.value: KickCallback,
+    ManageActions.START.value: PlayCallback,
+    ManageActions.COMPLETE.value: CompleteCallback,
+}
+
+
+class ManageCallback(Callback):
+    get_available_actions = staticmethod(SyncManageCallback.get_available_actions)
+
+    def __init__(
+        self,
+        bot: OrderedAsyncTeleBot,
+        moroz: AsyncMoroz,
+        broadcaster: AsyncBroadcaster | None = None,
+    ):
+        super().__init__(bot, moroz)
+        self.broadcaster = broadcaster or AsyncBroadcaster(bot)
+
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/manage from {user}")
+
+        managed_rooms = await self.moroz.get_rooms_managed_by_user(user.id)
+        active_managed_rooms = [room for room in managed_rooms if room.is_active]
+
+        if not active_managed_rooms:
+            past_games_info = (
+                f" However, you have managed {len(managed_rooms)} rooms in the past. Use /history to see them."
+                if managed_rooms
+                else ""
+            )
+            await self.bot.send_message(
+                user.id,
+                f"You are not managing any active rooms currently.{past_games_info}",
+            )
+            return
+
+        code_to_room = {room.short_code: room for room in active_managed_rooms}
+
+        answer = await self.bot.send_message(
+            user.id,
+            "Please select a room to manage:",
+            reply_markup=get_keyboard(
+                [f"{room.display_short_code}" for room in active_managed_rooms]
+                + [ManageActions.CANCEL.value]
+            ),
+        )
+        self.bot.register_next_step_handler(
+            answer,
+            self._handle_room_chosen,
+            user=user,
+            code_to_room=code_to_room,
+        )
+
+    @in_unit_of_work
+    async def _handle_room_chosen(
+        self,
+        message: types.Message,
+        user: User,
+        code_to_room: dict[int, Room],
+    ):
+        chosen_text = text(message)
+        if chosen_text == ManageActions.CANCEL.value:
+            await self.bot.send_message(
+                user.id,
+                "Room management cancelled.",
+                reply_markup=remove_keyboard(),
+            )
+            logger.debug(f"Room management cancelled by {user}")
+            return
+        room_short_code = int(chosen_text)
+        logger.debug(f"Room to manage chosen: {room_short_code} by {user}")
+
+        room = code_to_room.get(room_short_code)
+        if room is None:
+            logger.critical(f"Room {room_short_code=} not found; {user=}")
+            await self.bot.send_message(
+                user.id, "Internal error.", reply_markup=remove_keyboard()
+            )
+            return
+
+        actions_kb = get_keyboard(self.get_available_actions(room), row_width=2)
+
+        answer = await self.bot.send_message(
+            user.id,
+            f"You are managing room {room.display_short_code}. Please choose an action:",
+            reply_markup=actions_kb,
+        )
+
+        self.bot.register_next_step_handler(
+            answer,
+            self._handle_action_chosen,
+            user=user,
+            room=room,
+        )
+
+    @in_unit_of_work
+    async def _handle_action_chosen(
+        self,
+        message: types.Message,
+        user: User,
+        room: Room,
+    ):
+        chosen_text = text(message)
+        if chosen_text not in self.get_available_actions(room):
+            logger.debug(f"Invalid action chosen: {chosen_text} by {user}")
+            await self.bot.send_message(
+                user.id,
+                "Invalid action selected. (How did you do that, huh?)",
+                reply_markup=remove_keyboard(),
+            )
+            return
+        if chosen_text == ManageActions.CANCEL.value:
+            await self.bot.send_message(
+                user.id,
+                "Room management cancelled.",
+                reply_markup=remove_keyboard(),
+            )
+            logger.debug(f"Room management cancelled by {user}")
+            return
+        await ACTION_CALLBACKS[chosen_text](
+            bot=self.bot, moroz=self.moroz, broadcaster=self.broadcaster
+        ).process_management(room=room, user=user)
@@ -0,0 +1,12 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback
+from src.models.user import User
+
+
+class MeCallback(Callback):
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/me from {user}")
+        msg = await self.moroz.get_user_information(user.id)
+        await self.bot.send_message(user.id, msg)
@@ -0,0 +1,43 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback, in_unit_of_work
+from src.applications.bot.utils import text
+from src.models.user import User
+from src.shared.exceptions import InvalidName
+
+
+class NameCallback(Callback):
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/name from {user}")
+        name_provided_msg = await self.bot.send_message(
+            user.id,
+            "Please provide the name you want to use.",
+        )
+        self.bot.register_next_step_handler(
+            name_provided_msg,
+            self._set_name,
+            user=user,
+        )
+
+    @in_unit_of_work
+    async def _set_name(self, message: types.Message, user: User):
+        new_name = text(message).strip()
+        logger.debug(f"Setting name for {user} to {new_name!r}")
+
+        try:
+            await self.moroz.update_name(user.id, new_name)
+        except InvalidName as e:
+            await self.bot.send_message(
+                user.id,
+                f"Invalid name: {e}. Please try again with a different name.",
+            )
+            return
+
+        await self.moroz.after_commit(
+            lambda: self.bot.send_message(
+                user.id,
+                f"Your name has been set to {new_name!r}.",
+            )
+        )
+        logger.debug(f"Name for {user} set to {new_name!r}")
@@ -0,0 +1,41 @@
+from loguru import logger
+from telebot import types
+
+from src.applications.async_bot.callbacks.base import Callback
+from src.applications.bot.utils import nothing_sent_since_now, user_from_message
+from src.models.user import User
+from src.shared.exceptions import UserNotFound
+
+
+class StartCallback(Callback):
+    async def process_wrap(self, message: types.Message):
+        # overriding to NOT check user existence beforehand
+        # since the point of /start is to create user if not exists
+        if await self._rate_limited(message):
+            return
+        user = user_from_message(message)
+        return await self.moroz.run_in_unit_of_work(
+            lambda: self.process(user, message=message),
+            retryable=nothing_sent_since_now(),
+        )
+
+    async def _create_user(self, user: User):
+        new_user = await self.moroz.create_user(user.id, user.username, user.name)
+        await self.moroz.after_commit(
+            lambda: self.bot.send_message(
+                new_user.id,
+                f"Welcome, {new_user.display_name}! You have been registered. /help may be useful to get started.",
+            )
+        )
+
+    async def _greet_again(self, user: User):
+        await self.bot.send_message(user.id, f"Welcome back, {user.display_name}!")
+
+    async def process(self, user: User, *, message: types.Message):
+        logger.info(f"/start from {user}")
+
+        try:
+            this_user = await self.moroz.get_user(user.id)
+            await self._greet_again(this_user)
+        except UserNotFound:
+            await self._create_user(user)
@@ -0,0 +1,104 @@
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from telebot import types, util
+
+from src.applications.async_bot.bot import OrderedAsyncTeleBot
+from src.applications.async_bot.broadcast import AsyncBroadcaster
+from src.applications.async_bot.callbacks.base import Callback
+from src.applications.async_bot.callbacks.create import CreateCallback
+from src.applications.async_bot.callbacks.echo import EchoCallback
+from src.applications.async_bot.callbacks.help import HelpCallback
+from src.applications.async_bot.callbacks.here import HereCallback
+from src.applications.async_bot.callbacks.history import HistoryCallback
+from src.applications.async_bot.callbacks.join import JoinCallback
+from src.applications.async_bot.callbacks.leave import LeaveCallback
+from src.applications.async_bot.callbacks.management.base import ManagementCallback
+from src.applications.async_bot.callbacks.management.kick import KickCallback
+from src.applications.async_bot.callbacks.management.manage import ManageCallback
+from src.applications.async_bot.callbacks.me import MeCallback
+from src.applications.async_bot.callbacks.name import NameCallback
+from src.applications.async_bot.callbacks.start import StartCallback
+from src.applications.bot.metrics import HANDLER_DURATION
+from src.applications.bot.utils import text
+from src.services.async_moroz import AsyncMoroz
+from src.shared.rate_limit import UserRateLimiter
+
+
+class Route(NamedTuple):
+    callback: type[Callback]
+    # False lets the callback run without the user lookup (or registration)
+    requires_registered_user: bool
+
+
+COMMANDS: dict[str, Route] = {
+    "start": Route(StartCallback, False),  # registers the user itself
+    "help": Route(HelpCallback, False),
+    "me": Route(MeCallback, True),
+    "leave": Route(LeaveCallback, True),
+    "join": Route(JoinCallback, True),
+    "manage": Route(ManageCallback, True),
+    "create": Route(CreateCallback, True),
+    "name": Route(NameCallback, True),
+    "history": Route(HistoryCallback, True),
+    "here": Route(HereCallback, True),
+}
+# any other text, including unknown commands
+FALLBACK = Route(EchoCallback, False)
+
+
+@dataclass
+class CallbacksManager:
+    """The `CallbacksManager` of the asyncio application."""
+
+    bot: OrderedAsyncTeleBot
+    moroz: AsyncMoroz
+    broadcaster: AsyncBroadcaster | None = None
+    rate_limiter: UserRateLimiter | None = None
+    command_costs: dict[str, float] = field(default_factory=dict)
+    _commands: dict[str, Callback] = field(init=False, repr=False)
+    _fallback: Callback = field(init=False, repr=False)
+    # callbacks with next steps by class name, see `callback_instance`
+    _with_next_steps: dict[str, Callback | ManagementCallback] = field(
+        init=False, repr=False
+    )
+
+    def __post_init__(self):
+        if self.broadcaster is None:
+            self.broadcaster = AsyncBroadcaster(self.bot)
+        self._commands = {
+            command: self._build(route, command) for command, route in COMMANDS.items()
+        }
+        self._fallback = self._build(FALLBACK, "")
+        self._with_next_steps = {
+            type(callback).__name__: callback
+            for callback in self._commands.values()
+            if isinstance(callback, (ManageCallback, JoinCallback, NameCallback))
+        }
+        self._with_next_steps[KickCallback.__name__] = KickCallback(
+            self.bot, self.moroz, self.broadcaster
+        )
+
+    def _build(self, route: Route, command: str) -> Callback:
+        if issubclass(route.callback, ManageCallback):
+            callback: Callback = route.callback(self.bot, self.moroz, self.broadcaster)
+        else:
+            callback = route.callback(self.bot, self.moroz)
+        callback.requires_registered_user = route.requires_registered_user
+        callback.rate_limiter = self.rate_limiter
+        callback.cost = self.command_costs.get(command, 1)
+        return callback
+
+    def callback_instance(self, name: str) -> Callback | ManagementCallback | None:
+        """An instance of the named callback class which has next steps
+        (to restore persisted conversations), or None if unknown."""
+        return self._with_next_steps.get(name)
+
+    async def dispatch(self, message: types.Message):
+        command = util.extract_command(text(message)) or ""
+        callback = self._commands.get(command, self._fallback)
+        with HANDLER_DURATION.time(handler=type(callback).__name__):
+            await callback.process_wrap(message)
+
+    def register_callbacks(self, bot: OrderedAsyncTeleBot):
+        bot.register_message_handler(self.dispatch)
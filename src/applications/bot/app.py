@@ -1,19 +1,93 @@
-import telebot
 from loguru import logger
 
+from src.applications.bot.broadcast import Broadcaster
 from src.applications.bot.callbacks_manager import CallbacksManager
-from src.applications.bot.utils import get_git_info
+from src.applications.bot.conversation import ConversationStore
+from src.applications.bot.dispatcher import ChatOrderedDispatcher, OrderedTeleBot
+from src.applications.bot.metrics import register_runtime_gauges
+from src.applications.bot.utils import get_build_info
+from src.applications.bot.webhook import WebhookConfig, WebhookServer
+from src.repositories.sqlite import SQLiteMaintenance
 from src.services.moroz import Moroz
+from src.shared.metrics import REGISTRY, MetricsServer
+from src.shared.rate_limit import UserRateLimiter
 
 
 class BotApp:
-    def __init__(self, api_token: str, moroz: Moroz):
+    def __init__(
+        self,
+        api_token: str,
+        moroz: Moroz,
+        broadcast_workers: int = 8,
+        broadcast_global_rate: float = 30,
+        broadcast_per_chat_rate: float = 1,
+        broadcast_max_retries: int = 3,
+        command_rate: float | None = 1,
+        command_burst: float = 10,
+        command_costs: dict[str, float] | None = None,
+        command_rate_limit_max_users: int = 100_000,
+        dispatcher_workers: int = 8,
+        dispatcher_max_pending: int = 1000,
+        conversation_max_entries: int = 10_000,
+        conversation_ttl_seconds: float = 3600,
+        conversation_state_path: str | None = None,
+        webhook: WebhookConfig | None = None,
+        metrics_host: str = "127.0.0.1",
+        metrics_port: int | None = None,
+        database_maintenance: SQLiteMaintenance | None = None,
+    ):
         self.api_token = api_token
         self.moroz = moroz
 
-        self.bot = telebot.TeleBot(self.api_token)
-        self.callbacks_manager = CallbacksManager(self.bot, self.moroz)
+        self.dispatcher = ChatOrderedDispatcher(
+            workers=dispatcher_workers, max_pending=dispatcher_max_pending
+        )
+        self.conversations = ConversationStore(
+            max_entries=conversation_max_entries,
+            ttl_seconds=conversation_ttl_seconds,
+            path=conversation_state_path,
+        )
+        self.bot = OrderedTeleBot(
+            self.api_token, self.dispatcher, next_step_backend=self.conversations
+        )
+        self.broadcaster = Broadcaster(
+            self.bot,
+            max_workers=broadcast_workers,
+            global_rate=broadcast_global_rate,
+            per_chat_rate=broadcast_per_chat_rate,
+            max_retries=broadcast_max_retries,
+        )
+        self.rate_limiter = (
+            UserRateLimiter(
+                command_rate, command_burst, max_users=command_rate_limit_max_users
+            )
+            if command_rate is not None
+            else None
+        )
+        self.callbacks_manager = CallbacksManager(
+            self.bot,
+            self.moroz,
+            self.broadcaster,
+            rate_limiter=self.rate_limiter,
+            command_costs=command_costs or {},
+        )
         self.callbacks_manager.register_callbacks(self.bot)
+        self.conversations.load(self.callbacks_manager.callback_instance)
+        self.webhook_server = (
+            WebhookServer(self.bot, webhook) if webhook is not None else None
+        )
+        register_runtime_gauges(
+            self.moroz.database_repository.engine.pool,
+            updates_pending=lambda: self.dispatcher.pending,
+            conversations_pending=lambda: self.conversations.size,
+            user_cache=self.moroz.database_repository.user_cache,
+        )
+        self.metrics_server = (
+            MetricsServer(REGISTRY, metrics_host, metrics_port)
+            if metrics_port is not None
+            else None
+        )
+        self.database_maintenance = database_maintenance
 
     def _notify_admin_with(self, message: str):
         if self.moroz.admin_user_id is not None:
@@ -24,12 +98,40 @@ class BotApp:
 
     def run(self):
         logger.info("Bot started")
-        _git = get_git_info()
+        build_info = get_build_info()
         self._notify_admin_with(
-            f"Bot has just started.\n\n{_git}" if _git else "Bot has just started."
+            f"Bot has just started.\n\n{build_info}"
+            if build_info
+            else "Bot has just started."
         )
 
-        self.bot.infinity_polling()
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+        if self.database_maintenance is not None:
+            self.database_maintenance.start()
+        try:
+            if self.webhook_server is None:
+                # polling is refused while a webhook (e.g. of webhook mode) is set
+                self.bot.remove_webhook()
+                self.bot.infinity_polling()
+            else:
+                self.webhook_server.register()
+                self.webhook_server.serve_forever()
+        finally:
+            self.dispatcher.shutdown()
+            self.conversations.close()
+            self.broadcaster.shutdown()
+            if self.metrics_server is not None:
+                self.metrics_server.shutdown()
+            if self.database_maintenance is not None:
+                self.database_maintenance.shutdown()
 
         logger.info("Bot stopped")
         self._notify_admin_with("Bot has just stopped.")
+
+    def stop(self):
+        """Make a running `run` return (e.g. from a signal handler or a test)."""
+        if self.webhook_server is None:
+            self.bot.stop_polling()
+        else:
+            self.webhook_server.shutdown()
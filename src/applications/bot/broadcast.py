@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+import requests
+import telebot
+from loguru import logger
+from telebot.apihelper import ApiException, ApiTelegramException
+
+from src.models.user import User
+from src.shared.cache import TTLCache
+from src.shared.rate_limit import TokenBucket
+
+if TYPE_CHECKING:
+    # imports aiohttp, which only the asyncio runtime needs
+    from telebot.asyncio_helper import ApiTelegramException as AsyncApiTelegramException
+
+TOO_MANY_REQUESTS = 429
+
+
+@dataclass(frozen=True)
+class Notification:
+    chat_id: int
+    text: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    chat_id: int
+    delivered: bool
+    attempts: int
+    error: str | None = None
+
+
+def retry_after(
+    e: ApiTelegramException | AsyncApiTelegramException,
+) -> float | None:
+    """The seconds to wait before retrying after a 429 error, else None."""
+    if e.error_code != TOO_MANY_REQUESTS:
+        return None
+    parameters = e.result_json.get("parameters") or {}
+    return float(parameters.get("retry_after", 1))
+
+
+def failed_delivery(notification: Notification, e: BaseException) -> DeliveryResult:
+    """The result of a delivery which raised an unexpected error."""
+    logger.opt(exception=e).error("Failed to deliver to {}", notification.chat_id)
+    return DeliveryResult(notification.chat_id, False, 1, str(e))
+
+
+def delivery_report(results: list[DeliveryResult], recipients: dict[int, User]) -> str:
+    """A note for the sender listing the users who could not be notified
+    (empty if everybody was)."""
+    failed = [
+        recipients[result.chat_id].formal_display_name
+        for result in results
+        if not result.delivered
+    ]
+    if not failed:
+        return ""
+    return (
+        f"\n\n⚠️ Could not notify {len(failed)} of {len(results)} players "
+        f"(they may have blocked the bot): {', '.join(failed)}."
+    )
+
+
+class Broadcaster:
+    """Sends messages to many chats concurrently on a bounded worker pool.
+
+    Deliveries respect Telegram's limits with token buckets: one shared by
+    all chats (`global_rate` messages per second) and one per chat
+    (`per_chat_rate`). A 429 response pauses the buckets for its
+    `retry_after` and the message is retried up to `max_retries` times;
+    other API errors (e.g. the user blocked the bot) are not retried.
+    `broadcast` returns as soon as the deliveries are submitted, so the
+    handler of an update is not held for the time a large room takes.
+    """
+
+    def __init__(
+        self,
+        bot: telebot.TeleBot,
+        *,
+        max_workers: int = 8,
+        global_rate: float = 30,
+        per_chat_rate: float = 1,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        executor: Executor | None = None,
+    ):
+        self.bot = bot
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._global_bucket = TokenBucket(global_rate, clock=clock)
+        # idle buckets are full again after a second, so forgetting them is safe
+        self._chat_buckets: TTLCache[int, TokenBucket] = TTLCache(
+            max_size=10_000, ttl_seconds=60, clock=clock
+        )
+        self._chat_buckets_lock = Lock()
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="broadcast"
+        )
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        with self._chat_buckets_lock:
+            if (bucket := self._chat_buckets.get(chat_id)) is None:
+                bucket = TokenBucket(self.per_chat_rate, clock=self._clock)
+            # refresh the entry's TTL on every use
+            self._chat_buckets.put(chat_id, bucket)
+            return bucket
+
+    def _wait_for(self, bucket: TokenBucket):
+        if (delay := bucket.reserve()) > 0:
+            self._sleep(delay)
+
+    def _deliver(self, notification: Notification) -> DeliveryResult:
+        chat_bucket = self._chat_bucket(notification.chat_id)
+        attempts = 0
+        while True:
+            attempts += 1
+            self._wait_for(chat_bucket)
+            self._wait_for(self._global_bucket)
+            try:
+                self.bot.send_message(
+                    notification.chat_id, notification.text, **notification.kwargs
+                )
+                return DeliveryResult(notification.chat_id, True, attempts)
+            except ApiTelegramException as e:
+                delay = retry_after(e)
+                if delay is None or attempts > self.max_retries:
+                    logger.warning(
+                        f"Failed to deliver to {notification.chat_id} "
+                        f"after {attempts} attempts: {e.description}"
+                    )
+                    return DeliveryResult(
+                        notification.chat_id, False, attempts, e.description
+                    )
+                logger.warning(
+                    f"Rate limited delivering to {notification.chat_id}; "
+                    f"retrying after {delay}s"
+                )
+                self._global_bucket.pause(delay)
+                chat_bucket.pause(delay)
+            except (ApiException, requests.RequestException) as e:
+                logger.warning(f"Failed to deliver to {notification.chat_id}: {e}")
+                return DeliveryResult(notification.chat_id, False, attempts, str(e))
+
+    def broadcast(
+        self, notifications: Iterable[Notification]
+    ) -> Future[list[DeliveryResult]]:
+        """Submit all notifications for delivery without waiting for them.
+
+        The returned future holds their results, in order, once every
+        delivery is done; its callbacks run on the worker of the last one.
+        """
+        notifications = list(notifications)
+        futures = [self._executor.submit(self._deliver, n) for n in notifications]
+        broadcast: Future[list[DeliveryResult]] = Future()
+        pending = len(futures)
+        pending_lock = Lock()
+
+        def _complete():
+            results = [
+                (
+                    future.result()
+                    if (e := future.exception()) is None
+                    else failed_delivery(notification, e)
+                )
+                for notification, future in zip(notifications, futures)
+            ]
+            failed = sum(not result.delivered for result in results)
+            logger.info("Broadcast {} messages, {} failed", len(results), failed)
+            broadcast.set_result(results)
+
+        def _delivered(_future: Future[DeliveryResult]):
+            nonlocal pending
+            with pending_lock:
+                pending -= 1
+                if pending:
+                    return
+            _complete()
+
+        if not futures:
+            _complete()
+        for future in futures:
+            future.add_done_callback(_delivered)
+        return broadcast
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
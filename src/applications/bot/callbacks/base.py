@@ -1,16 +1,53 @@
+import functools
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, cast
 
 import telebot
 from loguru import logger
 from telebot import types
 
-from src.applications.bot.utils import user_from_message
+from src.applications.bot.metrics import COMMANDS_RATE_LIMITED, HANDLER_DURATION
+from src.applications.bot.utils import (
+    RATE_LIMITED_MESSAGE,
+    ROOM_BUSY_MESSAGE,
+    nothing_sent_since_now,
+    user_from_message,
+)
 from src.models.user import User
 from src.services.moroz import Moroz
-from src.shared.exceptions import UserNotFound
+from src.shared.exceptions import RoomBusy, UserNotFound
+from src.shared.rate_limit import Admission, UserRateLimiter
+
+
+def in_unit_of_work[F: Callable[..., Any]](method: F) -> F:
+    """Run a handler (e.g. a next-step handler) in one database transaction,
+    run again after a transient database error if it has sent nothing yet."""
+
+    @functools.wraps(method)
+    def wrapper(self, message: types.Message, *args, **kwargs):
+        handler = f"{type(self).__name__}.{method.__name__}"
+        try:
+            with HANDLER_DURATION.time(handler=handler):
+                return self.moroz.run_in_unit_of_work(
+                    lambda: method(self, message, *args, **kwargs),
+                    retryable=nothing_sent_since_now(),
+                )
+        except RoomBusy:
+            self.bot.send_message(message.chat.id, ROOM_BUSY_MESSAGE)
+            logger.info(f"{handler} gave up on a busy room")
+
+    return cast(F, wrapper)
 
 
 class Callback(ABC):
+    # stateless commands set this to False to skip the user lookup
+    requires_registered_user: bool = True
+    # set by the CallbacksManager: the command takes `cost` tokens of
+    # its user's bucket, and is not limited without a `rate_limiter`
+    rate_limiter: UserRateLimiter | None = None
+    cost: float = 1
+
     def __init__(self, bot: telebot.TeleBot, moroz: Moroz):
         self.bot = bot
         self.moroz = moroz
@@ -24,13 +61,26 @@ class Callback(ABC):
         if message.from_user.is_bot:
             logger.info(f"Ignoring message from bot user {message.from_user}")
             return
+        if self._rate_limited(message):
+            return
 
         usr = user_from_message(message)
 
-        try:
+        if not self.requires_registered_user:
+            logger.info(f"{self.__class__.__name__} from {usr}: {message.text}")
+            return self.process(usr, message=message)
+
+        def _process():
             user_actual = self.moroz.get_user(usr.id)
             logger.info(f"{self.__class__.__name__} from {user_actual}: {message.text}")
             return self.process(user_actual, message=message)
+
+        try:
+            # replies are sent after the commit, so a transient database
+            # error can usually be recovered from by running it all again
+            return self.moroz.run_in_unit_of_work(
+                _process, retryable=nothing_sent_since_now()
+            )
         except UserNotFound:
             self.bot.send_message(
                 message.chat.id,
@@ -38,6 +88,24 @@ class Callback(ABC):
             )
             logger.info(f"User {usr} is not registered")
             return
+        except RoomBusy:
+            self.bot.send_message(message.chat.id, ROOM_BUSY_MESSAGE)
+            logger.info(f"{self.__class__.__name__} from {usr} gave up on a busy room")
+            return
+
+    def _rate_limited(self, message: types.Message) -> bool:
+        """Whether the message is over its user's rate limit, in which case
+        it is not processed and the user is only told once per flood."""
+        if self.rate_limiter is None:
+            return False
+        admission = self.rate_limiter.admit(message.chat.id, self.cost)
+        if admission is Admission.ALLOWED:
+            return False
+        COMMANDS_RATE_LIMITED.inc(admission=admission.value)
+        if admission is Admission.REFUSED:
+            self.bot.send_message(message.chat.id, RATE_LIMITED_MESSAGE)
+            logger.info("User {} is rate limited", message.chat.id)
+        return True
 
     @abstractmethod
     def process(self, user: User, *, message: types.Message): ...
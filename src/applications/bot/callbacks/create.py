@@ -3,7 +3,7 @@ from telebot import types
 
 from src.applications.bot.callbacks.base import Callback
 from src.models.user import User
-from src.shared.exceptions import MaxNumberOfRoomsReached
+from src.shared.exceptions import MaxNumberOfRoomsReached, ShortCodesExhausted
 
 
 class CreateCallback(Callback):
@@ -18,14 +18,24 @@ class CreateCallback(Callback):
                 "Please /manage and delete an existing room before creating a new one.",
             )
             return
+        except ShortCodesExhausted as e:
+            logger.warning(f"No room created for {user}: {e}")
+            self.bot.send_message(
+                user.id,
+                "Could not allocate an ID for a new room right now. "
+                "Please try to /create it again later.",
+            )
+            return
 
         _here_part = "; please click /here to enter" if user.room_id is None else ""
 
-        self.bot.send_message(
-            user.id,
-            rf"""Room created successfully\! 🎉
+        self.moroz.after_commit(
+            lambda: self.bot.send_message(
+                user.id,
+                rf"""Room created successfully\! 🎉
 This room ID: `{room.display_short_code}` \(share this with your friends\)\.
 Note that you are not automatically joined to the room{_here_part}\.
 Use /manage to view info, manage, or delete your rooms\.""",
-            parse_mode="MarkdownV2",
+                parse_mode="MarkdownV2",
+            )
         )
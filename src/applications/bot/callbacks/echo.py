@@ -6,6 +6,8 @@ from src.models.user import User
 
 
 class EchoCallback(Callback):
+    requires_registered_user = False
+
     def process(self, user: User, *, message: types.Message):
         logger.info(f"/echo from {user}")
         self.bot.reply_to(message, f"Unknown command {message.text!r}. Try /help.")
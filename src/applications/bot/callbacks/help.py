@@ -7,7 +7,7 @@ from src.models.user import User
 HELP_MESSAGE = """Welcome to the Secret Santa Bot!
 To start with,
 /create a room,
-/join using the four-digit code (and invite others),
+/join using the room code (and invite others),
 /manage to start (among other things).
 
 Available commands:
@@ -23,6 +23,8 @@ Available commands:
 
 
 class HelpCallback(Callback):
+    requires_registered_user = False
+
     def process(self, user: User, *, message: types.Message):
         logger.info(f"/help from {user}")
         _admin_contact = (
@@ -23,11 +23,12 @@ class HereCallback(Callback):
         logger.info(f"/here from {user}")
         if self._option_join_just_created_room(user):
             logger.info(f"User {user} joined just created room")
-            self.bot.send_message(user.id, "You have joined the room you just created.")
+            msg = "You have joined the room you just created."
         else:
             msg = "Couldn't determine what to do with the /here command."
             logger.info(msg)
-            self.bot.send_message(user.id, msg)
+        # the room is locked until the commit, so nothing is sent before it
+        self.moroz.after_commit(lambda: self.bot.send_message(user.id, msg))
 
     def _option_join_just_created_room(self, user: User) -> bool:
         """
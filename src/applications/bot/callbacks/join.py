@@ -1,9 +1,9 @@
 from loguru import logger
 from telebot import types
 
-from src.applications.bot.callbacks.base import Callback
+from src.applications.bot.callbacks.base import Callback, in_unit_of_work
 from src.applications.bot.utils import text
-from src.models.room import Room
+from src.models.room import Room, format_short_code, parse_short_code
 from src.models.user import User
 from src.shared.exceptions import GameAlreadyCompleted, GameAlreadyStarted, RoomNotFound
 
@@ -29,6 +29,7 @@ class JoinCallback(Callback):
             user=user,
         )
 
+    @in_unit_of_work
     def _handle_room_code_entered(
         self,
         message: types.Message,
@@ -36,7 +37,7 @@ class JoinCallback(Callback):
     ):
         chosen_text = text(message)
         try:
-            room_short_code = int(chosen_text)
+            room_short_code = parse_short_code(chosen_text)
         except ValueError:
             self.bot.send_message(
                 user.id,
@@ -45,38 +46,31 @@ class JoinCallback(Callback):
             logger.info(f"Invalid room ID format entered by {user}: {chosen_text!r}")
             return
 
-        room_short_code_str = f"{room_short_code:04d}"
+        room_short_code_str = format_short_code(room_short_code)
         logger.info(f"User {user} joining room with code {room_short_code_str}")
 
+        # the room is locked until the commit, so nothing is sent before it
         try:
             joined_room = self.moroz.join_room_by_short_code(
                 user_id=user.id, room_short_code=room_short_code
             )
         except RoomNotFound:
-            self.bot.send_message(
-                user.id,
-                f"Room with ID {room_short_code_str} not found.",
-            )
-            return
+            reply = f"Room with ID {room_short_code_str} not found."
         except GameAlreadyStarted:
-            self.bot.send_message(
-                user.id,
-                f"The game in room {room_short_code_str} has already started. You cannot join now.",
-            )
-            return
+            reply = f"The game in room {room_short_code_str} has already started. You cannot join now."
         except GameAlreadyCompleted:
-            self.bot.send_message(
-                user.id,
-                f"The game in room {room_short_code_str} has already completed. You cannot join now.",
-            )
+            reply = f"The game in room {room_short_code_str} has already completed. You cannot join now."
+        else:
+            self.moroz.after_commit(lambda: self._notify_joined(user, joined_room))
             return
+        self.moroz.after_commit(lambda: self.bot.send_message(user.id, reply))
 
+    def _notify_joined(self, user: User, room: Room):
         self.bot.send_message(
             user.id,
-            f"You have successfully joined the room {room_short_code_str}! 🎉",
+            f"You have successfully joined the room {room.display_short_code}! 🎉",
         )
-
-        self._notify_manager(user, joined_room)
+        self._notify_manager(user, room)
 
     def _notify_manager(self, user: User, room: Room):
         logger.info(f"Notifying manager about {user} joining {room}")
@@ -10,23 +10,25 @@ from src.shared.exceptions import NotInRoom
 class LeaveCallback(Callback):
     def process(self, user: User, *, message: types.Message):
         logger.info(f"/leave from {user}")
+        # the room is locked until the commit, so nothing is sent before it
         try:
             left_room = self.moroz.leave_room(user_id=user.id)
         except NotInRoom:
-            self.bot.send_message(
-                user.id,
-                "You are not currently in any room.",
+            self.moroz.after_commit(
+                lambda: self.bot.send_message(
+                    user.id,
+                    "You are not currently in any room.",
+                )
             )
             return
 
+        self.moroz.after_commit(lambda: self._notify_left(user, left_room))
+
+    def _notify_left(self, user: User, room: Room):
         self.bot.send_message(
             user.id,
             "You have successfully left the room! 🎉",
         )
-
-        self._notify_manager(user, left_room)
-
-    def _notify_manager(self, user: User, room: Room):
         logger.debug(f"Notifying manager about {user} leaving {room}")
         self.bot.send_message(
             room.manager_user_id,
@@ -2,15 +2,22 @@ from abc import ABC, abstractmethod
 
 import telebot
 
+from src.applications.bot.broadcast import Broadcaster
 from src.models.room import Room
 from src.models.user import User
 from src.services.moroz import Moroz
 
 
 class ManagementCallback(ABC):
-    def __init__(self, bot: telebot.TeleBot, moroz: Moroz):
+    def __init__(
+        self,
+        bot: telebot.TeleBot,
+        moroz: Moroz,
+        broadcaster: Broadcaster | None = None,
+    ):
         self.bot = bot
         self.moroz = moroz
+        self.broadcaster = broadcaster or Broadcaster(bot)
 
     @abstractmethod
     def process_management(self, user: User, room: Room): ...
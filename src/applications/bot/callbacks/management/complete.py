@@ -1,26 +1,66 @@
 from loguru import logger
 
+from src.applications.bot.broadcast import (
+    DeliveryResult,
+    Notification,
+    delivery_report,
+)
 from src.applications.bot.callbacks.management.base import ManagementCallback
 from src.applications.bot.utils import remove_keyboard
 from src.models.room import Room
 from src.models.user import User
+from src.shared.exceptions import GameAlreadyCompleted
 
 
 class CompleteCallback(ManagementCallback):
     def process_management(self, user: User, room: Room):
         logger.info(f"Complete action chosen by {user} in {room}")
-        users_in_just_completed_room = self.moroz.complete_game_in_room(room.id)
+        try:
+            users_in_just_completed_room = self.moroz.complete_game_in_room(room.id)
+        except GameAlreadyCompleted:
+            # e.g. "Complete" chosen twice before the first one went through
+            logger.info(f"Game in {room.id=} already completed; ignoring {user}")
+            self.moroz.after_commit(
+                lambda: self.bot.send_message(
+                    user.id,
+                    f"The game in room {room.display_short_code} has already completed.",
+                    reply_markup=remove_keyboard(),
+                )
+            )
+            return
+
+        self.moroz.after_commit(
+            lambda: self._notify_participants(user, room, users_in_just_completed_room)
+        )
 
+    def _notify_participants(self, user: User, room: Room, participants: list[User]):
+        notifications = []
+        for participant in participants:
+            logger.debug(
+                "Notifying user {} about game completion in {}", participant, room
+            )
+            notifications.append(
+                Notification(
+                    participant.id,
+                    f"The game in room {room.display_short_code} has been completed by its manager. Thank you for participating!",
+                )
+            )
+        self.broadcaster.broadcast(notifications).add_done_callback(
+            lambda broadcast: self._report(user, room, broadcast.result(), participants)
+        )
+
+    @logger.catch
+    def _report(
+        self,
+        user: User,
+        room: Room,
+        results: list[DeliveryResult],
+        participants: list[User],
+    ):
         self.bot.send_message(
             user.id,
-            f"The game in room {room.display_short_code} has been completed successfully. 🎉",
+            f"The game in room {room.display_short_code} has been completed successfully. 🎉"
+            + delivery_report(results, {u.id: u for u in participants}),
             reply_markup=remove_keyboard(),
         )
         logger.debug(f"Game in room {room} completed by {user}")
-
-        for user in users_in_just_completed_room:
-            logger.debug(f"Notifying user {user} about game completion in {room}")
-            self.bot.send_message(
-                user.id,
-                f"The game in room {room.display_short_code} has been completed by its manager. Thank you for participating!",
-            )
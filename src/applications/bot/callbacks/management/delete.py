@@ -1,5 +1,10 @@
 from loguru import logger
 
+from src.applications.bot.broadcast import (
+    DeliveryResult,
+    Notification,
+    delivery_report,
+)
 from src.applications.bot.callbacks.management.base import ManagementCallback
 from src.applications.bot.utils import remove_keyboard
 from src.models.room import Room
@@ -12,21 +17,8 @@ class DeleteCallback(ManagementCallback):
         users_in_just_deleted_room = self.moroz.delete_room(
             room_id=room.id,
         )
-        self.bot.send_message(
-            user.id,
-            f"Room {room.display_short_code} ({len(users_in_just_deleted_room)} players) deleted successfully. 🎉",
-            reply_markup=remove_keyboard(),
-        )
-        logger.debug(f"Room {room} deleted by {user}")
-
-        self._notify_ex_members(room, user, users_in_just_deleted_room)
-
-    def _notify_one_user(self, user: User, manager_user: User, ex_room: Room):
-        logger.debug(f"Notifying user {user} about {ex_room} deletion")
-        self.bot.send_message(
-            user.id,
-            f"The room {ex_room.display_short_code} you were in has been deleted by its manager {manager_user.formal_display_name}. "
-            "You have been removed from the room.",
+        self.moroz.after_commit(
+            lambda: self._notify_ex_members(room, user, users_in_just_deleted_room)
         )
 
     def _notify_ex_members(
@@ -35,5 +27,34 @@ class DeleteCallback(ManagementCallback):
         manager_user: User,
         users_in_room: list[User],
     ):
+        notifications = []
         for user in users_in_room:
-            self._notify_one_user(user, manager_user, room)
+            logger.debug("Notifying user {} about {} deletion", user, room)
+            notifications.append(
+                Notification(
+                    user.id,
+                    f"The room {room.display_short_code} you were in has been deleted by its manager {manager_user.formal_display_name}. "
+                    "You have been removed from the room.",
+                )
+            )
+        self.broadcaster.broadcast(notifications).add_done_callback(
+            lambda broadcast: self._report(
+                room, manager_user, broadcast.result(), users_in_room
+            )
+        )
+
+    @logger.catch
+    def _report(
+        self,
+        room: Room,
+        manager_user: User,
+        results: list[DeliveryResult],
+        users_in_room: list[User],
+    ):
+        self.bot.send_message(
+            manager_user.id,
+            f"Room {room.display_short_code} ({len(users_in_room)} players) deleted successfully. 🎉"
+            + delivery_report(results, {u.id: u for u in users_in_room}),
+            reply_markup=remove_keyboard(),
+        )
+        logger.debug(f"Room {room} deleted by {manager_user}")
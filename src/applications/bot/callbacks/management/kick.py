@@ -1,5 +1,6 @@
 from loguru import logger
 
+from src.applications.bot.callbacks.base import in_unit_of_work
 from src.applications.bot.callbacks.management.base import ManagementCallback
 from src.applications.bot.utils import get_keyboard, remove_keyboard, text
 from src.models.room import Room
@@ -42,6 +43,7 @@ class KickCallback(ManagementCallback):
             player_repr_to_id=player_repr_to_id,
         )
 
+    @in_unit_of_work
     def _handle_player_selected(
         self,
         message,
@@ -67,28 +69,32 @@ class KickCallback(ManagementCallback):
             logger.debug(f"Invalid player selection by {user}: {chosen_text!r}")
             return
 
+        # the room is locked until the commit, so nothing is sent before it
         try:
             player_to_kick = self.moroz.get_user(player_to_kick_id)
-            room = self.moroz.leave_room(user_id=player_to_kick.id)
+            room = self.moroz.kick_from_room(room.id, player_to_kick.id)
         except NotInRoom:
             logger.warning(f"Player {chosen_text=} was not in room (why?)")
-            self.bot.send_message(
-                user.id,
-                f"Player {chosen_text} is already not in the room. "
-                "Perhaps they left while you were choosing?",
-                reply_markup=remove_keyboard(),
+            self.moroz.after_commit(
+                lambda: self.bot.send_message(
+                    user.id,
+                    f"Player {chosen_text} is already not in the room. "
+                    "Perhaps they left while you were choosing?",
+                    reply_markup=remove_keyboard(),
+                )
             )
             return
 
         logger.debug(f"User manager {user} kicking {player_to_kick=} from {room=}")
+        self.moroz.after_commit(lambda: self._notify_kicked(player_to_kick, room, user))
 
+    def _notify_kicked(self, kicked_user: User, room: Room, manager_user: User):
         self.bot.send_message(
-            user.id,
-            f"Player {player_to_kick.formal_display_name} has been kicked from the room {room.display_short_code}.",
+            manager_user.id,
+            f"Player {kicked_user.formal_display_name} has been kicked from the room {room.display_short_code}.",
             reply_markup=remove_keyboard(),
         )
-
-        self._notify_kicked_player(player_to_kick, room, user)
+        self._notify_kicked_player(kicked_user, room, manager_user)
 
     def _notify_kicked_player(
         self,
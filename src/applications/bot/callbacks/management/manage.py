@@ -1,9 +1,11 @@
 from enum import StrEnum
 
+import telebot
 from loguru import logger
 from telebot import types
 
-from src.applications.bot.callbacks.base import Callback
+from src.applications.bot.broadcast import Broadcaster
+from src.applications.bot.callbacks.base import Callback, in_unit_of_work
 from src.applications.bot.callbacks.management.complete import CompleteCallback
 from src.applications.bot.callbacks.management.delete import DeleteCallback
 from src.applications.bot.callbacks.management.info import InfoCallback
@@ -12,6 +14,7 @@ from src.applications.bot.callbacks.management.play import PlayCallback
 from src.applications.bot.utils import get_keyboard, remove_keyboard, text
 from src.models.room import Room
 from src.models.user import User
+from src.services.moroz import Moroz
 
 
 class ManageActions(StrEnum):
@@ -24,6 +27,15 @@ class ManageActions(StrEnum):
 
 
 class ManageCallback(Callback):
+    def __init__(
+        self,
+        bot: telebot.TeleBot,
+        moroz: Moroz,
+        broadcaster: Broadcaster | None = None,
+    ):
+        super().__init__(bot, moroz)
+        self.broadcaster = broadcaster or Broadcaster(bot)
+
     @staticmethod
     def get_available_actions(room: Room) -> list[str]:
         # all except complete if not started and not completed
@@ -80,6 +92,7 @@ class ManageCallback(Callback):
             code_to_room=code_to_room,
         )
 
+    @in_unit_of_work
     def _handle_room_chosen(
         self,
         message: types.Message,
@@ -121,6 +134,7 @@ class ManageCallback(Callback):
             room=room,
         )
 
+    @in_unit_of_work
     def _handle_action_chosen(
         self,
         message: types.Message,
@@ -144,22 +158,22 @@ class ManageCallback(Callback):
             )
             logger.debug(f"Room management cancelled by {user}")
         elif chosen_text == ManageActions.INFO.value:
-            InfoCallback(bot=self.bot, moroz=self.moroz).process_management(
-                room=room, user=user
-            )
+            InfoCallback(
+                bot=self.bot, moroz=self.moroz, broadcaster=self.broadcaster
+            ).process_management(room=room, user=user)
         elif chosen_text == ManageActions.DELETE.value:
-            DeleteCallback(bot=self.bot, moroz=self.moroz).process_management(
-                room=room, user=user
-            )
+            DeleteCallback(
+                bot=self.bot, moroz=self.moroz, broadcaster=self.broadcaster
+            ).process_management(room=room, user=user)
         elif chosen_text == ManageActions.KICK_PLAYER.value:
-            KickCallback(bot=self.bot, moroz=self.moroz).process_management(
-                room=room, user=user
-            )
+            KickCallback(
+                bot=self.bot, moroz=self.moroz, broadcaster=self.broadcaster
+            ).process_management(room=room, user=user)
         elif chosen_text == ManageActions.START.value:
-            PlayCallback(bot=self.bot, moroz=self.moroz).process_management(
-                room=room, user=user
-            )
+            PlayCallback(
+                bot=self.bot, moroz=self.moroz, broadcaster=self.broadcaster
+            ).process_management(room=room, user=user)
         elif chosen_text == ManageActions.COMPLETE.value:
-            CompleteCallback(bot=self.bot, moroz=self.moroz).process_management(
-                room=room, user=user
-            )
+            CompleteCallback(
+                bot=self.bot, moroz=self.moroz, broadcaster=self.broadcaster
+            ).process_management(room=room, user=user)
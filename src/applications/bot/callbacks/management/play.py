@@ -1,44 +1,102 @@
 from loguru import logger
 
+from src.applications.bot.broadcast import (
+    DeliveryResult,
+    Notification,
+    delivery_report,
+)
 from src.applications.bot.callbacks.management.base import ManagementCallback
 from src.applications.bot.utils import remove_keyboard
 from src.models.room import Room
 from src.models.user import User
-from src.shared.exceptions import RoomTooSmall
+from src.shared.exceptions import (
+    GameAlreadyStarted,
+    NoValidAssignment,
+    RoomTooSmall,
+)
 
 
 class PlayCallback(ManagementCallback):
     def process_management(self, user: User, room: Room):
         logger.info(f"Play action chosen by {user} in {room}")
 
+        # the room is locked until the commit, so nothing is sent before it
         try:
             target_pairs = self.moroz.start_game_in_room(room.id)
         except RoomTooSmall:
             logger.debug(
                 f"Attempt to start game in too small {room.id=} by user {user}"
             )
-            self.bot.send_message(
-                user.id,
+            self._reply_after_commit(
+                user,
                 "Cannot start the game: not enough players in "
                 f"the room (need at least {self.moroz.min_players_to_start_game}).",
-                reply_markup=remove_keyboard(),
+            )
+            return
+        except GameAlreadyStarted:
+            # e.g. "Start" chosen twice before the first one went through
+            logger.info(f"Game in {room.id=} already started; ignoring {user}")
+            self._reply_after_commit(
+                user,
+                f"The game in room {room.display_short_code} has already started.",
+            )
+            return
+        except NoValidAssignment as e:
+            logger.info(f"No valid assignment of targets in {room.id=}: {e}")
+            self._reply_after_commit(
+                user,
+                f"Cannot start the game: {e}.",
             )
             return
 
+        notifications = []
         for giver, receiver in target_pairs:
-            logger.debug(f"Notifying {giver} about their target {receiver}")
-            self.bot.send_message(
-                giver.id,
-                f"The game in room {room.display_short_code} has started! "
-                f"You are to give a gift to {receiver.formal_display_name} 🎁",
+            logger.debug("Notifying {} about their target {}", giver, receiver)
+            notifications.append(
+                Notification(
+                    giver.id,
+                    f"The game in room {room.display_short_code} has started! "
+                    f"You are to give a gift to {receiver.formal_display_name} 🎁",
+                )
+            )
+        participants = {giver.id: giver for giver, _ in target_pairs}
+        self.moroz.after_commit(
+            lambda: self._notify_participants(user, room, notifications, participants)
+        )
+
+    def _reply_after_commit(self, user: User, reply: str):
+        self.moroz.after_commit(
+            lambda: self.bot.send_message(
+                user.id, reply, reply_markup=remove_keyboard()
             )
+        )
+
+    def _notify_participants(
+        self,
+        user: User,
+        room: Room,
+        notifications: list[Notification],
+        participants: dict[int, User],
+    ):
+        self.broadcaster.broadcast(notifications).add_done_callback(
+            lambda broadcast: self._report(user, room, broadcast.result(), participants)
+        )
 
-        participants = ", ".join(u.formal_display_name for u, _ in target_pairs)
+    @logger.catch
+    def _report(
+        self,
+        user: User,
+        room: Room,
+        results: list[DeliveryResult],
+        participants: dict[int, User],
+    ):
+        names = ", ".join(u.formal_display_name for u in participants.values())
         self.bot.send_message(
             user.id,
             f"The game in room {room.display_short_code} has started! "
-            f"All participants ({participants}) have been notified privately. "
-            "Note that you may want to complete this game later under /manage.",
+            f"All participants ({names}) have been notified privately. "
+            "Note that you may want to complete this game later under /manage."
+            + delivery_report(results, participants),
             reply_markup=remove_keyboard(),
         )
         logger.debug(f"Game started in room {room} by user {user}")
@@ -1,7 +1,7 @@
 from loguru import logger
 from telebot import types
 
-from src.applications.bot.callbacks.base import Callback
+from src.applications.bot.callbacks.base import Callback, in_unit_of_work
 from src.applications.bot.utils import text
 from src.models.user import User
 from src.shared.exceptions import InvalidName
@@ -20,6 +20,7 @@ class NameCallback(Callback):
             user=user,
         )
 
+    @in_unit_of_work
     def _set_name(self, message: types.Message, user: User):
         new_name = text(message).strip()
         logger.debug(f"Setting name for {user} to {new_name!r}")
@@ -33,8 +34,10 @@ class NameCallback(Callback):
             )
             return
 
-        self.bot.send_message(
-            user.id,
-            f"Your name has been set to {new_name!r}.",
+        self.moroz.after_commit(
+            lambda: self.bot.send_message(
+                user.id,
+                f"Your name has been set to {new_name!r}.",
+            )
         )
         logger.debug(f"Name for {user} set to {new_name!r}")
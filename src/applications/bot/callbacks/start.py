@@ -2,7 +2,7 @@ from loguru import logger
 from telebot import types
 
 from src.applications.bot.callbacks.base import Callback
-from src.applications.bot.utils import user_from_message
+from src.applications.bot.utils import nothing_sent_since_now, user_from_message
 from src.models.user import User
 from src.shared.exceptions import UserNotFound
 
@@ -11,13 +11,21 @@ class StartCallback(Callback):
     def process_wrap(self, message: types.Message):
         # overriding to NOT check user existence beforehand
         # since the point of /start is to create user if not exists
-        return self.process(user_from_message(message), message=message)
+        if self._rate_limited(message):
+            return
+        user = user_from_message(message)
+        return self.moroz.run_in_unit_of_work(
+            lambda: self.process(user, message=message),
+            retryable=nothing_sent_since_now(),
+        )
 
     def _create_user(self, user: User):
         new_user = self.moroz.create_user(user.id, user.username, user.name)
-        self.bot.send_message(
-            new_user.id,
-            f"Welcome, {new_user.display_name}! You have been registered. /help may be useful to get started.",
+        self.moroz.after_commit(
+            lambda: self.bot.send_message(
+                new_user.id,
+                f"Welcome, {new_user.display_name}! You have been registered. /help may be useful to get started.",
+            )
         )
 
     def _greet_again(self, user: User):
@@ -1,8 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import NamedTuple
 
 import telebot
-from telebot import types
+from telebot import types, util
 
+from src.applications.bot.broadcast import Broadcaster
+from src.applications.bot.callbacks.base import Callback
 from src.applications.bot.callbacks.create import CreateCallback
 from src.applications.bot.callbacks.echo import EchoCallback
 from src.applications.bot.callbacks.help import HelpCallback
@@ -10,61 +13,98 @@ from src.applications.bot.callbacks.here import HereCallback
 from src.applications.bot.callbacks.history import HistoryCallback
 from src.applications.bot.callbacks.join import JoinCallback
 from src.applications.bot.callbacks.leave import LeaveCallback
+from src.applications.bot.callbacks.management.base import ManagementCallback
+from src.applications.bot.callbacks.management.kick import KickCallback
 from src.applications.bot.callbacks.management.manage import ManageCallback
 from src.applications.bot.callbacks.me import MeCallback
 from src.applications.bot.callbacks.name import NameCallback
 from src.applications.bot.callbacks.start import StartCallback
+from src.applications.bot.metrics import HANDLER_DURATION
+from src.applications.bot.utils import text
 from src.services.moroz import Moroz
+from src.shared.rate_limit import UserRateLimiter
 
 
-@dataclass
-class CallbacksManager:
-    """Manages bot callbacks."""
-
-    bot: telebot.TeleBot
-    moroz: Moroz
-
-    def register_callbacks(self, bot: telebot.TeleBot):
-        @bot.message_handler(commands=["start"])
-        def start_handler(message: types.Message):
-            StartCallback(self.bot, self.moroz).process_wrap(message)
-
-        @bot.message_handler(commands=["help"])
-        def help_handler(message: types.Message):
-            HelpCallback(self.bot, self.moroz).process_wrap(message)
+class Route(NamedTuple):
+    callback: type[Callback]
+    # False lets the callback run without the user lookup (or registration)
+    requires_registered_user: bool
 
-        @bot.message_handler(commands=["me"])
-        def me_handler(message: types.Message):
-            MeCallback(self.bot, self.moroz).process_wrap(message)
 
-        @bot.message_handler(commands=["leave"])
-        def leave_handler(message: types.Message):
-            LeaveCallback(self.bot, self.moroz).process_wrap(message)
+COMMANDS: dict[str, Route] = {
+    "start": Route(StartCallback, False),  # registers the user itself
+    "help": Route(HelpCallback, False),
+    "me": Route(MeCallback, True),
+    "leave": Route(LeaveCallback, True),
+    "join": Route(JoinCallback, True),
+    "manage": Route(ManageCallback, True),
+    "create": Route(CreateCallback, True),
+    "name": Route(NameCallback, True),
+    "history": Route(HistoryCallback, True),
+    "here": Route(HereCallback, True),
+}
+# any other text, including unknown commands
+FALLBACK = Route(EchoCallback, False)
 
-        @bot.message_handler(commands=["join"])
-        def join_handler(message: types.Message):
-            JoinCallback(self.bot, self.moroz).process_wrap(message)
 
-        @bot.message_handler(commands=["manage"])
-        def manage_handler(message: types.Message):
-            ManageCallback(self.bot, self.moroz).process_wrap(message)
-
-        @bot.message_handler(commands=["create"])
-        def create_handler(message: types.Message):
-            CreateCallback(self.bot, self.moroz).process_wrap(message)
-
-        @bot.message_handler(commands=["name"])
-        def name_handler(message: types.Message):
-            NameCallback(self.bot, self.moroz).process_wrap(message)
+@dataclass
+class CallbacksManager:
+    """Manages bot callbacks.
 
-        @bot.message_handler(commands=["history"])
-        def history_handler(message: types.Message):
-            HistoryCallback(self.bot, self.moroz).process_wrap(message)
+    Messages are routed by a single handler through a dict of command
+    to callback; callbacks are built once and reused for every message.
+    With a `rate_limiter`, each command takes its cost in `command_costs`
+    (1 if it is not listed) from the bucket of its user.
+    """
 
-        @bot.message_handler(commands=["here"])
-        def here_handler(message: types.Message):
-            HereCallback(self.bot, self.moroz).process_wrap(message)
+    bot: telebot.TeleBot
+    moroz: Moroz
+    broadcaster: Broadcaster | None = None
+    rate_limiter: UserRateLimiter | None = None
+    command_costs: dict[str, float] = field(default_factory=dict)
+    _commands: dict[str, Callback] = field(init=False, repr=False)
+    _fallback: Callback = field(init=False, repr=False)
+    # callbacks with next steps by class name, see `callback_instance`
+    _with_next_steps: dict[str, Callback | ManagementCallback] = field(
+        init=False, repr=False
+    )
+
+    def __post_init__(self):
+        if self.broadcaster is None:
+            self.broadcaster = Broadcaster(self.bot)
+        self._commands = {
+            command: self._build(route, command) for command, route in COMMANDS.items()
+        }
+        self._fallback = self._build(FALLBACK, "")
+        self._with_next_steps = {
+            type(callback).__name__: callback
+            for callback in self._commands.values()
+            if isinstance(callback, (ManageCallback, JoinCallback, NameCallback))
+        }
+        self._with_next_steps[KickCallback.__name__] = KickCallback(
+            self.bot, self.moroz, self.broadcaster
+        )
+
+    def _build(self, route: Route, command: str) -> Callback:
+        if issubclass(route.callback, ManageCallback):
+            callback: Callback = route.callback(self.bot, self.moroz, self.broadcaster)
+        else:
+            callback = route.callback(self.bot, self.moroz)
+        callback.requires_registered_user = route.requires_registered_user
+        callback.rate_limiter = self.rate_limiter
+        callback.cost = self.command_costs.get(command, 1)
+        return callback
+
+    def callback_instance(self, name: str) -> Callback | ManagementCallback | None:
+        """An instance of the named callback class which has next steps
+        (to restore persisted conversations), or None if unknown."""
+        return self._with_next_steps.get(name)
+
+    def dispatch(self, message: types.Message):
+        command = util.extract_command(text(message)) or ""
+        callback = self._commands.get(command, self._fallback)
+        with HANDLER_DURATION.time(handler=type(callback).__name__):
+            callback.process_wrap(message)
 
-        @bot.message_handler(func=lambda message: True)
-        def echo_handler(message: types.Message):
-            EchoCallback(self.bot, self.moroz).process_wrap(message)
+    def register_callbacks(self, bot: telebot.TeleBot):
+        bot.register_message_handler(self.dispatch)
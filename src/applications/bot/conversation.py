@@ -0,0 +1,218 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from threading import RLock, Timer
+from typing import Any
+
+from loguru import logger
+from sqlmodel import SQLModel
+from telebot import Handler
+from telebot.handler_backends import HandlerBackend
+
+from src.models.room import Room
+from src.models.user import User
+
+# models that may be captured in a conversation's state
+_MODELS: dict[str, type[SQLModel]] = {"User": User, "Room": Room}
+
+# resolves the name of a callback class into an instance of it
+CallbackResolver = Callable[[str], object | None]
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, SQLModel) and type(value).__name__ in _MODELS:
+        return {
+            "__model__": type(value).__name__,
+            "data": value.model_dump(mode="json"),
+        }
+    if isinstance(value, dict):
+        # JSON would turn e.g. the int keys of `code_to_room` into strings
+        return {
+            "__dict__": [[_dump_value(k), _dump_value(v)] for k, v in value.items()]
+        }
+    if isinstance(value, (list, tuple)):
+        return [_dump_value(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot persist {type(value).__name__} in conversation state")
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_load_value(v) for v in value]
+    if isinstance(value, dict):
+        if "__model__" in value:
+            return _MODELS[value["__model__"]].model_validate(value["data"])
+        return {_load_value(k): _load_value(v) for k, v in value["__dict__"]}
+    return value
+
+
+class ConversationStore(HandlerBackend):
+    """A next-step handler backend for telebot: the pending step of each
+    chat's conversation (e.g. "/manage" waiting for the room to be chosen).
+
+    Steps expire `ttl_seconds` after they were registered and at most
+    `max_entries` chats are tracked (least recently active ones are
+    evicted), so abandoned conversations do not pile up.
+
+    With a `path`, steps whose callback is a method of a bot callback and
+    whose arguments are plain data or models are persisted there as JSON
+    (at most `save_delay` seconds after a change) and restored by `load`,
+    so that pending conversations survive restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 3600,
+        path: str | Path | None = None,
+        save_delay: float = 1,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = Path(path) if path is not None else None
+        self.save_delay = save_delay
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, list[Handler]]] = OrderedDict()
+        self._lock = RLock()
+        self._save_timer: Timer | None = None
+
+    # not __len__: telebot would take an empty store for a missing one
+    @property
+    def size(self) -> int:
+        """Number of chats with a pending step."""
+        return len(self._entries)
+
+    def _evict(self, now: float):
+        # entries are ordered by registration, hence by expiry as well
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or next(iter(self._entries.values()))[0] <= now
+        ):
+            chat_id, _ = self._entries.popitem(last=False)
+            logger.debug(f"Conversation state of chat {chat_id} evicted")
+
+    def register_handler(self, handler_group_id: int, handler: Handler):
+        with self._lock:
+            now = self._clock()
+            _, handlers = self._entries.pop(handler_group_id, (None, []))
+            self._entries[handler_group_id] = (
+                now + self.ttl_seconds,
+                handlers + [handler],
+            )
+            self._evict(now)
+        self._schedule_save()
+
+    def clear_handlers(self, handler_group_id: int):
+        with self._lock:
+            removed = self._entries.pop(handler_group_id, None)
+        if removed is not None:
+            self._schedule_save()
+
+    def get_handlers(self, handler_group_id: int) -> list[Handler] | None:
+        with self._lock:
+            entry = self._entries.pop(handler_group_id, None)
+        if entry is None:
+            return None
+        self._schedule_save()
+        expires_at, handlers = entry
+        if expires_at <= self._clock():
+            logger.debug(f"Conversation state of chat {handler_group_id} expired")
+            return None
+        return handlers
+
+    @staticmethod
+    def _dump_handler(handler: Handler) -> dict[str, Any] | None:
+        owner = getattr(handler.callback, "__self__", None)
+        if owner is None:
+            return None
+        try:
+            return {
+                "callback": f"{type(owner).__name__}.{handler.callback.__name__}",
+                "args": _dump_value(list(handler.args)),
+                "kwargs": {k: _dump_value(v) for k, v in handler.kwargs.items()},
+            }
+        except TypeError as e:
+            logger.debug(f"Not persisting {handler.callback}: {e}")
+            return None
+
+    def save(self):
+        """Write the persistable state to `path` (atomically)."""
+        if self.path is None:
+            return
+        with self._lock:
+            now = self._clock()
+            self._evict(now)
+            entries = []
+            for chat_id, (expires_at, handlers) in self._entries.items():
+                dumped = [d for h in handlers if (d := self._dump_handler(h))]
+                if dumped:
+                    entries.append(
+                        {
+                            "chat_id": chat_id,
+                            "expires_at": expires_at,
+                            "handlers": dumped,
+                        }
+                    )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps({"version": 1, "entries": entries}))
+        os.replace(tmp_path, self.path)
+        logger.debug(f"Saved conversation state of {len(entries)} chats")
+
+    def _schedule_save(self):
+        if self.path is None:
+            return
+        if self.save_delay <= 0:
+            self.save()
+            return
+        with self._lock:
+            if self._save_timer is None or not self._save_timer.is_alive():
+                self._save_timer = Timer(self.save_delay, self.save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def load(self, resolve: CallbackResolver):
+        """Restore the state saved at `path`, binding the callbacks
+        to the instances returned by `resolve`."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            saved = json.loads(self.path.read_text())
+        except ValueError:
+            logger.exception(f"Ignoring corrupt conversation state at {self.path}")
+            return
+        now = self._clock()
+        with self._lock:
+            for entry in saved["entries"]:
+                if entry["expires_at"] <= now:
+                    continue
+                handlers = []
+                for dumped in entry["handlers"]:
+                    owner_name, method_name = dumped["callback"].split(".")
+                    if (owner := resolve(owner_name)) is None:
+                        logger.warning(f"Unknown callback {dumped['callback']}")
+                        continue
+                    handlers.append(
+                        Handler(
+                            getattr(owner, method_name),
+                            *_load_value(dumped["args"]),
+                            **{k: _load_value(v) for k, v in dumped["kwargs"].items()},
+                        )
+                    )
+                if handlers:
+                    self._entries[entry["chat_id"]] = (entry["expires_at"], handlers)
+            self._evict(now)
+        logger.info(f"Restored conversation state of {len(self._entries)} chats")
+
+    def close(self):
+        """Save pending changes right away."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+        self.save()
@@ -0,0 +1,201 @@
+from collections import deque
+from collections.abc import Callable, Hashable
+from threading import Condition, Thread
+
+import telebot
+from loguru import logger
+from telebot import types, util
+from telebot.apihelper import ApiTelegramException
+
+from src.applications.bot.broadcast import TOO_MANY_REQUESTS
+from src.applications.bot.metrics import (
+    TELEGRAM_ERRORS,
+    TELEGRAM_RATE_LIMITED,
+    TELEGRAM_REQUEST_DURATION,
+)
+from src.applications.bot.utils import count_sent_message
+from src.repositories.query_stats import track_queries
+
+
+class ChatOrderedDispatcher:
+    """Runs tasks on a fixed pool of worker threads, in parallel across
+    keys (chats) but strictly one after another, in submission order,
+    within a key.
+
+    At most `max_pending` tasks may be queued or running at a time;
+    `submit` then waits (or gives up) until a worker frees a slot.
+    Chats with a backlog are served round-robin, so that one busy chat
+    does not starve the others.
+    """
+
+    def __init__(self, workers: int = 8, max_pending: int = 1000):
+        self.max_pending = max_pending
+        self._changed = Condition()
+        # chats with queued tasks; a chat is here iff it is in `_ready`
+        # or one of its tasks is running
+        self._chats: dict[Hashable, deque[Callable[[], object]]] = {}
+        self._ready: deque[Hashable] = deque()
+        self._pending = 0
+        self._closed = False
+        self._threads = [
+            Thread(target=self._work, name=f"dispatcher-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Number of tasks queued or running."""
+        return self._pending
+
+    def submit(
+        self,
+        key: Hashable,
+        task: Callable[[], object],
+        *,
+        block: bool = True,
+        timeout: float | None = None,
+    ) -> bool:
+        """Queue `task` after the other tasks of `key`.
+        Returns False if the queue stayed full (never when blocking
+        without a timeout)."""
+        with self._changed:
+            if self._closed:
+                raise RuntimeError("Dispatcher is shut down")
+            if not self._changed.wait_for(
+                lambda: self._pending < self.max_pending,
+                timeout if block else 0,
+            ):
+                logger.warning(f"Dispatcher queue is full ({self._pending} pending)")
+                return False
+            self._pending += 1
+            if (queue := self._chats.get(key)) is not None:
+                queue.append(task)
+            else:
+                self._chats[key] = deque([task])
+                self._ready.append(key)
+                self._changed.notify_all()
+            return True
+
+    def _next_task(self) -> tuple[Hashable, Callable[[], object]] | None:
+        with self._changed:
+            self._changed.wait_for(lambda: self._ready or self._closed)
+            if not self._ready:
+                return None
+            key = self._ready.popleft()
+            return key, self._chats[key][0]
+
+    def _work(self):
+        while (next_task := self._next_task()) is not None:
+            key, task = next_task
+            try:
+                task()
+            except Exception:  # noqa: BLE001 - the worker must outlive any task
+                logger.exception(f"Task of chat {key} failed")
+            with self._changed:
+                queue = self._chats[key]
+                queue.popleft()
+                if queue:
+                    # back of the line, behind the other waiting chats
+                    self._ready.append(key)
+                else:
+                    del self._chats[key]
+                self._pending -= 1
+                self._changed.notify_all()
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until all submitted tasks are done."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self):
+        """Finish the submitted tasks and stop the workers."""
+        self.join()
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+
+def chat_key(update: types.Update) -> Hashable:
+    """The chat (or, failing that, the user) an update belongs to."""
+    for message in (
+        update.message,
+        update.edited_message,
+        update.channel_post,
+        update.edited_channel_post,
+    ):
+        if message is not None:
+            return message.chat.id
+    for event in (
+        update.callback_query,
+        update.inline_query,
+        update.chosen_inline_result,
+        update.my_chat_member,
+        update.chat_member,
+        update.chat_join_request,
+    ):
+        if event is not None:
+            return event.from_user.id
+    # unrelated to any chat; no ordering needed
+    return ("update", update.update_id)
+
+
+def describe_update(update: types.Update) -> str:
+    """A label of an update for logs, e.g. "update 42 (/join)"."""
+    if (message := update.message) is not None and message.text:
+        command = util.extract_command(message.text)
+        kind = f"/{command}" if command else "text"
+    else:
+        kind = "other"
+    return f"update {update.update_id} ({kind})"
+
+
+class OrderedTeleBot(telebot.TeleBot):
+    """A TeleBot handling updates of different chats in parallel and
+    those of one chat in order (as next-step handlers expect).
+
+    Updates are only queued by `process_new_updates`; handlers then run
+    synchronously on the dispatcher's workers.
+    """
+
+    def __init__(self, token: str, dispatcher: ChatOrderedDispatcher, **kwargs):
+        super().__init__(token, threaded=False, **kwargs)
+        self.dispatcher = dispatcher
+
+    def enqueue_update(self, update: types.Update, *, block: bool = True) -> bool:
+        """Queue an update for handling; False if the queue is full
+        and `block` is False."""
+        return self.dispatcher.submit(
+            chat_key(update),
+            lambda: self._handle(update),
+            block=block,
+        )
+
+    def _handle(self, update: types.Update):
+        with track_queries(describe_update(update)):
+            super().process_new_updates([update])
+
+    def send_message(self, chat_id: int | str, text: str, *args, **kwargs):
+        # even a failed request may have been delivered
+        count_sent_message()
+        with TELEGRAM_REQUEST_DURATION.time(method="sendMessage"):
+            try:
+                return super().send_message(chat_id, text, *args, **kwargs)
+            except ApiTelegramException as e:
+                TELEGRAM_ERRORS.inc(method="sendMessage", code=str(e.error_code))
+                if e.error_code == TOO_MANY_REQUESTS:
+                    TELEGRAM_RATE_LIMITED.inc(method="sendMessage")
+                raise
+            except Exception:
+                TELEGRAM_ERRORS.inc(method="sendMessage", code="network")
+                raise
+
+    def process_new_updates(self, updates: list[types.Update]):
+        for update in updates:
+            self.enqueue_update(update)
+            # polling fetches the updates after this id next
+            if update.update_id > (self.last_update_id or 0):
+                self.last_update_id = update.update_id
@@ -0,0 +1,100 @@
+from collections.abc import Callable
+
+from sqlalchemy.pool import Pool, QueuePool
+
+from src.models.user import User
+from src.shared.cache import TTLCache
+from src.shared.metrics import REGISTRY, Counter, CounterFunction, Gauge, Histogram
+
+HANDLER_DURATION = REGISTRY.register(
+    Histogram(
+        "bot_handler_duration_seconds",
+        "Time to handle a command or a conversation step.",
+        ["handler"],
+    )
+)
+TELEGRAM_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "telegram_request_duration_seconds",
+        "Duration of Telegram Bot API requests.",
+        ["method"],
+    )
+)
+TELEGRAM_ERRORS = REGISTRY.register(
+    Counter(
+        "telegram_errors",
+        "Failed Telegram Bot API requests by error code.",
+        ["method", "code"],
+    )
+)
+TELEGRAM_RATE_LIMITED = REGISTRY.register(
+    Counter(
+        "telegram_rate_limited",
+        "Telegram Bot API requests refused with 429 Too Many Requests.",
+        ["method"],
+    )
+)
+COMMANDS_RATE_LIMITED = REGISTRY.register(
+    Counter(
+        "bot_commands_rate_limited",
+        "Commands refused by the per-user rate limit, by admission.",
+        ["admission"],
+    )
+)
+
+
+def register_runtime_gauges(
+    pool: Pool,
+    *,
+    updates_pending: Callable[[], float],
+    conversations_pending: Callable[[], float],
+    user_cache: TTLCache[int, User] | None = None,
+):
+    """Expose the state of the connection pool, the update queue,
+    the conversations and the user cache of a running bot."""
+    if isinstance(pool, QueuePool):
+        REGISTRY.register(
+            Gauge(
+                "db_pool_checked_out",
+                "Database connections currently in use.",
+                pool.checkedout,
+            )
+        )
+        REGISTRY.register(
+            Gauge(
+                "db_pool_overflow",
+                "Database connections open beyond the pool size.",
+                # negative while the pool is not filled up yet
+                lambda: max(pool.overflow(), 0),
+            )
+        )
+    REGISTRY.register(
+        Gauge(
+            "bot_updates_pending",
+            "Updates queued or being handled.",
+            updates_pending,
+        )
+    )
+    REGISTRY.register(
+        Gauge(
+            "bot_conversations_pending",
+            "Chats waiting for a next step.",
+            conversations_pending,
+        )
+    )
+    if user_cache is not None:
+        REGISTRY.register(
+            CounterFunction(
+                "user_cache_hits", "Users found in the cache.", lambda: user_cache.hits
+            )
+        )
+        REGISTRY.register(
+            CounterFunction(
+                "user_cache_misses",
+                "Users looked up in the cache but read from the database.",
+                lambda: user_cache.misses,
+            )
+        )
+        REGISTRY.register(
+            Gauge("user_cache_size", "Users in the cache.", lambda: len(user_cache))
+        )
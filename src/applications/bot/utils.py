@@ -1,5 +1,8 @@
-import subprocess
+import json
+from collections.abc import Callable
+from contextvars import ContextVar
 from itertools import batched
+from pathlib import Path
 from typing import NamedTuple
 
 from loguru import logger
@@ -33,7 +36,32 @@ def user_from_message(message: types.Message) -> User:
     )
 
 
-class GitInfo(NamedTuple):
+# the transaction of the request was rolled back; nothing has changed
+ROOM_BUSY_MESSAGE = "Somebody else is changing this room right now. Please try again."
+
+# messages sent by the handlers run in the current context, counted by the bots
+_messages_sent: ContextVar[int] = ContextVar("messages_sent", default=0)
+
+
+def count_sent_message():
+    _messages_sent.set(_messages_sent.get() + 1)
+
+
+def nothing_sent_since_now() -> Callable[[], bool]:
+    """A check that no message has been sent (in this context) since the
+    call, i.e. that a handler can run again without repeating itself."""
+    sent = _messages_sent.get()
+    return lambda: _messages_sent.get() == sent
+
+
+# sent once per flood of commands, see `UserRateLimiter`
+RATE_LIMITED_MESSAGE = "You are sending commands too fast. Please wait a moment."
+
+# written at image build time, see the Dockerfile
+BUILD_INFO_PATH = Path(__file__).resolve().parents[3] / "build-info.json"
+
+
+class BuildInfo(NamedTuple):
     branch_name: str
     commit_hash: str
     commit_message: str
@@ -46,26 +74,18 @@ class GitInfo(NamedTuple):
         )
 
 
-def get_git_info() -> GitInfo | None:
-    def _output(cmd: list[str]) -> str:
-        return (
-            subprocess.check_output(
-                cmd,
-                stderr=subprocess.STDOUT,
-            )
-            .decode("utf-8")
-            .strip()
-        )
-
+def get_build_info(path: Path = BUILD_INFO_PATH) -> BuildInfo | None:
+    """The version the image was built from, if it was recorded."""
     try:
-        commit_hash = _output(["git", "rev-parse", "--short", "HEAD"])
-        branch_name = _output(["git", "rev-parse", "--abbrev-ref", "HEAD"])
-        commit_message = _output(["git", "log", "-1", "--pretty=%B"])
-        return GitInfo(
-            branch_name=branch_name,
-            commit_hash=commit_hash,
-            commit_message=commit_message,
+        info = json.loads(path.read_text())
+        return BuildInfo(
+            branch_name=info["branch_name"],
+            commit_hash=info["commit_hash"],
+            commit_message=info["commit_message"],
         )
-    except Exception as e:
-        logger.warning(f"Failed to get git info: {e}")
+    except FileNotFoundError:
+        logger.info(f"No build info at {path}")
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Failed to read build info from {path}: {e!r}")
         return None
@@ -0,0 +1,118 @@
+import hmac
+import json
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from loguru import logger
+from telebot import types
+
+from src.applications.bot.dispatcher import OrderedTeleBot
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+@dataclass(frozen=True)
+class WebhookConfig:
+    # public URL Telegram posts updates to (e.g. of a load balancer)
+    url: str
+    secret_token: str | None = None
+    listen_host: str = "0.0.0.0"
+    listen_port: int = 8080
+    path: str = "/webhook"
+    # concurrent connections Telegram may open to us
+    max_connections: int = 40
+    max_body_bytes: int = 1 << 20
+
+
+class WebhookServer:
+    """An embedded HTTP server receiving updates pushed by Telegram.
+
+    Each request is checked against the secret token and its update
+    queued on the bot's dispatcher before it is acknowledged, so that slow
+    handlers never make Telegram wait. A full queue is answered with 503,
+    which Telegram retries later.
+    """
+
+    def __init__(self, bot: OrderedTeleBot, config: WebhookConfig):
+        self.bot = bot
+        self.config = config
+        self._httpd = ThreadingHTTPServer(
+            (config.listen_host, config.listen_port), self._handler_class()
+        )
+        self._thread: Thread | None = None
+
+    @property
+    def server_address(self) -> tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                status = server._receive(self)
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                logger.trace(f"Webhook {self.address_string()}: {format % args}")
+
+        return Handler
+
+    def _authorized(self, request: BaseHTTPRequestHandler) -> bool:
+        # without a secret token nothing proves a request comes from Telegram
+        if not self.config.secret_token:
+            return False
+        return hmac.compare_digest(
+            request.headers.get(SECRET_TOKEN_HEADER, ""), self.config.secret_token
+        )
+
+    def _receive(self, request: BaseHTTPRequestHandler) -> HTTPStatus:
+        if request.path != self.config.path:
+            return HTTPStatus.NOT_FOUND
+        if not self._authorized(request):
+            logger.warning(f"Rejected webhook request from {request.client_address}")
+            return HTTPStatus.FORBIDDEN
+        length = int(request.headers.get("Content-Length") or 0)
+        if length > self.config.max_body_bytes:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        try:
+            update = types.Update.de_json(json.loads(request.rfile.read(length)))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Malformed webhook update: {e}")
+            return HTTPStatus.BAD_REQUEST
+        if update is None:
+            return HTTPStatus.BAD_REQUEST
+        if not self.bot.enqueue_update(update, block=False):
+            return HTTPStatus.SERVICE_UNAVAILABLE
+        return HTTPStatus.OK
+
+    def register(self):
+        """Point Telegram at this server."""
+        self.bot.set_webhook(
+            url=self.config.url,
+            secret_token=self.config.secret_token,
+            max_connections=self.config.max_connections,
+        )
+        logger.info(f"Webhook registered at {self.config.url}")
+
+    def serve_forever(self):
+        logger.info(f"Webhook server listening on {self.server_address}")
+        self._httpd.serve_forever()
+
+    def start(self):
+        """Serve in a background thread."""
+        self._thread = Thread(
+            target=self.serve_forever, name="webhook-server", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -1,26 +1,96 @@
-from typing import cast
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
 
-import dotenv
 from dependency_injector.containers import DeclarativeContainer
-from dependency_injector.providers import Configuration, Singleton
-from sqlalchemy import create_engine
+from dependency_injector.providers import Configuration, Object, Selector, Singleton
 
 from src.applications.bot.app import BotApp
+from src.applications.bot.webhook import WebhookConfig
+from src.models.user import User
 from src.repositories.database import DatabaseRepository
+from src.repositories.engine import create_async_database_engine, create_database_engine
+from src.repositories.short_codes import ShortCodeAllocator
+from src.repositories.sqlite import SQLiteProfile, sqlite_maintenance
 from src.services.moroz import Moroz
 from src.settings import Settings
+from src.shared.cache import TTLCache
+
+if TYPE_CHECKING:
+    from src.applications.async_bot.app import AsyncBotApp
+    from src.repositories.async_database import AsyncDatabaseRepository
+    from src.services.async_moroz import AsyncMoroz
+
+
+# the asyncio runtime (AsyncTeleBot, aiohttp) is imported only when selected
+
+
+def _async_database_repository(**kwargs: Any) -> AsyncDatabaseRepository:
+    from src.repositories.async_database import AsyncDatabaseRepository
+
+    return AsyncDatabaseRepository(**kwargs)
+
+
+def _async_moroz(**kwargs: Any) -> AsyncMoroz:
+    from src.services.async_moroz import AsyncMoroz
+
+    return AsyncMoroz(**kwargs)
+
 
-dotenv.load_dotenv()
+def _async_bot_app(**kwargs: Any) -> AsyncBotApp:
+    from src.applications.async_bot.app import AsyncBotApp
+
+    return AsyncBotApp(**kwargs)
 
 
 class ApplicationContainer(DeclarativeContainer):
+    """The application's components. `config` is loaded by the caller,
+    e.g. `container.config.from_pydantic(Settings())`."""
+
     config = Configuration()
-    config.from_pydantic(Settings())  # type: ignore
     config = cast(Settings, config)  # type: ignore[assignment]
 
-    db_engine = Singleton(create_engine, config.database_url)
+    sqlite_profile = Singleton(
+        SQLiteProfile,
+        journal_mode=config.sqlite_journal_mode,
+        busy_timeout_ms=config.sqlite_busy_timeout_ms,
+        synchronous=config.sqlite_synchronous,
+        mmap_size=config.sqlite_mmap_size,
+        cache_size_kib=config.sqlite_cache_size_kib,
+    )
+
+    db_engine = Singleton(
+        create_database_engine,
+        config.database_url,
+        sqlite_profile=sqlite_profile,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout_seconds,
+        pool_recycle=config.db_pool_recycle_seconds,
+        pool_pre_ping=config.db_pool_pre_ping,
+    )
+
+    short_code_allocator = Singleton(
+        ShortCodeAllocator,
+        min_digits=config.short_code_min_digits,
+        max_digits=config.short_code_max_digits,
+        max_occupancy=config.short_code_max_occupancy,
+    )
 
-    database_repository = Singleton(DatabaseRepository, engine=db_engine)
+    user_cache: Singleton[TTLCache[int, User]] = Singleton(
+        TTLCache,
+        max_size=config.user_cache_size,
+        ttl_seconds=config.user_cache_ttl_seconds,
+    )
+
+    database_repository = Singleton(
+        DatabaseRepository,
+        engine=db_engine,
+        short_code_allocator=short_code_allocator,
+        user_cache=user_cache,
+        read_retries=config.db_read_retries,
+        read_retry_backoff=config.db_read_retry_backoff_seconds,
+    )
 
     moroz = Singleton(
         Moroz,
@@ -30,6 +100,109 @@ class ApplicationContainer(DeclarativeContainer):
         admin_name=config.admin_name,
         admin_username=config.admin_username,
         admin_user_id=config.admin_user_id,
+        avoid_past_targets=config.avoid_past_targets,
+    )
+
+    webhook = Selector(
+        config.bot_mode,
+        polling=Object(None),
+        webhook=Singleton(
+            WebhookConfig,
+            url=config.webhook_url,
+            secret_token=config.webhook_secret_token,
+            listen_host=config.webhook_listen_host,
+            listen_port=config.webhook_listen_port,
+            path=config.webhook_path,
+            max_connections=config.webhook_max_connections,
+        ),
+    )
+
+    database_maintenance = Singleton(
+        sqlite_maintenance,
+        config.database_url,
+        interval_seconds=config.sqlite_maintenance_interval_seconds,
+        vacuum_every=config.sqlite_vacuum_every,
+    )
+
+    bot_app = Singleton(
+        BotApp,
+        api_token=config.bot_token,
+        moroz=moroz,
+        broadcast_workers=config.broadcast_workers,
+        broadcast_global_rate=config.broadcast_global_rate,
+        broadcast_per_chat_rate=config.broadcast_per_chat_rate,
+        broadcast_max_retries=config.broadcast_max_retries,
+        command_rate=config.command_rate,
+        command_burst=config.command_burst,
+        command_costs=config.command_costs,
+        command_rate_limit_max_users=config.command_rate_limit_max_users,
+        dispatcher_workers=config.dispatcher_workers,
+        dispatcher_max_pending=config.dispatcher_max_pending,
+        conversation_max_entries=config.conversation_max_entries,
+        conversation_ttl_seconds=config.conversation_ttl_seconds,
+        conversation_state_path=config.conversation_state_path,
+        webhook=webhook,
+        metrics_host=config.metrics_host,
+        metrics_port=config.metrics_port,
+        database_maintenance=database_maintenance,
+    )
+
+    async_db_engine = Singleton(
+        create_async_database_engine,
+        config.async_database_url,
+        sqlite_profile=sqlite_profile,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout_seconds,
+        pool_recycle=config.db_pool_recycle_seconds,
+        pool_pre_ping=config.db_pool_pre_ping,
+    )
+
+    async_database_repository = Singleton(
+        _async_database_repository,
+        engine=async_db_engine,
+        short_code_allocator=short_code_allocator,
+        user_cache=user_cache,
+        read_retries=config.db_read_retries,
+        read_retry_backoff=config.db_read_retry_backoff_seconds,
+    )
+
+    async_moroz = Singleton(
+        _async_moroz,
+        database_repository=async_database_repository,
+        max_rooms_managed_by_user=config.max_rooms_managed_by_user,
+        min_players_to_start_game=config.min_players_to_start_game,
+        admin_name=config.admin_name,
+        admin_username=config.admin_username,
+        admin_user_id=config.admin_user_id,
+        avoid_past_targets=config.avoid_past_targets,
+    )
+
+    async_database_maintenance = Singleton(
+        sqlite_maintenance,
+        config.async_database_url,
+        interval_seconds=config.sqlite_maintenance_interval_seconds,
+        vacuum_every=config.sqlite_vacuum_every,
+    )
+
+    async_bot_app = Singleton(
+        _async_bot_app,
+        api_token=config.bot_token,
+        moroz=async_moroz,
+        broadcast_max_concurrency=config.broadcast_max_concurrency,
+        broadcast_global_rate=config.broadcast_global_rate,
+        broadcast_per_chat_rate=config.broadcast_per_chat_rate,
+        broadcast_max_retries=config.broadcast_max_retries,
+        command_rate=config.command_rate,
+        command_burst=config.command_burst,
+        command_costs=config.command_costs,
+        command_rate_limit_max_users=config.command_rate_limit_max_users,
+        conversation_max_entries=config.conversation_max_entries,
+        conversation_ttl_seconds=config.conversation_ttl_seconds,
+        conversation_state_path=config.conversation_state_path,
+        metrics_host=config.metrics_host,
+        metrics_port=config.metrics_port,
+        database_maintenance=async_database_maintenance,
     )
 
-    bot_app = Singleton(BotApp, api_token=config.bot_token, moroz=moroz)
+    app = Selector(config.bot_runtime, threads=bot_app, asyncio=async_bot_app)
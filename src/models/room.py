@@ -2,16 +2,44 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from pydantic import AwareDatetime
-from sqlmodel import Column, Field, Integer, SQLModel
+from sqlmodel import Column, Field, Index, Integer, SQLModel, text
 
 from src.models._types import UTCDateTime
 
+SHORT_CODE_DISPLAY_DIGITS = 4
+
+
+def format_short_code(short_code: int) -> str:
+    """The short code as shown to users: padded with zeros to
+    `SHORT_CODE_DISPLAY_DIGITS`, as the codes of the narrowest space are."""
+    return f"{short_code:0{SHORT_CODE_DISPLAY_DIGITS}d}"
+
+
+def parse_short_code(text: str) -> int:
+    """The short code a user entered; only ASCII digits are accepted, so
+    that e.g. "1_234" or "-1" is not taken for another room's code.
+    Raises ValueError otherwise."""
+    if not (text.isascii() and text.isdigit()):
+        raise ValueError(f"Not a short code: {text!r}")
+    return int(text)
+
 
 class Room(SQLModel, table=True):  # type: ignore[call-arg]
+    __table_args__ = (
+        # short codes are unique among active rooms only
+        Index(
+            "ix_room_active_short_code",
+            "short_code",
+            unique=True,
+            postgresql_where=text("completed_dt IS NULL"),
+            sqlite_where=text("completed_dt IS NULL"),
+        ),
+    )
+
     id: str = Field(primary_key=True, description="Room ID (hex string)")
     short_code: int = Field(sa_column=Column(Integer, nullable=False, index=True))
 
-    manager_user_id: int = Field(foreign_key="user.id", nullable=False)
+    manager_user_id: int = Field(foreign_key="user.id", nullable=False, index=True)
 
     created_dt: AwareDatetime = Field(
         sa_column=Column(UTCDateTime(), nullable=False),
@@ -30,7 +58,7 @@ class Room(SQLModel, table=True):  # type: ignore[call-arg]
 
     @property
     def display_short_code(self) -> str:
-        return f"{self.short_code:04d}"
+        return format_short_code(self.short_code)
 
     @property
     def game_started(self) -> bool:
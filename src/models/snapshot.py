@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+from src.models.room import Room
+from src.models.user import User
+
+
+@dataclass
+class RoomSnapshot:
+    """A room with its manager, participants and (optionally)
+    the target of one participant, loaded together."""
+
+    room: Room
+    manager: User
+    participants: list[User]
+    target: User | None = None
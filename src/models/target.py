@@ -1,9 +1,14 @@
 from typing import Optional
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class Target(SQLModel, table=True):  # type: ignore[call-arg]
+    __table_args__ = (
+        Index("ix_target_room_id_user_id", "room_id", "user_id", unique=True),
+        Index("ix_target_user_id_target_user_id", "user_id", "target_user_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     room_id: str = Field(foreign_key="room.id", nullable=False)
     user_id: int = Field(foreign_key="user.id", nullable=False)
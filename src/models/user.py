@@ -14,7 +14,7 @@ class User(SQLModel, table=True):  # type: ignore[call-arg]
     name: Optional[str] = Field(default=None)
     username: Optional[str] = Field(default=None)
 
-    room_id: Optional[str] = Field(default=None, foreign_key="room.id")
+    room_id: Optional[str] = Field(default=None, foreign_key="room.id", index=True)
 
     def __str__(self) -> str:
         _in_room = f" (in room {self.room_id})" if self.room_id else ""
@@ -0,0 +1,255 @@
+import asyncio
+import inspect
+import random
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from loguru import logger
+from pydantic_extra_types.pendulum_dt import DateTime
+from sqlalchemy import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.models.room import Room
+from src.models.snapshot import RoomSnapshot
+from src.models.user import User
+from src.repositories.database import DatabaseRepository, is_transient_error
+from src.repositories.migrations import migrate
+from src.repositories.short_codes import ShortCodeAllocator
+from src.shared.cache import TTLCache
+
+AfterCommitCallback = Callable[[], Awaitable[None] | None]
+
+
+class AsyncDatabaseRepository:
+    """The `DatabaseRepository` on an asyncio engine (e.g. asyncpg, aiosqlite).
+
+    Calls run the queries of the synchronous repository on the sync facade
+    of an `AsyncSession` (`AsyncSession.run_sync`), so statements, caching
+    and exceptions are the same while the driver I/O is awaited.
+    The schema is migrated by `migrate`, not on construction.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        short_code_allocator: ShortCodeAllocator | None = None,
+        user_cache: TTLCache[int, User] | None = None,
+        *,
+        read_retries: int = 3,
+        read_retry_backoff: float = 0.1,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.engine = engine
+        self.repository = DatabaseRepository(
+            engine.sync_engine,
+            short_code_allocator=short_code_allocator,
+            user_cache=user_cache,
+            migrate_schema=False,
+        )
+        self.read_retries = read_retries
+        self.read_retry_backoff = read_retry_backoff
+        self._sleep = sleep
+        self.session = async_sessionmaker(engine, expire_on_commit=False)
+        self._uow_session: ContextVar[AsyncSession | None] = ContextVar(
+            f"async_uow_session_{id(self)}", default=None
+        )
+
+    async def migrate(self) -> int:
+        """Bring the database schema up to date, see `migrate`."""
+
+        def _migrate(conn: Connection) -> int:
+            return migrate(conn.engine)
+
+        async with self.engine.connect() as conn:
+            return await conn.run_sync(_migrate)
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[None]:
+        """Run every repository call awaited inside the block in one session
+        (the calls must not be awaited concurrently, e.g. by `gather`).
+        Commits on success, rolls back on error; re-entrant."""
+        if self._uow_session.get() is not None:
+            yield
+            return
+        async with self.session() as s:
+            # see `DatabaseRepository.unit_of_work`
+            if self.repository.user_cache is not None:
+                s.sync_session.info["user_cache_generation"] = (
+                    self.repository.user_cache.generation
+                )
+            token = self._uow_session.set(s)
+            try:
+                yield
+                await s.commit()
+            except BaseException:
+                await s.rollback()
+                raise
+            finally:
+                self._uow_session.reset(token)
+                # other tasks may have cached the pre-commit state meanwhile
+                if self.repository.user_cache is not None:
+                    for user_id in s.sync_session.info.get("written_user_ids", ()):
+                        self.repository.user_cache.invalidate(user_id)
+            for callback in s.sync_session.info.get("after_commit", ()):
+                if inspect.isawaitable(result := callback()):
+                    await result
+
+    async def run_in_unit_of_work[T](
+        self,
+        work: Callable[[], Awaitable[T]],
+        *,
+        retryable: Callable[[], bool] = lambda: True,
+    ) -> T:
+        """Await `work` in a unit of work, retried as in
+        `DatabaseRepository.run_in_unit_of_work`."""
+        if self._uow_session.get() is not None:
+            return await work()
+        attempt = 0
+        while True:
+            try:
+                async with self.unit_of_work():
+                    return await work()
+            except DBAPIError as e:
+                if (
+                    not is_transient_error(e)
+                    or attempt == self.read_retries
+                    or not retryable()
+                ):
+                    raise
+                delay = random.uniform(0, self.read_retry_backoff * 2**attempt)
+                logger.warning(
+                    "Retrying a unit of work in {:.3f}s after a transient error: {}",
+                    delay,
+                    e.orig,
+                )
+                await self._sleep(delay)
+                attempt += 1
+
+    async def after_commit(self, callback: AfterCommitCallback):
+        """Run `callback` once the current unit of work has committed
+        (right away outside of one); dropped if it rolls back."""
+        if (s := self._uow_session.get()) is None:
+            if inspect.isawaitable(result := callback()):
+                await result
+            return
+        s.sync_session.info.setdefault("after_commit", []).append(callback)
+
+    async def run[T](self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call `function`, which uses the synchronous `repository`
+        (e.g. a `Moroz` method), in the current unit of work
+        or in one of its own."""
+
+        def _bound(sync_session: Session) -> T:
+            with self.repository.bind(sync_session):
+                return function(*args, **kwargs)
+
+        async with self.unit_of_work():
+            s = self._uow_session.get()
+            assert s is not None
+            return await s.run_sync(_bound)
+
+    async def _read[T](self, read: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """`run` an idempotent read, retried as in `DatabaseRepository`
+        on transient errors when not in a unit of work."""
+        if self._uow_session.get() is not None:
+            return await self.run(read, *args, **kwargs)
+        for attempt in range(self.read_retries):
+            try:
+                return await self.run(read, *args, **kwargs)
+            except DBAPIError as e:
+                if not is_transient_error(e):
+                    raise
+                delay = random.uniform(0, self.read_retry_backoff * 2**attempt)
+                logger.warning(
+                    "Retrying {} in {:.3f}s after a transient error: {}",
+                    read.__name__,
+                    delay,
+                    e.orig,
+                )
+                await self._sleep(delay)
+        return await self.run(read, *args, **kwargs)
+
+    async def create_room(self, created_by_user_id: int) -> Room:
+        return await self.run(self.repository.create_room, created_by_user_id)
+
+    async def assign_targets(
+        self, room_id: str, user_target_pairs: list[tuple[int, int]]
+    ):
+        await self.run(self.repository.assign_targets, room_id, user_target_pairs)
+
+    async def get_target(self, room_id: str, user_id: int) -> User:
+        return await self._read(self.repository.get_target, room_id, user_id)
+
+    async def get_targets_in_room(self, room_id: str) -> list[tuple[User, User]]:
+        return await self._read(self.repository.get_targets_in_room, room_id)
+
+    async def get_target_history(self, room_id: str) -> list[tuple[int, int]]:
+        return await self._read(self.repository.get_target_history, room_id)
+
+    async def get_room_snapshot(
+        self, room_id: str, for_user_id: int | None = None
+    ) -> RoomSnapshot:
+        return await self._read(self.repository.get_room_snapshot, room_id, for_user_id)
+
+    async def get_room_by_short_code(self, short_code: int) -> Room:
+        return await self._read(self.repository.get_room_by_short_code, short_code)
+
+    async def create_user(
+        self, id: int, username: str | None, name: str | None
+    ) -> User:
+        return await self.run(self.repository.create_user, id, username, name)
+
+    async def get_room(self, room_id: str) -> Room:
+        return await self._read(self.repository.get_room, room_id)
+
+    async def get_user(self, user_id: int) -> User:
+        return await self._read(self.repository.get_user, user_id)
+
+    async def get_rooms_managed_by_user(self, user_id: int) -> list[Room]:
+        return await self._read(self.repository.get_rooms_managed_by_user, user_id)
+
+    async def get_users_in_room(self, room_id: str) -> list[User]:
+        return await self._read(self.repository.get_users_in_room, room_id)
+
+    async def join_room_by_short_code(self, user_id: int, short_code: int) -> Room:
+        return await self.run(
+            self.repository.join_room_by_short_code, user_id, short_code
+        )
+
+    async def join_room(self, user_id: int, room_id: str):
+        await self.run(self.repository.join_room, user_id, room_id)
+
+    async def delete_room(self, room_id: str):
+        await self.run(self.repository.delete_room, room_id)
+
+    async def dissolve_room(self, room_id: str) -> list[User]:
+        return await self.run(self.repository.dissolve_room, room_id)
+
+    async def leave_room(self, user_id: int) -> Room:
+        return await self.run(self.repository.leave_room, user_id)
+
+    async def kick_from_room(self, room_id: str, user_id: int) -> Room:
+        return await self.run(self.repository.kick_from_room, room_id, user_id)
+
+    async def set_user_name(self, user_id: int, name: str):
+        await self.run(self.repository.set_user_name, user_id, name)
+
+    async def set_game_started(self, room_id: str, started_dt: DateTime):
+        await self.run(self.repository.set_game_started, room_id, started_dt)
+
+    async def start_game(
+        self,
+        room_id: str,
+        user_target_pairs: list[tuple[int, int]],
+        started_dt: DateTime,
+    ):
+        await self.run(
+            self.repository.start_game, room_id, user_target_pairs, started_dt
+        )
+
+    async def set_game_completed(self, room_id: str, completed_dt: DateTime):
+        await self.run(self.repository.set_game_completed, room_id, completed_dt)
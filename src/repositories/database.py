@@ -1,92 +1,495 @@
+from __future__ import annotations
+
+import functools
 import random
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Concatenate, NoReturn
 
 from loguru import logger
 from pydantic_extra_types.pendulum_dt import DateTime
-from sqlalchemy import Engine
-from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
+from sqlalchemy import Engine, and_, func, insert, literal, select, update
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
+from sqlalchemy.orm import Session, aliased, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import col
 
 from src.models.room import Room
+from src.models.snapshot import RoomSnapshot
 from src.models.target import Target
 from src.models.user import User
+from src.repositories.migrations import migrate
+from src.repositories.query_stats import instrument
+from src.repositories.short_codes import ShortCodeAllocator
+from src.shared.cache import TTLCache
 from src.shared.exceptions import (
+    GameAlreadyCompleted,
+    GameAlreadyStarted,
     NotInRoom,
+    RoomBusy,
     RoomNotFound,
+    ShortCodesExhausted,
     TargetNotAssigned,
     UserAlreadyExists,
     UserNotFound,
 )
 
+_ACTIVE_ROOM = col(Room.completed_dt).is_(None)
+
+
+# set while a read is being retried, so that the reads it makes are not
+# retried themselves (which would multiply the attempts and the backoff)
+_retrying: ContextVar[bool] = ContextVar("retrying_read", default=False)
+
+
+def is_transient_error(e: DBAPIError) -> bool:
+    """Errors after which the same read may succeed, e.g. a connection
+    dropped by the server or a locked SQLite database."""
+    return isinstance(e, OperationalError) or e.connection_invalidated
+
+
+def is_lock_contention(e: DBAPIError) -> bool:
+    """Errors of a lock that could not be taken right away: a row lock
+    taken with NOWAIT (SQLSTATE 55P03) or a busy SQLite database."""
+    code = getattr(e.orig, "pgcode", None) or getattr(e.orig, "sqlstate", None)
+    return code == "55P03" or "database is locked" in str(e.orig)
+
+
+def _retry_transient[**P, T](
+    read: Callable[Concatenate[DatabaseRepository, P], T],
+) -> Callable[Concatenate[DatabaseRepository, P], T]:
+    """Retry an idempotent read with exponential backoff (and jitter) on
+    transient errors. Not inside a unit of work, whose transaction
+    does not survive the error: the whole unit of work is retried
+    instead, see `DatabaseRepository.run_in_unit_of_work`."""
+
+    @functools.wraps(read)
+    def wrapper(self: DatabaseRepository, *args: P.args, **kwargs: P.kwargs) -> T:
+        if self._uow_session.get() is not None or _retrying.get():
+            return read(self, *args, **kwargs)
+        token = _retrying.set(True)
+        try:
+            for attempt in range(self.read_retries):
+                try:
+                    return read(self, *args, **kwargs)
+                except DBAPIError as e:
+                    if not is_transient_error(e):
+                        raise
+                    delay = random.uniform(0, self.read_retry_backoff * 2**attempt)
+                    logger.warning(
+                        "Retrying {} in {:.3f}s after a transient error: {}",
+                        read.__name__,
+                        delay,
+                        e.orig,
+                    )
+                    self._sleep(delay)
+            return read(self, *args, **kwargs)
+        finally:
+            _retrying.reset(token)
+
+    return wrapper
+
 
 class DatabaseRepository:
-    def __init__(self, engine: Engine):
+    SHORT_CODE_ATTEMPTS = 5
+
+    def __init__(
+        self,
+        engine: Engine,
+        short_code_allocator: ShortCodeAllocator | None = None,
+        user_cache: TTLCache[int, User] | None = None,
+        *,
+        migrate_schema: bool = True,
+        read_retries: int = 3,
+        read_retry_backoff: float = 0.1,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
         self.engine = engine
-        SQLModel.metadata.create_all(engine)
-        self.session = sessionmaker(engine)
+        self.short_code_allocator = short_code_allocator or ShortCodeAllocator()
+        self.user_cache = user_cache
+        self.read_retries = read_retries
+        self.read_retry_backoff = read_retry_backoff
+        self._sleep = sleep
+        instrument(engine)
+        if migrate_schema:
+            migrate(engine)
+        # keep loaded attributes after commit so returned models stay usable
+        self.session = sessionmaker(engine, expire_on_commit=False)
+        self._uow_session: ContextVar[Session | None] = ContextVar(
+            f"uow_session_{id(self)}", default=None
+        )
 
-    def create_room(self, created_by_user_id: int) -> Room:
-        logger.debug(f"Creating room by {created_by_user_id}")
-        room_id = random.randbytes(4).hex()
+    @contextmanager
+    def unit_of_work(self) -> Iterator[None]:
+        """Run every repository call made inside the block in one session,
+        i.e. on one pooled connection and in one transaction.
+        Commits on success, rolls back on error; re-entrant."""
+        if self._uow_session.get() is not None:
+            yield
+            return
+        with self.session() as s:
+            # what this session reads may be older than writes committed
+            # meanwhile, so it is cached only while no user was written since
+            if self.user_cache is not None:
+                s.info["user_cache_generation"] = self.user_cache.generation
+            token = self._uow_session.set(s)
+            try:
+                yield
+                s.commit()
+            except BaseException:
+                s.rollback()
+                raise
+            finally:
+                self._uow_session.reset(token)
+                # other threads may have cached the pre-commit state meanwhile
+                for user_id in s.info.get("written_user_ids", ()):
+                    self._uncache_user(user_id)
+            for callback in s.info.get("after_commit", ()):
+                callback()
 
-        room = Room(
-            id=room_id,
-            short_code=int(room_id, 16) % 10_000,
-            manager_user_id=created_by_user_id,
-        )
+    def run_in_unit_of_work[T](
+        self, work: Callable[[], T], *, retryable: Callable[[], bool] = lambda: True
+    ) -> T:
+        """Run `work` in a unit of work, and again in a new one after a
+        transient error (with the backoff of reads) while `retryable()`,
+        e.g. while `work` has not told anybody about its first attempt.
+        Inside a unit of work, `work` just joins it."""
+        if self._uow_session.get() is not None:
+            return work()
+        attempt = 0
+        while True:
+            try:
+                with self.unit_of_work():
+                    return work()
+            except DBAPIError as e:
+                if (
+                    not is_transient_error(e)
+                    or attempt == self.read_retries
+                    or not retryable()
+                ):
+                    raise
+                delay = random.uniform(0, self.read_retry_backoff * 2**attempt)
+                logger.warning(
+                    "Retrying a unit of work in {:.3f}s after a transient error: {}",
+                    delay,
+                    e.orig,
+                )
+                self._sleep(delay)
+                attempt += 1
+
+    @contextmanager
+    def bind(self, session: Session) -> Iterator[None]:
+        """Run every repository call made inside the block in `session`,
+        as in a unit of work whose transaction is managed by the caller
+        (see `AsyncDatabaseRepository`)."""
+        token = self._uow_session.set(session)
+        try:
+            yield
+        finally:
+            self._uow_session.reset(token)
 
+    def after_commit(self, callback: Callable[[], object]):
+        """Run `callback` once the current unit of work has committed
+        (right away outside of one); dropped if it rolls back."""
+        if (s := self._uow_session.get()) is None:
+            callback()
+            return
+        s.info.setdefault("after_commit", []).append(callback)
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """The current unit-of-work session, or a fresh short-lived one."""
+        if (s := self._uow_session.get()) is not None:
+            yield s
+            return
         with self.session() as s:
-            s.add(room)
+            yield s
+
+    def _commit(self, s: Session):
+        """Commit a short-lived session; only flush inside a unit of work."""
+        if s is self._uow_session.get():
+            s.flush()
+        else:
             s.commit()
-            s.refresh(room)
-            logger.debug(f"Added room {room}")
-            return room
+            # other threads may have cached the pre-commit state meanwhile
+            for user_id in s.info.pop("written_user_ids", ()):
+                self._uncache_user(user_id)
+
+    def _uncache_user(self, user_id: int):
+        if self.user_cache is not None:
+            self.user_cache.invalidate(user_id)
+
+    def _invalidate_user(self, s: Session, user_id: int):
+        """Drop a user that is being written from the cache, and again once
+        the write has committed. Inside a unit of work, also bypass the cache
+        for them until the transaction ends."""
+        self._uncache_user(user_id)
+        s.info.setdefault("written_user_ids", set()).add(user_id)
+
+    def _lock_room(self, s: Session, room_id: str, *, shared: bool = False) -> Room:
+        """Lock the room until the end of the transaction, so that what is
+        checked about it stays true until the writes that follow commit.
+        Changes of its members (join, leave) take a shared lock, changes of
+        the room itself (start, complete, delete) an exclusive one.
+
+        The lock is not waited for (NOWAIT). SQLite has no row locks, so the
+        write lock of the database is taken instead (BEGIN IMMEDIATE), which
+        waits for the other writer up to the busy timeout.
+
+        Raises
+            `RoomBusy` if another transaction holds the lock
+            `RoomNotFound` if the room does not exist
+        """
+        try:
+            if self.engine.dialect.name == "sqlite":
+                self._begin_immediate(s)
+            room = s.scalar(
+                select(Room)
+                .where(col(Room.id) == room_id)
+                .with_for_update(nowait=True, read=shared)
+                .execution_options(populate_existing=True)
+            )
+        except OperationalError as e:
+            if not is_lock_contention(e):
+                raise
+            logger.info("Room room_id={!r} is locked: {}", room_id, e.orig)
+            raise RoomBusy(f"Room {room_id} is being changed by another request")
+        if room is None:
+            raise RoomNotFound(f"Room with {room_id=} not found")
+        return room
+
+    @staticmethod
+    def _begin_immediate(s: Session):
+        conn = s.connection()
+        # the driver begins a transaction (and takes the write lock) only
+        # before the first write; once it has, the lock is held already
+        if not conn.connection.driver_connection.in_transaction:  # type: ignore[union-attr]
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    def lock_room(self, room_id: str) -> Room:
+        """Lock the room for a change made of several calls in the current
+        unit of work (e.g. reading its members, then starting the game),
+        and return it as of the lock.
+
+        Raises
+            `RoomBusy` if another transaction holds the lock
+            `RoomNotFound` if the room does not exist
+        """
+        logger.debug("Locking room_id={!r}", room_id)
+        with self._session() as s:
+            if s is not self._uow_session.get():
+                raise RuntimeError("lock_room is only useful in a unit of work")
+            return self._lock_room(s, room_id)
+
+    def _short_code_taken(self, s: Session, short_code: int) -> bool:
+        return (
+            s.scalar(
+                select(col(Room.id)).where(
+                    _ACTIVE_ROOM, col(Room.short_code) == short_code
+                )
+            )
+            is not None
+        )
+
+    def _free_short_code(self, s: Session) -> int:
+        """Pick a short code not used by any active room."""
+        active_rooms = (
+            s.scalar(select(func.count()).select_from(Room).where(_ACTIVE_ROOM)) or 0
+        )
+        for _ in range(self.SHORT_CODE_ATTEMPTS):
+            candidates = self.short_code_allocator.candidates(active_rooms)
+            taken = set(
+                s.scalars(
+                    select(col(Room.short_code)).where(
+                        _ACTIVE_ROOM, col(Room.short_code).in_(candidates)
+                    )
+                )
+            )
+            for short_code in candidates:
+                if short_code not in taken:
+                    return short_code
+        raise ShortCodesExhausted(
+            f"No free short code found among {active_rooms} active rooms"
+        )
+
+    def create_room(self, created_by_user_id: int) -> Room:
+        logger.debug("Creating room by {}", created_by_user_id)
+        with self._session() as s:
+            for _ in range(self.SHORT_CODE_ATTEMPTS):
+                room = Room(
+                    id=random.randbytes(4).hex(),
+                    short_code=self._free_short_code(s),
+                    manager_user_id=created_by_user_id,
+                )
+                try:
+                    with s.begin_nested():
+                        s.add(room)
+                except IntegrityError:
+                    if not self._short_code_taken(s, room.short_code):
+                        raise
+                    logger.info("Short code {} was just taken; retry", room.short_code)
+                    continue
+                self._commit(s)
+                s.refresh(room)
+                logger.debug("Added room {}", room)
+                return room
+        raise ShortCodesExhausted("Could not allocate a short code for a new room")
 
     def assign_targets(self, room_id: str, user_target_pairs: list[tuple[int, int]]):
-        logger.debug(f"Adding targets in {room_id=}: {user_target_pairs=}")
-        with self.session() as s:
+        logger.debug(
+            "Adding {} targets in room_id={!r}", len(user_target_pairs), room_id
+        )
+        with self._session() as s:
             targets = [
                 Target(room_id=room_id, user_id=u_id, target_user_id=t_id)
                 for u_id, t_id in user_target_pairs
             ]
             s.add_all(targets)
-            s.commit()
-            logger.debug(f"Added {len(targets)} targets for {room_id=}")
+            self._commit(s)
+            logger.debug("Added {} targets for room_id={!r}", len(targets), room_id)
 
+    @_retry_transient
     def get_target(self, room_id: str, user_id: int) -> User:
-        logger.debug(f"Getting target in {room_id=} for {user_id=}")
-        with self.session() as s:
-            target = (
-                s.query(Target)
-                .filter(
-                    Target.room_id == room_id,  # type: ignore[arg-type]
-                    Target.user_id == user_id,  # type: ignore[arg-type]
+        logger.debug(
+            "Getting target in room_id={!r} for user_id={!r}", room_id, user_id
+        )
+        with self._session() as s:
+            target_user = s.scalar(
+                select(User)
+                .join(Target, col(Target.target_user_id) == col(User.id))
+                .where(
+                    col(Target.room_id) == room_id,
+                    col(Target.user_id) == user_id,
                 )
-                .first()
             )
-        if target is None:
+        if target_user is None:
             raise TargetNotAssigned(f"User {user_id=} has no target in room {room_id=}")
-        target_user = self.get_user(user_id=target.target_user_id)
-        logger.debug(f"Got {target_user=} in room {room_id=} for user {user_id=}")
+        logger.debug(
+            "Got target_user={!r} in room room_id={!r} for user user_id={!r}",
+            target_user,
+            room_id,
+            user_id,
+        )
         return target_user
 
+    @_retry_transient
+    def get_targets_in_room(self, room_id: str) -> list[tuple[User, User]]:
+        """Return all (giver, receiver) pairs of the room in one query."""
+        logger.debug("Getting targets in room_id={!r}", room_id)
+        giver, receiver = aliased(User), aliased(User)
+        with self._session() as s:
+            pairs = [
+                (g, r)
+                for g, r in s.execute(
+                    select(giver, receiver)
+                    .select_from(Target)
+                    .join(giver, col(Target.user_id) == giver.id)
+                    .join(receiver, col(Target.target_user_id) == receiver.id)
+                    .where(col(Target.room_id) == room_id)
+                )
+            ]
+        logger.debug("Got {} targets in room_id={!r}", len(pairs), room_id)
+        return pairs
+
+    @_retry_transient
+    def get_target_history(self, room_id: str) -> list[tuple[int, int]]:
+        """Return the (giver, receiver) pairs of every past game, in any room,
+        between users who are now in the room, in one query."""
+        logger.debug("Getting target history of room_id={!r}", room_id)
+        giver, receiver = aliased(User), aliased(User)
+        with self._session() as s:
+            pairs = [
+                (user_id, target_user_id)
+                for user_id, target_user_id in s.execute(
+                    select(col(Target.user_id), col(Target.target_user_id))
+                    .join(giver, col(Target.user_id) == giver.id)
+                    .join(receiver, col(Target.target_user_id) == receiver.id)
+                    .where(
+                        col(giver.room_id) == room_id,
+                        col(receiver.room_id) == room_id,
+                    )
+                    .distinct()
+                )
+            ]
+        logger.debug("Got {} past targets in room_id={!r}", len(pairs), room_id)
+        return pairs
+
+    @_retry_transient
+    def get_room_snapshot(
+        self, room_id: str, for_user_id: int | None = None
+    ) -> RoomSnapshot:
+        """Load the room, its manager and the target of `for_user_id` (if any)
+        in one statement and the participants in another."""
+        logger.debug(
+            "Getting snapshot of room_id={!r} for for_user_id={!r}",
+            room_id,
+            for_user_id,
+        )
+        # raises RoomNotFound
+        manager, target_user = aliased(User), aliased(User)
+        with self._session() as s:
+            row = s.execute(
+                select(Room, manager, target_user)
+                .join(manager, col(Room.manager_user_id) == manager.id)
+                .outerjoin(
+                    Target,
+                    and_(
+                        col(Target.room_id) == col(Room.id),
+                        col(Target.user_id) == for_user_id,
+                    ),
+                )
+                .outerjoin(target_user, col(Target.target_user_id) == target_user.id)
+                .where(col(Room.id) == room_id)
+            ).first()
+            if row is None:
+                raise RoomNotFound(f"Room {room_id=} not found")
+            participants = list(
+                s.scalars(select(User).where(col(User.room_id) == room_id))
+            )
+        room, manager_user, target = row
+        logger.debug(
+            "Got snapshot of room={!r}: {} participants", room, len(participants)
+        )
+        return RoomSnapshot(
+            room=room,
+            manager=manager_user,
+            participants=participants,
+            target=target,
+        )
+
+    @_retry_transient
     def get_room_by_short_code(self, short_code: int) -> Room:
-        logger.debug(f"Getting room by {short_code=}")
-        with self.session() as s:
-            rooms = s.query(Room).filter(Room.short_code == short_code).all()  # type: ignore[arg-type]
-        if not rooms:
+        """Return the active room with this short code, or, if there is none,
+        the most recently completed one (so callers can tell why it cannot be
+        joined)."""
+        logger.debug("Getting room by short_code={!r}", short_code)
+        with self._session() as s:
+            room = s.scalar(
+                select(Room).where(_ACTIVE_ROOM, col(Room.short_code) == short_code)
+            )
+            if room is None:
+                room = s.scalar(
+                    select(Room)
+                    .where(col(Room.short_code) == short_code)
+                    .order_by(col(Room.completed_dt).desc())
+                    .limit(1)
+                )
+        if room is None:
             raise RoomNotFound(f"Room {short_code=} not found")
-        if len(rooms) > 1:
-            logger.warning(f"More than one room found with {short_code=}: {rooms}")
-            return max(rooms, key=lambda r: r.created_dt)
-        logger.debug(f"Get room by {short_code=}: {rooms[0]}")
-        return rooms[0]
+        logger.debug("Get room by short_code={!r}: {}", short_code, room)
+        return room
 
     def create_user(self, id: int, username: str | None, name: str | None) -> User:
-        logger.debug(f"Creating user {id=}, {username=}, {name=}")
-        with self.session() as s:
+        logger.debug(
+            "Creating user id={!r}, username={!r}, name={!r}", id, username, name
+        )
+        with self._session() as s:
             if s.get(User, id) is not None:
                 raise UserAlreadyExists(f"User id={id} already exists")
 
+            self._invalidate_user(s, id)
             user = User(
                 id=id,
                 username=username,
@@ -95,118 +498,361 @@ class DatabaseRepository:
             )
 
             s.add(user)
-            s.commit()
+            self._commit(s)
             s.refresh(user)
-            logger.debug(f"Created {user=}")
+            logger.debug("Created user={!r}", user)
             return user
 
+    @_retry_transient
     def get_room(self, room_id: str) -> Room:
-        logger.debug(f"Getting {room_id=}")
-        with self.session() as s:
+        logger.debug("Getting room_id={!r}", room_id)
+        with self._session() as s:
             room = s.get(Room, room_id)
         if room is None:
             raise RoomNotFound(f"Room {room_id=} not found")
-        logger.debug(f"Got {room=}")
+        logger.debug("Got room={!r}", room)
         return room
 
+    @_retry_transient
     def get_user(self, user_id: int) -> User:
-        logger.debug(f"Getting {user_id=}")
-        with self.session() as s:
+        logger.debug("Getting user_id={!r}", user_id)
+        with self._session() as s:
+            cache = (
+                None
+                if user_id in s.info.get("written_user_ids", ())
+                else self.user_cache
+            )
+            if cache is not None and (cached := cache.get(user_id)) is not None:
+                logger.debug("Got {} (cached)", cached)
+                # callers may change what they get
+                return User(**cached.model_dump())
+            generation = (
+                s.info.get("user_cache_generation", cache.generation)
+                if cache is not None
+                else None
+            )
             user = s.get(User, user_id)
         if user is None:
             raise UserNotFound(f"User {user_id=} not found")
-        logger.debug(f"Got {user}")
+        if cache is not None:
+            # cache a copy detached from any session, unless a user was
+            # written meanwhile (this one may be older than the write)
+            cache.put(user_id, User(**user.model_dump()), generation=generation)
+        logger.debug("Got {}", user)
         return user
 
+    @_retry_transient
     def get_rooms_managed_by_user(self, user_id: int) -> list[Room]:
-        logger.debug(f"Getting rooms managed by {user_id=}")
+        logger.debug("Getting rooms managed by user_id={!r}", user_id)
         # raises UserNotFound
         _ = self.get_user(user_id=user_id)  # raises if not found
 
-        with self.session() as s:
+        with self._session() as s:
             rooms = s.query(Room).filter(Room.manager_user_id == user_id).all()  # type: ignore[arg-type]
-        logger.debug(f"Got rooms managed by {user_id=}: {rooms}")
+        logger.debug("Got {} rooms managed by user_id={!r}", len(rooms), user_id)
         return rooms
 
+    @_retry_transient
     def get_users_in_room(self, room_id: str) -> list[User]:
-        logger.debug(f"Getting users in {room_id=}")
+        logger.debug("Getting users in room_id={!r}", room_id)
         # raises RoomNotFound
         _ = self.get_room(room_id=room_id)  # raises if not found
 
-        with self.session() as s:
+        with self._session() as s:
             users = s.query(User).filter(User.room_id == room_id).all()  # type: ignore[arg-type]
-        logger.debug(f"Got users in {room_id=}: {users}")
+        logger.debug("Got {} users in room_id={!r}", len(users), room_id)
         return users
 
+    def join_room_by_short_code(self, user_id: int, short_code: int) -> Room:
+        """Move the user into the active, not yet started room with this short
+        code with one conditional UPDATE, which returns the room; if none
+        matches, read why in one more statement.
+
+        Raises
+            `UserNotFound` if the user does not exist
+            `RoomNotFound` if no room has this short code
+            `GameAlreadyStarted` if the game in the room has already started
+            `GameAlreadyCompleted` if the game in the room has already completed
+            `RoomBusy` if the room is locked by another transaction
+        """
+        logger.debug(
+            "User user_id={!r} joining room short_code={!r}", user_id, short_code
+        )
+        joinable = (
+            select(
+                col(Room.id).label("room_id"),
+                literal(user_id).label("user_id"),
+            )
+            .where(
+                col(Room.short_code) == short_code,
+                _ACTIVE_ROOM,
+                col(Room.started_dt).is_(None),
+            )
+            # not started until the transaction ends, see `_lock_room`
+            .with_for_update(read=True, nowait=True)
+            .subquery()
+        )
+
+        def _of_room(column):
+            # SQLite cannot return the columns of the FROM of an UPDATE
+            return (
+                select(column)
+                .where(col(Room.id) == col(User.room_id))
+                .scalar_subquery()
+            )
+
+        with self._session() as s:
+            try:
+                joined = s.execute(
+                    update(User)
+                    .where(col(User.id) == joinable.c.user_id)
+                    .values(room_id=joinable.c.room_id)
+                    .returning(
+                        col(User.room_id),
+                        _of_room(col(Room.manager_user_id)),
+                        _of_room(col(Room.created_dt)),
+                    )
+                    .execution_options(synchronize_session=False)
+                ).first()
+            except OperationalError as e:
+                if not is_lock_contention(e):
+                    raise
+                logger.info("Room short_code={!r} is locked: {}", short_code, e.orig)
+                raise RoomBusy(
+                    f"Room {short_code=} is being changed by another request"
+                )
+            if joined is None:
+                self._raise_not_joinable(s, user_id, short_code)
+            room_id, manager_user_id, created_dt = joined
+            if (user := s.identity_map.get(s.identity_key(User, user_id))) is not None:
+                set_committed_value(user, "room_id", room_id)
+            self._invalidate_user(s, user_id)
+            self._commit(s)
+        room = Room(
+            id=room_id,
+            short_code=short_code,
+            manager_user_id=manager_user_id,
+            created_dt=created_dt,
+        )
+        logger.debug("User user_id={!r} joined {}", user_id, room)
+        return room
+
+    def _raise_not_joinable(
+        self, s: Session, user_id: int, short_code: int
+    ) -> NoReturn:
+        """Raise why the user could not join the room with this short code:
+        the active room with it or, if there is none, the most recently
+        completed one is read along with whether the user exists."""
+        user_exists = select(col(User.id)).where(col(User.id) == user_id).exists()
+        found = s.execute(
+            select(Room, user_exists)
+            .where(col(Room.short_code) == short_code)
+            .order_by(
+                col(Room.completed_dt).is_not(None), col(Room.completed_dt).desc()
+            )
+            .limit(1)
+        ).first()
+        if found is None:
+            raise RoomNotFound(f"Room {short_code=} not found")
+        room, user_found = found
+        if not user_found:
+            raise UserNotFound(f"User with id={user_id} not found")
+        if room.game_started:
+            raise GameAlreadyStarted(f"Game in room {room.id} has already started")
+        if room.game_completed:
+            raise GameAlreadyCompleted(f"Game in room {room.id} has already completed")
+        # e.g. a room completed and another created with the code meanwhile
+        raise RoomBusy(f"Room {short_code=} changed while joining")
+
     def join_room(self, user_id: int, room_id: str):
-        logger.debug(f"User {user_id=} joining {room_id=}")
+        logger.debug("User user_id={!r} joining room_id={!r}", user_id, room_id)
         # raises UserNotFound, RoomNotFound
-        with self.session() as s:
+        # raises GameAlreadyStarted, GameAlreadyCompleted, RoomBusy
+        with self._session() as s:
             user = s.get(User, user_id)
             if user is None:
                 raise UserNotFound(f"User with id={user_id} not found")
-            room = s.get(Room, room_id)
-            if room is None:
-                raise RoomNotFound(f"Room with {room_id=} not found")
+            room = self._lock_room(s, room_id, shared=True)
+            if room.game_started:
+                raise GameAlreadyStarted(f"Game in room {room_id} has already started")
+            if room.game_completed:
+                raise GameAlreadyCompleted(
+                    f"Game in room {room_id} has already completed"
+                )
             user.room_id = room_id
-            s.commit()
-            logger.debug(f"User {user} joined {room}")
+            self._invalidate_user(s, user_id)
+            self._commit(s)
+            logger.debug("User {} joined {}", user, room)
 
     def delete_room(self, room_id: str):
-        logger.debug(f"Deleting {room_id=}")
-        # raises RoomNotFound
-        with self.session() as s:
-            room = s.get(Room, room_id)
-            if room is None:
-                raise RoomNotFound(f"Room with {room_id=} not found")
+        logger.debug("Deleting room_id={!r}", room_id)
+        # raises RoomNotFound, RoomBusy
+        with self._session() as s:
+            room = self._lock_room(s, room_id)
             s.delete(room)
-            s.commit()
-            logger.debug(f"Deleted {room=}")
+            self._commit(s)
+            logger.debug("Deleted room={!r}", room)
+
+    def dissolve_room(self, room_id: str) -> list[User]:
+        """Remove every member from the room in a single statement
+        and return the affected users."""
+        logger.debug("Dissolving room_id={!r}", room_id)
+        # raises RoomNotFound, RoomBusy
+        with self._session() as s:
+            self._lock_room(s, room_id)
+            users = list(
+                s.scalars(
+                    update(User)
+                    .where(User.room_id == room_id)  # type: ignore[arg-type]
+                    .values(room_id=None)
+                    .returning(User)
+                )
+            )
+            for user in users:
+                self._invalidate_user(s, user.id)
+            self._commit(s)
+            logger.debug(
+                "Dissolved room_id={!r}: {} users removed", room_id, len(users)
+            )
+            return users
 
     def leave_room(self, user_id: int) -> Room:
-        logger.debug(f"User {user_id=} leaving room")
+        logger.debug("User user_id={!r} leaving room", user_id)
         # raises UserNotFound, NotInRoom
-        with self.session() as s:
+        with self._session() as s:
             user = s.get(User, user_id)
             if user is None:
                 raise UserNotFound(f"User {user_id=} not found")
             if (room_id := user.room_id) is None:
                 raise NotInRoom(f"User {user_id=} is not in any room")
-            room = self.get_room(room_id)
+            # raises RoomNotFound, RoomBusy
+            room = self._lock_room(s, room_id, shared=True)
             user.room_id = None
-            s.commit()
-            logger.debug(f"User {user_id=} left {room_id=}")
+            self._invalidate_user(s, user_id)
+            self._commit(s)
+            logger.debug("User user_id={!r} left room_id={!r}", user_id, room_id)
+            return room
+
+    def kick_from_room(self, room_id: str, user_id: int) -> Room:
+        logger.debug("Kicking user_id={!r} from room_id={!r}", user_id, room_id)
+        # raises UserNotFound, NotInRoom
+        with self._session() as s:
+            # raises RoomNotFound, RoomBusy
+            room = self._lock_room(s, room_id, shared=True)
+            # conditional, so that a user who has left the room (and perhaps
+            # joined another one) meanwhile is not kicked from elsewhere
+            kicked = s.scalar(
+                update(User)
+                .where(col(User.id) == user_id, col(User.room_id) == room_id)
+                .values(room_id=None)
+                .returning(col(User.id))
+                .execution_options(synchronize_session=False)
+            )
+            if kicked is None:
+                if s.get(User, user_id) is None:
+                    raise UserNotFound(f"User {user_id=} not found")
+                raise NotInRoom(f"User {user_id=} is not in room {room_id=}")
+            if (user := s.identity_map.get(s.identity_key(User, user_id))) is not None:
+                set_committed_value(user, "room_id", None)
+            self._invalidate_user(s, user_id)
+            self._commit(s)
+            logger.debug("Kicked user_id={!r} from room_id={!r}", user_id, room_id)
             return room
 
     def set_user_name(self, user_id: int, name: str):
-        logger.debug(f"Setting user {user_id=} {name=}")
+        logger.debug("Setting user user_id={!r} name={!r}", user_id, name)
         # raises UserNotFound
-        with self.session() as s:
+        with self._session() as s:
             user = s.get(User, user_id)
             if user is None:
                 raise UserNotFound(f"User {user_id=} not found")
             user.name = name
-            s.commit()
-            logger.debug(f"Set {user_id=} {name=}")
+            self._invalidate_user(s, user_id)
+            self._commit(s)
+            logger.debug("Set user_id={!r} name={!r}", user_id, name)
 
     def set_game_started(self, room_id: str, started_dt: DateTime):
-        logger.debug(f"Setting game started_dt for {room_id=} to {started_dt=}")
+        logger.debug(
+            "Setting game started_dt for room_id={!r} to started_dt={!r}",
+            room_id,
+            started_dt,
+        )
         # raises RoomNotFound
-        with self.session() as s:
+        with self._session() as s:
             room = s.get(Room, room_id)
             if room is None:
                 raise RoomNotFound(f"Room with {room_id=} not found")
             room.started_dt = started_dt
-            s.commit()
-            logger.debug(f"Set game started dt for room {room_id=} to {started_dt=}")
+            self._commit(s)
+            logger.debug(
+                "Set game started dt for room room_id={!r} to started_dt={!r}",
+                room_id,
+                started_dt,
+            )
+
+    def start_game(
+        self,
+        room_id: str,
+        user_target_pairs: list[tuple[int, int]],
+        started_dt: DateTime,
+    ):
+        """Set `started_dt` of the room and insert all its targets in one
+        transaction, with one executemany INSERT (batched into multi-row
+        statements by the driver). The givers must be the members
+        of the room (see `lock_room`).
+
+        Raises
+            `RoomNotFound` if the room does not exist
+            `GameAlreadyStarted` if the game in the room has already started
+            `RoomBusy` if the room is locked, or its members have changed
+        """
+        logger.debug(
+            "Starting game in room_id={!r} with {} targets",
+            room_id,
+            len(user_target_pairs),
+        )
+        with self._session() as s:
+            room = self._lock_room(s, room_id)
+            if room.game_started:
+                raise GameAlreadyStarted(f"Game in room {room_id} has already started")
+            members = set(
+                s.scalars(select(col(User.id)).where(col(User.room_id) == room_id))
+            )
+            if members != {giver for giver, _ in user_target_pairs}:
+                raise RoomBusy(f"Members of room {room_id} changed while starting")
+            room.started_dt = started_dt
+            if user_target_pairs:
+                s.connection().execute(
+                    insert(Target),
+                    [
+                        {"room_id": room_id, "user_id": u_id, "target_user_id": t_id}
+                        for u_id, t_id in user_target_pairs
+                    ],
+                )
+            self._commit(s)
+            logger.debug(
+                "Started game in room_id={!r} with {} targets",
+                room_id,
+                len(user_target_pairs),
+            )
 
     def set_game_completed(self, room_id: str, completed_dt: DateTime):
-        logger.debug(f"Setting game completed_dt for {room_id=} to {completed_dt=}")
-        # raises RoomNotFound
-        with self.session() as s:
-            room = s.get(Room, room_id)
-            if room is None:
-                raise RoomNotFound(f"Room {room_id=} not found")
+        logger.debug(
+            "Setting game completed_dt for room_id={!r} to completed_dt={!r}",
+            room_id,
+            completed_dt,
+        )
+        # raises RoomNotFound, RoomBusy
+        with self._session() as s:
+            room = self._lock_room(s, room_id)
+            if room.game_completed:
+                raise GameAlreadyCompleted(
+                    f"Game in room {room_id} has already completed"
+                )
             room.completed_dt = completed_dt
-            s.commit()
-            logger.debug(f"Set game completed_dt for {room_id=} to {completed_dt=}")
+            self._commit(s)
+            logger.debug(
+                "Set game completed_dt for room_id={!r} to completed_dt={!r}",
+                room_id,
+                completed_dt,
+            )
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+from src.repositories.sqlite import SQLiteProfile, apply_sqlite_profile, is_sqlite
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def pool_options(
+    url: str,
+    *,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    pool_recycle: int = 1800,
+    pool_pre_ping: bool = True,
+) -> dict[str, Any]:
+    """Engine options for the connection pool of `url`.
+
+    Sizing applies only where the dialect pools connections in a queue
+    (e.g. PostgreSQL, file SQLite); in-memory SQLite keeps its own pool."""
+    options: dict[str, Any] = {
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+    }
+    u = make_url(url)
+    pool_class = u.get_dialect().get_pool_class(u)  # type: ignore[attr-defined]
+    if issubclass(pool_class, QueuePool):
+        options |= {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+        }
+    return options
+
+
+def log_pool_events(pool: Pool):
+    """Log the life cycle of pooled connections, so that the pool can be
+    sized from the number of connections checked out at peak times."""
+
+    @event.listens_for(pool, "connect")
+    def _connect(_dbapi_connection, _record):
+        logger.info(f"Database connection opened; pool: {pool.status()}")
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(_dbapi_connection, _record, _proxy):
+        logger.opt(lazy=True).debug(
+            "Database connection checked out; pool: {}", pool.status
+        )
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(_dbapi_connection, _record):
+        logger.opt(lazy=True).debug(
+            "Database connection checked in; pool: {}", pool.status
+        )
+
+    @event.listens_for(pool, "invalidate")
+    def _invalidate(_dbapi_connection, _record, exception):
+        logger.warning(f"Database connection invalidated: {exception}")
+
+    @event.listens_for(pool, "close")
+    def _close(_dbapi_connection, _record):
+        logger.info(f"Database connection closed; pool: {pool.status()}")
+
+
+def create_database_engine(
+    url: str, *, sqlite_profile: SQLiteProfile | None = None, **pool_kwargs: Any
+) -> Engine:
+    """`create_engine` with the pool configured by `pool_options`
+    and its events logged, and `sqlite_profile` applied to SQLite."""
+    engine = create_engine(url, **pool_options(url, **pool_kwargs))
+    log_pool_events(engine.pool)
+    if sqlite_profile is not None and is_sqlite(url):
+        apply_sqlite_profile(engine, sqlite_profile)
+    return engine
+
+
+def create_async_database_engine(
+    url: str, *, sqlite_profile: SQLiteProfile | None = None, **pool_kwargs: Any
+) -> AsyncEngine:
+    """`create_async_engine` with the pool configured by `pool_options`
+    and its events logged, and `sqlite_profile` applied to SQLite."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(url, **pool_options(url, **pool_kwargs))
+    log_pool_events(engine.sync_engine.pool)
+    if sqlite_profile is not None and is_sqlite(url):
+        apply_sqlite_profile(engine.sync_engine, sqlite_profile)
+    return engine
@@ -0,0 +1,313 @@
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from loguru import logger
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+)
+
+schema_version_table = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_dt", DateTime(timezone=True), nullable=False),
+)
+
+# a Postgres advisory lock key, the same for every process migrating
+MIGRATION_LOCK_KEY = 0x6D6F726F7A  # "moroz"
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+    # non-transactional migrations run in autocommit mode
+    # (required e.g. for CREATE INDEX CONCURRENTLY on Postgres)
+    transactional: bool = True
+
+
+def _create_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: list[str],
+    *,
+    unique: bool = False,
+    where: str | None = None,
+):
+    """Create an index if it does not exist yet, without blocking
+    writes to the table on Postgres."""
+    quote = conn.dialect.identifier_preparer.quote
+    concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    if concurrently:
+        _drop_if_invalid(conn, quote(name))
+    conn.exec_driver_sql(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX {concurrently}"
+        f"IF NOT EXISTS {quote(name)} ON {quote(table)} "
+        f"({', '.join(quote(c) for c in columns)})"
+        + (f" WHERE {where}" if where else "")
+    )
+
+
+def _drop_if_invalid(conn: Connection, name: str):
+    """Drop an index left INVALID by a failed CREATE INDEX CONCURRENTLY,
+    which IF NOT EXISTS would otherwise keep (unusable, but maintained)."""
+    valid = conn.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar()
+    if valid is False:
+        logger.warning(f"Dropping invalid index {name} to build it again")
+        conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def _create_baseline_schema(conn: Connection):
+    """The tables as the models described them before migrations were
+    introduced, frozen so that later changes of the models do not change
+    this version. Tables created by the former `create_all` on start are
+    kept as they are."""
+    postgres = conn.dialect.name == "postgresql"
+    naive_dt = "TIMESTAMP WITHOUT TIME ZONE" if postgres else "DATETIME"
+    aware_dt = "TIMESTAMP WITH TIME ZONE" if postgres else "DATETIME"
+    serial = "SERIAL" if postgres else "INTEGER"
+    # room and user reference each other, and Postgres checks a reference
+    # when it is created: the one of room is added once user exists
+    room_manager_fk = (
+        "" if postgres else ', FOREIGN KEY (manager_user_id) REFERENCES "user" (id)'
+    )
+    existing = set(inspect(conn).get_table_names())
+    if "room" not in existing:
+        conn.exec_driver_sql(
+            "CREATE TABLE room ("
+            "id VARCHAR NOT NULL, "
+            "short_code INTEGER NOT NULL, "
+            "manager_user_id INTEGER NOT NULL, "
+            f"created_dt {naive_dt} NOT NULL, "
+            f"started_dt {naive_dt}, "
+            f"completed_dt {naive_dt}, "
+            f"PRIMARY KEY (id){room_manager_fk})"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_room_short_code ON room (short_code)")
+    if "user" not in existing:
+        conn.exec_driver_sql(
+            'CREATE TABLE "user" ('
+            f"id {serial} NOT NULL, "
+            f"joined_dt {aware_dt} NOT NULL, "
+            "name VARCHAR, "
+            "username VARCHAR, "
+            "room_id VARCHAR, "
+            "PRIMARY KEY (id), "
+            "FOREIGN KEY (room_id) REFERENCES room (id))"
+        )
+    if "target" not in existing:
+        conn.exec_driver_sql(
+            "CREATE TABLE target ("
+            f"id {serial} NOT NULL, "
+            "room_id VARCHAR NOT NULL, "
+            "user_id INTEGER NOT NULL, "
+            "target_user_id INTEGER NOT NULL, "
+            "PRIMARY KEY (id), "
+            "FOREIGN KEY (room_id) REFERENCES room (id), "
+            'FOREIGN KEY (user_id) REFERENCES "user" (id), '
+            'FOREIGN KEY (target_user_id) REFERENCES "user" (id))'
+        )
+    if postgres and "room" not in existing:
+        conn.exec_driver_sql(
+            "ALTER TABLE room "
+            'ADD FOREIGN KEY (manager_user_id) REFERENCES "user" (id)'
+        )
+
+
+def _add_lookup_indexes(conn: Connection):
+    _create_index(conn, "ix_user_room_id", "user", ["room_id"])
+    _create_index(conn, "ix_room_manager_user_id", "room", ["manager_user_id"])
+    _create_index(
+        conn,
+        "ix_target_room_id_user_id",
+        "target",
+        ["room_id", "user_id"],
+        unique=True,
+    )
+
+
+def _deduplicate_active_short_codes(conn: Connection):
+    """Give a fresh code to all but the newest active room sharing a code
+    (the older ones were unreachable by /join anyway)."""
+    rows = conn.execute(
+        text(
+            "SELECT id, short_code FROM room "
+            "WHERE completed_dt IS NULL ORDER BY created_dt DESC"
+        )
+    ).all()
+    taken: set[int] = set()
+    duplicates: list[str] = []
+    for room_id, short_code in rows:
+        if short_code in taken:
+            duplicates.append(room_id)
+        taken.add(short_code)
+    for room_id in duplicates:
+        short_code = random.choice([c for c in range(10_000) if c not in taken])
+        taken.add(short_code)
+        conn.execute(
+            text("UPDATE room SET short_code = :short_code WHERE id = :id"),
+            {"short_code": short_code, "id": room_id},
+        )
+        logger.warning(f"Reassigned room {room_id} to {short_code=}")
+
+
+def _add_active_short_code_index(conn: Connection):
+    _create_index(
+        conn,
+        "ix_room_active_short_code",
+        "room",
+        ["short_code"],
+        unique=True,
+        where="completed_dt IS NULL",
+    )
+
+
+def _add_target_history_index(conn: Connection):
+    _create_index(
+        conn,
+        "ix_target_user_id_target_user_id",
+        "target",
+        ["user_id", "target_user_id"],
+    )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "baseline schema", _create_baseline_schema),
+    Migration(
+        2,
+        "indexes on user.room_id, room.manager_user_id, target(room_id, user_id)",
+        _add_lookup_indexes,
+        transactional=False,
+    ),
+    Migration(
+        3, "deduplicate short codes of active rooms", _deduplicate_active_short_codes
+    ),
+    Migration(
+        4,
+        "unique index on short_code of active rooms",
+        _add_active_short_code_index,
+        transactional=False,
+    ),
+    Migration(
+        5,
+        "index on target(user_id, target_user_id) for the target history",
+        _add_target_history_index,
+        transactional=False,
+    ),
+]
+
+HEAD_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Return the version of the applied schema (0 for an empty database)."""
+    if not inspect(conn).has_table(schema_version_table.name):
+        return 0
+    return conn.execute(select(func.max(schema_version_table.c.version))).scalar() or 0
+
+
+def _apply(conn: Connection, migration: Migration):
+    logger.info(f"Applying migration {migration.version}: {migration.description}")
+    schema_version_table.create(conn, checkfirst=True)
+    migration.upgrade(conn)
+    conn.execute(
+        insert(schema_version_table).values(
+            version=migration.version,
+            description=migration.description,
+            applied_dt=datetime.now(timezone.utc),
+        )
+    )
+
+
+def _apply_pending(engine: Engine, version: int) -> int:
+    """Apply the migrations after `version`, each in a transaction of its
+    own or in autocommit mode."""
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        if migration.transactional:
+            with engine.begin() as conn:
+                _apply(conn, migration)
+        else:
+            with engine.connect() as conn:
+                _apply(conn.execution_options(isolation_level="AUTOCOMMIT"), migration)
+        version = migration.version
+    return version
+
+
+def _migrate_postgresql(engine: Engine) -> int:
+    """Apply the pending migrations under an advisory lock, held by a
+    connection of its own, so that processes starting at once migrate one
+    after the other (and the later ones find nothing left to do)."""
+    with engine.connect() as lock:
+        lock = lock.execution_options(isolation_level="AUTOCOMMIT")
+        lock.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            with engine.connect() as conn:
+                version = get_schema_version(conn)
+            return _apply_pending(engine, version)
+        finally:
+            lock.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+
+
+def _migrate_sqlite(engine: Engine) -> int:
+    """Apply the pending migrations in one transaction holding the write
+    lock of the database (BEGIN IMMEDIATE) from the version check on, so
+    that a concurrent migration waits for it (up to the busy timeout).
+    SQLite builds indexes in transactions anyway."""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        version = get_schema_version(conn)
+        for migration in MIGRATIONS:
+            if migration.version > version:
+                _apply(conn, migration)
+                version = migration.version
+        conn.commit()
+    return version
+
+
+def migrate(engine: Engine) -> int:
+    """Bring the database schema up to `HEAD_VERSION`.
+
+    Only the schema version is read when the database is up to date.
+    Otherwise the migrations run under a lock (on Postgres and SQLite),
+    so that several processes can start on the same database at once.
+    Returns the resulting schema version.
+    """
+    with engine.connect() as conn:
+        version = get_schema_version(conn)
+    if version >= HEAD_VERSION:
+        logger.debug(f"Database schema is up to date ({version=})")
+        return version
+
+    if engine.dialect.name == "postgresql":
+        version = _migrate_postgresql(engine)
+    elif engine.dialect.name == "sqlite":
+        version = _migrate_sqlite(engine)
+    else:
+        version = _apply_pending(engine, version)
+
+    logger.success(f"Database schema migrated to {version=}")
+    return version
@@ -0,0 +1,60 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from loguru import logger
+from sqlalchemy import Engine, event
+
+
+@dataclass
+class QueryStats:
+    label: str
+    statements: int = 0
+    duration: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.label}: {self.statements} statements "
+            f"in {self.duration * 1000:.1f} ms"
+        )
+
+
+# every scope being tracked in the current context, outermost first
+_active: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+    "query_stats_active", default=()
+)
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _many):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(_conn, _cursor, _statement, _parameters, context, _many):
+    duration = time.perf_counter() - context._query_started
+    for stats in _active.get():
+        stats.statements += 1
+        stats.duration += duration
+
+
+def instrument(engine: Engine):
+    """Attribute the statements executed by `engine` to the
+    `track_queries` scopes they are executed in. Idempotent."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(label: str, *, log: bool = True) -> Iterator[QueryStats]:
+    """Count the statements (and their time) executed inside the block,
+    e.g. while handling one update. Scopes may be nested."""
+    stats = QueryStats(label)
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+        if log:
+            logger.info(f"Queries of {stats}")
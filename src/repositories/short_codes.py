@@ -0,0 +1,35 @@
+import random
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ShortCodeAllocator:
+    """Proposes room short codes.
+
+    Codes are drawn at random from a space of `min_digits` digits which
+    widens (up to `max_digits`) once the share of codes held by active
+    rooms would exceed `max_occupancy`, so that a random probe is likely
+    to hit a free code. A widened space only holds codes with as many
+    digits, so that a code never reads (padded) as one of a narrower space. Uniqueness among active rooms is checked by the
+    repository and enforced by a partial unique index.
+    """
+
+    min_digits: int = 4
+    max_digits: int = 6
+    max_occupancy: float = 0.5
+    candidates_per_probe: int = 8
+
+    def code_space(self, active_rooms: int) -> int:
+        """The number of codes to draw from given the number of active rooms."""
+        digits = self.min_digits
+        while (
+            digits < self.max_digits and active_rooms >= 10**digits * self.max_occupancy
+        ):
+            digits += 1
+        return 10**digits
+
+    def candidates(self, active_rooms: int) -> list[int]:
+        """Distinct random codes to probe for availability."""
+        space = self.code_space(active_rooms)
+        codes = range(0 if space == 10**self.min_digits else space // 10, space)
+        return random.sample(codes, min(self.candidates_per_probe, len(codes)))
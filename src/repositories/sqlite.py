@@ -0,0 +1,144 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from threading import Event, Thread
+
+from loguru import logger
+from sqlalchemy import Engine, event, make_url
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """Connection settings of a SQLite database shared by concurrent threads.
+
+    With the write-ahead log, readers no longer block the writer (and vice
+    versa); writers wait up to `busy_timeout_ms` for the write lock instead
+    of failing with "database is locked". `synchronous=NORMAL` is durable
+    across application crashes with WAL; a power loss may drop the last
+    transactions but never corrupts the database.
+    """
+
+    journal_mode: str = "wal"
+    busy_timeout_ms: int = 5000
+    synchronous: str = "normal"
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size_kib: int = 64 * 1024
+    temp_store: str = "memory"
+
+    @property
+    def pragmas(self) -> dict[str, str | int]:
+        return {
+            "journal_mode": self.journal_mode,
+            "busy_timeout": self.busy_timeout_ms,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            # a negative size is in KiB rather than pages
+            "cache_size": -self.cache_size_kib,
+            "temp_store": self.temp_store,
+        }
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def sqlite_database_path(url: str) -> str | None:
+    """The file of a SQLite `url`; None for other databases and in-memory ones."""
+    u = make_url(url)
+    if u.get_backend_name() != "sqlite" or u.database in (None, "", ":memory:"):
+        return None
+    return u.database
+
+
+def apply_sqlite_profile(engine: Engine, profile: SQLiteProfile):
+    """Set the PRAGMAs of `profile` on every new connection of `engine`."""
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in profile.pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    logger.info(f"SQLite profile applied: {profile}")
+
+
+class SQLiteMaintenance:
+    """Keeps a SQLite database fast in a background thread: every
+    `interval_seconds` it refreshes the query planner statistics (ANALYZE)
+    and truncates the write-ahead log, and every `vacuum_every` runs
+    it also rebuilds the file (VACUUM) to return free pages.
+
+    It uses a connection of its own, so it works alongside any driver.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        interval_seconds: float = 3600,
+        vacuum_every: int = 24,
+        busy_timeout_ms: int = 5000,
+    ):
+        self.database_path = database_path
+        self.interval_seconds = interval_seconds
+        self.vacuum_every = vacuum_every
+        self.busy_timeout_ms = busy_timeout_ms
+        self.runs = 0
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def run_once(self):
+        vacuum = self.vacuum_every > 0 and (self.runs + 1) % self.vacuum_every == 0
+        started = time.perf_counter()
+        conn = sqlite3.connect(
+            self.database_path,
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,  # VACUUM cannot run in a transaction
+        )
+        try:
+            conn.execute("ANALYZE")
+            if vacuum:
+                conn.execute("VACUUM")
+            busy, log_frames, checkpointed = conn.execute(
+                "PRAGMA wal_checkpoint(TRUNCATE)"
+            ).fetchone()
+        finally:
+            conn.close()
+        self.runs += 1
+        logger.info(
+            f"SQLite maintenance of {self.database_path}"
+            f"{' with VACUUM' if vacuum else ''} took "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms; WAL checkpoint: "
+            f"{checkpointed}/{log_frames} frames{' (busy)' if busy else ''}"
+        )
+
+    def _run(self):
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except sqlite3.Error:
+                logger.exception(f"SQLite maintenance of {self.database_path}")
+
+    def start(self):
+        """Run the maintenance periodically in a background thread."""
+        self._thread = Thread(target=self._run, name="sqlite-maintenance", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def sqlite_maintenance(
+    url: str | None, interval_seconds: float | None, vacuum_every: int = 24
+) -> SQLiteMaintenance | None:
+    """The maintenance of the SQLite file of `url`, if it is one
+    and an interval is set."""
+    if url is None or interval_seconds is None:
+        return None
+    if (path := sqlite_database_path(url)) is None:
+        return None
+    return SQLiteMaintenance(path, interval_seconds, vacuum_every)
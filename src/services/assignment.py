@@ -0,0 +1,216 @@
+"""Secret Santa target assignment.
+
+An assignment gives every participant exactly one other participant
+(a derangement of the participants, i.e. a cover of them by cycles),
+such that nobody draws somebody they are excluded from (e.g. their
+partner, or last season's target).
+
+Without exclusions, the participants are shuffled into one big cycle.
+Otherwise the assignment is a perfect matching of givers to receivers
+in the graph of allowed pairs: a randomized greedy matching completed
+by augmenting paths, searched directly on the complement of the
+exclusions, so it costs O(n + exclusions) rather than O(n²). The cycles
+of the matching are then merged into as few as the exclusions allow,
+so that chains of gifts stay long.
+"""
+
+import random
+from collections import deque
+from collections.abc import Collection, Iterable, Sequence
+from itertools import pairwise
+
+from loguru import logger
+
+from src.shared.exceptions import NoValidAssignment
+
+# random draws of a receiver before falling back to a scan of the free ones
+_GREEDY_DRAWS = 8
+# random single cycles tried while the exclusions are sparse
+_CYCLE_ATTEMPTS = 3
+# random swaps tried per cycle being merged, per participant in the cycle
+_MERGE_DRAWS = 4
+# participants listed in the reason of a `NoValidAssignment`
+_REASON_IDS = 10
+
+Exclusions = dict[int, set[int]]
+
+
+def _exclusions_among(
+    participants: Collection[int], exclusions: Iterable[tuple[int, int]]
+) -> Exclusions:
+    excluded: Exclusions = {}
+    for giver, receiver in exclusions:
+        if giver != receiver and giver in participants and receiver in participants:
+            excluded.setdefault(giver, set()).add(receiver)
+    return excluded
+
+
+def _allowed(excluded: Exclusions, giver: int, receiver: int) -> bool:
+    return giver != receiver and receiver not in excluded.get(giver, ())
+
+
+def _random_cycle(participants: Sequence[int], rng: random.Random) -> dict[int, int]:
+    shuffled = list(participants)
+    rng.shuffle(shuffled)
+    return dict(pairwise(shuffled + shuffled[:1]))
+
+
+def _greedy_matching(
+    participants: Sequence[int], excluded: Exclusions, rng: random.Random
+) -> dict[int, int]:
+    """Match givers to random free allowed receivers; some may stay unmatched."""
+    givers = list(participants)
+    rng.shuffle(givers)
+    free = list(participants)
+    position = {receiver: i for i, receiver in enumerate(free)}
+    target: dict[int, int] = {}
+
+    def _take(i: int) -> int:
+        receiver, last = free[i], free[-1]
+        free[i], position[last] = last, i
+        free.pop()
+        del position[receiver]
+        return receiver
+
+    for giver in givers:
+        # the most constrained givers could be matched first, but random
+        # draws almost always succeed unless nearly everybody is excluded
+        for _ in range(min(_GREEDY_DRAWS, len(free))):
+            i = rng.randrange(len(free))
+            if _allowed(excluded, giver, free[i]):
+                target[giver] = _take(i)
+                break
+        else:
+            for i, receiver in enumerate(free):
+                if _allowed(excluded, giver, receiver):
+                    target[giver] = _take(i)
+                    break
+    return target
+
+
+def _augment(
+    giver: int,
+    participants: Sequence[int],
+    target: dict[int, int],
+    giver_of: dict[int, int],
+    excluded: Exclusions,
+):
+    """Match `giver` by an augmenting path (found by a breadth-first search
+    on the complement of the exclusions), or explain why it cannot be."""
+    unvisited = set(participants)
+    reached_from: dict[int, int] = {}  # receiver -> giver it was reached from
+    queue = deque([giver])
+    visited_givers = [giver]
+    while queue:
+        g = queue.popleft()
+        g_excluded = excluded.get(g, ())
+        # every receiver leaves `unvisited` at most once and every other
+        # one scanned is an exclusion of g, hence O(n + exclusions) in total
+        reachable = [r for r in unvisited if r != g and r not in g_excluded]
+        for r in reachable:
+            unvisited.discard(r)
+            reached_from[r] = g
+            if r not in giver_of:
+                # flip the path ending at the free receiver r
+                while True:
+                    g = reached_from[r]
+                    previous = target.get(g)
+                    target[g], giver_of[r] = r, g
+                    if previous is None:
+                        return
+                    r = previous
+            queue.append(giver_of[r])
+            visited_givers.append(giver_of[r])
+    # Hall's condition fails: the visited givers can only give to the
+    # visited receivers, which are one fewer
+    receivers = sorted(reached_from)
+    raise NoValidAssignment(_violation(sorted(visited_givers), receivers))
+
+
+def _violation(givers: list[int], receivers: list[int]) -> str:
+    def _ids(ids: list[int]) -> str:
+        shown = ", ".join(map(str, ids[:_REASON_IDS]))
+        return shown + (
+            f" and {len(ids) - _REASON_IDS} more" if len(ids) > _REASON_IDS else ""
+        )
+
+    if not receivers:
+        return f"Participant {givers[0]} is excluded from drawing anybody"
+    return (
+        f"{len(givers)} participants ({_ids(givers)}) may only draw "
+        f"{len(receivers)} others ({_ids(receivers)})"
+    )
+
+
+def _cycles(target: dict[int, int]) -> list[list[int]]:
+    seen: set[int] = set()
+    cycles = []
+    for start in target:
+        if start in seen:
+            continue
+        cycle = []
+        node = start
+        while node not in seen:
+            seen.add(node)
+            cycle.append(node)
+            node = target[node]
+        cycles.append(cycle)
+    return cycles
+
+
+def _merge_cycles(target: dict[int, int], excluded: Exclusions, rng: random.Random):
+    """Join cycles into the largest one where the exclusions allow it:
+    swapping the targets of `a` (in the main cycle) and `b` (in another)
+    joins the two cycles into one."""
+    cycles = sorted(_cycles(target), key=len, reverse=True)
+    main = cycles[0]
+    for cycle in cycles[1:]:
+        for _ in range(_MERGE_DRAWS * len(cycle)):
+            a, b = rng.choice(main), rng.choice(cycle)
+            if _allowed(excluded, a, target[b]) and _allowed(excluded, b, target[a]):
+                target[a], target[b] = target[b], target[a]
+                main.extend(cycle)
+                break
+
+
+def assign_targets(
+    participants: Sequence[int],
+    exclusions: Iterable[tuple[int, int]] = (),
+    *,
+    rng: random.Random | None = None,
+) -> dict[int, int]:
+    """Return the target of every participant: another participant that is
+    not excluded for them by a (giver, receiver) pair of `exclusions`.
+
+    Raises
+        `NoValidAssignment` with the reason if the exclusions leave none
+    """
+    rng = rng or random.Random()
+    if len(participants) < 2:
+        raise NoValidAssignment("At least 2 participants are needed")
+    if len(set(participants)) != len(participants):
+        raise ValueError("Participants must be unique")
+
+    excluded = _exclusions_among(set(participants), exclusions)
+    if not excluded:
+        return _random_cycle(participants, rng)
+
+    # sparse exclusions rarely hit a random cycle
+    for _ in range(_CYCLE_ATTEMPTS):
+        target = _random_cycle(participants, rng)
+        if all(_allowed(excluded, g, r) for g, r in target.items()):
+            return target
+
+    target = _greedy_matching(participants, excluded, rng)
+    giver_of = {r: g for g, r in target.items()}
+    unmatched = [g for g in participants if g not in target]
+    logger.debug(
+        "Greedy matching left {} of {} participants unmatched",
+        len(unmatched),
+        len(participants),
+    )
+    for giver in unmatched:
+        _augment(giver, participants, target, giver_of, excluded)
+
+    _merge_cycles(target, excluded, rng)
+    return target
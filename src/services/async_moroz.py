@@ -0,0 +1,129 @@
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.async_database import AfterCommitCallback, AsyncDatabaseRepository
+from src.services.moroz import Moroz
+
+
+@dataclass
+class AsyncMoroz:
+    """The game logic of `Moroz` for asyncio applications.
+
+    Each call runs the corresponding `Moroz` method in one unit of work
+    of the async repository, so the semantics and exceptions are the same.
+    """
+
+    database_repository: AsyncDatabaseRepository
+    max_rooms_managed_by_user: int
+    min_players_to_start_game: int
+    admin_name: str | None = None
+    admin_username: str | None = None
+    admin_user_id: int | None = None
+    avoid_past_targets: bool = True
+    moroz: Moroz = field(init=False)
+
+    def __post_init__(self):
+        self.moroz = Moroz(
+            database_repository=self.database_repository.repository,
+            max_rooms_managed_by_user=self.max_rooms_managed_by_user,
+            min_players_to_start_game=self.min_players_to_start_game,
+            admin_name=self.admin_name,
+            admin_username=self.admin_username,
+            admin_user_id=self.admin_user_id,
+            avoid_past_targets=self.avoid_past_targets,
+        )
+
+    def unit_of_work(self) -> AbstractAsyncContextManager[None]:
+        """Make all calls inside the block share one database transaction."""
+        return self.database_repository.unit_of_work()
+
+    async def run_in_unit_of_work[T](
+        self,
+        work: Callable[[], Awaitable[T]],
+        *,
+        retryable: Callable[[], bool] = lambda: True,
+    ) -> T:
+        """Await `work` in a unit of work, see `Moroz.run_in_unit_of_work`."""
+        return await self.database_repository.run_in_unit_of_work(
+            work, retryable=retryable
+        )
+
+    async def after_commit(self, callback: AfterCommitCallback):
+        """Defer `callback` (e.g. sending notifications) until the current
+        unit of work has committed, see `Moroz.after_commit`."""
+        await self.database_repository.after_commit(callback)
+
+    async def create_room(self, created_by_user_id: int) -> Room:
+        return await self.database_repository.run(
+            self.moroz.create_room, created_by_user_id
+        )
+
+    async def delete_room(self, room_id: str) -> list[User]:
+        return await self.database_repository.run(self.moroz.delete_room, room_id)
+
+    async def join_room_by_short_code(self, user_id: int, room_short_code: int) -> Room:
+        return await self.database_repository.run(
+            self.moroz.join_room_by_short_code, user_id, room_short_code
+        )
+
+    async def start_game_in_room(
+        self, room_id: str, exclusions: Iterable[tuple[int, int]] = ()
+    ) -> list[tuple[User, User]]:
+        return await self.database_repository.run(
+            self.moroz.start_game_in_room, room_id, exclusions
+        )
+
+    async def complete_game_in_room(self, room_id: str) -> list[User]:
+        return await self.database_repository.run(
+            self.moroz.complete_game_in_room, room_id
+        )
+
+    async def get_rooms_managed_by_user(self, user_id: int) -> list[Room]:
+        return await self.database_repository.run(
+            self.moroz.get_rooms_managed_by_user, user_id
+        )
+
+    async def create_user(
+        self, user_id: int, username: str | None, name: str | None
+    ) -> User:
+        return await self.database_repository.run(
+            self.moroz.create_user, user_id, username, name
+        )
+
+    async def get_room_information(self, room_id: str) -> str:
+        return await self.database_repository.run(
+            self.moroz.get_room_information, room_id
+        )
+
+    async def get_user_information(self, user_id: int) -> str:
+        return await self.database_repository.run(
+            self.moroz.get_user_information, user_id
+        )
+
+    async def update_name(self, user_id: int, name: str):
+        await self.database_repository.run(self.moroz.update_name, user_id, name)
+
+    async def get_user(self, user_id: int) -> User:
+        return await self.database_repository.run(self.moroz.get_user, user_id)
+
+    async def get_users_in_room(self, room_id: str) -> list[User]:
+        return await self.database_repository.run(self.moroz.get_users_in_room, room_id)
+
+    async def get_targets_in_room(self, room_id: str) -> list[tuple[User, User]]:
+        return await self.database_repository.run(
+            self.moroz.get_targets_in_room, room_id
+        )
+
+    async def get_room(self, room_id: str) -> Room:
+        return await self.database_repository.run(self.moroz.get_room, room_id)
+
+    async def leave_room(self, user_id: int) -> Room:
+        return await self.database_repository.run(self.moroz.leave_room, user_id)
+
+    async def kick_from_room(self, room_id: str, user_id: int) -> Room:
+        return await self.database_repository.run(
+            self.moroz.kick_from_room, room_id, user_id
+        )
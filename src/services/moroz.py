@@ -1,20 +1,21 @@
-import random
+from collections.abc import Callable, Iterable
+from contextlib import AbstractContextManager
 from dataclasses import dataclass
-from itertools import pairwise
 
 from loguru import logger
 from pydantic_extra_types.pendulum_dt import DateTime
 
 from src.models.room import Room
+from src.models.snapshot import RoomSnapshot
 from src.models.user import User
 from src.repositories.database import DatabaseRepository
+from src.services.assignment import assign_targets
 from src.shared.exceptions import (
-    GameAlreadyCompleted,
     GameAlreadyStarted,
     InvalidName,
     MaxNumberOfRoomsReached,
+    NoValidAssignment,
     RoomTooSmall,
-    TargetNotAssigned,
 )
 from src.shared.utils import is_name_valid
 
@@ -29,6 +30,24 @@ class Moroz:
     admin_name: str | None = None
     admin_username: str | None = None
     admin_user_id: int | None = None
+    avoid_past_targets: bool = True
+
+    def unit_of_work(self) -> AbstractContextManager[None]:
+        """Make all calls inside the block share one database transaction."""
+        return self.database_repository.unit_of_work()
+
+    def run_in_unit_of_work[T](
+        self, work: Callable[[], T], *, retryable: Callable[[], bool] = lambda: True
+    ) -> T:
+        """Run `work` in a unit of work, run again after a transient database
+        error while `retryable()`, see `DatabaseRepository.run_in_unit_of_work`."""
+        return self.database_repository.run_in_unit_of_work(work, retryable=retryable)
+
+    def after_commit(self, callback: Callable[[], object]):
+        """Defer `callback` (e.g. sending notifications) until the current
+        unit of work has committed, so that no transaction is held open
+        while it runs."""
+        self.database_repository.after_commit(callback)
 
     def create_room(self, created_by_user_id: int) -> Room:
         """Create a new room managed by the given user
@@ -39,7 +58,7 @@ class Moroz:
                 the maximum allowed number of rooms
             `UserNotFound` if the user does not exist
         """
-        logger.info(f"Creating room by {created_by_user_id=}")
+        logger.info("Creating room by created_by_user_id={!r}", created_by_user_id)
         managed_rooms = self.database_repository.get_rooms_managed_by_user(
             user_id=created_by_user_id
         )
@@ -57,7 +76,7 @@ class Moroz:
         room = self.database_repository.create_room(
             created_by_user_id=created_by_user_id,
         )
-        logger.success(f"Room created {room=}")
+        logger.success("Room created room={!r}", room)
         return room
 
     def delete_room(self, room_id: str) -> list[User]:
@@ -65,15 +84,15 @@ class Moroz:
 
         Raises
             `RoomNotFound` if the room does not exist
+            `RoomBusy` if the room is being changed by another request
         """
-        logger.info(f"Deleting {room_id=} by its manager")
-        users_in_room = self.database_repository.get_users_in_room(room_id)
-        for user in users_in_room:
-            self.leave_room(user_id=user.id)
-        self.database_repository.delete_room(
-            room_id=room_id,
-        )
-        logger.success(f"Room deleted {room_id=}")
+        logger.info("Deleting room_id={!r} by its manager", room_id)
+        with self.unit_of_work():
+            users_in_room = self.database_repository.dissolve_room(room_id)
+            self.database_repository.delete_room(
+                room_id=room_id,
+            )
+        logger.success("Room deleted room_id={!r}", room_id)
         return users_in_room
 
     def join_room_by_short_code(self, user_id: int, room_short_code: int) -> Room:
@@ -84,94 +103,133 @@ class Moroz:
             `UserNotFound` if the user does not exist
             `GameAlreadyStarted` if the game in the room has already started
             `GameAlreadyCompleted` if the game in the room has already completed
+            `RoomBusy` if the room is being changed by another request
         """
-        logger.info(f"User {user_id} joining {room_short_code=}")
-        user = self.database_repository.get_user(user_id)
-        room = self.database_repository.get_room_by_short_code(room_short_code)
-        if room.game_started:
-            msg = f"Game in room {room.id} has already started"
-            logger.info(msg)
-            raise GameAlreadyStarted(msg)
-        if room.game_completed:
-            msg = f"Game in room {room.id} has already completed"
-            logger.info(msg)
-            raise GameAlreadyCompleted(msg)
-        self.database_repository.join_room(
-            user_id=user.id,
-            room_id=room.id,
+        logger.info("User {} joining room_short_code={!r}", user_id, room_short_code)
+        room = self.database_repository.join_room_by_short_code(
+            user_id=user_id,
+            short_code=room_short_code,
         )
-        logger.success(f"User {user} joined {room}")
+        logger.success("User {} joined {}", user_id, room)
         return room
 
-    def start_game_in_room(self, room_id: str) -> list[tuple[User, User]]:
-        logger.info(f"Starting game in {room_id=}")
-        users_in_room = self.database_repository.get_users_in_room(room_id)
-        if len(users_in_room) < self.min_players_to_start_game:
-            msg = (
-                f"Cannot start game in {room_id=} with "
-                f"only {len(users_in_room)} users; minimum is {self.min_players_to_start_game}"
+    def start_game_in_room(
+        self, room_id: str, exclusions: Iterable[tuple[int, int]] = ()
+    ) -> list[tuple[User, User]]:
+        """Assign every user in the room a target and start the game.
+
+        Nobody draws a (giver, receiver) pair of `exclusions`, and, where
+        possible, nobody draws somebody they have drawn in a past game.
+
+        Raises
+            `RoomTooSmall` if the room has fewer users than required
+            `NoValidAssignment` if the exclusions leave no assignment
+            `GameAlreadyStarted` if the game in the room has already started
+            `RoomBusy` if the room is being changed by another request
+        """
+        logger.info("Starting game in room_id={!r}", room_id)
+        with self.unit_of_work():
+            # nobody joins or leaves between reading the members and starting
+            room = self.database_repository.lock_room(room_id)
+            # members may leave a started room, which is not too small then
+            if room.game_started:
+                raise GameAlreadyStarted(f"Game in room {room_id} has already started")
+            users_in_room = self.database_repository.get_users_in_room(room_id)
+            if len(users_in_room) < self.min_players_to_start_game:
+                msg = (
+                    f"Cannot start game in {room_id=} with "
+                    f"only {len(users_in_room)} users; minimum is {self.min_players_to_start_game}"
+                )
+                logger.info(msg)
+                raise RoomTooSmall(msg)
+            logger.info(
+                "Game started in room_id={!r} with {} users",
+                room_id,
+                len(users_in_room),
             )
-            logger.info(msg)
-            raise RoomTooSmall(msg)
-        logger.info(f"Game started in {room_id=} with users {users_in_room}")
-        random.shuffle(users_in_room)
-        target_pairs: list[tuple[User, User]] = [
-            (user, target)
-            for user, target in pairwise(users_in_room + [users_in_room[0]])
-        ]
-        self.database_repository.assign_targets(
-            room_id=room_id,
-            user_target_pairs=[(user.id, target.id) for user, target in target_pairs],
-        )
-        self.database_repository.set_game_started(
-            room_id=room_id,
-            started_dt=DateTime.utcnow(),
-        )
-        logger.success(f"Game started in {room_id=}")
+            users = {user.id: user for user in users_in_room}
+            targets = self._assign_targets(room_id, list(users), list(exclusions))
+            target_pairs = [
+                (users[user_id], users[target_id])
+                for user_id, target_id in targets.items()
+            ]
+            # all or nothing: a room never has targets without having started
+            self.database_repository.start_game(
+                room_id=room_id,
+                user_target_pairs=list(targets.items()),
+                started_dt=DateTime.utcnow(),
+            )
+        logger.success("Game started in room_id={!r}", room_id)
         return target_pairs
 
+    def _assign_targets(
+        self, room_id: str, user_ids: list[int], exclusions: list[tuple[int, int]]
+    ) -> dict[int, int]:
+        if self.avoid_past_targets:
+            history = self.database_repository.get_target_history(room_id)
+            if history:
+                try:
+                    return assign_targets(user_ids, [*exclusions, *history])
+                except NoValidAssignment as e:
+                    # e.g. a small group which has played many times already
+                    logger.info(
+                        "Past targets cannot all be avoided in room_id={!r}: {}",
+                        room_id,
+                        e,
+                    )
+        return assign_targets(user_ids, exclusions)
+
     def complete_game_in_room(self, room_id: str) -> list[User]:
-        logger.info(f"Completing game in room {room_id=}")
-        users_in_room = self.database_repository.get_users_in_room(room_id)
-        self.database_repository.set_game_completed(
-            room_id=room_id,
-            completed_dt=DateTime.utcnow(),
-        )
-        for usr in users_in_room:
-            self.leave_room(user_id=usr.id)
-        logger.success(f"Game completed in {room_id=}")
+        """Complete the game in the room and remove its members from it.
+
+        Raises
+            `RoomNotFound` if the room does not exist
+            `GameAlreadyCompleted` if the game in the room has already completed
+            `RoomBusy` if the room is being changed by another request
+        """
+        logger.info("Completing game in room room_id={!r}", room_id)
+        with self.unit_of_work():
+            self.database_repository.set_game_completed(
+                room_id=room_id,
+                completed_dt=DateTime.utcnow(),
+            )
+            users_in_room = self.database_repository.dissolve_room(room_id)
+        logger.success("Game completed in room_id={!r}", room_id)
         return users_in_room
 
     def get_rooms_managed_by_user(self, user_id: int) -> list[Room]:
-        logger.info(f"Getting rooms managed by {user_id=}")
+        logger.info("Getting rooms managed by user_id={!r}", user_id)
         return self.database_repository.get_rooms_managed_by_user(user_id)
 
     def create_user(self, user_id: int, username: str | None, name: str | None) -> User:
         logger.info(
-            f"Creating user with id={user_id}, username={username}, name={name}"
+            "Creating user with id={}, username={}, name={}", user_id, username, name
         )
         new_user = self.database_repository.create_user(
             id=user_id, username=username, name=name
         )
-        logger.success(f"Created {new_user}")
+        logger.success("Created {}", new_user)
         return new_user
 
     def get_room_information(self, room_id: str) -> str:
-        logger.info(f"Getting information about {room_id=}")
-
-        room = self.database_repository.get_room(room_id)
-        manager = self.database_repository.get_user(room.manager_user_id)
-        participants = self.database_repository.get_users_in_room(room.id)
+        logger.info("Getting information about room_id={!r}", room_id)
+        snapshot = self.database_repository.get_room_snapshot(room_id)
+        msg = self._render_room_information(snapshot)
+        logger.success("Got information about room={}", snapshot.room)
+        return msg
 
+    @staticmethod
+    def _render_room_information(snapshot: RoomSnapshot) -> str:
+        room = snapshot.room
         lines: list[str] = []
 
         lines.append(f"Room {room.display_short_code}")
-        lines.append(f"  managed by: {manager.formal_display_name}")
+        lines.append(f"  managed by: {snapshot.manager.formal_display_name}")
         lines.append(f"  created at: {room.created_dt}")
 
-        if participants:
+        if snapshot.participants:
             lines.append("  participants:")
-            for usr in participants:
+            for usr in snapshot.participants:
                 lines.append(f"    {usr.formal_display_name}")
         else:
             lines.append("  participants: none")
@@ -183,12 +241,10 @@ class Moroz:
             if room.game_completed:
                 lines.append(f"  completed at: {room.completed_dt}")
 
-        msg = "\n".join(lines)
-        logger.success(f"Got information about {room=}")
-        return msg
+        return "\n".join(lines)
 
     def get_user_information(self, user_id: int) -> str:
-        logger.info(f"Getting information about {user_id=}")
+        logger.info("Getting information about user_id={!r}", user_id)
 
         user = self.database_repository.get_user(user_id)
 
@@ -210,45 +266,51 @@ class Moroz:
         if user.room_id is None:
             lines.append("Status: not in any room.")
             msg = "\n".join(lines)
-            logger.success(f"Got information about {user=} (not in any room)")
+            logger.success("Got information about user={!r} (not in any room)", user)
             return msg
 
-        room = self.database_repository.get_room(user.room_id)
+        snapshot = self.database_repository.get_room_snapshot(
+            user.room_id, for_user_id=user.id
+        )
 
-        lines.append("You are in " + self.get_room_information(room.id))
+        lines.append("You are in " + self._render_room_information(snapshot))
 
         # if the game has started, show the target
-        try:
-            target_user = self.database_repository.get_target(room.id, user.id)
-            lines.append(f"Your target is: {target_user.formal_display_name} 🎁")
-        except TargetNotAssigned:
-            pass
+        if snapshot.target is not None:
+            lines.append(f"Your target is: {snapshot.target.formal_display_name} 🎁")
 
         msg = "\n".join(lines)
-        logger.success(f"Got information about {user=}")
+        logger.success("Got information about user={!r}", user)
         return msg
 
     def update_name(self, user_id: int, name: str):
-        logger.info(f"Updating {user_id=} name to {name=}")
+        logger.info("Updating user_id={!r} name to name={!r}", user_id, name)
         status = is_name_valid(name)
         if not status:
             logger.info(
-                f"Invalid name {name!r} provided by {user_id=}: {status.reason}"
+                "Invalid name {!r} provided by user_id={!r}: {}",
+                name,
+                user_id,
+                status.reason,
             )
             raise InvalidName(status.reason)
         self.database_repository.set_user_name(user_id, name)
-        logger.success(f"Updated {user_id=} name to {name=}")
+        logger.success("Updated user_id={!r} name to name={!r}", user_id, name)
 
     def get_user(self, user_id: int) -> User:
-        logger.info(f"Getting {user_id=}")
+        logger.info("Getting user_id={!r}", user_id)
         return self.database_repository.get_user(user_id)
 
     def get_users_in_room(self, room_id: str) -> list[User]:
-        logger.info(f"Getting users in room id={room_id}")
+        logger.info("Getting users in room id={}", room_id)
         return self.database_repository.get_users_in_room(room_id)
 
+    def get_targets_in_room(self, room_id: str) -> list[tuple[User, User]]:
+        logger.info("Getting targets in room id={}", room_id)
+        return self.database_repository.get_targets_in_room(room_id)
+
     def get_room(self, room_id: str) -> Room:
-        logger.info(f"Getting {room_id=}")
+        logger.info("Getting room_id={!r}", room_id)
         return self.database_repository.get_room(room_id)
 
     def leave_room(self, user_id: int) -> Room:
@@ -257,8 +319,23 @@ class Moroz:
         Raises
             `UserNotFound` if the user does not exist
             `NotInRoom` if the user is not in any room
+            `RoomBusy` if the room is being changed by another request
         """
-        logger.info(f"User {user_id} leaving room id={user_id}")
+        logger.info("User {} leaving their room", user_id)
         left_room = self.database_repository.leave_room(user_id)
-        logger.success(f"User {user_id} left their room")
+        logger.success("User {} left their room", user_id)
         return left_room
+
+    def kick_from_room(self, room_id: str, user_id: int) -> Room:
+        """Remove the user from the given room (but from no other one).
+
+        Raises
+            `UserNotFound` if the user does not exist
+            `NotInRoom` if the user is not in this room (anymore)
+            `RoomNotFound` if the room does not exist
+            `RoomBusy` if the room is being changed by another request
+        """
+        logger.info("Kicking user {} from room_id={!r}", user_id, room_id)
+        room = self.database_repository.kick_from_room(room_id, user_id)
+        logger.success("User {} kicked from room_id={!r}", user_id, room_id)
+        return room
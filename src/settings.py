@@ -1,11 +1,105 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     bot_token: str
+    log_level: str = "INFO"
     database_url: str
     max_rooms_managed_by_user: int
     min_players_to_start_game: int = 4
+    # nobody draws a past target again unless it is unavoidable
+    avoid_past_targets: bool = True
     admin_name: str | None = None
     admin_username: str | None = None
     admin_user_id: int | None = None
+    short_code_min_digits: int = 4
+    short_code_max_digits: int = 6
+    short_code_max_occupancy: float = 0.5
+    # connection pool of the database engine, see src/repositories/engine.py
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # transient errors on reads outside a unit of work, and on whole commands
+    # that have not sent anything yet, are retried
+    db_read_retries: int = 3
+    db_read_retry_backoff_seconds: float = 0.1
+    # applied when DATABASE_URL is SQLite, see src/repositories/sqlite.py
+    sqlite_journal_mode: str = "wal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_synchronous: str = "normal"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+    # ANALYZE and WAL checkpoint every interval (disabled if unset),
+    # VACUUM every `sqlite_vacuum_every` of them
+    sqlite_maintenance_interval_seconds: float | None = 3600
+    sqlite_vacuum_every: int = 24
+    # the users read by each process are cached in it and invalidated by its
+    # own writes only: the writes of other processes (e.g. replicas) show
+    # once the entries expire, so the TTL is kept short
+    user_cache_size: int = 10_000
+    user_cache_ttl_seconds: float = 5
+    broadcast_workers: int = 8
+    broadcast_global_rate: float = 30
+    broadcast_per_chat_rate: float = 1
+    broadcast_max_retries: int = 3
+    # per-user limit of commands (disabled if unset), see
+    # src/shared/rate_limit.py; a command not in `command_costs` costs 1
+    command_rate: float | None = 1
+    command_burst: float = 10
+    command_costs: dict[str, float] = {
+        "help": 0.5,
+        "me": 2,
+        "join": 2,
+        "leave": 2,
+        "here": 2,
+        "create": 3,
+    }
+    command_rate_limit_max_users: int = 100_000
+    dispatcher_workers: int = 8
+    dispatcher_max_pending: int = 1000
+    conversation_max_entries: int = 10_000
+    conversation_ttl_seconds: float = 3600
+    conversation_state_path: str | None = None
+    bot_mode: Literal["polling", "webhook"] = "polling"
+    webhook_url: str | None = None
+    webhook_secret_token: str | None = None
+    webhook_listen_host: str = "0.0.0.0"
+    webhook_listen_port: int = 8080
+    webhook_path: str = "/webhook"
+    webhook_max_connections: int = 40
+    # the Prometheus metrics endpoint is disabled unless a port is set
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int | None = None
+    # "asyncio" runs the AsyncBotApp (polling only) on ASYNC_DATABASE_URL,
+    # e.g. postgresql+asyncpg://... or sqlite+aiosqlite:///...
+    bot_runtime: Literal["threads", "asyncio"] = "threads"
+    async_database_url: str | None = None
+    broadcast_max_concurrency: int = 100
+
+    @model_validator(mode="after")
+    def _webhook_url_required(self) -> Settings:
+        if self.bot_mode == "webhook":
+            if not self.webhook_url:
+                raise ValueError("WEBHOOK_URL is required in webhook mode")
+            # anybody could post updates to the webhook otherwise
+            if not self.webhook_secret_token:
+                raise ValueError("WEBHOOK_SECRET_TOKEN is required in webhook mode")
+        return self
+
+    @model_validator(mode="after")
+    def _asyncio_runtime_supported(self) -> Settings:
+        if self.bot_runtime == "asyncio":
+            if not self.async_database_url:
+                raise ValueError(
+                    "ASYNC_DATABASE_URL is required by the asyncio runtime"
+                )
+            if self.bot_mode != "polling":
+                raise ValueError("The asyncio runtime supports polling mode only")
+        return self
@@ -62,3 +62,21 @@ class InvalidName(AppError):
     """Raised when a provided name is invalid."""
 
     pass
+
+
+class ShortCodesExhausted(AppError):
+    """Raised when no free room short code could be allocated."""
+
+    pass
+
+
+class NoValidAssignment(AppError):
+    """Raised when the exclusions leave no valid assignment of targets."""
+
+    pass
+
+
+class RoomBusy(AppError):
+    """Raised when a room is being changed by another request at the same time."""
+
+    pass
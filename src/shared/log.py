@@ -0,0 +1,22 @@
+import sys
+from typing import TextIO
+
+from loguru import logger
+
+
+def setup_logging(level: str = "INFO", sink: TextIO = sys.stderr) -> int:
+    """Replace loguru's default sink with one writing from a background
+    thread (`enqueue`), so that a slow log driver (e.g. CloudWatch) never
+    blocks the threads handling updates. Returns the id of the sink.
+
+    Messages are formatted only at or above `level`: log with arguments
+    (`logger.debug("Got {}", user)`), not f-strings, on hot paths.
+    """
+    logger.remove()
+    return logger.add(
+        sink,
+        level=level,
+        enqueue=True,
+        # variable values in tracebacks are slow to format and may hold secrets
+        diagnose=False,
+    )
@@ -0,0 +1,123 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from threading import Lock
+
+from src.shared.cache import TTLCache
+
+
+class TokenBucket:
+    """A thread-safe token bucket refilled at `rate` tokens per second,
+    holding at most `capacity` tokens (default: one second worth, at least 1).
+
+    Callers reserve tokens up front and are told how long to wait, so that
+    concurrent callers queue up fairly instead of polling the bucket."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take `tokens` (possibly going into debt) and return the number of
+        seconds to wait before the reserved tokens may be used."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take `tokens` only if they are available right now."""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def pause(self, seconds: float):
+        """Drain the bucket so that the next token is available
+        only after `seconds` (e.g. after a "retry after" response)."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+class Admission(Enum):
+    ALLOWED = "allowed"
+    # the first command refused in a flood, to be answered once
+    REFUSED = "refused"
+    # the following ones, to be ignored silently
+    DROPPED = "dropped"
+
+
+@dataclass
+class _Flood:
+    bucket: TokenBucket
+    refused: bool = False
+
+
+class UserRateLimiter:
+    """Per-user token buckets of `rate` tokens per second holding at most
+    `burst` tokens, for commands which cost different numbers of tokens.
+
+    Once a user runs out of tokens, their first refused command is
+    `REFUSED` and the following ones are `DROPPED` until one is allowed
+    again. The buckets of at most `max_users` users are kept, and those
+    idle long enough to be full again are forgotten, which changes
+    nothing for their users."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        *,
+        max_users: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._floods: TTLCache[int, _Flood] = TTLCache(
+            max_size=max_users, ttl_seconds=burst / rate, clock=clock
+        )
+        self._lock = Lock()
+
+    def admit(self, user_id: int, cost: float = 1) -> Admission:
+        """Take `cost` tokens (at most a full bucket) from the user's bucket."""
+        with self._lock:
+            if (flood := self._floods.get(user_id)) is None:
+                bucket = TokenBucket(self.rate, self.burst, clock=self._clock)
+                flood = _Flood(bucket)
+            # refresh the entry's TTL on every command
+            self._floods.put(user_id, flood)
+            if flood.bucket.try_acquire(min(cost, self.burst)):
+                flood.refused = False
+                return Admission.ALLOWED
+            if flood.refused:
+                return Admission.DROPPED
+            flood.refused = True
+            return Admission.REFUSED
+
+    def __len__(self) -> int:
+        return len(self._floods)
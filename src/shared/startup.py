@@ -0,0 +1,36 @@
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from loguru import logger
+
+
+class StartupReport:
+    """Times the phases of the start of the application
+    (imports, settings, wiring, ...) to be logged as one line."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._started = clock()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + self._clock() - started
+
+    @property
+    def total(self) -> float:
+        return self._clock() - self._started
+
+    def __str__(self) -> str:
+        phases = ", ".join(
+            f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()
+        )
+        return f"Started in {self.total * 1000:.0f} ms ({phases})"
+
+    def log(self):
+        logger.info(str(self))
@@ -0,0 +1,11 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.applications.async_bot.bot import OrderedAsyncTeleBot
+
+
+@pytest.fixture
+def bot_mock() -> OrderedAsyncTeleBot:
+    # its coroutine methods (e.g. send_message) are AsyncMocks
+    return MagicMock(spec=OrderedAsyncTeleBot)
@@ -0,0 +1,82 @@
+import asyncio
+from collections import defaultdict
+
+import pytest
+from telebot import types
+
+from src.applications.async_bot.bot import OrderedAsyncTeleBot
+from src.applications.bot.conversation import ConversationStore
+
+
+def _message_update(update_id: int, chat_id: int, text: str) -> types.Update:
+    update = types.Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "U"},
+                "text": text,
+            },
+        }
+    )
+    assert update is not None
+    return update
+
+
+class TestOrderedAsyncTeleBot:
+    @pytest.fixture
+    def bot(self) -> OrderedAsyncTeleBot:
+        return OrderedAsyncTeleBot("123:TEST", ConversationStore())
+
+    def test_next_step_flow_kept_in_order(
+        self, runner: asyncio.Runner, bot: OrderedAsyncTeleBot
+    ):
+        # GIVEN: a two-step flow per chat, as in /name or /join
+        answers: dict[int, list[str]] = defaultdict(list)
+
+        async def _second_step(message: types.Message):
+            answers[message.chat.id].append(f"step2:{message.text}")
+
+        @bot.message_handler(func=lambda _: True)
+        async def _first_step(message: types.Message):
+            await asyncio.sleep(0.01)  # slower than the arrival of the next message
+            answers[message.chat.id].append(f"step1:{message.text}")
+            bot.register_next_step_handler(message, _second_step)
+
+        # WHEN
+        updates = []
+        for chat_id in range(10):
+            updates.append(_message_update(2 * chat_id, chat_id, "first"))
+            updates.append(_message_update(2 * chat_id + 1, chat_id, "second"))
+        runner.run(bot.process_new_updates(updates))
+
+        # THEN
+        assert answers == {
+            chat_id: ["step1:first", "step2:second"] for chat_id in range(10)
+        }
+        assert bot.pending == 0
+
+    def test_failing_next_step_does_not_block_chat(
+        self, runner: asyncio.Runner, bot: OrderedAsyncTeleBot
+    ):
+        # GIVEN
+        handled: list[str] = []
+
+        async def _fail(message: types.Message):
+            raise ValueError("boom")
+
+        @bot.message_handler(func=lambda _: True)
+        async def _handle(message: types.Message):
+            handled.append(str(message.text))
+
+        first = _message_update(1, 42, "first")
+        assert first.message is not None
+        bot.register_next_step_handler(first.message, _fail)
+
+        # WHEN
+        runner.run(bot.process_new_updates([first, _message_update(2, 42, "second")]))
+
+        # THEN: the failing step consumed the first message only
+        assert handled == ["second"]
@@ -1,11 +1,23 @@
+import sqlite3
 from unittest import mock
 
 import pytest
 from pytest import LogCaptureFixture
 from pytest_loguru.plugin import caplog  # noqa: F401
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import create_engine
 
-from src.applications.bot.callbacks.base import Callback
-from src.shared.exceptions import UserNotFound
+from src.applications.bot.callbacks.base import Callback, in_unit_of_work
+from src.applications.bot.utils import (
+    RATE_LIMITED_MESSAGE,
+    ROOM_BUSY_MESSAGE,
+    count_sent_message,
+)
+from src.repositories.database import DatabaseRepository
+from src.services.moroz import Moroz
+from src.shared.exceptions import RoomBusy, UserNotFound
+from src.shared.rate_limit import UserRateLimiter
 
 
 class AnyCallback(Callback):
@@ -13,6 +25,22 @@ class AnyCallback(Callback):
         pass
 
 
+class BusyCallback(Callback):
+    def process(self, user, *, message):
+        raise RoomBusy("busy")
+
+    @in_unit_of_work
+    def next_step(self, message):
+        raise RoomBusy("busy")
+
+
+class StatelessCallback(Callback):
+    requires_registered_user = False
+
+    def process(self, user, *, message):
+        pass
+
+
 class TestCallback:
     @pytest.fixture(scope="function")
     def user_from_message_patched(self, user_mock):
@@ -102,3 +130,145 @@ class TestCallback:
             "You are not registered yet. Please /start to register.",
         )
         assert "User non-existent-user is not registered" in caplog.text
+
+    def test_process_wrap_room_busy(
+        self,
+        message_factory,
+        bot_mock,
+        moroz_mock,
+        user_mock,
+        user_from_message_patched,
+    ):
+        # GIVEN
+        message = message_factory()
+        moroz_mock.get_user.return_value = user_mock
+        callback = BusyCallback(bot_mock, moroz_mock)
+        # WHEN
+        callback.process_wrap(message)
+        callback.next_step(message)
+        # THEN: the user is asked to try again, twice
+        bot_mock.send_message.assert_has_calls(
+            [mock.call(message.chat.id, ROOM_BUSY_MESSAGE)] * 2
+        )
+
+    def test_process_wrap_stateless_skips_lookup(
+        self,
+        message_factory,
+        bot_mock,
+        moroz_mock,
+        user_mock,
+        user_from_message_patched,
+    ):
+        # GIVEN
+        message = message_factory(text="/help")
+        callback = StatelessCallback(bot_mock, moroz_mock)
+        # WHEN
+        with mock.patch.object(callback, "process") as process_mock:
+            callback.process_wrap(message)
+        # THEN
+        moroz_mock.get_user.assert_not_called()
+        moroz_mock.unit_of_work.assert_not_called()
+        process_mock.assert_called_once_with(user_mock, message=message)
+
+    def test_process_wrap_rate_limited(
+        self,
+        message_factory,
+        bot_mock,
+        moroz_mock,
+        user_mock,
+        user_from_message_patched,
+    ):
+        # GIVEN
+        message = message_factory(text="/me")
+        moroz_mock.get_user.return_value = user_mock
+        callback = AnyCallback(bot_mock, moroz_mock)
+        callback.rate_limiter = UserRateLimiter(rate=0.001, burst=4)
+        callback.cost = 2
+        # WHEN
+        for _ in range(5):
+            callback.process_wrap(message)
+        # THEN: two commands processed, the third answered, the others dropped
+        assert moroz_mock.get_user.call_count == 2
+        bot_mock.send_message.assert_called_once_with(
+            message.chat.id, RATE_LIMITED_MESSAGE
+        )
+
+
+class TestCallbackRetries:
+    """A command is run again after a transient database error, unless it
+    has already sent something (which would then be sent twice)."""
+
+    USER_ID = 12345
+
+    @pytest.fixture
+    def moroz(self):
+        engine = create_engine("sqlite://")
+        repo = DatabaseRepository(engine, sleep=lambda _: None)
+        repo.create_user(id=self.USER_ID, username="user", name="User")
+        yield Moroz(
+            database_repository=repo,
+            max_rooms_managed_by_user=1,
+            min_players_to_start_game=2,
+        )
+        engine.dispose()
+
+    @staticmethod
+    def _fail_next_update(moroz: Moroz):
+        """Make the next UPDATE fail as if the database were locked."""
+        failures = [sqlite3.OperationalError("database is locked")]
+
+        def _before_cursor_execute(_conn, _cursor, statement, parameters, *_):
+            if statement.startswith("UPDATE") and failures:
+                raise OperationalError(statement, parameters, failures.pop())
+
+        event.listen(
+            moroz.database_repository.engine,
+            "before_cursor_execute",
+            _before_cursor_execute,
+        )
+
+    class RenameCallback(Callback):
+        def __init__(self, *args, send_first: bool = False):
+            super().__init__(*args)
+            self.send_first = send_first
+            self.attempts = 0
+
+        def process(self, user, *, message):
+            self.attempts += 1
+            if self.send_first:
+                self.bot.send_message(user.id, "Renaming...")
+            self.moroz.update_name(user.id, "Renamed")
+            self.moroz.after_commit(lambda: self.bot.send_message(user.id, "Done"))
+
+    @pytest.fixture
+    def counting_bot_mock(self, bot_mock):
+        # as the bots of the applications do
+        bot_mock.send_message.side_effect = lambda *_, **__: count_sent_message()
+        return bot_mock
+
+    def test_retried(self, moroz: Moroz, counting_bot_mock, message_factory):
+        # GIVEN
+        self._fail_next_update(moroz)
+        callback = self.RenameCallback(counting_bot_mock, moroz)
+        # WHEN
+        callback.process_wrap(message_factory(text="/rename", chat_id=self.USER_ID))
+        # THEN
+        assert callback.attempts == 2
+        assert moroz.get_user(self.USER_ID).name == "Renamed"
+        counting_bot_mock.send_message.assert_called_once_with(self.USER_ID, "Done")
+
+    def test_not_retried_after_a_send(
+        self, moroz: Moroz, counting_bot_mock, message_factory
+    ):
+        # GIVEN
+        self._fail_next_update(moroz)
+        callback = self.RenameCallback(counting_bot_mock, moroz, send_first=True)
+        # WHEN
+        with pytest.raises(OperationalError):
+            callback.process_wrap(message_factory(text="/rename", chat_id=self.USER_ID))
+        # THEN
+        assert callback.attempts == 1
+        assert moroz.get_user(self.USER_ID).name == "User"
+        counting_bot_mock.send_message.assert_called_once_with(
+            self.USER_ID, "Renaming..."
+        )
@@ -5,7 +5,7 @@ from pytest_loguru.plugin import caplog  # noqa: F401
 
 from src.applications.bot.callbacks.create import CreateCallback
 from src.models.user import User
-from src.shared.exceptions import MaxNumberOfRoomsReached
+from src.shared.exceptions import MaxNumberOfRoomsReached, ShortCodesExhausted
 
 
 class TestCreateCallback:
@@ -57,3 +57,24 @@ class TestCreateCallback:
             "Please /manage and delete an existing room before creating a new one.",
         )
         assert "/create from this-user" in caplog.text
+
+    def test_process_short_codes_exhausted(
+        self,
+        message_factory,
+        bot_mock,
+        moroz_mock,
+        user_mock,
+        caplog: LogCaptureFixture,  # noqa: F811
+    ):
+        # GIVEN
+        message = message_factory(text="/create")
+        moroz_mock.create_room.side_effect = ShortCodesExhausted("all taken")
+        # WHEN
+        CreateCallback(bot_mock, moroz_mock).process(user_mock, message=message)
+        # THEN
+        bot_mock.send_message.assert_called_once_with(
+            user_mock.id,
+            "Could not allocate an ID for a new room right now. "
+            "Please try to /create it again later.",
+        )
+        assert "No room created for this-user: all taken" in caplog.text
@@ -1,28 +1,141 @@
+import asyncio
+import importlib
+import inspect
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, TypeVar
+from unittest.mock import MagicMock
+
 import pytest
+import telebot
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import create_engine
 
+from src.applications.async_bot.bot import OrderedAsyncTeleBot
+from src.applications.bot.broadcast import Broadcaster
 from src.models.room import Room
 from src.models.user import User
+from src.repositories.async_database import AsyncDatabaseRepository
 from src.repositories.database import DatabaseRepository
+from src.services.async_moroz import AsyncMoroz
 from src.services.moroz import Moroz
+from tests.utils import ImmediateExecutor
+
+T = TypeVar("T")
+
+
+@dataclass
+class Stack:
+    """The application a scenario runs against: "threads" (`Moroz` and
+    src/applications/bot) or "asyncio" (`AsyncMoroz` and
+    src/applications/async_bot)."""
+
+    name: str
+    runner: asyncio.Runner | None = None
+
+    def callback(self, cls: type[T]) -> type[T]:
+        """The counterpart on this stack of `cls`, a callback
+        of src/applications/bot."""
+        if self.name == "threads":
+            return cls
+        module = importlib.import_module(
+            cls.__module__.replace(".applications.bot.", ".applications.async_bot.")
+        )
+        return getattr(module, cls.__name__)
+
+    def run(self, result: Any) -> Any:
+        """The result of a call to the application, awaited on asyncio."""
+        if inspect.isawaitable(result):
+            assert self.runner is not None
+            return self.runner.run(result)  # type: ignore[arg-type]
+        return result
+
+
+class BlockingDatabaseRepository:
+    """An `AsyncDatabaseRepository` whose coroutines are run to completion,
+    so that scenarios set up and check the database as on the threads stack."""
+
+    def __init__(self, repository: AsyncDatabaseRepository, runner: asyncio.Runner):
+        self.repository = repository
+        self.runner = runner
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.repository, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+        return lambda *args, **kwargs: self.runner.run(attribute(*args, **kwargs))
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[None]:
+        # the runner runs every coroutine in one context,
+        # so the calls run in between join the unit of work
+        unit_of_work = self.repository.unit_of_work()
+        self.runner.run(unit_of_work.__aenter__())
+        try:
+            yield
+        except BaseException as e:
+            if not self.runner.run(unit_of_work.__aexit__(type(e), e, e.__traceback__)):
+                raise
+        else:
+            self.runner.run(unit_of_work.__aexit__(None, None, None))
+
+
+@pytest.fixture(params=["threads", "asyncio"])
+def stack(request) -> Stack:
+    if request.param == "threads":
+        return Stack("threads")
+    return Stack("asyncio", request.getfixturevalue("runner"))
+
+
+@pytest.fixture
+def bot_mock(stack: Stack) -> Iterator[MagicMock]:
+    if stack.name == "threads":
+        yield MagicMock(spec=telebot.TeleBot)
+        return
+    # its coroutine methods (e.g. send_message) are AsyncMocks
+    bot_mock = MagicMock(spec=OrderedAsyncTeleBot)
+    yield bot_mock
+    assert bot_mock.send_message.await_count == bot_mock.send_message.call_count
+
+
+@pytest.fixture
+def broadcaster(stack: Stack, bot_mock: MagicMock) -> Broadcaster | None:
+    """A `Broadcaster` delivering on the handler's thread, so that scenarios
+    can check its messages right away (the asyncio one is awaited)."""
+    if stack.name == "threads":
+        return Broadcaster(bot_mock, executor=ImmediateExecutor())
+    return None
 
 
 @pytest.fixture(scope="function")
-def database_repo():
-    engine = create_engine("sqlite:///:memory:", echo=False)
-    repo = DatabaseRepository(engine)
-    yield repo
-    engine.dispose()
+def database_repo(stack: Stack):
+    if stack.name == "threads":
+        engine = create_engine("sqlite:///:memory:", echo=False)
+        yield DatabaseRepository(engine)
+        engine.dispose()
+        return
+    assert stack.runner is not None
+    async_engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    repo = AsyncDatabaseRepository(async_engine)
+    stack.runner.run(repo.migrate())
+    yield BlockingDatabaseRepository(repo, stack.runner)
+    stack.runner.run(async_engine.dispose())
 
 
 @pytest.fixture(scope="function")
-def moroz_integrated(database_repo):
-    app = Moroz(
-        database_repository=database_repo,
+def moroz_integrated(stack: Stack, database_repo):
+    if stack.name == "threads":
+        return Moroz(
+            database_repository=database_repo,
+            max_rooms_managed_by_user=2,
+            min_players_to_start_game=3,
+        )
+    return AsyncMoroz(
+        database_repository=database_repo.repository,
         max_rooms_managed_by_user=2,
         min_players_to_start_game=3,
     )
-    return app
 
 
 @pytest.fixture
@@ -5,14 +5,18 @@ import pytest
 from pytest_loguru.plugin import caplog  # noqa: F401
 
 from src.applications.bot.app import BotApp
+from src.applications.bot.utils import BuildInfo
 from tests.utils import Regex
 
+# about the threads application only
+pytestmark = pytest.mark.parametrize("stack", ["threads"], indirect=True)
+
 
 class TestBotStarted:
     @pytest.fixture
     def bot_app(self, bot_mock, moroz_integrated) -> BotApp:
         with mock.patch(
-            "src.applications.bot.app.telebot.TeleBot", return_value=bot_mock
+            "src.applications.bot.app.OrderedTeleBot", return_value=bot_mock
         ):
             bot_app = BotApp(api_token="TEST_TOKEN", moroz=moroz_integrated)
         return bot_app
@@ -68,3 +72,23 @@ class TestBotStarted:
         )
         assert "Bot started" in caplog.text
         assert "Bot stopped" in caplog.text
+
+    def test_notify_admin_with_build_info(
+        self,
+        bot_app: BotApp,
+        bot_mock,
+    ):
+        # GIVEN
+        bot_app.moroz.admin_user_id = 99999
+        build_info = BuildInfo("main", "abc1234", "Release")
+        # WHEN
+        with mock.patch(
+            "src.applications.bot.app.get_build_info", return_value=build_info
+        ):
+            bot_app.run()
+        # THEN
+        bot_mock.send_message.assert_any_call(
+            99999,
+            "Bot has just started.\n\n"
+            "Branch: main\nCommit: abc1234\nMessage: Release",
+        )
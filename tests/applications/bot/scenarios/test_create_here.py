@@ -14,15 +14,16 @@ from tests.utils import Regex
 
 class TestCreateHereCallback:
     @pytest.fixture
-    def here_callback(self, bot_mock, moroz_integrated) -> HereCallback:
-        return HereCallback(bot=bot_mock, moroz=moroz_integrated)
+    def here_callback(self, stack, bot_mock, moroz_integrated) -> HereCallback:
+        return stack.callback(HereCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     @pytest.fixture
-    def create_callback(self, bot_mock, moroz_integrated) -> CreateCallback:
-        return CreateCallback(bot=bot_mock, moroz=moroz_integrated)
+    def create_callback(self, stack, bot_mock, moroz_integrated) -> CreateCallback:
+        return stack.callback(CreateCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_join_just_created_room_success(
         self,
+        stack,
         create_callback: CreateCallback,
         here_callback: HereCallback,
         database_repo: DatabaseRepository,
@@ -35,14 +36,14 @@ class TestCreateHereCallback:
         travelling_to = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
         user = database_repo.create_user(id=501, username="creator", name="Creator")
         with time_machine.travel(travelling_to, tick=False):
-            create_callback.process(user, message=message_factory("/create"))
+            stack.run(create_callback.process(user, message=message_factory("/create")))
 
         # WHEN
         with time_machine.travel(
             travelling_to + timedelta(seconds=ALLOW_HERE_CONTEXT_SECONDS - 1),
             tick=False,
         ):
-            here_callback.process(user, message=message_factory("/here"))
+            stack.run(here_callback.process(user, message=message_factory("/here")))
 
         # THEN
         bot_mock.send_message.assert_has_calls(
@@ -59,6 +60,7 @@ class TestCreateHereCallback:
 
     def test_join_just_created_room_too_late(
         self,
+        stack,
         create_callback: CreateCallback,
         here_callback: HereCallback,
         database_repo: DatabaseRepository,
@@ -69,14 +71,14 @@ class TestCreateHereCallback:
         travelling_to = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
         user = database_repo.create_user(id=501, username="creator", name="Creator")
         with time_machine.travel(travelling_to, tick=False):
-            create_callback.process(user, message=message_factory("/create"))
+            stack.run(create_callback.process(user, message=message_factory("/create")))
 
         # WHEN
         with time_machine.travel(
             travelling_to + timedelta(seconds=ALLOW_HERE_CONTEXT_SECONDS + 1),
             tick=False,
         ):
-            here_callback.process(user, message=message_factory("/here"))
+            stack.run(here_callback.process(user, message=message_factory("/here")))
 
         # THEN
         user = database_repo.get_user(user.id)
@@ -98,6 +100,7 @@ class TestCreateHereCallback:
 
     def test_join_just_created_room_already_in_room(
         self,
+        stack,
         create_callback: CreateCallback,
         here_callback: HereCallback,
         database_repo: DatabaseRepository,
@@ -109,7 +112,7 @@ class TestCreateHereCallback:
         travelling_to = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
         user = database_repo.create_user(id=501, username="creator", name="Creator")
         with time_machine.travel(travelling_to, tick=False):
-            create_callback.process(user, message=message_factory("/create"))
+            stack.run(create_callback.process(user, message=message_factory("/create")))
         another_room = database_repo.create_room(created_by_user_id=user.id)
         database_repo.join_room(user.id, another_room.id)
         user = database_repo.get_user(user.id)
@@ -119,7 +122,7 @@ class TestCreateHereCallback:
             travelling_to + timedelta(seconds=ALLOW_HERE_CONTEXT_SECONDS - 1),
             tick=False,
         ):
-            here_callback.process(user, message=message_factory("/here"))
+            stack.run(here_callback.process(user, message=message_factory("/here")))
 
         # THEN
         user = database_repo.get_user(user.id)
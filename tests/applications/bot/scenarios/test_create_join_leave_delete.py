@@ -41,19 +41,20 @@ class TestCreateJoinLeaveDelete:
     """
 
     @pytest.fixture
-    def create_callback(self, bot_mock, moroz_integrated) -> CreateCallback:
-        return CreateCallback(bot=bot_mock, moroz=moroz_integrated)
+    def create_callback(self, stack, bot_mock, moroz_integrated) -> CreateCallback:
+        return stack.callback(CreateCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     @pytest.fixture
-    def join_callback(self, bot_mock, moroz_integrated) -> JoinCallback:
-        return JoinCallback(bot=bot_mock, moroz=moroz_integrated)
+    def join_callback(self, stack, bot_mock, moroz_integrated) -> JoinCallback:
+        return stack.callback(JoinCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     @pytest.fixture
-    def leave_callback(self, bot_mock, moroz_integrated) -> LeaveCallback:
-        return LeaveCallback(bot=bot_mock, moroz=moroz_integrated)
+    def leave_callback(self, stack, bot_mock, moroz_integrated) -> LeaveCallback:
+        return stack.callback(LeaveCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_create_join_leave(
         self,
+        stack,
         create_callback: CreateCallback,
         join_callback: JoinCallback,
         leave_callback: LeaveCallback,
@@ -69,7 +70,7 @@ class TestCreateJoinLeaveDelete:
         managed_rooms_init = database_repo.get_rooms_managed_by_user(user_mock.id)
 
         # WHEN Create
-        create_callback.process(user_mock, message=create_message)
+        stack.run(create_callback.process(user_mock, message=create_message))
 
         # THEN Create
         managed_rooms = database_repo.get_rooms_managed_by_user(user_mock.id)
@@ -86,7 +87,7 @@ class TestCreateJoinLeaveDelete:
         # WHEN Join (initiated)
         join_message = message_factory(text="/join")
         this_user = database_repo.get_user(user_mock.id)
-        join_callback.process(this_user, message=join_message)
+        stack.run(join_callback.process(this_user, message=join_message))
 
         # THEN Join
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
@@ -98,7 +99,7 @@ class TestCreateJoinLeaveDelete:
 
         # WHEN Join (room code entered)
         answer_message = message_factory(text=created_room.display_short_code)
-        callback_fn(answer_message, user=this_user)
+        stack.run(callback_fn(answer_message, user=this_user))
 
         # THEN Join
         assert "joining room with code" in caplog.text
@@ -114,7 +115,7 @@ class TestCreateJoinLeaveDelete:
         # WHEN Leave
         leave_message = message_factory(text="/leave")
         this_user = database_repo.get_user(user_mock.id)
-        leave_callback.process(this_user, message=leave_message)
+        stack.run(leave_callback.process(this_user, message=leave_message))
 
         # THEN Leave
         successful_leave_call = mock.call(
@@ -23,11 +23,12 @@ class TestCreateReachLimit:
     """
 
     @pytest.fixture
-    def callback(self, bot_mock, moroz_integrated) -> CreateCallback:
-        return CreateCallback(bot=bot_mock, moroz=moroz_integrated)
+    def callback(self, stack, bot_mock, moroz_integrated) -> CreateCallback:
+        return stack.callback(CreateCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_create_room_success(
         self,
+        stack,
         callback: CreateCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -40,7 +41,7 @@ class TestCreateReachLimit:
         )
         message = message_factory(text="/create")
         # WHEN
-        callback.process(user, message=message)
+        stack.run(callback.process(user, message=message))
         # THEN
         managed_rooms = database_repo.get_rooms_managed_by_user(user.id)
         assert len(managed_rooms) == 1
@@ -53,6 +54,7 @@ class TestCreateReachLimit:
 
     def test_create_room_max_reached(
         self,
+        stack,
         callback: CreateCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -69,18 +71,18 @@ class TestCreateReachLimit:
         )
 
         # WHEN / THEN
-        callback.process(user, message=message)
+        stack.run(callback.process(user, message=message))
         managed_rooms = database_repo.get_rooms_managed_by_user(user.id)
         assert len(managed_rooms) == 1
         assert _on_not_created_log_part not in caplog.text
 
-        callback.process(user, message=message)
+        stack.run(callback.process(user, message=message))
         managed_rooms = database_repo.get_rooms_managed_by_user(user.id)
         assert len(managed_rooms) == 2
         assert _on_not_created_log_part not in caplog.text
         assert "Room created" in caplog.text
 
-        callback.process(user, message=message)
+        stack.run(callback.process(user, message=message))
         managed_rooms = database_repo.get_rooms_managed_by_user(user.id)
         assert len(managed_rooms) == 2
         assert _on_not_created_log_part in caplog.text
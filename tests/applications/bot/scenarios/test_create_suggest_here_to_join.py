@@ -23,11 +23,12 @@ class TestCreateSuggestHereToJoin:
     """
 
     @pytest.fixture
-    def callback(self, bot_mock, moroz_integrated) -> CreateCallback:
-        return CreateCallback(bot=bot_mock, moroz=moroz_integrated)
+    def callback(self, stack, bot_mock, moroz_integrated) -> CreateCallback:
+        return stack.callback(CreateCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_create_room_suggest_here_to_join(
         self,
+        stack,
         callback: CreateCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -40,7 +41,7 @@ class TestCreateSuggestHereToJoin:
         )
         message = message_factory(text="/create")
         # WHEN
-        callback.process(user, message=message)
+        stack.run(callback.process(user, message=message))
         # THEN
         bot_mock.send_message.assert_called_once_with(
             user.id,
@@ -51,6 +52,7 @@ class TestCreateSuggestHereToJoin:
 
     def test_create_room_no_suggest_here(
         self,
+        stack,
         callback: CreateCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -64,7 +66,7 @@ class TestCreateSuggestHereToJoin:
         message = message_factory(text="/create")
         manager = database_repo.get_user(manager.id)
         # WHEN
-        callback.process(manager, message=message)
+        stack.run(callback.process(manager, message=message))
         # THEN
         bot_mock.send_message.assert_called_once_with(
             manager.id,
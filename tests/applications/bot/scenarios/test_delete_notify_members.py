@@ -1,6 +1,8 @@
+import re
 from unittest import mock
 
 import pytest
+from telebot.apihelper import ApiTelegramException
 
 from src.applications.bot.callbacks.management.delete import DeleteCallback
 from src.models.room import Room
@@ -23,11 +25,16 @@ class TestRoomDeletedNotifyMembers:
     """
 
     @pytest.fixture
-    def delete_callback(self, bot_mock, moroz_integrated) -> DeleteCallback:
-        return DeleteCallback(bot=bot_mock, moroz=moroz_integrated)
+    def delete_callback(
+        self, stack, bot_mock, moroz_integrated, broadcaster
+    ) -> DeleteCallback:
+        return stack.callback(DeleteCallback)(
+            bot=bot_mock, moroz=moroz_integrated, broadcaster=broadcaster
+        )
 
     def test_delete_notify_members(
         self,
+        stack,
         delete_callback: DeleteCallback,
         create_manager_room: tuple[User, Room],
         database_repo: DatabaseRepository,
@@ -43,7 +50,7 @@ class TestRoomDeletedNotifyMembers:
 
         # WHEN
         manager = database_repo.get_user(manager.id)
-        delete_callback.process_management(manager, room)
+        stack.run(delete_callback.process_management(manager, room))
 
         # THEN
         with pytest.raises(RoomNotFound):
@@ -68,3 +75,45 @@ class TestRoomDeletedNotifyMembers:
         )
         bot_mock.send_message.assert_has_calls(calls, any_order=True)
         assert bot_mock.send_message.call_count == 3
+
+    def test_delete_reports_undelivered_to_manager(
+        self,
+        stack,
+        delete_callback: DeleteCallback,
+        create_manager_room: tuple[User, Room],
+        database_repo: DatabaseRepository,
+        bot_mock,
+    ):
+        # GIVEN: member2 has blocked the bot
+        manager, room = create_manager_room
+        member1 = database_repo.create_user(id=202, username="member1", name="Member1")
+        member2 = database_repo.create_user(id=203, username="member2", name="Member2")
+        database_repo.join_room(user_id=member1.id, room_id=room.id)
+        database_repo.join_room(user_id=member2.id, room_id=room.id)
+
+        def _send_message(chat_id, *_args, **_kwargs):
+            if chat_id == member2.id:
+                raise ApiTelegramException(
+                    "sendMessage",
+                    None,
+                    {"error_code": 403, "description": "Forbidden: bot was blocked"},
+                )
+
+        bot_mock.send_message.side_effect = _send_message
+
+        # WHEN
+        manager = database_repo.get_user(manager.id)
+        with database_repo.unit_of_work():
+            stack.run(delete_callback.process_management(manager, room))
+            # THEN: nobody is notified before the deletion is committed
+            bot_mock.send_message.assert_not_called()
+
+        bot_mock.send_message.assert_called_with(
+            manager.id,
+            Regex(
+                r"Room.+deleted successfully.+Could not notify 1 of 2 players"
+                r".+Member2 \(@member2\)\.",
+                re.DOTALL,
+            ),
+            reply_markup=mock.ANY,
+        )
@@ -13,11 +13,12 @@ from tests.utils import Regex
 
 class TestGetRoomInformation:
     @pytest.fixture
-    def info_callback(self, bot_mock, moroz_integrated) -> InfoCallback:
-        return InfoCallback(bot=bot_mock, moroz=moroz_integrated)
+    def info_callback(self, stack, bot_mock, moroz_integrated) -> InfoCallback:
+        return stack.callback(InfoCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_empty_room(
         self,
+        stack,
         info_callback: InfoCallback,
         bot_mock,
         create_manager_room: tuple[User, Room],
@@ -26,7 +27,7 @@ class TestGetRoomInformation:
         manager, room = create_manager_room
 
         # WHEN
-        info_callback.process_management(manager, room)
+        stack.run(info_callback.process_management(manager, room))
 
         # assert: bot was called once with the correct user and message
         bot_mock.send_message.assert_called_once_with(
@@ -40,6 +41,7 @@ class TestGetRoomInformation:
 
     def test_room_with_participants_not_started(
         self,
+        stack,
         info_callback: InfoCallback,
         database_repo: DatabaseRepository,
         bot_mock,
@@ -57,7 +59,7 @@ class TestGetRoomInformation:
         database_repo.join_room(user_id=participant2.id, room_id=room.id)
 
         # WHEN
-        info_callback.process_management(manager, room)
+        stack.run(info_callback.process_management(manager, room))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -71,6 +73,7 @@ class TestGetRoomInformation:
 
     def test_room_with_participants_started(
         self,
+        stack,
         info_callback: InfoCallback,
         database_repo: DatabaseRepository,
         bot_mock,
@@ -87,7 +90,7 @@ class TestGetRoomInformation:
         room = database_repo.get_room(room.id)
 
         # WHEN
-        info_callback.process_management(manager, room)
+        stack.run(info_callback.process_management(manager, room))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -101,6 +104,7 @@ class TestGetRoomInformation:
 
     def test_room_with_participants_completed(
         self,
+        stack,
         info_callback: InfoCallback,
         database_repo: DatabaseRepository,
         bot_mock,
@@ -118,7 +122,7 @@ class TestGetRoomInformation:
         room = database_repo.get_room(room.id)
 
         # WHEN
-        info_callback.process_management(manager, room)
+        stack.run(info_callback.process_management(manager, room))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
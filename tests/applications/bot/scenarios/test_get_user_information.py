@@ -12,11 +12,12 @@ from tests.utils import Regex
 
 class TestGetUserInformation:
     @pytest.fixture
-    def me_callback(self, bot_mock, moroz_integrated) -> MeCallback:
-        return MeCallback(bot=bot_mock, moroz=moroz_integrated)
+    def me_callback(self, stack, bot_mock, moroz_integrated) -> MeCallback:
+        return stack.callback(MeCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_user_not_in_any_room_and_not_manager(
         self,
+        stack,
         me_callback: MeCallback,
         bot_mock,
         message_factory,
@@ -31,7 +32,7 @@ class TestGetUserInformation:
         user = database_repo.get_user(user.id)
 
         # WHEN
-        me_callback.process(user, message=message_factory())
+        stack.run(me_callback.process(user, message=message_factory()))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -44,6 +45,7 @@ class TestGetUserInformation:
 
     def test_user_manages_active_room_but_not_in_any_room(
         self,
+        stack,
         me_callback: MeCallback,
         bot_mock,
         message_factory,
@@ -54,7 +56,7 @@ class TestGetUserInformation:
         manager, _ = create_manager_room
 
         # WHEN
-        me_callback.process(manager, message=message_factory())
+        stack.run(me_callback.process(manager, message=message_factory()))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -68,6 +70,7 @@ class TestGetUserInformation:
 
     def test_user_in_room_but_not_manager(
         self,
+        stack,
         me_callback: MeCallback,
         bot_mock,
         database_repo: DatabaseRepository,
@@ -86,7 +89,7 @@ class TestGetUserInformation:
         room = database_repo.get_room(room.id)
 
         # WHEN
-        me_callback.process(participant, message=message_factory())
+        stack.run(me_callback.process(participant, message=message_factory()))
 
         # THEN:
         # - no "Status: not in any room."
@@ -101,6 +104,7 @@ class TestGetUserInformation:
 
     def test_two_managers_in_each_others_rooms(
         self,
+        stack,
         me_callback: MeCallback,
         bot_mock,
         database_repo: DatabaseRepository,
@@ -123,8 +127,8 @@ class TestGetUserInformation:
         manager2 = database_repo.get_user(manager2.id)
 
         # WHEN
-        me_callback.process(manager1, message=message_factory())
-        me_callback.process(manager2, message=message_factory())
+        stack.run(me_callback.process(manager1, message=message_factory()))
+        stack.run(me_callback.process(manager2, message=message_factory()))
 
         # THEN
         bot_mock.send_message.assert_has_calls(
@@ -154,6 +158,7 @@ class TestGetUserInformation:
 
     def test_display_target_in_started_game(
         self,
+        stack,
         me_callback: MeCallback,
         bot_mock,
         database_repo: DatabaseRepository,
@@ -172,7 +177,7 @@ class TestGetUserInformation:
         room = database_repo.get_room(room.id)
 
         # WHEN
-        me_callback.process(p1, message=message_factory())
+        stack.run(me_callback.process(p1, message=message_factory()))
 
         # THEN ("Your target is: ..." not included in the message)
         bot_mock.send_message.assert_called_once_with(
@@ -185,9 +190,9 @@ class TestGetUserInformation:
 
         # WHEN
         bot_mock.reset_mock()
-        me_callback.moroz.start_game_in_room(room.id)  # start game
-        me_callback.process(p1, message=message_factory())
-        me_callback.process(manager, message=message_factory())
+        stack.run(me_callback.moroz.start_game_in_room(room.id))  # start game
+        stack.run(me_callback.process(p1, message=message_factory()))
+        stack.run(me_callback.process(manager, message=message_factory()))
 
         # THEN: includes "Your target is: ..."
         bot_mock.send_message.assert_has_calls(
@@ -6,11 +6,12 @@ from src.repositories.database import DatabaseRepository
 
 class TestHelpCallback:
     @pytest.fixture
-    def help_callback(self, bot_mock, moroz_integrated) -> HelpCallback:
-        return HelpCallback(bot=bot_mock, moroz=moroz_integrated)
+    def help_callback(self, stack, bot_mock, moroz_integrated) -> HelpCallback:
+        return stack.callback(HelpCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_help_message_sent(
         self,
+        stack,
         help_callback: HelpCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -19,7 +20,7 @@ class TestHelpCallback:
         # GIVEN
         user = database_repo.create_user(id=101, username="helpuser", name="Help User")
         # WHEN
-        help_callback.process(user, message=message_factory("/help"))
+        stack.run(help_callback.process(user, message=message_factory("/help")))
         # THEN
         help_text = bot_mock.send_message.call_args.args[1]
         for cmd in [
@@ -38,6 +39,7 @@ class TestHelpCallback:
 
     def test_help_message_admin_username(
         self,
+        stack,
         help_callback: HelpCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -49,13 +51,14 @@ class TestHelpCallback:
         )
         help_callback.moroz.admin_username = "adminuser"
         # WHEN
-        help_callback.process(user, message=message_factory("/help"))
+        stack.run(help_callback.process(user, message=message_factory("/help")))
         # THEN
         help_text = bot_mock.send_message.call_args.args[1]
         assert "share feedback with me: @adminuser" in help_text
 
     def test_help_message_admin_name_and_username(
         self,
+        stack,
         help_callback: HelpCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -68,7 +71,7 @@ class TestHelpCallback:
         help_callback.moroz.admin_name = "Admin Name"
         help_callback.moroz.admin_username = "adminuser"
         # WHEN
-        help_callback.process(user, message=message_factory("/help"))
+        stack.run(help_callback.process(user, message=message_factory("/help")))
         # THEN
         help_text = bot_mock.send_message.call_args.args[1]
         assert "share feedback with me: Admin Name (@adminuser)" in help_text
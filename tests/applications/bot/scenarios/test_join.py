@@ -29,11 +29,12 @@ class TestJoinRoom:
     """
 
     @pytest.fixture
-    def join_callback(self, bot_mock, moroz_integrated) -> JoinCallback:
-        return JoinCallback(bot=bot_mock, moroz=moroz_integrated)
+    def join_callback(self, stack, bot_mock, moroz_integrated) -> JoinCallback:
+        return stack.callback(JoinCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_join_ok(
         self,
+        stack,
         join_callback: JoinCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -46,7 +47,7 @@ class TestJoinRoom:
         message = message_factory(text="/join")
 
         # WHEN (user initiates join)
-        join_callback.process(this_user, message=message)
+        stack.run(join_callback.process(this_user, message=message))
 
         # THEN
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
@@ -54,7 +55,7 @@ class TestJoinRoom:
 
         # WHEN (user enters room code)
         answer_message = message_factory(text=created_room.display_short_code)
-        callback_fn(answer_message, user=this_user)
+        stack.run(callback_fn(answer_message, user=this_user))
 
         # THEN
         assert "joining room with code" in caplog.text
@@ -73,6 +74,7 @@ class TestJoinRoom:
 
     def test_join_invalid_code_format(
         self,
+        stack,
         join_callback: JoinCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -86,7 +88,7 @@ class TestJoinRoom:
         message = message_factory(text="/join")
 
         # WHEN (user initiates join)
-        join_callback.process(this_user, message=message)
+        stack.run(join_callback.process(this_user, message=message))
 
         # THEN
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
@@ -94,7 +96,7 @@ class TestJoinRoom:
 
         # WHEN (user enters invalid room code)
         answer_message = message_factory(text="invalid-code")
-        callback_fn(answer_message, user=this_user)
+        stack.run(callback_fn(answer_message, user=this_user))
 
         # THEN
         assert "Invalid room ID format entered" in caplog.text
@@ -106,6 +108,7 @@ class TestJoinRoom:
 
     def test_join_room_not_found(
         self,
+        stack,
         join_callback: JoinCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -119,7 +122,7 @@ class TestJoinRoom:
         message = message_factory(text="/join")
 
         # WHEN (user initiates join)
-        join_callback.process(this_user, message=message)
+        stack.run(join_callback.process(this_user, message=message))
 
         # THEN
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
@@ -128,7 +131,7 @@ class TestJoinRoom:
         # WHEN (user enters non-existing room code)
         non_existing_code = f"{(created_room.short_code + 1) % 10000:04d}"
         answer_message = message_factory(text=non_existing_code)
-        callback_fn(answer_message, user=this_user)
+        stack.run(callback_fn(answer_message, user=this_user))
 
         # THEN
         assert bot_mock.send_message.call_count == 2
@@ -28,15 +28,16 @@ class TestJoinLeaveNotifyManager:
     """
 
     @pytest.fixture
-    def join_callback(self, bot_mock, moroz_integrated) -> JoinCallback:
-        return JoinCallback(bot=bot_mock, moroz=moroz_integrated)
+    def join_callback(self, stack, bot_mock, moroz_integrated) -> JoinCallback:
+        return stack.callback(JoinCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     @pytest.fixture
-    def leave_callback(self, bot_mock, moroz_integrated) -> LeaveCallback:
-        return LeaveCallback(bot=bot_mock, moroz=moroz_integrated)
+    def leave_callback(self, stack, bot_mock, moroz_integrated) -> LeaveCallback:
+        return stack.callback(LeaveCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_leave_without_joining(
         self,
+        stack,
         leave_callback: LeaveCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -46,7 +47,7 @@ class TestJoinLeaveNotifyManager:
         user = database_repo.create_user(id=303, username="leaver", name="Leaver")
         message = message_factory(text="/leave", chat_id=user.id)
         # WHEN
-        leave_callback.process(user, message=message)
+        stack.run(leave_callback.process(user, message=message))
         # THEN
         bot_mock.send_message.assert_called_once_with(
             user.id,
@@ -55,6 +56,7 @@ class TestJoinLeaveNotifyManager:
 
     def test_join_leave_notify_manager(
         self,
+        stack,
         join_callback: JoinCallback,
         create_manager_room: tuple[User, Room],
         leave_callback: LeaveCallback,
@@ -70,7 +72,7 @@ class TestJoinLeaveNotifyManager:
 
         # WHEN
         joiner_user = database_repo.get_user(joiner.id)
-        join_callback.process(joiner_user, message=message)
+        stack.run(join_callback.process(joiner_user, message=message))
 
         # THEN
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
@@ -80,7 +82,7 @@ class TestJoinLeaveNotifyManager:
         answer_message = message_factory(
             text=room.display_short_code, chat_id=joiner.id
         )
-        callback_fn(answer_message, user=joiner_user)
+        stack.run(callback_fn(answer_message, user=joiner_user))
 
         # THEN
         users_in_room = database_repo.get_users_in_room(room.id)
@@ -90,7 +92,7 @@ class TestJoinLeaveNotifyManager:
 
         # WHEN (the joiner leaves the room)
         leave_message = message_factory(text="/leave", chat_id=joiner.id)
-        leave_callback.process(joiner_user, message=leave_message)
+        stack.run(leave_callback.process(joiner_user, message=leave_message))
 
         # THEN
         users_in_room = database_repo.get_users_in_room(room.id)
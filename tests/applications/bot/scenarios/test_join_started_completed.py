@@ -20,11 +20,12 @@ class TestJoinStartedCompletedGame:
     """
 
     @pytest.fixture
-    def join_callback(self, bot_mock, moroz_integrated) -> JoinCallback:
-        return JoinCallback(bot=bot_mock, moroz=moroz_integrated)
+    def join_callback(self, stack, bot_mock, moroz_integrated) -> JoinCallback:
+        return stack.callback(JoinCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_join_started_game(
         self,
+        stack,
         join_callback: JoinCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -38,9 +39,11 @@ class TestJoinStartedCompletedGame:
 
         # WHEN
         this_user = database_repo.get_user(this_user.id)
-        join_callback._handle_room_code_entered(
-            message=code_chosen_msg,
-            user=this_user,
+        stack.run(
+            join_callback._handle_room_code_entered(
+                message=code_chosen_msg,
+                user=this_user,
+            )
         )
 
         # THEN
@@ -51,6 +54,7 @@ class TestJoinStartedCompletedGame:
 
     def test_join_completed_game(
         self,
+        stack,
         join_callback: JoinCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -66,9 +70,11 @@ class TestJoinStartedCompletedGame:
 
         # WHEN
         this_user = database_repo.get_user(this_user.id)
-        join_callback._handle_room_code_entered(
-            message=code_chosen_msg,
-            user=this_user,
+        stack.run(
+            join_callback._handle_room_code_entered(
+                message=code_chosen_msg,
+                user=this_user,
+            )
         )
 
         # THEN
@@ -30,8 +30,8 @@ class TestKickPlayer:
     """
 
     @pytest.fixture
-    def kick_callback(self, bot_mock, moroz_integrated) -> KickCallback:
-        return KickCallback(bot=bot_mock, moroz=moroz_integrated)
+    def kick_callback(self, stack, bot_mock, moroz_integrated) -> KickCallback:
+        return stack.callback(KickCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     @pytest.fixture
     def create_manager_member_room(
@@ -56,6 +56,7 @@ class TestKickPlayer:
 
     def test_kick_player_success(
         self,
+        stack,
         kick_callback: KickCallback,
         create_manager_member_room: tuple[User, User, Room],
         database_repo: DatabaseRepository,
@@ -67,7 +68,7 @@ class TestKickPlayer:
         manager, member, room = create_manager_member_room
 
         # WHEN (manager initiates kick)
-        kick_callback.process_management(manager, room)
+        stack.run(kick_callback.process_management(manager, room))
 
         # THEN – a next step handler is registered
         _, (_, callback_fn), kwargs = bot_mock.register_next_step_handler.mock_calls[0]
@@ -75,7 +76,7 @@ class TestKickPlayer:
 
         # WHEN (manager selects the member to kick)
         answer_message = message_factory(text=member.formal_display_name)
-        callback_fn(answer_message, **kwargs)
+        stack.run(callback_fn(answer_message, **kwargs))
 
         # THEN – logs contain kicking info
         assert "kicking" in caplog.text
@@ -106,6 +107,7 @@ class TestKickPlayer:
 
     def test_kick_no_players_in_room(
         self,
+        stack,
         kick_callback: KickCallback,
         database_repo: DatabaseRepository,
         create_manager_room: tuple[User, Room],
@@ -115,7 +117,7 @@ class TestKickPlayer:
         # GIVEN: manager + room with no players returned by moroz
         manager, room = create_manager_room
         # WHEN
-        kick_callback.process_management(manager, room)
+        stack.run(kick_callback.process_management(manager, room))
         # THEN
         bot_mock.send_message.assert_called_with(
             manager.id,
@@ -126,6 +128,7 @@ class TestKickPlayer:
 
     def test_kick_cancel_selection(
         self,
+        stack,
         kick_callback: KickCallback,
         create_manager_member_room: tuple[User, User, Room],
         bot_mock,
@@ -136,12 +139,12 @@ class TestKickPlayer:
         manager, _, room = create_manager_member_room
 
         # manager initiates kick to register handler
-        kick_callback.process_management(manager, room)
+        stack.run(kick_callback.process_management(manager, room))
         _, (_, callback_fn), kwargs = bot_mock.register_next_step_handler.mock_calls[0]
 
         # WHEN – manager presses "Cancel"
         cancel_message = message_factory(text="Cancel")
-        callback_fn(cancel_message, **kwargs)
+        stack.run(callback_fn(cancel_message, **kwargs))
 
         # THEN
         bot_mock.send_message.assert_called_with(
@@ -153,6 +156,7 @@ class TestKickPlayer:
 
     def test_kick_invalid_selection(
         self,
+        stack,
         kick_callback: KickCallback,
         create_manager_member_room: tuple[User, User, Room],
         bot_mock,
@@ -167,11 +171,13 @@ class TestKickPlayer:
         message = message_factory(text=invalid_choice)
 
         # WHEN – manager selects something not in player_repr_to_id
-        kick_callback._handle_player_selected(
-            message,
-            user=manager,
-            room=room,
-            player_repr_to_id=player_repr_to_id,
+        stack.run(
+            kick_callback._handle_player_selected(
+                message,
+                user=manager,
+                room=room,
+                player_repr_to_id=player_repr_to_id,
+            )
         )
 
         # THEN
@@ -185,6 +191,7 @@ class TestKickPlayer:
 
     def test_kick_player_already_not_in_room(
         self,
+        stack,
         kick_callback: KickCallback,
         create_manager_member_room: tuple[User, User, Room],
         database_repo: DatabaseRepository,
@@ -200,11 +207,13 @@ class TestKickPlayer:
         message = message_factory(text=member.formal_display_name)
 
         # WHEN – manager tries to kick a player already not in room
-        kick_callback._handle_player_selected(
-            message,
-            user=manager,
-            room=room,
-            player_repr_to_id=player_repr_to_id,
+        stack.run(
+            kick_callback._handle_player_selected(
+                message,
+                user=manager,
+                room=room,
+                player_repr_to_id=player_repr_to_id,
+            )
         )
 
         # THEN – manager is informed
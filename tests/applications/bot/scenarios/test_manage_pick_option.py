@@ -20,18 +20,23 @@ class TestManagePickOption:
     """Manager manages the room."""
 
     @pytest.fixture
-    def manage_callback(self, bot_mock, moroz_integrated) -> ManageCallback:
-        return ManageCallback(bot=bot_mock, moroz=moroz_integrated)
+    def manage_callback(
+        self, stack, bot_mock, moroz_integrated, broadcaster
+    ) -> ManageCallback:
+        return stack.callback(ManageCallback)(
+            bot=bot_mock, moroz=moroz_integrated, broadcaster=broadcaster
+        )
 
     @pytest.fixture
-    def get_keyboard_patch(self):
+    def get_keyboard_patch(self, stack):
         with mock.patch(
-            "src.applications.bot.callbacks.management.manage.get_keyboard"
+            f"{stack.callback(ManageCallback).__module__}.get_keyboard"
         ) as get_keyboard_mock:
             yield get_keyboard_mock
 
     def test_manage_non_manager_tries_to_manage(
         self,
+        stack,
         manage_callback: ManageCallback,
         database_repo: DatabaseRepository,
         message_factory,
@@ -45,7 +50,7 @@ class TestManagePickOption:
             id=123, username="otheruser", name="Other"
         )
         # WHEN
-        manage_callback.process(some_other_user, message=message)
+        stack.run(manage_callback.process(some_other_user, message=message))
         # THEN
         bot_mock.send_message.assert_called_once_with(
             some_other_user.id,
@@ -54,6 +59,7 @@ class TestManagePickOption:
 
     def test_manage_no_active_rooms_suggest_history(
         self,
+        stack,
         manage_callback: ManageCallback,
         database_repo: DatabaseRepository,
         message_factory,
@@ -69,7 +75,7 @@ class TestManagePickOption:
         database_repo.set_game_completed(past_room.id, DateTime.utcnow().add(days=4))
         message = message_factory(text="/manage")
         # WHEN
-        manage_callback.process(manager_user, message=message)
+        stack.run(manage_callback.process(manager_user, message=message))
         # THEN
         bot_mock.send_message.assert_called_once_with(
             manager_user.id,
@@ -78,6 +84,7 @@ class TestManagePickOption:
 
     def test_manage_manager_initiates_manage_has_room(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -88,7 +95,7 @@ class TestManagePickOption:
         manager_user, created_room = create_manager_room
         message = message_factory(text="/manage")
         # WHEN
-        manage_callback.process(manager_user, message=message)
+        stack.run(manage_callback.process(manager_user, message=message))
         # THEN
         bot_mock.send_message.assert_called_once_with(
             manager_user.id,
@@ -101,6 +108,7 @@ class TestManagePickOption:
 
     def test_manage_manager_cancels(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -110,13 +118,15 @@ class TestManagePickOption:
         manager_user, created_room = create_manager_room
         message = message_factory(text="/manage")
         # WHEN
-        manage_callback.process(manager_user, message=message)
+        stack.run(manage_callback.process(manager_user, message=message))
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
         answer_message = message_factory(text=ManageActions.CANCEL.value)
-        callback_fn(
-            answer_message,
-            user=manager_user,
-            code_to_room={created_room.short_code: created_room},
+        stack.run(
+            callback_fn(
+                answer_message,
+                user=manager_user,
+                code_to_room={created_room.short_code: created_room},
+            )
         )
         # THEN
         bot_mock.send_message.assert_called_with(
@@ -127,6 +137,7 @@ class TestManagePickOption:
 
     def test_manage_manager_picks_room_to_manage_internal_error(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -137,13 +148,15 @@ class TestManagePickOption:
         manager_user, created_room = create_manager_room
         message = message_factory(text="/manage")
         # WHEN
-        manage_callback.process(manager_user, message=message)
+        stack.run(manage_callback.process(manager_user, message=message))
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
         answer_message = message_factory(text=created_room.display_short_code)
-        callback_fn(
-            answer_message,
-            user=manager_user,
-            code_to_room={},  # empty dict to trigger internal error
+        stack.run(
+            callback_fn(
+                answer_message,
+                user=manager_user,
+                code_to_room={},  # empty dict to trigger internal error
+            )
         )
         # THEN
         bot_mock.send_message.assert_called_with(
@@ -158,6 +171,7 @@ class TestManagePickOption:
 
     def test_manage_correct_action_options_new_room(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -170,10 +184,12 @@ class TestManagePickOption:
         kb_mock = mock.MagicMock()
         get_keyboard_patch.return_value = kb_mock
         # WHEN
-        manage_callback._handle_room_chosen(
-            room_chosen_message,
-            user=manager_user,
-            code_to_room={created_room.short_code: created_room},
+        stack.run(
+            manage_callback._handle_room_chosen(
+                room_chosen_message,
+                user=manager_user,
+                code_to_room={created_room.short_code: created_room},
+            )
         )
         # THEN
         get_keyboard_patch.assert_called_once_with(
@@ -194,6 +210,7 @@ class TestManagePickOption:
 
     def test_manage_correct_action_options_in_progress_room(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -209,10 +226,12 @@ class TestManagePickOption:
         get_keyboard_patch.return_value = kb_mock
         # WHEN
         this_room = database_repo.get_room(created_room.id)
-        manage_callback._handle_room_chosen(
-            message_factory(text=created_room.display_short_code),
-            user=manager_user,
-            code_to_room={created_room.short_code: this_room},
+        stack.run(
+            manage_callback._handle_room_chosen(
+                message_factory(text=created_room.display_short_code),
+                user=manager_user,
+                code_to_room={created_room.short_code: this_room},
+            )
         )
         # THEN
         get_keyboard_patch.assert_called_once_with(
@@ -231,6 +250,7 @@ class TestManagePickOption:
 
     def test_manage_invalid_action_chosen(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -239,10 +259,12 @@ class TestManagePickOption:
         # GIVEN
         manager_user, created_room = create_manager_room
         # WHEN
-        manage_callback._handle_action_chosen(
-            message_factory(text="Some invalid action"),
-            user=manager_user,
-            room=created_room,
+        stack.run(
+            manage_callback._handle_action_chosen(
+                message_factory(text="Some invalid action"),
+                user=manager_user,
+                room=created_room,
+            )
         )
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -253,6 +275,7 @@ class TestManagePickOption:
 
     def test_manage_action_cancel_chosen(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -261,10 +284,12 @@ class TestManagePickOption:
         # GIVEN
         manager_user, created_room = create_manager_room
         # WHEN
-        manage_callback._handle_action_chosen(
-            message_factory(text=ManageActions.CANCEL.value),
-            user=manager_user,
-            room=created_room,
+        stack.run(
+            manage_callback._handle_action_chosen(
+                message_factory(text=ManageActions.CANCEL.value),
+                user=manager_user,
+                room=created_room,
+            )
         )
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -275,6 +300,7 @@ class TestManagePickOption:
 
     def test_manage_action_info_chosen(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -283,10 +309,12 @@ class TestManagePickOption:
         # GIVEN
         manager_user, created_room = create_manager_room
         # WHEN
-        manage_callback._handle_action_chosen(
-            message_factory(text=ManageActions.INFO.value),
-            user=manager_user,
-            room=created_room,
+        stack.run(
+            manage_callback._handle_action_chosen(
+                message_factory(text=ManageActions.INFO.value),
+                user=manager_user,
+                room=created_room,
+            )
         )
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -300,6 +328,7 @@ class TestManagePickOption:
 
     def test_manage_action_delete_chosen(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -309,10 +338,12 @@ class TestManagePickOption:
         # GIVEN
         manager_user, created_room = create_manager_room
         # WHEN
-        manage_callback._handle_action_chosen(
-            message_factory(text=ManageActions.DELETE.value),
-            user=manager_user,
-            room=created_room,
+        stack.run(
+            manage_callback._handle_action_chosen(
+                message_factory(text=ManageActions.DELETE.value),
+                user=manager_user,
+                room=created_room,
+            )
         )
         # THEN
         bot_mock.send_message.assert_called_with(
@@ -325,6 +356,7 @@ class TestManagePickOption:
 
     def test_manage_action_kick_player_chosen(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -335,10 +367,12 @@ class TestManagePickOption:
         manager_user, created_room = create_manager_room
         database_repo.join_room(manager_user.id, created_room.id)
         # WHEN
-        manage_callback._handle_action_chosen(
-            message_factory(text=ManageActions.KICK_PLAYER.value),
-            user=manager_user,
-            room=created_room,
+        stack.run(
+            manage_callback._handle_action_chosen(
+                message_factory(text=ManageActions.KICK_PLAYER.value),
+                user=manager_user,
+                room=created_room,
+            )
         )
         # THEN (only checking the call here)
         bot_mock.send_message.assert_called_once_with(
@@ -349,6 +383,7 @@ class TestManagePickOption:
 
     def test_manage_action_start_chosen(
         self,
+        stack,
         manage_callback: ManageCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -357,10 +392,12 @@ class TestManagePickOption:
         # GIVEN
         manager_user, created_room = create_manager_room
         # WHEN
-        manage_callback._handle_action_chosen(
-            message_factory(text=ManageActions.START.value),
-            user=manager_user,
-            room=created_room,
+        stack.run(
+            manage_callback._handle_action_chosen(
+                message_factory(text=ManageActions.START.value),
+                user=manager_user,
+                room=created_room,
+            )
         )
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -371,6 +408,7 @@ class TestManagePickOption:
 
     def test_manage_action_complete_chosen(
         self,
+        stack,
         manage_callback: ManageCallback,
         database_repo: DatabaseRepository,
         message_factory,
@@ -388,10 +426,12 @@ class TestManagePickOption:
         database_repo.set_game_started(created_room.id, DateTime.utcnow())
         this_room = database_repo.get_room(created_room.id)
         # WHEN
-        manage_callback._handle_action_chosen(
-            message_factory(text=ManageActions.COMPLETE.value),
-            user=manager_user,
-            room=this_room,
+        stack.run(
+            manage_callback._handle_action_chosen(
+                message_factory(text=ManageActions.COMPLETE.value),
+                user=manager_user,
+                room=this_room,
+            )
         )
         # THEN
         assert len(bot_mock.send_message.mock_calls) == 3
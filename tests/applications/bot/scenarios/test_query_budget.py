@@ -0,0 +1,76 @@
+import pytest
+
+from src.applications.bot.callbacks_manager import CallbacksManager
+from src.models.room import Room
+from src.models.user import User
+from src.repositories.database import DatabaseRepository
+from tests.utils import assert_query_budget
+
+# about the threads application only
+pytestmark = pytest.mark.parametrize("stack", ["threads"], indirect=True)
+
+
+class TestQueryBudget:
+    """Statements per command must not grow with the room size (no N+1).
+
+    Given:
+    - a room with a manager and 30 players
+    When:
+    - a command is sent
+    Then:
+    - it executes at most the budgeted number of statements
+    """
+
+    @pytest.fixture
+    def callbacks_manager(self, bot_mock, moroz_integrated) -> CallbacksManager:
+        return CallbacksManager(bot_mock, moroz_integrated)
+
+    @pytest.fixture
+    def players(
+        self, database_repo: DatabaseRepository, create_manager_room: tuple[User, Room]
+    ) -> list[User]:
+        _, room = create_manager_room
+        players = []
+        for i in range(30):
+            player = database_repo.create_user(
+                id=500 + i, username=f"p{i}", name=f"P{i}"
+            )
+            database_repo.join_room(user_id=player.id, room_id=room.id)
+            players.append(player)
+        return players
+
+    @pytest.mark.parametrize(
+        "command, budget",
+        [("/me", 4), ("/help", 0), ("/start", 1), ("/join", 2), ("/leave", 4)],
+    )
+    def test_player_commands(
+        self, callbacks_manager, message_factory, players, command, budget
+    ):
+        message = message_factory(chat_id=players[0].id, text=command)
+        with assert_query_budget(budget):
+            callbacks_manager.dispatch(message)
+
+    @pytest.mark.parametrize(
+        "command, budget", [("/manage", 2), ("/create", 8), ("/here", 3)]
+    )
+    def test_manager_commands(
+        self,
+        callbacks_manager,
+        message_factory,
+        players,
+        create_manager_room,
+        command,
+        budget,
+    ):
+        manager, _ = create_manager_room
+        message = message_factory(chat_id=manager.id, text=command)
+        with assert_query_budget(budget):
+            callbacks_manager.dispatch(message)
+
+    def test_budget_exceeded(self, database_repo: DatabaseRepository):
+        with (
+            pytest.raises(AssertionError, match="budget of 1 statements exceeded"),
+            assert_query_budget(1),
+        ):
+            database_repo.create_user(id=1, username="user", name="User")
+            database_repo.get_user(1)
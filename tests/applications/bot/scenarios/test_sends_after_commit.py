@@ -0,0 +1,94 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlmodel import create_engine
+
+from src.applications.bot.callbacks.join import JoinCallback
+from src.applications.bot.callbacks.leave import LeaveCallback
+from src.applications.bot.callbacks.management.kick import KickCallback
+from src.repositories.database import DatabaseRepository
+from src.services.moroz import Moroz
+
+# about the threads application only
+pytestmark = pytest.mark.parametrize("stack", ["threads"], indirect=True)
+
+MANAGER_ID = 401
+MEMBER_ID = 1001
+
+
+def _writable(path: Path) -> bool:
+    """Whether another connection could write to the database right now."""
+    conn = sqlite3.connect(path, timeout=0, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("ROLLBACK")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+class TestSendsAfterCommit:
+    """No message is sent while a room (i.e. the SQLite database) is locked.
+
+    Given:
+    - a manager, a member and the manager's room, on a file SQLite database
+    When:
+    - the member leaves the room, joins it again and is kicked from it
+    Then:
+    - every message is sent after the transition was committed: another
+      connection can take the write lock at that moment
+    - every message of the transitions is sent
+    """
+
+    @pytest.fixture
+    def database_path(self, tmp_path) -> Path:
+        return tmp_path / "bot.db"
+
+    @pytest.fixture
+    def moroz(self, database_path):
+        engine = create_engine(f"sqlite:///{database_path}")
+        yield Moroz(
+            database_repository=DatabaseRepository(engine),
+            max_rooms_managed_by_user=1,
+            min_players_to_start_game=2,
+        )
+        engine.dispose()
+
+    def test_sends_after_commit(
+        self, moroz: Moroz, database_path, bot_mock, message_factory
+    ):
+        # GIVEN
+        repo = moroz.database_repository
+        manager = repo.create_user(id=MANAGER_ID, username="manager", name="Manager")
+        member = repo.create_user(id=MEMBER_ID, username="member", name="Member")
+        room = moroz.create_room(created_by_user_id=manager.id)
+        repo.join_room(member.id, room.id)
+        locked_sends = []
+        bot_mock.send_message.side_effect = lambda chat_id, text, **_: (
+            None if _writable(database_path) else locked_sends.append(text)
+        )
+        join = JoinCallback(bot_mock, moroz)
+        kick = KickCallback(bot_mock, moroz, broadcaster=None)
+
+        # WHEN
+        LeaveCallback(bot_mock, moroz).process_wrap(
+            message_factory(text="/leave", chat_id=member.id)
+        )
+        join._handle_room_code_entered(
+            message_factory(text=room.display_short_code, chat_id=member.id),
+            user=repo.get_user(member.id),
+        )
+        kick._handle_player_selected(
+            message_factory(text="Member", chat_id=manager.id),
+            user=repo.get_user(manager.id),
+            room=room,
+            player_repr_to_id={"Member": member.id},
+        )
+
+        # THEN
+        assert locked_sends == []
+        assert bot_mock.send_message.call_count == 6
+        assert repo.get_user(member.id).room_id is None
@@ -24,15 +24,16 @@ class TestSetName:
     """
 
     @pytest.fixture
-    def join_callback(self, bot_mock, moroz_integrated) -> JoinCallback:
-        return JoinCallback(bot=bot_mock, moroz=moroz_integrated)
+    def join_callback(self, stack, bot_mock, moroz_integrated) -> JoinCallback:
+        return stack.callback(JoinCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     @pytest.fixture
-    def name_callback(self, bot_mock, moroz_integrated):
-        return NameCallback(bot=bot_mock, moroz=moroz_integrated)
+    def name_callback(self, stack, bot_mock, moroz_integrated):
+        return stack.callback(NameCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_set_name_ok(
         self,
+        stack,
         join_callback: JoinCallback,
         name_callback: NameCallback,
         create_manager_room: tuple[User, Room],
@@ -47,14 +48,14 @@ class TestSetName:
         )
         name_message = message_factory(text="/name", chat_id=user.id)
         # WHEN
-        name_callback.process(user, message=name_message)
+        stack.run(name_callback.process(user, message=name_message))
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
         # THEN
         assert callback_fn == name_callback._set_name
 
         # WHEN (user enters new name)
         new_name_message = message_factory(text="Complicated User")
-        name_callback._set_name(new_name_message, user)
+        stack.run(name_callback._set_name(new_name_message, user))
         # THEN
         updated_user = database_repo.get_user(user.id)
         assert updated_user.name == "Complicated User"
@@ -65,13 +66,13 @@ class TestSetName:
 
         # WHEN: user joins the room
         join_message = message_factory(text="/join", chat_id=user.id)
-        join_callback.process(updated_user, message=join_message)
+        stack.run(join_callback.process(updated_user, message=join_message))
         # THEN
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[1]
         assert callback_fn == join_callback._handle_room_code_entered
         # WHEN (user enters room code)
         join_room_message = message_factory(text=room.display_short_code)
-        callback_fn(join_room_message, updated_user)
+        stack.run(callback_fn(join_room_message, updated_user))
         # THEN (the manager is notified about the join with the updated name)
         bot_mock.send_message.assert_called_with(
             manager.id,
@@ -89,6 +90,7 @@ class TestSetName:
     )
     def test_set_name_invalid(
         self,
+        stack,
         name_callback: NameCallback,
         message_factory,
         database_repo: DatabaseRepository,
@@ -102,7 +104,7 @@ class TestSetName:
         )
         name_message = message_factory(text="/name", chat_id=user.id)
         # WHEN
-        name_callback.process(user, message=name_message)
+        stack.run(name_callback.process(user, message=name_message))
         _, (_, callback_fn), _ = bot_mock.register_next_step_handler.mock_calls[0]
         # THEN
         assert callback_fn == name_callback._set_name
@@ -111,7 +113,7 @@ class TestSetName:
         invalid_name_message = message_factory(
             text=invalid_name
         )  # Empty name is invalid
-        name_callback._set_name(invalid_name_message, user)
+        stack.run(name_callback._set_name(invalid_name_message, user))
         # THEN
         updated_user = database_repo.get_user(user.id)
         assert updated_user.name == "Simple User"  # Name should not be changed
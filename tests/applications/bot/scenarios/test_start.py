@@ -7,11 +7,12 @@ from tests.utils import Regex
 
 class TestStartBot:
     @pytest.fixture
-    def start_callback(self, bot_mock, moroz_integrated) -> StartCallback:
-        return StartCallback(bot=bot_mock, moroz=moroz_integrated)
+    def start_callback(self, stack, bot_mock, moroz_integrated) -> StartCallback:
+        return stack.callback(StartCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_start_register(
         self,
+        stack,
         start_callback: StartCallback,
         database_repo: DatabaseRepository,
         message_factory,
@@ -21,7 +22,7 @@ class TestStartBot:
         message = message_factory(text="/start", chat_id=1001, username="newuser")
 
         # WHEN
-        start_callback.process_wrap(message)
+        stack.run(start_callback.process_wrap(message))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -34,6 +35,7 @@ class TestStartBot:
 
     def test_start_welcome_back(
         self,
+        stack,
         start_callback: StartCallback,
         database_repo: DatabaseRepository,
         message_factory,
@@ -48,7 +50,7 @@ class TestStartBot:
         )
 
         # WHEN
-        start_callback.process_wrap(message)
+        stack.run(start_callback.process_wrap(message))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
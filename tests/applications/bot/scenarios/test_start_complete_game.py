@@ -1,3 +1,4 @@
+import dataclasses
 from unittest import mock
 
 import pytest
@@ -8,7 +9,6 @@ from src.applications.bot.callbacks.management.play import PlayCallback
 from src.models.room import Room
 from src.models.user import User
 from src.repositories.database import DatabaseRepository
-from src.services.moroz import Moroz
 from tests.utils import Regex
 
 
@@ -33,20 +33,27 @@ class TestStartCompleteGame:
     """
 
     @pytest.fixture
-    def start_game_callback(self, bot_mock, database_repo) -> PlayCallback:
-        moroz_allow_duets = Moroz(
-            database_repository=database_repo,
-            max_rooms_managed_by_user=2,
-            min_players_to_start_game=2,  # allow duets for testing
+    def start_game_callback(
+        self, stack, bot_mock, moroz_integrated, broadcaster
+    ) -> PlayCallback:
+        moroz_allow_duets = dataclasses.replace(
+            moroz_integrated, min_players_to_start_game=2  # allow duets for testing
+        )
+        return stack.callback(PlayCallback)(
+            bot=bot_mock, moroz=moroz_allow_duets, broadcaster=broadcaster
         )
-        return PlayCallback(bot=bot_mock, moroz=moroz_allow_duets)
 
     @pytest.fixture
-    def complete_game_callback(self, bot_mock, moroz_integrated) -> CompleteCallback:
-        return CompleteCallback(bot=bot_mock, moroz=moroz_integrated)
+    def complete_game_callback(
+        self, stack, bot_mock, moroz_integrated, broadcaster
+    ) -> CompleteCallback:
+        return stack.callback(CompleteCallback)(
+            bot=bot_mock, moroz=moroz_integrated, broadcaster=broadcaster
+        )
 
     def test_try_start_game_lonely_manager(
         self,
+        stack,
         start_game_callback: PlayCallback,
         database_repo: DatabaseRepository,
         create_manager_room: tuple[User, Room],
@@ -58,7 +65,7 @@ class TestStartCompleteGame:
         manager = database_repo.get_user(manager.id)
 
         # WHEN
-        start_game_callback.process_management(manager, room)
+        stack.run(start_game_callback.process_management(manager, room))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -67,8 +74,38 @@ class TestStartCompleteGame:
             reply_markup=mock.ANY,
         )
 
+    def test_start_game_twice(
+        self,
+        stack,
+        start_game_callback: PlayCallback,
+        database_repo: DatabaseRepository,
+        create_manager_room: tuple[User, Room],
+        bot_mock,
+    ):
+        # GIVEN: a game started in the room
+        manager, room = create_manager_room
+        for id_ in (200, 201):
+            database_repo.create_user(id=id_, username=f"p{id_}", name=f"P{id_}")
+            database_repo.join_room(user_id=id_, room_id=room.id)
+        manager = database_repo.get_user(manager.id)
+        stack.run(start_game_callback.process_management(manager, room))
+        targets = database_repo.get_targets_in_room(room.id)
+        bot_mock.reset_mock()
+
+        # WHEN: the manager starts it again from a stale menu
+        stack.run(start_game_callback.process_management(manager, room))
+
+        # THEN: nothing changes and the manager is told why
+        bot_mock.send_message.assert_called_once_with(
+            manager.id,
+            Regex("The game in room .+ has already started."),
+            reply_markup=mock.ANY,
+        )
+        assert database_repo.get_targets_in_room(room.id) == targets
+
     def test_start_game_in_room(
         self,
+        stack,
         start_game_callback: PlayCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -91,7 +128,7 @@ class TestStartCompleteGame:
         manager = database_repo.get_user(manager.id)
 
         # WHEN
-        start_game_callback.process_management(manager, room)
+        stack.run(start_game_callback.process_management(manager, room))
 
         # THEN
         room_after = database_repo.get_room(room.id)
@@ -131,6 +168,7 @@ class TestStartCompleteGame:
 
     def test_manager_plays_duet(
         self,
+        stack,
         start_game_callback: PlayCallback,
         create_manager_room: tuple[User, Room],
         message_factory,
@@ -145,7 +183,7 @@ class TestStartCompleteGame:
         manager = database_repo.get_user(manager.id)
         player = database_repo.get_user(player.id)
         # WHEN
-        start_game_callback.process_management(manager, room)
+        stack.run(start_game_callback.process_management(manager, room))
         # THEN
         room_after = database_repo.get_room(room.id)
         assert room_after.started_dt is not None
@@ -170,6 +208,7 @@ class TestStartCompleteGame:
 
     def test_complete_game_in_room(
         self,
+        stack,
         start_game_callback: PlayCallback,
         complete_game_callback: CompleteCallback,
         message_factory,
@@ -192,10 +231,10 @@ class TestStartCompleteGame:
         manager = database_repo.get_user(manager.id)
 
         # Start the game first
-        start_game_callback.process_management(manager, room)
+        stack.run(start_game_callback.process_management(manager, room))
 
         # WHEN: complete the game
-        complete_game_callback.process_management(manager, room)
+        stack.run(complete_game_callback.process_management(manager, room))
         # THEN
         room_after = database_repo.get_room(room.id)
         assert room_after.started_dt is not None
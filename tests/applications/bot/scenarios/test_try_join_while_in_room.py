@@ -20,11 +20,12 @@ class TestJoinWhileInRoom:
     """
 
     @pytest.fixture
-    def join_callback(self, bot_mock, moroz_integrated) -> JoinCallback:
-        return JoinCallback(bot=bot_mock, moroz=moroz_integrated)
+    def join_callback(self, stack, bot_mock, moroz_integrated) -> JoinCallback:
+        return stack.callback(JoinCallback)(bot=bot_mock, moroz=moroz_integrated)
 
     def test_join_while_in_room(
         self,
+        stack,
         join_callback: JoinCallback,
         message_factory,
         create_manager_room: tuple[User, Room],
@@ -39,7 +40,7 @@ class TestJoinWhileInRoom:
         this_user = database_repo.get_user(created_user.id)
 
         # WHEN
-        join_callback.process(this_user, message=message)
+        stack.run(join_callback.process(this_user, message=message))
 
         # THEN
         bot_mock.send_message.assert_called_once_with(
@@ -4,6 +4,7 @@ import pytest
 from pytest import LogCaptureFixture
 from pytest_loguru.plugin import caplog  # noqa: F401
 
+from src.applications.async_bot.callbacks.base import Callback as AsyncCallback
 from src.applications.bot.callbacks.base import Callback
 from src.models.user import User
 from src.repositories.database import DatabaseRepository
@@ -15,21 +16,30 @@ class AnyCallback(Callback):
         pass
 
 
+class AnyAsyncCallback(AsyncCallback):
+    async def process(self, user, *, message):
+        pass
+
+
 class TestRejectNonRegistered:
     @pytest.fixture(scope="function")
-    def user_from_message_patched(self, user_mock):
+    def user_from_message_patched(self, stack, user_mock):
         with mock.patch(
-            "src.applications.bot.callbacks.base.user_from_message",
+            f"{stack.callback(Callback).__module__}.user_from_message",
             return_value=user_mock,
         ) as patched:
             yield patched
 
     @pytest.fixture
-    def callback(self, bot_mock, moroz_integrated) -> AnyCallback:
-        return AnyCallback(bot=bot_mock, moroz=moroz_integrated)
+    def callback(
+        self, stack, bot_mock, moroz_integrated
+    ) -> AnyCallback | AnyAsyncCallback:
+        callback_class = AnyCallback if stack.name == "threads" else AnyAsyncCallback
+        return callback_class(bot=bot_mock, moroz=moroz_integrated)
 
     def test_user_not_found(
         self,
+        stack,
         callback: AnyCallback,
         message_factory,
         user_mock: User,
@@ -41,7 +51,7 @@ class TestRejectNonRegistered:
         message = message_factory()
         user_from_message_patched.return_value = user_mock
         # WHEN / THEN
-        callback.process_wrap(message)
+        stack.run(callback.process_wrap(message))
         assert "is not registered" in caplog.text
         bot_mock.send_message.assert_called_once_with(
             message.chat.id,
@@ -50,6 +60,7 @@ class TestRejectNonRegistered:
 
     def test_user_exists(
         self,
+        stack,
         callback: AnyCallback,
         message_factory,
         user_mock: User,
@@ -64,6 +75,9 @@ class TestRejectNonRegistered:
         message = message_factory()
         user_from_message_patched.return_value = created_user
         # WHEN
-        callback.process_wrap(message)
+        stack.run(callback.process_wrap(message))
         # THEN
-        assert "AnyCallback from User(id=12345; @testuser, Test): Hello" in caplog.text
+        assert (
+            f"{type(callback).__name__} from User(id=12345; @testuser, Test): Hello"
+            in caplog.text
+        )
@@ -0,0 +1,132 @@
+from threading import Event, Lock
+
+import pytest
+from telebot.apihelper import ApiTelegramException
+
+from src.applications.bot.broadcast import Broadcaster, DeliveryResult, Notification
+
+
+def _api_error(error_code: int, description: str, **parameters):
+    result_json = {"ok": False, "error_code": error_code, "description": description}
+    if parameters:
+        result_json["parameters"] = parameters
+    return ApiTelegramException("sendMessage", None, result_json)
+
+
+class TestBroadcaster:
+    @pytest.fixture
+    def sleeps(self) -> list[float]:
+        return []
+
+    @pytest.fixture
+    def broadcaster(self, bot_mock, sleeps):
+        lock = Lock()
+
+        def _sleep(seconds: float):
+            with lock:
+                sleeps.append(seconds)
+
+        broadcaster = Broadcaster(
+            bot_mock, max_workers=4, global_rate=1000, per_chat_rate=1000, sleep=_sleep
+        )
+        yield broadcaster
+        broadcaster.shutdown()
+
+    def test_all_delivered_in_order(self, broadcaster: Broadcaster, bot_mock):
+        # GIVEN
+        notifications = [
+            Notification(chat_id, f"hi {chat_id}") for chat_id in range(50)
+        ]
+        # WHEN
+        results = broadcaster.broadcast(notifications).result()
+        # THEN
+        assert results == [DeliveryResult(chat_id, True, 1) for chat_id in range(50)]
+        assert bot_mock.send_message.call_count == 50
+        bot_mock.send_message.assert_any_call(7, "hi 7")
+
+    def test_returns_before_deliveries_complete(
+        self, broadcaster: Broadcaster, bot_mock
+    ):
+        # GIVEN: sends which only complete once released
+        released = Event()
+        bot_mock.send_message.side_effect = lambda *_: released.wait(timeout=5)
+        # WHEN
+        broadcast = broadcaster.broadcast([Notification(1, "a"), Notification(2, "b")])
+        # THEN
+        assert not broadcast.done()
+        released.set()
+        assert broadcast.result(timeout=5) == [
+            DeliveryResult(1, True, 1),
+            DeliveryResult(2, True, 1),
+        ]
+
+    def test_nothing_to_deliver(self, broadcaster: Broadcaster):
+        assert broadcaster.broadcast([]).result(timeout=0) == []
+
+    def test_retry_after_honored(self, broadcaster: Broadcaster, bot_mock, sleeps):
+        # GIVEN
+        bot_mock.send_message.side_effect = [
+            _api_error(429, "Too Many Requests", retry_after=3),
+            None,
+        ]
+        # WHEN
+        results = broadcaster.broadcast([Notification(1, "hi")]).result()
+        # THEN
+        assert results == [DeliveryResult(1, True, 2)]
+        assert max(sleeps) == pytest.approx(3, abs=0.1)
+
+    def test_gives_up_after_max_retries(self, broadcaster: Broadcaster, bot_mock):
+        # GIVEN
+        bot_mock.send_message.side_effect = _api_error(
+            429, "Too Many Requests", retry_after=1
+        )
+        # WHEN
+        (result,) = broadcaster.broadcast([Notification(1, "hi")]).result()
+        # THEN
+        assert not result.delivered
+        assert result.attempts == broadcaster.max_retries + 1
+
+    def test_other_errors_not_retried(self, broadcaster: Broadcaster, bot_mock):
+        # GIVEN
+        def _send(chat_id, text):
+            if chat_id == 2:
+                raise _api_error(403, "Forbidden: bot was blocked by the user")
+
+        bot_mock.send_message.side_effect = _send
+        # WHEN
+        results = broadcaster.broadcast(
+            [Notification(1, "hi"), Notification(2, "hi")]
+        ).result()
+        # THEN
+        assert results == [
+            DeliveryResult(1, True, 1),
+            DeliveryResult(2, False, 1, "Forbidden: bot was blocked by the user"),
+        ]
+
+    def test_unexpected_error_reported(self, broadcaster: Broadcaster, bot_mock):
+        # GIVEN
+        def _send(chat_id, text):
+            if chat_id == 2:
+                raise RuntimeError("boom")
+
+        bot_mock.send_message.side_effect = _send
+        # WHEN
+        results = broadcaster.broadcast(
+            [Notification(1, "hi"), Notification(2, "hi")]
+        ).result(timeout=5)
+        # THEN: the other deliveries are reported all the same
+        assert results == [
+            DeliveryResult(1, True, 1),
+            DeliveryResult(2, False, 1, "boom"),
+        ]
+
+    def test_per_chat_rate_limited(self, bot_mock, sleeps):
+        # GIVEN
+        broadcaster = Broadcaster(
+            bot_mock, global_rate=1000, per_chat_rate=1, sleep=sleeps.append
+        )
+        # WHEN
+        broadcaster.broadcast([Notification(1, "a"), Notification(1, "b")]).result()
+        broadcaster.shutdown()
+        # THEN: the second message to the same chat waits for a token
+        assert sleeps and max(sleeps) == pytest.approx(1, abs=0.1)
@@ -0,0 +1,108 @@
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.applications.bot.callbacks.echo import EchoCallback
+from src.applications.bot.callbacks.join import JoinCallback
+from src.applications.bot.callbacks.management.kick import KickCallback
+from src.applications.bot.callbacks_manager import COMMANDS, CallbacksManager
+from src.applications.bot.metrics import HANDLER_DURATION
+from src.shared.rate_limit import UserRateLimiter
+
+
+class TestCallbacksManager:
+    @pytest.fixture
+    def manager(self, bot_mock, moroz_mock) -> CallbacksManager:
+        return CallbacksManager(bot_mock, moroz_mock, broadcaster=MagicMock())
+
+    def test_single_handler_registered(self, manager: CallbacksManager, bot_mock):
+        manager.register_callbacks(bot_mock)
+        bot_mock.register_message_handler.assert_called_once_with(manager.dispatch)
+
+    @pytest.mark.parametrize("command", list(COMMANDS))
+    def test_command_routed(self, manager: CallbacksManager, message_factory, command):
+        # GIVEN
+        message = message_factory(text=f"/{command} arg")
+        callback = manager._commands[command]
+        # WHEN
+        with mock.patch.object(callback, "process_wrap") as process_wrap:
+            manager.dispatch(message)
+        # THEN
+        process_wrap.assert_called_once_with(message)
+        assert isinstance(callback, COMMANDS[command].callback)
+
+    @pytest.mark.parametrize("message_text", ["hello", "/unknown", ""])
+    def test_other_text_echoed(
+        self, manager: CallbacksManager, message_factory, message_text
+    ):
+        # GIVEN
+        message = message_factory(text=message_text)
+        # WHEN
+        with mock.patch.object(manager._fallback, "process_wrap") as process_wrap:
+            manager.dispatch(message)
+        # THEN
+        process_wrap.assert_called_once_with(message)
+        assert isinstance(manager._fallback, EchoCallback)
+
+    def test_command_addressed_to_bot(self, manager: CallbacksManager, message_factory):
+        message = message_factory(text="/join@ded_moroz_bot")
+        with mock.patch.object(manager._commands["join"], "process_wrap") as join:
+            manager.dispatch(message)
+        join.assert_called_once_with(message)
+
+    def test_command_costs(self, bot_mock, moroz_mock):
+        # GIVEN
+        limiter = UserRateLimiter(rate=1, burst=10)
+        # WHEN
+        manager = CallbacksManager(
+            bot_mock,
+            moroz_mock,
+            broadcaster=MagicMock(),
+            rate_limiter=limiter,
+            command_costs={"me": 2, "help": 0.5},
+        )
+        # THEN
+        assert manager._commands["me"].cost == 2
+        assert manager._commands["help"].cost == 0.5
+        assert manager._commands["leave"].cost == 1
+        assert manager._fallback.cost == 1
+        assert all(c.rate_limiter is limiter for c in manager._commands.values())
+
+    def test_callbacks_reused(self, manager: CallbacksManager, message_factory):
+        # GIVEN
+        callback = manager._commands["me"]
+        # WHEN
+        manager.dispatch(message_factory(text="/me"))
+        manager.dispatch(message_factory(text="/me"))
+        # THEN
+        assert manager._commands["me"] is callback
+
+    @pytest.mark.parametrize(
+        "message_text, looked_up",
+        [("/help", False), ("some text", False), ("/me", True), ("/join", True)],
+    )
+    def test_user_lookup_only_where_required(
+        self,
+        manager: CallbacksManager,
+        message_factory,
+        moroz_mock,
+        message_text,
+        looked_up,
+    ):
+        manager.dispatch(message_factory(text=message_text))
+        assert moroz_mock.get_user.called is looked_up
+
+    def test_handler_latency_recorded(self, manager: CallbacksManager, message_factory):
+        # GIVEN
+        before = HANDLER_DURATION.count(handler="HelpCallback")
+        # WHEN
+        manager.dispatch(message_factory(text="/help"))
+        # THEN
+        assert HANDLER_DURATION.count(handler="HelpCallback") == before + 1
+
+    def test_callback_instance(self, manager: CallbacksManager):
+        assert manager.callback_instance("JoinCallback") is manager._commands["join"]
+        assert isinstance(manager.callback_instance("KickCallback"), KickCallback)
+        assert manager.callback_instance("EchoCallback") is None
+        assert isinstance(manager._commands["join"], JoinCallback)
@@ -0,0 +1,152 @@
+from unittest.mock import MagicMock
+
+import pytest
+import telebot
+from telebot import Handler, types
+
+from src.applications.bot.callbacks.management.manage import ManageCallback
+from src.applications.bot.callbacks.name import NameCallback
+from src.applications.bot.callbacks_manager import CallbacksManager
+from src.applications.bot.conversation import ConversationStore
+from src.models.room import Room
+from src.models.user import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _message_update(update_id: int, chat_id: int, text: str) -> types.Update:
+    update = types.Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "U"},
+                "text": text,
+            },
+        }
+    )
+    assert update is not None
+    return update
+
+
+class TestConversationStore:
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def callbacks_manager(self, bot_mock, moroz_mock) -> CallbacksManager:
+        return CallbacksManager(bot_mock, moroz_mock, broadcaster=MagicMock())
+
+    def test_handlers_taken_once(self, clock):
+        # GIVEN
+        store = ConversationStore(clock=clock)
+        store.register_handler(1, Handler(print, "a"))
+        # WHEN / THEN
+        handlers = store.get_handlers(1)
+        assert handlers is not None and handlers[0].args == ("a",)
+        assert store.get_handlers(1) is None
+
+    def test_expired_handlers_dropped(self, clock):
+        # GIVEN
+        store = ConversationStore(ttl_seconds=60, clock=clock)
+        store.register_handler(1, Handler(print))
+        # WHEN
+        clock.now += 60
+        # THEN
+        assert store.get_handlers(1) is None
+
+    def test_size_cap_evicts_oldest(self, clock):
+        # GIVEN
+        store = ConversationStore(max_entries=2, clock=clock)
+        # WHEN
+        for chat_id in (1, 2, 3):
+            store.register_handler(chat_id, Handler(print))
+        # THEN
+        assert store.size == 2
+        assert store.get_handlers(1) is None
+        assert store.get_handlers(3) is not None
+
+    def test_expired_entries_evicted_on_register(self, clock):
+        # GIVEN
+        store = ConversationStore(ttl_seconds=60, clock=clock)
+        store.register_handler(1, Handler(print))
+        clock.now += 61
+        # WHEN
+        store.register_handler(2, Handler(print))
+        # THEN
+        assert store.size == 1
+
+    def test_state_survives_restart(self, tmp_path, clock, callbacks_manager, bot_mock):
+        # GIVEN: a manager choosing a room under /manage
+        path = tmp_path / "conversations.json"
+        store = ConversationStore(path=path, save_delay=0, clock=clock)
+        manage = ManageCallback(bot_mock, callbacks_manager.moroz)
+        user = User(id=1, name="Manager", username="manager")
+        room = Room(id="abcd", short_code=42, manager_user_id=1)
+        store.register_handler(
+            1, Handler(manage._handle_room_chosen, user=user, code_to_room={42: room})
+        )
+        store.register_handler(2, Handler(lambda _: None))  # not persistable
+
+        # WHEN
+        restarted = ConversationStore(path=path, clock=clock)
+        restarted.load(callbacks_manager.callback_instance)
+
+        # THEN
+        assert restarted.get_handlers(2) is None
+        (handler,) = restarted.get_handlers(1) or []
+        assert isinstance(handler.callback.__self__, ManageCallback)
+        assert handler.callback.__name__ == "_handle_room_chosen"
+        assert handler.kwargs["user"] == user
+        assert handler.kwargs["code_to_room"] == {42: room}
+
+    def test_expired_state_not_restored(self, tmp_path, clock, callbacks_manager):
+        # GIVEN
+        path = tmp_path / "conversations.json"
+        store = ConversationStore(ttl_seconds=60, path=path, save_delay=0, clock=clock)
+        name = NameCallback(callbacks_manager.bot, callbacks_manager.moroz)
+        store.register_handler(1, Handler(name._set_name, user=User(id=1)))
+        # WHEN
+        clock.now += 60
+        restarted = ConversationStore(path=path, clock=clock)
+        restarted.load(callbacks_manager.callback_instance)
+        # THEN
+        assert restarted.size == 0
+
+    def test_restored_next_step_handled(self, tmp_path, clock, moroz_mock):
+        # GIVEN: /name asked for a name right before a restart
+        path = tmp_path / "conversations.json"
+        bot = telebot.TeleBot(
+            "123:TEST",
+            threaded=False,
+            next_step_backend=ConversationStore(path=path, save_delay=0),
+        )
+        bot.send_message = MagicMock()  # type: ignore[method-assign]
+        user = User(id=7, name="Old")
+        bot.register_next_step_handler_by_chat_id(
+            7, NameCallback(bot, moroz_mock)._set_name, user=user
+        )
+
+        # WHEN
+        store = ConversationStore(path=path)
+        restarted_bot = telebot.TeleBot(
+            "123:TEST", threaded=False, next_step_backend=store
+        )
+        restarted_bot.send_message = MagicMock()  # type: ignore[method-assign]
+        store.load(CallbacksManager(restarted_bot, moroz_mock).callback_instance)
+        restarted_bot.process_new_updates([_message_update(1, 7, "New")])
+
+        # THEN
+        moroz_mock.update_name.assert_called_once_with(7, "New")
+        restarted_bot.send_message.assert_called_once_with(
+            7, "Your name has been set to 'New'."
+        )
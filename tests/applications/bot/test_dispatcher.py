@@ -0,0 +1,188 @@
+import functools
+import random
+import threading
+import time
+from collections import defaultdict
+from unittest import mock
+
+import pytest
+import telebot
+from telebot import types
+from telebot.apihelper import ApiTelegramException
+
+from src.applications.bot.dispatcher import (
+    ChatOrderedDispatcher,
+    OrderedTeleBot,
+    chat_key,
+    describe_update,
+)
+from src.applications.bot.metrics import (
+    TELEGRAM_ERRORS,
+    TELEGRAM_RATE_LIMITED,
+    TELEGRAM_REQUEST_DURATION,
+)
+
+
+def _message_update(update_id: int, chat_id: int, text: str) -> types.Update:
+    update = types.Update.de_json(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "U"},
+                "text": text,
+            },
+        }
+    )
+    assert update is not None
+    return update
+
+
+class TestChatOrderedDispatcher:
+    @pytest.fixture
+    def dispatcher(self):
+        dispatcher = ChatOrderedDispatcher(workers=4, max_pending=100)
+        yield dispatcher
+        dispatcher.shutdown()
+
+    def test_order_within_chat(self, dispatcher: ChatOrderedDispatcher):
+        # GIVEN
+        seen: dict[int, list[int]] = defaultdict(list)
+
+        def _task(chat_id: int, seq: int):
+            time.sleep(random.random() / 1000)
+            seen[chat_id].append(seq)
+
+        # WHEN
+        for seq in range(20):
+            for chat_id in range(5):
+                dispatcher.submit(chat_id, functools.partial(_task, chat_id, seq))
+        dispatcher.join()
+
+        # THEN
+        assert seen == {chat_id: list(range(20)) for chat_id in range(5)}
+        assert dispatcher.pending == 0
+
+    def test_slow_chat_does_not_block_others(self, dispatcher: ChatOrderedDispatcher):
+        # GIVEN
+        release = threading.Event()
+        done = threading.Event()
+        dispatcher.submit("slow", release.wait)
+        dispatcher.submit("slow", lambda: None)
+
+        # WHEN
+        dispatcher.submit("fast", done.set)
+
+        # THEN
+        assert done.wait(timeout=5)
+        release.set()
+
+    def test_full_queue_rejects_without_blocking(self):
+        # GIVEN
+        dispatcher = ChatOrderedDispatcher(workers=1, max_pending=2)
+        release = threading.Event()
+        dispatcher.submit(1, release.wait)
+        dispatcher.submit(1, lambda: None)
+
+        # WHEN / THEN
+        assert not dispatcher.submit(2, lambda: None, block=False)
+        assert not dispatcher.submit(2, lambda: None, timeout=0.01)
+        release.set()
+        assert dispatcher.submit(2, lambda: None, timeout=5)
+        dispatcher.shutdown()
+
+    def test_failing_task_does_not_stop_chat(self, dispatcher: ChatOrderedDispatcher):
+        # GIVEN
+        done = threading.Event()
+
+        def _fail():
+            raise ValueError("boom")
+
+        # WHEN
+        dispatcher.submit(1, _fail)
+        dispatcher.submit(1, done.set)
+
+        # THEN
+        assert done.wait(timeout=5)
+
+    def test_submit_after_shutdown(self):
+        dispatcher = ChatOrderedDispatcher(workers=1)
+        dispatcher.shutdown()
+        with pytest.raises(RuntimeError):
+            dispatcher.submit(1, lambda: None)
+
+
+class TestOrderedTeleBot:
+    @pytest.fixture
+    def bot(self):
+        dispatcher = ChatOrderedDispatcher(workers=4)
+        yield OrderedTeleBot("123:TEST", dispatcher)
+        dispatcher.shutdown()
+
+    def test_next_step_flow_kept_in_order(self, bot: OrderedTeleBot):
+        # GIVEN: a two-step flow per chat, as in /name or /join
+        answers: dict[int, list[str]] = defaultdict(list)
+
+        def _second_step(message: types.Message):
+            answers[message.chat.id].append(f"step2:{message.text}")
+
+        @bot.message_handler(func=lambda _: True)
+        def _first_step(message: types.Message):
+            time.sleep(0.01)  # slower than the arrival of the next message
+            answers[message.chat.id].append(f"step1:{message.text}")
+            bot.register_next_step_handler(message, _second_step)
+
+        # WHEN
+        updates = []
+        for chat_id in range(10):
+            updates.append(_message_update(2 * chat_id, chat_id, "first"))
+            updates.append(_message_update(2 * chat_id + 1, chat_id, "second"))
+        bot.process_new_updates(updates)
+        bot.dispatcher.join()
+
+        # THEN
+        assert answers == {
+            chat_id: ["step1:first", "step2:second"] for chat_id in range(10)
+        }
+        assert bot.last_update_id == 19
+
+    def test_send_message_errors_counted(self, bot: OrderedTeleBot, monkeypatch):
+        # GIVEN
+        error = ApiTelegramException(
+            "sendMessage",
+            None,
+            {
+                "error_code": 429,
+                "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": 1},
+            },
+        )
+        monkeypatch.setattr(
+            telebot.TeleBot, "send_message", mock.Mock(side_effect=error)
+        )
+        errors = TELEGRAM_ERRORS.value(method="sendMessage", code="429")
+        rate_limited = TELEGRAM_RATE_LIMITED.value(method="sendMessage")
+        requests = TELEGRAM_REQUEST_DURATION.count(method="sendMessage")
+
+        # WHEN
+        with pytest.raises(ApiTelegramException):
+            bot.send_message(42, "hi")
+
+        # THEN
+        assert TELEGRAM_ERRORS.value(method="sendMessage", code="429") == errors + 1
+        assert TELEGRAM_RATE_LIMITED.value(method="sendMessage") == rate_limited + 1
+        assert TELEGRAM_REQUEST_DURATION.count(method="sendMessage") == requests + 1
+
+    def test_describe_update(self):
+        assert describe_update(_message_update(3, 42, "/join@bot")) == (
+            "update 3 (/join)"
+        )
+        assert describe_update(_message_update(4, 42, "1234")) == "update 4 (text)"
+
+    def test_chat_key(self):
+        assert chat_key(_message_update(1, 42, "hi")) == 42
+        update = types.Update.de_json({"update_id": 7})
+        assert update is not None
+        assert chat_key(update) == ("update", 7)
@@ -0,0 +1,29 @@
+from sqlmodel import create_engine
+
+from src.applications.bot.metrics import register_runtime_gauges
+from src.models.user import User
+from src.shared.cache import TTLCache
+from src.shared.metrics import REGISTRY
+
+
+class TestRuntimeGauges:
+    def test_user_cache_exported(self, real_user_factory):
+        # GIVEN
+        engine = create_engine("sqlite://")
+        cache: TTLCache[int, User] = TTLCache(max_size=10, ttl_seconds=5)
+        register_runtime_gauges(
+            engine.pool,
+            updates_pending=lambda: 0,
+            conversations_pending=lambda: 0,
+            user_cache=cache,
+        )
+        # WHEN
+        cache.put(1, real_user_factory(id=1))
+        cache.get(1)
+        cache.get(2)
+        # THEN
+        metrics = REGISTRY.render()
+        assert "user_cache_hits_total 1\n" in metrics
+        assert "user_cache_misses_total 1\n" in metrics
+        assert "user_cache_size 1\n" in metrics
+        engine.dispose()
@@ -0,0 +1,28 @@
+import json
+
+from src.applications.bot.utils import BuildInfo, get_build_info
+
+
+class TestGetBuildInfo:
+    def test_read_from_file(self, tmp_path):
+        # GIVEN
+        path = tmp_path / "build-info.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "branch_name": "main",
+                    "commit_hash": "abc1234",
+                    "commit_message": "Release",
+                }
+            )
+        )
+        # WHEN / THEN
+        assert get_build_info(path) == BuildInfo("main", "abc1234", "Release")
+
+    def test_missing_file(self, tmp_path):
+        assert get_build_info(tmp_path / "build-info.json") is None
+
+    def test_malformed_file(self, tmp_path):
+        path = tmp_path / "build-info.json"
+        path.write_text('{"commit_hash": "abc1234"}')
+        assert get_build_info(path) is None
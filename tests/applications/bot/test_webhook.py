@@ -0,0 +1,208 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+import requests
+from sqlmodel import create_engine
+from telebot import apihelper
+
+from src.applications.bot.app import BotApp
+from src.applications.bot.webhook import (
+    SECRET_TOKEN_HEADER,
+    WebhookConfig,
+    WebhookServer,
+)
+from src.repositories.database import DatabaseRepository
+from src.services.moroz import Moroz
+
+SECRET = "s3cret"
+
+
+class FakeTelegram:
+    """A local stand-in for the Bot API recording the calls made to it."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict[str, str]]] = []
+        self.received = threading.Condition()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                url = urlsplit(self.path)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                params = dict(parse_qsl(url.query)) | dict(parse_qsl(body.decode()))
+                method = url.path.rsplit("/", 1)[-1]
+                with fake.received:
+                    fake.calls.append((method, params))
+                    fake.received.notify_all()
+                result: object = True
+                if method == "sendMessage":
+                    result = {
+                        "message_id": len(fake.calls),
+                        "date": 0,
+                        "chat": {"id": int(params["chat_id"]), "type": "private"},
+                        "text": params["text"],
+                    }
+                payload = json.dumps({"ok": True, "result": result}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_address[1]
+
+    def wait_for(self, method: str, timeout: float = 5) -> dict[str, str]:
+        with self.received:
+            assert self.received.wait_for(
+                lambda: any(m == method for m, _ in self.calls), timeout
+            ), f"{method} was not called; calls: {self.calls}"
+            return next(params for m, params in self.calls if m == method)
+
+
+def _update(update_id: int, chat_id: int, text: str) -> dict:
+    chat = {
+        "id": chat_id,
+        "type": "private",
+        "first_name": "Alice",
+        "username": "alice",
+    }
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": chat,
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Alice"},
+            "text": text,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(text)}],
+        },
+    }
+
+
+class TestWebhook:
+    @pytest.fixture
+    def fake_telegram(self, monkeypatch) -> Iterator[FakeTelegram]:
+        fake = FakeTelegram()
+        thread = threading.Thread(target=fake.httpd.serve_forever, daemon=True)
+        thread.start()
+        monkeypatch.setattr(
+            apihelper, "API_URL", f"http://127.0.0.1:{fake.port}/bot{{0}}/{{1}}"
+        )
+        yield fake
+        fake.httpd.shutdown()
+        fake.httpd.server_close()
+
+    @pytest.fixture
+    def bot_app(self, fake_telegram, tmp_path) -> Iterator[BotApp]:
+        engine = create_engine(f"sqlite:///{tmp_path / 'webhook.db'}")
+        moroz = Moroz(
+            database_repository=DatabaseRepository(engine),
+            max_rooms_managed_by_user=2,
+            min_players_to_start_game=3,
+        )
+        app = BotApp(
+            api_token="123:TEST",
+            moroz=moroz,
+            webhook=WebhookConfig(
+                url="https://bot.example.com/webhook",
+                secret_token=SECRET,
+                listen_host="127.0.0.1",
+                listen_port=0,
+            ),
+        )
+        thread = threading.Thread(target=app.run, daemon=True)
+        thread.start()
+        fake_telegram.wait_for("setWebhook")
+        yield app
+        app.stop()
+        thread.join(timeout=5)
+        engine.dispose()
+
+    @pytest.fixture
+    def webhook_url(self, bot_app: BotApp) -> str:
+        assert bot_app.webhook_server is not None
+        host, port = bot_app.webhook_server.server_address
+        return f"http://{host}:{port}/webhook"
+
+    def test_webhook_registered_with_secret(self, fake_telegram, bot_app):
+        params = fake_telegram.wait_for("setWebhook")
+        assert params["url"] == "https://bot.example.com/webhook"
+        assert params["secret_token"] == SECRET
+
+    def test_update_acknowledged_and_processed(self, fake_telegram, webhook_url):
+        # WHEN
+        response = requests.post(
+            webhook_url,
+            json=_update(1, chat_id=777, text="/start"),
+            headers={SECRET_TOKEN_HEADER: SECRET},
+            timeout=5,
+        )
+        # THEN
+        assert response.status_code == 200
+        params = fake_telegram.wait_for("sendMessage")
+        assert params["chat_id"] == "777"
+        assert params["text"].startswith("Welcome, Alice!")
+
+    @pytest.mark.parametrize("headers", [{}, {SECRET_TOKEN_HEADER: "wrong"}])
+    def test_wrong_secret_rejected(self, fake_telegram, webhook_url, headers):
+        response = requests.post(
+            webhook_url,
+            json=_update(1, chat_id=777, text="/start"),
+            headers=headers,
+            timeout=5,
+        )
+        assert response.status_code == 403
+
+    def test_malformed_update_rejected(self, webhook_url):
+        response = requests.post(
+            webhook_url,
+            data=b"not json",
+            headers={SECRET_TOKEN_HEADER: SECRET},
+            timeout=5,
+        )
+        assert response.status_code == 400
+
+    def test_unknown_path(self, webhook_url):
+        response = requests.post(
+            webhook_url.replace("/webhook", "/other"),
+            json={},
+            headers={SECRET_TOKEN_HEADER: SECRET},
+            timeout=5,
+        )
+        assert response.status_code == 404
+
+
+class TestWebhookWithoutSecret:
+    def test_requests_rejected(self, bot_mock):
+        # GIVEN: a secret token is required by the settings, but not here
+        server = WebhookServer(
+            bot_mock,
+            WebhookConfig(
+                url="https://bot.example.com/webhook",
+                listen_host="127.0.0.1",
+                listen_port=0,
+            ),
+        )
+        request = MagicMock(spec=BaseHTTPRequestHandler)
+        request.path = "/webhook"
+        request.headers = {SECRET_TOKEN_HEADER: ""}
+        request.client_address = ("127.0.0.1", 12345)
+        # WHEN / THEN
+        try:
+            assert server._receive(request) == HTTPStatus.FORBIDDEN
+            bot_mock.process_new_updates.assert_not_called()
+        finally:
+            server._httpd.server_close()
@@ -0,0 +1,12 @@
+from benchmarks.assignment import CASES, main, run
+
+
+class TestAssignmentBenchmark:
+    def test_every_case_runs(self):
+        results = run(participants=40, exclusions=4, repeat=1)
+        assert [r.case for r in results] == list(CASES)
+        assert all(r.cycles >= 1 for r in results)
+
+    def test_main(self, capsys):
+        assert main(["--participants", "20", "--exclusions", "2", "--repeat", "1"]) == 0
+        assert "families" in capsys.readouterr().out
@@ -0,0 +1,26 @@
+from benchmarks.commands import SCENARIOS, Result, main, regressions, run
+
+
+class TestCommandsBenchmark:
+    def test_every_scenario_runs(self):
+        results = run(sizes=[4], repeat=1)
+        assert [r.command for r in results] == list(SCENARIOS)
+        assert all(r.telegram_calls > 0 for r in results)
+
+    def test_regressions(self):
+        # GIVEN
+        baseline = {"p50_ms": 10.0, "statements": 4, "telegram_calls": 5}
+        result = Result("/me", 4, 10.5, 11, 12, statements=4, telegram_calls=5)
+        # WHEN / THEN
+        assert regressions(result, baseline, tolerance=0.25) == []
+        result.p50_ms, result.statements = 20.0, 5
+        assert regressions(result, baseline, tolerance=0.25) == [
+            "SQL 4 -> 5",
+            "p50 10.00 -> 20.00 ms",
+        ]
+
+    def test_baseline_round_trip(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        args = ["--sizes", "4", "--repeat", "1", "--command", "/me"]
+        assert main([*args, "--baseline", str(baseline), "--update-baseline"]) == 0
+        assert main([*args, "--baseline", str(baseline), "--tolerance", "100"]) == 0
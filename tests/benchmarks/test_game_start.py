@@ -0,0 +1,13 @@
+from benchmarks.game_start import METHODS, main, run
+
+
+class TestGameStartBenchmark:
+    def test_every_method_runs(self):
+        results = run(sizes=[4, 8], repeat=1)
+        assert [r.method for r in results] == list(METHODS) * 2
+        # as many statements whatever the size of the room
+        assert results[1].statements == results[3].statements
+
+    def test_main(self, capsys):
+        assert main(["--sizes", "4", "--repeat", "1"]) == 0
+        assert "start_game" in capsys.readouterr().out
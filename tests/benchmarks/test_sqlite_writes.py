@@ -0,0 +1,12 @@
+from benchmarks.sqlite_writes import PROFILES, main, run
+
+
+class TestSQLiteWritesBenchmark:
+    def test_every_profile_runs(self):
+        results = run(threads=2, operations=4, write_ratio=0.5)
+        assert [r.profile for r in results] == list(PROFILES)
+        assert all(r.writes_per_second > 0 and r.locked == 0 for r in results)
+
+    def test_main(self, capsys):
+        assert main(["--threads", "2", "--operations", "2"]) == 0
+        assert "production profile" in capsys.readouterr().out
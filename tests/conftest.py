@@ -1,3 +1,5 @@
+import asyncio
+from collections.abc import Iterator
 from unittest.mock import MagicMock
 
 import pytest
@@ -8,9 +10,20 @@ from src.repositories.database import DatabaseRepository
 from src.services.moroz import Moroz
 
 
+@pytest.fixture
+def runner() -> Iterator[asyncio.Runner]:
+    """One event loop for all the steps of a test of async code."""
+    with asyncio.Runner() as runner:
+        yield runner
+
+
 @pytest.fixture
 def moroz_mock() -> MagicMock:
-    return MagicMock(spec=Moroz)
+    moroz = MagicMock(spec=Moroz)
+    # as outside of a unit of work
+    moroz.after_commit.side_effect = lambda callback: callback()
+    moroz.run_in_unit_of_work.side_effect = lambda work, **_: work()
+    return moroz
 
 
 @pytest.fixture
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+
+from src.repositories.async_database import AsyncDatabaseRepository
+from src.repositories.database import DatabaseRepository
+from src.shared.cache import TTLCache
+
+
+@pytest.fixture(scope="function")
+def database_repo():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    repo = DatabaseRepository(engine)
+    yield repo
+    engine.dispose()
+
+
+@pytest.fixture
+def async_database_repo(runner):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    repo = AsyncDatabaseRepository(engine, user_cache=TTLCache(100, 60))
+    runner.run(repo.migrate())
+    yield repo
+    runner.run(engine.dispose())
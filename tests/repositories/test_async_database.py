@@ -0,0 +1,153 @@
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.repositories.async_database import AsyncDatabaseRepository
+from src.shared.exceptions import NotInRoom, RoomNotFound, UserNotFound
+
+
+class TestAsyncDatabaseRepository:
+    def test_same_results_and_exceptions(
+        self, runner: asyncio.Runner, async_database_repo: AsyncDatabaseRepository
+    ):
+        # GIVEN
+        repo = async_database_repo
+        manager = runner.run(repo.create_user(1, "manager", "Manager"))
+        room = runner.run(repo.create_room(created_by_user_id=manager.id))
+
+        # WHEN
+        runner.run(repo.join_room(manager.id, room.id))
+        snapshot = runner.run(repo.get_room_snapshot(room.id))
+
+        # THEN
+        assert [u.id for u in snapshot.participants] == [manager.id]
+        assert runner.run(repo.get_user(manager.id)).room_id == room.id
+        with pytest.raises(UserNotFound):
+            runner.run(repo.get_user(2))
+        with pytest.raises(RoomNotFound):
+            runner.run(repo.get_room("none"))
+        runner.run(repo.leave_room(manager.id))
+        with pytest.raises(NotInRoom):
+            runner.run(repo.leave_room(manager.id))
+
+    def test_unit_of_work_commits_once(
+        self, runner: asyncio.Runner, async_database_repo: AsyncDatabaseRepository
+    ):
+        # GIVEN
+        repo = async_database_repo
+        calls: list[str] = []
+
+        async def _create_and_join():
+            async with repo.unit_of_work():
+                await repo.create_user(1, "manager", "Manager")
+                room = await repo.create_room(created_by_user_id=1)
+                await repo.join_room(1, room.id)
+                await repo.after_commit(lambda: calls.append("sync"))
+
+                async def _deferred():
+                    calls.append("async")
+
+                await repo.after_commit(_deferred)
+                # THEN: deferred until the commit
+                assert calls == []
+                return room
+
+        # WHEN
+        room = runner.run(_create_and_join())
+
+        # THEN
+        assert calls == ["sync", "async"]
+        assert runner.run(repo.get_user(1)).room_id == room.id
+
+    def test_unit_of_work_rolls_back(
+        self, runner: asyncio.Runner, async_database_repo: AsyncDatabaseRepository
+    ):
+        # GIVEN
+        repo = async_database_repo
+        calls: list[str] = []
+
+        async def _create_and_fail():
+            async with repo.unit_of_work():
+                await repo.create_user(1, "manager", "Manager")
+                await repo.after_commit(lambda: calls.append("done"))
+                await repo.get_room("none")
+
+        # WHEN
+        with pytest.raises(RoomNotFound):
+            runner.run(_create_and_fail())
+
+        # THEN
+        assert calls == []
+        with pytest.raises(UserNotFound):
+            runner.run(repo.get_user(1))
+
+    def test_write_invalidates_cache(
+        self, runner: asyncio.Runner, async_database_repo: AsyncDatabaseRepository
+    ):
+        # GIVEN: a cached user
+        repo = async_database_repo
+        runner.run(repo.create_user(1, "manager", "Manager"))
+        runner.run(repo.get_user(1))
+        # WHEN
+        runner.run(repo.set_user_name(1, "Santa"))
+        # THEN
+        assert runner.run(repo.get_user(1)).name == "Santa"
+
+    def test_concurrent_units_of_work(self, runner: asyncio.Runner, tmp_path):
+        # GIVEN: a file database, i.e. a connection per unit of work
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}")
+        repo = AsyncDatabaseRepository(engine)
+        runner.run(repo.migrate())
+
+        async def _register(user_id: int):
+            async with repo.unit_of_work():
+                await repo.create_user(user_id, f"user{user_id}", None)
+                await asyncio.sleep(0)
+                return await repo.get_user(user_id)
+
+        async def _register_all():
+            return await asyncio.gather(*(_register(i) for i in range(20)))
+
+        # WHEN
+        users = runner.run(_register_all())
+
+        # THEN
+        assert [u.id for u in users] == list(range(20))
+        runner.run(engine.dispose())
+
+    def test_transient_read_error_retried(
+        self, runner: asyncio.Runner, async_database_repo: AsyncDatabaseRepository
+    ):
+        # GIVEN
+        repo = async_database_repo
+        runner.run(repo.create_user(1, "user", "User"))
+        delays: list[float] = []
+
+        async def _sleep(delay: float):
+            delays.append(delay)
+
+        repo._sleep = _sleep
+        failures = iter(range(1))
+
+        def _before_cursor_execute(_conn, _cursor, statement, parameters, *_):
+            if next(failures, None) is not None:
+                raise OperationalError(
+                    statement,
+                    parameters,
+                    sqlite3.OperationalError("database is locked"),
+                )
+
+        event.listen(
+            repo.engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+        )
+
+        # WHEN
+        rooms = runner.run(repo.get_rooms_managed_by_user(1))
+
+        # THEN
+        assert rooms == []
+        assert len(delays) == 1
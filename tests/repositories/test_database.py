@@ -0,0 +1,709 @@
+import sqlite3
+from contextlib import nullcontext
+
+import pytest
+from pydantic_extra_types.pendulum_dt import DateTime
+from sqlalchemy import event, update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlmodel import col, create_engine
+
+from src.models.room import Room
+from src.repositories.database import DatabaseRepository, is_lock_contention
+from src.repositories.engine import create_database_engine
+from src.repositories.sqlite import SQLiteProfile
+from src.shared.cache import TTLCache
+from src.shared.exceptions import (
+    GameAlreadyCompleted,
+    GameAlreadyStarted,
+    NotInRoom,
+    RoomBusy,
+    RoomNotFound,
+    TargetNotAssigned,
+    UserNotFound,
+)
+
+
+class TestDissolveRoom:
+    def test_dissolve_room_clears_members(self, database_repo: DatabaseRepository):
+        # GIVEN
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        room = database_repo.create_room(created_by_user_id=manager.id)
+        other_room = database_repo.create_room(created_by_user_id=manager.id)
+        members = [
+            database_repo.create_user(id=10 + i, username=f"m{i}", name=f"M{i}")
+            for i in range(3)
+        ]
+        for member in members:
+            database_repo.join_room(user_id=member.id, room_id=room.id)
+        outsider = database_repo.create_user(id=99, username="out", name="Out")
+        database_repo.join_room(user_id=outsider.id, room_id=other_room.id)
+
+        # WHEN
+        dissolved = database_repo.dissolve_room(room.id)
+
+        # THEN
+        assert {u.id for u in dissolved} == {m.id for m in members}
+        assert all(u.room_id is None for u in dissolved)
+        assert database_repo.get_users_in_room(room.id) == []
+        assert database_repo.get_user(outsider.id).room_id == other_room.id
+
+    def test_dissolve_empty_room(self, database_repo: DatabaseRepository):
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        room = database_repo.create_room(created_by_user_id=manager.id)
+        assert database_repo.dissolve_room(room.id) == []
+
+    def test_dissolve_room_not_found(self, database_repo: DatabaseRepository):
+        with pytest.raises(RoomNotFound):
+            database_repo.dissolve_room("deadbeef")
+
+
+class TestUnitOfWork:
+    @pytest.fixture
+    def file_repo(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'uow.db'}")
+        checkouts: list[int] = []
+        event.listen(engine, "checkout", lambda *_: checkouts.append(1))
+        repo = DatabaseRepository(engine)
+        yield repo, checkouts
+        engine.dispose()
+
+    def test_single_checkout_per_unit_of_work(self, file_repo):
+        # GIVEN
+        repo, checkouts = file_repo
+        manager = repo.create_user(id=1, username="manager", name="Manager")
+        room = repo.create_room(created_by_user_id=manager.id)
+        checkouts.clear()
+
+        # WHEN
+        with repo.unit_of_work():
+            repo.get_user(manager.id)
+            repo.join_room(user_id=manager.id, room_id=room.id)
+            repo.get_rooms_managed_by_user(manager.id)
+            left_room = repo.leave_room(manager.id)
+
+        # THEN
+        assert len(checkouts) == 1
+        assert left_room.id == room.id
+        assert repo.get_user(manager.id).room_id is None
+
+    def test_leave_room_uses_one_connection(self, file_repo):
+        repo, checkouts = file_repo
+        manager = repo.create_user(id=1, username="manager", name="Manager")
+        room = repo.create_room(created_by_user_id=manager.id)
+        repo.join_room(user_id=manager.id, room_id=room.id)
+        checkouts.clear()
+
+        repo.leave_room(manager.id)
+
+        assert len(checkouts) == 1
+
+    def test_rollback_on_error(self, file_repo):
+        # GIVEN
+        repo, _ = file_repo
+        repo.create_user(id=1, username="manager", name="Manager")
+
+        # WHEN
+        with pytest.raises(UserNotFound), repo.unit_of_work():
+            repo.set_user_name(1, "Renamed")
+            repo.get_user(2)
+
+        # THEN
+        assert repo.get_user(1).name == "Manager"
+
+    def test_after_commit_deferred_until_commit(self, database_repo):
+        # GIVEN
+        calls: list[str] = []
+        # WHEN
+        with database_repo.unit_of_work():
+            database_repo.after_commit(lambda: calls.append("done"))
+            # THEN
+            assert calls == []
+        assert calls == ["done"]
+
+    def test_after_commit_dropped_on_rollback(self, database_repo):
+        # GIVEN
+        calls: list[str] = []
+        # WHEN
+        with pytest.raises(UserNotFound), database_repo.unit_of_work():
+            database_repo.after_commit(lambda: calls.append("done"))
+            database_repo.get_user(1)
+        # THEN
+        assert calls == []
+
+    def test_after_commit_outside_unit_of_work_runs_now(self, database_repo):
+        calls: list[str] = []
+        database_repo.after_commit(lambda: calls.append("done"))
+        assert calls == ["done"]
+
+
+class TestTargets:
+    @pytest.fixture
+    def room_with_targets(self, database_repo: DatabaseRepository):
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        room = database_repo.create_room(created_by_user_id=manager.id)
+        for i in (2, 3, 4):
+            database_repo.create_user(id=i, username=f"p{i}", name=f"P{i}")
+        database_repo.assign_targets(room.id, [(2, 3), (3, 4), (4, 2)])
+        return room
+
+    @pytest.fixture
+    def statements(self, database_repo: DatabaseRepository):
+        executed: list[str] = []
+        event.listen(
+            database_repo.engine,
+            "before_cursor_execute",
+            lambda _conn, _cursor, statement, *_: executed.append(statement),
+        )
+        return executed
+
+    def test_get_target_single_query(
+        self, database_repo, room_with_targets, statements
+    ):
+        target = database_repo.get_target(room_with_targets.id, 3)
+
+        assert target.id == 4
+        assert len(statements) == 1
+
+    def test_get_target_not_assigned(self, database_repo, room_with_targets):
+        with pytest.raises(TargetNotAssigned):
+            database_repo.get_target(room_with_targets.id, 1)
+
+    def test_get_targets_in_room(self, database_repo, room_with_targets, statements):
+        pairs = database_repo.get_targets_in_room(room_with_targets.id)
+
+        assert sorted((g.id, r.id) for g, r in pairs) == [(2, 3), (3, 4), (4, 2)]
+        assert len(statements) == 1
+
+
+class TestStartGame:
+    @pytest.fixture
+    def room(self, database_repo: DatabaseRepository):
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        room = database_repo.create_room(created_by_user_id=manager.id)
+        for i in (2, 3, 4):
+            database_repo.create_user(id=i, username=f"p{i}", name=f"P{i}")
+            database_repo.join_room(i, room.id)
+        return room
+
+    def test_targets_and_started_dt_set_together(
+        self, database_repo: DatabaseRepository, room
+    ):
+        # GIVEN
+        executed: list[str] = []
+        event.listen(
+            database_repo.engine,
+            "before_cursor_execute",
+            lambda _conn, _cursor, statement, *_: executed.append(statement),
+        )
+
+        # WHEN
+        database_repo.start_game(
+            room.id, [(2, 3), (3, 4), (4, 2)], started_dt=DateTime.utcnow()
+        )
+
+        # THEN: one INSERT of all the targets and one UPDATE of the room
+        writes = [s.split()[0] for s in executed if s.startswith(("INSERT", "UPDATE"))]
+        assert sorted(writes) == ["INSERT", "UPDATE"]
+        assert database_repo.get_room(room.id).game_started
+        pairs = database_repo.get_targets_in_room(room.id)
+        assert sorted((g.id, r.id) for g, r in pairs) == [(2, 3), (3, 4), (4, 2)]
+
+    def test_already_started(self, database_repo: DatabaseRepository, room):
+        # GIVEN
+        database_repo.start_game(room.id, [(2, 3), (3, 4), (4, 2)], DateTime.utcnow())
+
+        # WHEN
+        with pytest.raises(GameAlreadyStarted):
+            database_repo.start_game(
+                room.id, [(2, 4), (4, 3), (3, 2)], DateTime.utcnow()
+            )
+
+        # THEN: the targets of the first start are kept
+        pairs = database_repo.get_targets_in_room(room.id)
+        assert sorted((g.id, r.id) for g, r in pairs) == [(2, 3), (3, 4), (4, 2)]
+
+    def test_members_changed(self, database_repo: DatabaseRepository, room):
+        # GIVEN: 5 joined after the targets were drawn for 2, 3 and 4
+        database_repo.create_user(id=5, username="p5", name="P5")
+        database_repo.join_room(5, room.id)
+
+        # WHEN
+        with pytest.raises(RoomBusy):
+            database_repo.start_game(
+                room.id, [(2, 3), (3, 4), (4, 2)], DateTime.utcnow()
+            )
+
+        # THEN
+        assert not database_repo.get_room(room.id).game_started
+
+    def test_room_not_found(self, database_repo: DatabaseRepository):
+        with pytest.raises(RoomNotFound):
+            database_repo.start_game("missing", [], DateTime.utcnow())
+
+    def test_failed_insert_does_not_start(
+        self, database_repo: DatabaseRepository, room
+    ):
+        # WHEN: a giver has two targets, which the unique index refuses
+        with pytest.raises(IntegrityError):
+            database_repo.start_game(
+                room.id, [(2, 3), (3, 4), (4, 2), (2, 4)], DateTime.utcnow()
+            )
+
+        # THEN
+        assert not database_repo.get_room(room.id).game_started
+        assert database_repo.get_targets_in_room(room.id) == []
+
+
+class TestJoinByShortCode:
+    @pytest.fixture
+    def room(self, database_repo: DatabaseRepository):
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        database_repo.create_user(id=2, username="player", name="Player")
+        return database_repo.create_room(created_by_user_id=manager.id)
+
+    @pytest.fixture
+    def statements(self, database_repo: DatabaseRepository):
+        executed: list[str] = []
+        event.listen(
+            database_repo.engine,
+            "before_cursor_execute",
+            lambda _conn, _cursor, statement, *_: executed.append(statement),
+        )
+        return executed
+
+    def test_join_in_one_statement(
+        self, database_repo: DatabaseRepository, room, statements
+    ):
+        # WHEN
+        joined = database_repo.join_room_by_short_code(2, room.short_code)
+
+        # THEN
+        assert len(statements) == 1
+        assert joined.model_dump() == room.model_dump()
+        assert database_repo.get_user(2).room_id == room.id
+
+    def test_loaded_user_updated_in_unit_of_work(
+        self, database_repo: DatabaseRepository, room
+    ):
+        with database_repo.unit_of_work():
+            user = database_repo.get_user(2)
+            database_repo.join_room_by_short_code(2, room.short_code)
+
+            assert user.room_id == room.id
+
+    def test_active_room_preferred(self, database_repo: DatabaseRepository, room):
+        # GIVEN: a completed room used the same code before
+        old_room = database_repo.create_room(created_by_user_id=1)
+        database_repo.set_game_completed(old_room.id, DateTime.utcnow())
+        with database_repo.engine.begin() as conn:
+            conn.execute(
+                update(Room)
+                .where(col(Room.id) == old_room.id)
+                .values(short_code=room.short_code)
+            )
+
+        # WHEN
+        joined = database_repo.join_room_by_short_code(2, room.short_code)
+
+        # THEN
+        assert joined.id == room.id
+
+    @pytest.mark.parametrize(
+        "started, completed, error",
+        [
+            (True, False, GameAlreadyStarted),
+            (True, True, GameAlreadyStarted),
+            (False, True, GameAlreadyCompleted),
+        ],
+    )
+    def test_not_joinable(
+        self,
+        database_repo: DatabaseRepository,
+        room,
+        statements,
+        started,
+        completed,
+        error,
+    ):
+        # GIVEN
+        if started:
+            database_repo.start_game(room.id, [], DateTime.utcnow())
+        if completed:
+            database_repo.set_game_completed(room.id, DateTime.utcnow())
+        statements.clear()
+
+        # WHEN
+        with pytest.raises(error):
+            database_repo.join_room_by_short_code(2, room.short_code)
+
+        # THEN: the failed UPDATE and one read of the reason
+        assert len(statements) == 2
+        assert database_repo.get_user(2).room_id is None
+
+    def test_room_not_found(self, database_repo: DatabaseRepository, room):
+        with pytest.raises(RoomNotFound):
+            database_repo.join_room_by_short_code(2, room.short_code + 1)
+
+    def test_user_not_found(self, database_repo: DatabaseRepository, room):
+        with pytest.raises(UserNotFound):
+            database_repo.join_room_by_short_code(3, room.short_code)
+
+
+class TestRoomLocks:
+    @pytest.fixture
+    def locked_repo(self, tmp_path):
+        path = tmp_path / "locks.db"
+        engine = create_database_engine(
+            f"sqlite:///{path}", sqlite_profile=SQLiteProfile(busy_timeout_ms=10)
+        )
+        repo = DatabaseRepository(engine)
+        manager = repo.create_user(id=1, username="manager", name="Manager")
+        room = repo.create_room(created_by_user_id=manager.id)
+        yield repo, room, path
+        engine.dispose()
+
+    def test_busy_room(self, locked_repo):
+        # GIVEN: another connection is writing
+        repo, room, path = locked_repo
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+
+        # WHEN / THEN
+        try:
+            with pytest.raises(RoomBusy):
+                repo.join_room(user_id=1, room_id=room.id)
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+        repo.join_room(user_id=1, room_id=room.id)
+
+    def test_join_started_room_refused(self, locked_repo):
+        repo, room, _ = locked_repo
+        repo.start_game(room.id, [], DateTime.utcnow())
+
+        with pytest.raises(GameAlreadyStarted):
+            repo.join_room(user_id=1, room_id=room.id)
+
+    def test_complete_twice_refused(self, locked_repo):
+        repo, room, _ = locked_repo
+        repo.set_game_completed(room.id, DateTime.utcnow())
+
+        with pytest.raises(GameAlreadyCompleted):
+            repo.set_game_completed(room.id, DateTime.utcnow())
+
+    def test_kick_only_from_the_room(self, locked_repo):
+        # GIVEN: the player has moved to another room
+        repo, room, _ = locked_repo
+        player = repo.create_user(id=2, username=None, name="Player")
+        other_manager = repo.create_user(id=3, username=None, name="Other")
+        other_room = repo.create_room(created_by_user_id=other_manager.id)
+        repo.join_room(player.id, other_room.id)
+
+        # WHEN / THEN
+        with pytest.raises(NotInRoom):
+            repo.kick_from_room(room.id, player.id)
+        with pytest.raises(UserNotFound):
+            repo.kick_from_room(room.id, 4)
+        assert repo.get_user(player.id).room_id == other_room.id
+        assert repo.kick_from_room(other_room.id, player.id).id == other_room.id
+        assert repo.get_user(player.id).room_id is None
+
+    def test_lock_room_needs_unit_of_work(self, locked_repo):
+        repo, room, _ = locked_repo
+
+        with pytest.raises(RuntimeError):
+            repo.lock_room(room.id)
+        with repo.unit_of_work():
+            repo.lock_room(room.id)
+
+    def test_lock_contention(self):
+        class LockNotAvailable(Exception):
+            pgcode = "55P03"
+
+        assert is_lock_contention(OperationalError("", {}, LockNotAvailable()))
+        assert is_lock_contention(
+            OperationalError("", {}, sqlite3.OperationalError("database is locked"))
+        )
+        assert not is_lock_contention(
+            OperationalError("", {}, sqlite3.OperationalError("disk I/O error"))
+        )
+
+
+class TestTargetHistory:
+    def test_pairs_of_current_members_from_any_room(
+        self, database_repo: DatabaseRepository
+    ):
+        # GIVEN: users 2-4 played in an old room, 5 played with 2 elsewhere
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        old_room = database_repo.create_room(created_by_user_id=manager.id)
+        other_room = database_repo.create_room(created_by_user_id=manager.id)
+        for i in (2, 3, 4, 5):
+            database_repo.create_user(id=i, username=f"p{i}", name=f"P{i}")
+        database_repo.assign_targets(old_room.id, [(2, 3), (3, 4), (4, 2)])
+        database_repo.assign_targets(other_room.id, [(2, 5), (5, 2)])
+        # AND: 2, 3 and 5 are now in a new room
+        new_room = database_repo.create_room(created_by_user_id=manager.id)
+        for i in (2, 3, 5):
+            database_repo.join_room(i, new_room.id)
+
+        # WHEN
+        history = database_repo.get_target_history(new_room.id)
+
+        # THEN: only the pairs between 2, 3 and 5 are returned
+        assert sorted(history) == [(2, 3), (2, 5), (5, 2)]
+
+    def test_empty_room(self, database_repo: DatabaseRepository):
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        room = database_repo.create_room(created_by_user_id=manager.id)
+
+        assert database_repo.get_target_history(room.id) == []
+
+
+class TestRoomSnapshot:
+    def test_snapshot_with_target(self, database_repo: DatabaseRepository):
+        # GIVEN
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        room = database_repo.create_room(created_by_user_id=manager.id)
+        for i in (2, 3):
+            database_repo.create_user(id=i, username=f"p{i}", name=f"P{i}")
+            database_repo.join_room(user_id=i, room_id=room.id)
+        database_repo.assign_targets(room.id, [(2, 3), (3, 2)])
+        statements: list[str] = []
+        event.listen(
+            database_repo.engine,
+            "before_cursor_execute",
+            lambda _conn, _cursor, statement, *_: statements.append(statement),
+        )
+
+        # WHEN
+        snapshot = database_repo.get_room_snapshot(room.id, for_user_id=2)
+
+        # THEN
+        assert snapshot.room.id == room.id
+        assert snapshot.manager.id == manager.id
+        assert {u.id for u in snapshot.participants} == {2, 3}
+        assert snapshot.target is not None and snapshot.target.id == 3
+        assert len(statements) == 2
+
+    def test_snapshot_without_target(self, database_repo: DatabaseRepository):
+        manager = database_repo.create_user(id=1, username="manager", name="Manager")
+        room = database_repo.create_room(created_by_user_id=manager.id)
+
+        snapshot = database_repo.get_room_snapshot(room.id, for_user_id=1)
+
+        assert snapshot.participants == []
+        assert snapshot.target is None
+
+    def test_snapshot_room_not_found(self, database_repo: DatabaseRepository):
+        with pytest.raises(RoomNotFound):
+            database_repo.get_room_snapshot("deadbeef")
+
+
+class TestUserCache:
+    @pytest.fixture
+    def cached_repo(self, database_repo: DatabaseRepository) -> DatabaseRepository:
+        database_repo.user_cache = TTLCache(max_size=100, ttl_seconds=60)
+        return database_repo
+
+    def test_repeated_get_user_hits_cache(self, cached_repo: DatabaseRepository):
+        cached_repo.create_user(id=1, username="user", name="User")
+        statements: list[str] = []
+        event.listen(
+            cached_repo.engine,
+            "before_cursor_execute",
+            lambda _conn, _cursor, statement, *_: statements.append(statement),
+        )
+
+        first = cached_repo.get_user(1)
+        second = cached_repo.get_user(1)
+
+        assert first.id == second.id == 1
+        assert len(statements) == 1
+        assert cached_repo.user_cache is not None
+        assert cached_repo.user_cache.hits == 1
+
+    @pytest.mark.parametrize("in_unit_of_work", [False, True])
+    def test_writes_invalidate(self, cached_repo: DatabaseRepository, in_unit_of_work):
+        manager = cached_repo.create_user(id=1, username="manager", name="Manager")
+        room = cached_repo.create_room(created_by_user_id=manager.id)
+        cached_repo.get_user(1)
+
+        with cached_repo.unit_of_work() if in_unit_of_work else nullcontext():
+            cached_repo.set_user_name(1, "Renamed")
+            assert cached_repo.get_user(1).name == "Renamed"
+            cached_repo.join_room(user_id=1, room_id=room.id)
+            assert cached_repo.get_user(1).room_id == room.id
+            cached_repo.leave_room(user_id=1)
+            assert cached_repo.get_user(1).room_id is None
+            cached_repo.join_room(user_id=1, room_id=room.id)
+            cached_repo.dissolve_room(room.id)
+            assert cached_repo.get_user(1).room_id is None
+
+        assert cached_repo.get_user(1).name == "Renamed"
+
+    def test_rolled_back_write_not_cached(self, cached_repo: DatabaseRepository):
+        cached_repo.create_user(id=1, username="user", name="User")
+
+        with pytest.raises(UserNotFound), cached_repo.unit_of_work():
+            cached_repo.set_user_name(1, "Renamed")
+            cached_repo.get_user(1)
+            cached_repo.get_user(2)
+
+        assert cached_repo.get_user(1).name == "User"
+
+    def test_cached_user_not_shared(self, cached_repo: DatabaseRepository):
+        cached_repo.create_user(id=1, username="user", name="User")
+        cached_repo.get_user(1).name = "Changed by a caller"
+
+        assert cached_repo.get_user(1).name == "User"
+        cached = cached_repo.get_user(1)
+        cached.name = "Changed by a caller"
+        assert cached_repo.get_user(1).name == "User"
+
+    def test_read_older_than_a_write_not_cached(self, cached_repo: DatabaseRepository):
+        # GIVEN: another process commits a write of the user (and drops it
+        # from the cache) right after its row was read
+        cached_repo.create_user(id=1, username="user", name="User")
+        cache = cached_repo.user_cache
+        assert cache is not None
+
+        event.listen(
+            cached_repo.engine,
+            "after_cursor_execute",
+            lambda *_: cache.invalidate(1),
+            once=True,
+        )
+        # WHEN
+        cached_repo.get_user(1)
+        # THEN
+        assert len(cache) == 0
+
+    def test_unit_of_work_older_than_a_write_not_cached(
+        self, cached_repo: DatabaseRepository
+    ):
+        cached_repo.create_user(id=1, username="user", name="User")
+        cache = cached_repo.user_cache
+        assert cache is not None
+
+        with cached_repo.unit_of_work():
+            cached_repo.get_user(1)
+            cache.invalidate(1)  # by a write committed elsewhere
+            # THEN: read from the state of the session, not cached again
+            cached_repo.get_user(1)
+            assert len(cache) == 0
+
+
+class TestReadRetries:
+    @pytest.fixture
+    def delays(self, database_repo: DatabaseRepository) -> list[float]:
+        delays: list[float] = []
+        database_repo._sleep = delays.append
+        return delays
+
+    @staticmethod
+    def _fail_next(repo: DatabaseRepository, times: int):
+        """Make the next `times` statements fail as if the database were locked."""
+        failures = iter(range(times))
+
+        def _before_cursor_execute(_conn, _cursor, statement, parameters, *_):
+            if next(failures, None) is not None:
+                raise OperationalError(
+                    statement,
+                    parameters,
+                    sqlite3.OperationalError("database is locked"),
+                )
+
+        event.listen(repo.engine, "before_cursor_execute", _before_cursor_execute)
+
+    def test_transient_error_retried(
+        self, database_repo: DatabaseRepository, delays: list[float]
+    ):
+        # GIVEN
+        database_repo.create_user(id=1, username="user", name="User")
+        self._fail_next(database_repo, times=2)
+
+        # WHEN
+        user = database_repo.get_user(1)
+
+        # THEN
+        assert user.id == 1
+        assert len(delays) == 2
+        assert 0 <= delays[0] <= database_repo.read_retry_backoff
+        assert 0 <= delays[1] <= 2 * database_repo.read_retry_backoff
+
+    def test_gives_up_after_retries(
+        self, database_repo: DatabaseRepository, delays: list[float]
+    ):
+        # GIVEN
+        database_repo.create_user(id=1, username="user", name="User")
+        self._fail_next(database_repo, times=database_repo.read_retries + 1)
+
+        # WHEN / THEN
+        with pytest.raises(OperationalError):
+            database_repo.get_user(1)
+        assert len(delays) == database_repo.read_retries
+
+    def test_nested_reads_retried_once(
+        self, database_repo: DatabaseRepository, delays: list[float]
+    ):
+        # GIVEN: get_rooms_managed_by_user reads the user first
+        database_repo.create_user(id=1, username="user", name="User")
+        self._fail_next(database_repo, times=1)
+
+        # WHEN
+        rooms = database_repo.get_rooms_managed_by_user(1)
+
+        # THEN
+        assert rooms == []
+        assert len(delays) == 1
+
+    def test_not_retried_in_unit_of_work(
+        self, database_repo: DatabaseRepository, delays: list[float]
+    ):
+        # GIVEN
+        database_repo.create_user(id=1, username="user", name="User")
+        self._fail_next(database_repo, times=1)
+
+        # WHEN / THEN
+        with pytest.raises(OperationalError), database_repo.unit_of_work():
+            database_repo.get_user(1)
+        assert delays == []
+
+    def test_unit_of_work_retried(
+        self, database_repo: DatabaseRepository, delays: list[float]
+    ):
+        # GIVEN
+        database_repo.create_user(id=1, username="user", name="User")
+        self._fail_next(database_repo, times=2)
+        attempts = []
+
+        def _work():
+            attempts.append(1)
+            database_repo.set_user_name(1, "Renamed")
+            return database_repo.get_user(1)
+
+        # WHEN
+        user = database_repo.run_in_unit_of_work(_work)
+
+        # THEN: run again as a whole, in a new transaction
+        assert user.name == "Renamed"
+        assert len(attempts) == len(delays) + 1 == 3
+
+    def test_unit_of_work_not_retried_if_not_retryable(
+        self, database_repo: DatabaseRepository, delays: list[float]
+    ):
+        database_repo.create_user(id=1, username="user", name="User")
+        self._fail_next(database_repo, times=1)
+
+        with pytest.raises(OperationalError):
+            database_repo.run_in_unit_of_work(
+                lambda: database_repo.get_user(1), retryable=lambda: False
+            )
+        assert delays == []
+
+    def test_not_found_not_retried(
+        self, database_repo: DatabaseRepository, delays: list[float]
+    ):
+        with pytest.raises(UserNotFound):
+            database_repo.get_user(1)
+        assert delays == []
@@ -0,0 +1,55 @@
+import pytest
+from pytest import LogCaptureFixture
+from pytest_loguru.plugin import caplog  # noqa: F401
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from src.repositories.engine import create_database_engine, pool_options
+
+
+class TestPoolOptions:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "postgresql+psycopg2://user@localhost/moroz",
+            "postgresql+asyncpg://user@localhost/moroz",
+            "sqlite:///moroz.db",
+        ],
+    )
+    def test_queue_pool_sized(self, url: str):
+        options = pool_options(url, pool_size=20, max_overflow=5, pool_timeout=3)
+        assert options == {
+            "pool_size": 20,
+            "max_overflow": 5,
+            "pool_timeout": 3,
+            "pool_recycle": 1800,
+            "pool_pre_ping": True,
+        }
+
+    def test_in_memory_sqlite_not_sized(self):
+        options = pool_options("sqlite:///:memory:", pool_size=20)
+        assert "pool_size" not in options
+        assert options["pool_pre_ping"] is True
+
+
+class TestCreateDatabaseEngine:
+    def test_pool_configured_and_logged(
+        self,
+        tmp_path,
+        caplog: LogCaptureFixture,  # noqa: F811
+    ):
+        # GIVEN
+        engine = create_database_engine(
+            f"sqlite:///{tmp_path / 'moroz.db'}", pool_size=2, max_overflow=1
+        )
+
+        # WHEN
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        engine.dispose()
+
+        # THEN
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == 2
+        assert "Database connection opened; pool: Pool size: 2" in caplog.text
+        assert "Database connection closed" in caplog.text
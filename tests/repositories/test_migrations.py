@@ -0,0 +1,151 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel, create_engine
+
+from src.models.target import Target
+from src.repositories.database import DatabaseRepository
+from src.repositories.migrations import HEAD_VERSION, get_schema_version, migrate
+
+
+def _index_names(engine, table: str) -> set[str]:
+    return {ix["name"] for ix in inspect(engine).get_indexes(table)}
+
+
+class TestMigrations:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+        yield engine
+        engine.dispose()
+
+    def test_fresh_database_migrated_to_head(self, engine):
+        # WHEN
+        version = migrate(engine)
+
+        # THEN
+        assert version == HEAD_VERSION
+        with engine.connect() as conn:
+            assert get_schema_version(conn) == HEAD_VERSION
+        assert "ix_user_room_id" in _index_names(engine, "user")
+        assert "ix_room_manager_user_id" in _index_names(engine, "room")
+        assert "ix_target_room_id_user_id" in _index_names(engine, "target")
+
+    def test_head_schema_matches_models(self, engine):
+        # WHEN: the frozen baseline and the migrations after it
+        migrate(engine)
+
+        # THEN
+        inspector = inspect(engine)
+        for table in SQLModel.metadata.tables.values():
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            assert columns == set(table.columns.keys())
+            assert _index_names(engine, table.name) == {ix.name for ix in table.indexes}
+
+    def test_concurrent_migration_waits(self, engine, tmp_path):
+        # GIVEN: a migration paused while creating the first table
+        other_engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+        paused, resume = threading.Event(), threading.Event()
+
+        def pause(_conn, _cursor, statement, *_):
+            if statement.startswith("CREATE TABLE room"):
+                paused.set()
+                resume.wait(timeout=5)
+
+        event.listen(engine, "before_cursor_execute", pause)
+        versions: list[int] = []
+        first = threading.Thread(target=lambda: versions.append(migrate(engine)))
+        first.start()
+        assert paused.wait(timeout=5)
+
+        # WHEN: another process starts meanwhile
+        second = threading.Thread(target=lambda: versions.append(migrate(other_engine)))
+        second.start()
+        time.sleep(0.2)
+        waited = second.is_alive()
+        resume.set()
+        first.join()
+        second.join()
+        other_engine.dispose()
+
+        # THEN: it waited, then found nothing left to apply
+        assert waited
+        assert versions == [HEAD_VERSION, HEAD_VERSION]
+        with engine.connect() as conn:
+            applied = conn.exec_driver_sql("SELECT version FROM schema_version").all()
+        assert sorted(v for (v,) in applied) == list(range(1, HEAD_VERSION + 1))
+
+    def test_legacy_database_gets_indexes(self, engine):
+        # GIVEN: tables created by the old create_all-on-start, without indexes
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for name in (
+                "ix_user_room_id",
+                "ix_room_manager_user_id",
+                "ix_target_room_id_user_id",
+            ):
+                conn.exec_driver_sql(f"DROP INDEX {name}")
+
+        # WHEN
+        migrate(engine)
+
+        # THEN
+        assert "ix_user_room_id" in _index_names(engine, "user")
+        assert "ix_target_room_id_user_id" in _index_names(engine, "target")
+
+    def test_duplicate_active_short_codes_reassigned(self, engine):
+        # GIVEN: a legacy database where two active rooms share a code
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_room_active_short_code")
+            conn.exec_driver_sql(
+                "INSERT INTO user (id, joined_dt) VALUES (1, '2024-01-01 00:00:00')"
+            )
+            for room_id, created_dt in (("old", "2024-01-01"), ("new", "2024-02-01")):
+                conn.exec_driver_sql(
+                    "INSERT INTO room (id, short_code, manager_user_id, created_dt) "
+                    f"VALUES ('{room_id}', 42, 1, '{created_dt} 00:00:00')"
+                )
+
+        # WHEN
+        migrate(engine)
+
+        # THEN: the newest room keeps the code
+        with engine.connect() as conn:
+            codes = dict(conn.exec_driver_sql("SELECT id, short_code FROM room").all())
+        assert codes["new"] == 42
+        assert codes["old"] != 42
+        assert "ix_room_active_short_code" in _index_names(engine, "room")
+
+    def test_up_to_date_startup_only_reads_version(self, engine):
+        # GIVEN
+        migrate(engine)
+        statements: list[str] = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda _conn, _cursor, statement, *_: statements.append(statement),
+        )
+
+        # WHEN
+        migrate(engine)
+
+        # THEN: only the schema_version lookups are executed
+        assert len(statements) == 2
+        assert all("schema_version" in s for s in statements)
+
+    def test_unique_target_per_user_in_room(self, engine):
+        # GIVEN
+        repo = DatabaseRepository(engine)
+        manager = repo.create_user(id=1, username="manager", name="Manager")
+        player = repo.create_user(id=2, username="player", name="Player")
+        room = repo.create_room(created_by_user_id=manager.id)
+        repo.assign_targets(room.id, [(manager.id, player.id)])
+
+        # WHEN / THEN
+        with pytest.raises(IntegrityError), repo.session() as s:
+            s.add(Target(room_id=room.id, user_id=manager.id, target_user_id=2))
+            s.commit()
@@ -0,0 +1,55 @@
+import pytest
+from pytest_loguru.plugin import caplog  # noqa: F401
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.repositories.database import DatabaseRepository
+from src.repositories.query_stats import instrument, track_queries
+
+
+class TestTrackQueries:
+    def test_statements_counted_and_timed(self, database_repo: DatabaseRepository):
+        # GIVEN
+        database_repo.create_user(id=1, username="user", name="User")
+        # WHEN
+        with track_queries("test") as stats:
+            database_repo.get_user(1)
+            database_repo.get_user(1)
+        # THEN
+        assert stats.statements == 2
+        assert stats.duration > 0
+
+    def test_nested_scopes(self, database_repo: DatabaseRepository):
+        database_repo.create_user(id=1, username="user", name="User")
+        with track_queries("outer") as outer:
+            database_repo.get_user(1)
+            with track_queries("inner") as inner:
+                database_repo.get_user(1)
+        assert (outer.statements, inner.statements) == (2, 1)
+
+    def test_outside_scope_not_counted(self, database_repo: DatabaseRepository):
+        with track_queries("test") as stats:
+            pass
+        database_repo.create_user(id=1, username="user", name="User")
+        assert stats.statements == 0
+
+    def test_failed_statement(self, database_repo: DatabaseRepository):
+        with track_queries("test") as stats:
+            with pytest.raises(OperationalError), database_repo.engine.connect() as c:
+                c.execute(text("SELECT * FROM missing_table"))
+            database_repo.get_targets_in_room("none")
+        assert stats.statements == 1
+
+    def test_instrument_idempotent(self, database_repo: DatabaseRepository):
+        # GIVEN: already instrumented by the repository
+        instrument(database_repo.engine)
+        # WHEN
+        with track_queries("test") as stats:
+            database_repo.get_targets_in_room("none")
+        # THEN
+        assert stats.statements == 1
+
+    def test_logged(self, database_repo: DatabaseRepository, caplog):  # noqa: F811
+        with track_queries("update 7 (/me)"):
+            database_repo.get_targets_in_room("none")
+        assert "Queries of update 7 (/me): 1 statements in" in caplog.text
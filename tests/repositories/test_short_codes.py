@@ -0,0 +1,115 @@
+from unittest import mock
+
+import pytest
+from pydantic_extra_types.pendulum_dt import DateTime
+
+from src.models.room import Room, format_short_code, parse_short_code
+from src.repositories.database import DatabaseRepository
+from src.repositories.short_codes import ShortCodeAllocator
+from src.shared.exceptions import RoomNotFound
+
+
+class TestShortCodeAllocator:
+    @pytest.mark.parametrize(
+        "active_rooms, expected_space",
+        [
+            (0, 10_000),
+            (4_999, 10_000),
+            (5_000, 100_000),
+            (50_000, 1_000_000),
+            (10_000_000, 1_000_000),
+        ],
+    )
+    def test_code_space_widens(self, active_rooms: int, expected_space: int):
+        allocator = ShortCodeAllocator(min_digits=4, max_digits=6, max_occupancy=0.5)
+        assert allocator.code_space(active_rooms) == expected_space
+
+    def test_candidates_are_distinct_and_in_space(self):
+        allocator = ShortCodeAllocator(min_digits=1, max_digits=1)
+        candidates = allocator.candidates(0)
+        assert len(set(candidates)) == len(candidates) == 8
+        assert all(0 <= c < 10 for c in candidates)
+
+    @pytest.mark.parametrize(
+        "active_rooms, low, high", [(0, 0, 10_000), (5_000, 10_000, 100_000)]
+    )
+    def test_widened_space_codes_have_its_digits(
+        self, active_rooms: int, low: int, high: int
+    ):
+        allocator = ShortCodeAllocator(min_digits=4, max_digits=6, max_occupancy=0.5)
+        for _ in range(100):
+            assert all(low <= c < high for c in allocator.candidates(active_rooms))
+
+
+class TestShortCodeDisplay:
+    @pytest.mark.parametrize(
+        "short_code, displayed",
+        [(7, "0007"), (1234, "1234"), (10_234, "10234"), (100_000, "100000")],
+    )
+    def test_display_round_trips(self, short_code: int, displayed: str):
+        room = Room(id="r", short_code=short_code, manager_user_id=1)
+        assert room.display_short_code == displayed
+        assert format_short_code(parse_short_code(displayed)) == displayed
+
+    @pytest.mark.parametrize("text", ["", "-1", "+12", "1_234", " 12", "١٢٣٤"])
+    def test_parse_rejects_non_ascii_digits(self, text: str):
+        with pytest.raises(ValueError):
+            parse_short_code(text)
+
+
+class TestRoomShortCodes:
+    @pytest.fixture
+    def tiny_code_repo(self, database_repo: DatabaseRepository) -> DatabaseRepository:
+        # a single-digit code space which never widens
+        database_repo.short_code_allocator = ShortCodeAllocator(
+            min_digits=1, max_digits=1, max_occupancy=1.0
+        )
+        database_repo.create_user(id=1, username="manager", name="Manager")
+        return database_repo
+
+    def test_codes_unique_among_active_rooms(self, tiny_code_repo):
+        rooms = [tiny_code_repo.create_room(created_by_user_id=1) for _ in range(10)]
+        assert sorted(room.short_code for room in rooms) == list(range(10))
+
+    def test_codes_of_completed_rooms_are_recycled(self, tiny_code_repo):
+        # GIVEN: the whole code space is taken, then one room completes
+        rooms = [tiny_code_repo.create_room(created_by_user_id=1) for _ in range(10)]
+        completed = rooms[3]
+        tiny_code_repo.set_game_completed(completed.id, DateTime.utcnow())
+
+        # WHEN
+        new_room = tiny_code_repo.create_room(created_by_user_id=1)
+
+        # THEN
+        assert new_room.short_code == completed.short_code
+        assert tiny_code_repo.get_room_by_short_code(new_room.short_code).id == (
+            new_room.id
+        )
+
+    def test_lookup_falls_back_to_completed_room(self, database_repo):
+        database_repo.create_user(id=1, username="manager", name="Manager")
+        room = database_repo.create_room(created_by_user_id=1)
+        database_repo.set_game_completed(room.id, DateTime.utcnow())
+
+        found = database_repo.get_room_by_short_code(room.short_code)
+
+        assert found.id == room.id
+        assert found.game_completed
+
+    def test_lookup_not_found(self, database_repo):
+        with pytest.raises(RoomNotFound):
+            database_repo.get_room_by_short_code(1234)
+
+    def test_concurrently_taken_code_is_retried(self, tiny_code_repo):
+        # GIVEN: the allocator believes code 0 is free although it is taken
+        taken = tiny_code_repo.create_room(created_by_user_id=1)
+        with mock.patch.object(
+            tiny_code_repo,
+            "_free_short_code",
+            side_effect=[taken.short_code, (taken.short_code + 1) % 10],
+        ):
+            # WHEN
+            room = tiny_code_repo.create_room(created_by_user_id=1)
+
+        # THEN
+        assert room.short_code == (taken.short_code + 1) % 10
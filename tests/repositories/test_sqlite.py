@@ -0,0 +1,111 @@
+import sqlite3
+
+import pytest
+from pytest import LogCaptureFixture
+from pytest_loguru.plugin import caplog  # noqa: F401
+from sqlalchemy import text
+
+from src.repositories.database import DatabaseRepository
+from src.repositories.engine import create_database_engine
+from src.repositories.sqlite import (
+    SQLiteMaintenance,
+    SQLiteProfile,
+    sqlite_database_path,
+    sqlite_maintenance,
+)
+
+
+class TestSQLiteProfile:
+    def test_pragmas_set_on_connect(self, tmp_path):
+        # GIVEN
+        engine = create_database_engine(
+            f"sqlite:///{tmp_path / 'moroz.db'}",
+            sqlite_profile=SQLiteProfile(busy_timeout_ms=1234, cache_size_kib=2048),
+        )
+
+        # WHEN
+        with engine.connect() as conn:
+            pragmas = {
+                name: conn.execute(text(f"PRAGMA {name}")).scalar()
+                for name in ("journal_mode", "busy_timeout", "synchronous")
+            }
+            cache_size = conn.execute(text("PRAGMA cache_size")).scalar()
+        engine.dispose()
+
+        # THEN
+        assert pragmas == {
+            "journal_mode": "wal",
+            "busy_timeout": 1234,
+            "synchronous": 1,
+        }
+        assert cache_size == -2048
+
+    def test_not_applied_without_profile(self, tmp_path):
+        engine = create_database_engine(f"sqlite:///{tmp_path / 'moroz.db'}")
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+        engine.dispose()
+
+    @pytest.mark.parametrize(
+        "url, path",
+        [
+            ("sqlite:////data/moroz.db", "/data/moroz.db"),
+            ("sqlite+aiosqlite:///moroz.db", "moroz.db"),
+            ("sqlite:///:memory:", None),
+            ("sqlite://", None),
+            ("postgresql+psycopg2://user@localhost/moroz", None),
+        ],
+    )
+    def test_database_path(self, url: str, path: str | None):
+        assert sqlite_database_path(url) == path
+
+
+class TestSQLiteMaintenance:
+    @pytest.fixture
+    def database_path(self, tmp_path) -> str:
+        path = tmp_path / "moroz.db"
+        engine = create_database_engine(
+            f"sqlite:///{path}", sqlite_profile=SQLiteProfile()
+        )
+        repo = DatabaseRepository(engine)
+        for user_id in range(50):
+            repo.create_user(user_id, f"user{user_id}", None)
+        engine.dispose()
+        return str(path)
+
+    def test_run_once(
+        self,
+        database_path: str,
+        caplog: LogCaptureFixture,  # noqa: F811
+    ):
+        # GIVEN
+        maintenance = SQLiteMaintenance(database_path, vacuum_every=2)
+
+        # WHEN
+        maintenance.run_once()
+        maintenance.run_once()
+
+        # THEN
+        with sqlite3.connect(database_path) as conn:
+            assert conn.execute("SELECT count(*) FROM sqlite_stat1").fetchone()[0] > 0
+        assert maintenance.runs == 2
+        messages = [r.getMessage() for r in caplog.records]
+        assert "with VACUUM" not in messages[0]
+        assert "with VACUUM" in messages[-1]
+
+    def test_runs_periodically_until_shutdown(self, database_path: str):
+        maintenance = SQLiteMaintenance(database_path, interval_seconds=0.01)
+        maintenance.start()
+        while maintenance.runs < 2:
+            pass
+        maintenance.shutdown()
+        assert maintenance.runs >= 2
+
+    def test_only_for_sqlite_files(self):
+        assert sqlite_maintenance("sqlite:///:memory:", 3600) is None
+        assert sqlite_maintenance("postgresql://user@localhost/moroz", 3600) is None
+        assert sqlite_maintenance("sqlite:////data/moroz.db", None) is None
+        maintenance = sqlite_maintenance("sqlite:////data/moroz.db", 60, 7)
+        assert maintenance is not None
+        assert maintenance.database_path == "/data/moroz.db"
+        assert (maintenance.interval_seconds, maintenance.vacuum_every) == (60, 7)
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from src.services.assignment import assign_targets
+from src.shared.exceptions import NoValidAssignment
+
+
+def _cycles(target: dict[int, int]) -> int:
+    seen: set[int] = set()
+    cycles = 0
+    for start in target:
+        if start not in seen:
+            cycles += 1
+            node = start
+            while node not in seen:
+                seen.add(node)
+                node = target[node]
+    return cycles
+
+
+def _assert_valid(participants, target, exclusions=()):
+    assert sorted(target) == sorted(participants)
+    assert sorted(target.values()) == sorted(participants)
+    assert all(giver != receiver for giver, receiver in target.items())
+    assert not set(target.items()) & set(exclusions)
+
+
+class TestAssignTargets:
+    def test_without_exclusions_one_cycle(self):
+        participants = list(range(50))
+
+        target = assign_targets(participants, rng=random.Random(1))
+
+        _assert_valid(participants, target)
+        assert _cycles(target) == 1
+
+    def test_exclusions_respected(self):
+        # GIVEN: 100 participants in couples, each also excluded
+        # from 30 random others
+        rng = random.Random(2)
+        participants = list(range(100))
+        exclusions = [(i, i ^ 1) for i in participants]
+        exclusions += [(i, rng.randrange(100)) for i in participants for _ in range(30)]
+
+        # WHEN
+        target = assign_targets(participants, exclusions, rng=rng)
+
+        # THEN
+        _assert_valid(participants, target, exclusions)
+        assert _cycles(target) == 1
+
+    def test_dense_exclusions_leave_single_assignment(self):
+        # GIVEN: everybody may only draw the next participant
+        participants = list(range(20))
+        exclusions = [
+            (g, r) for g in participants for r in participants if r != (g + 1) % 20
+        ]
+
+        # WHEN
+        target = assign_targets(participants, exclusions, rng=random.Random(3))
+
+        # THEN
+        assert target == {g: (g + 1) % 20 for g in participants}
+
+    def test_exclusions_outside_participants_ignored(self):
+        target = assign_targets([1, 2], [(1, 3), (3, 1), (2, 2)])
+
+        assert target == {1: 2, 2: 1}
+
+    def test_participant_excluded_from_everybody(self):
+        with pytest.raises(NoValidAssignment) as e:
+            assign_targets([0, 1, 2], [(0, 1), (0, 2)], rng=random.Random(4))
+
+        assert str(e.value) == "Participant 0 is excluded from drawing anybody"
+
+    def test_group_with_too_few_receivers(self):
+        # GIVEN: 0, 1 and 2 may only draw 0 and 1,
+        # so three givers compete for two receivers
+        exclusions = [(g, 3) for g in (0, 1, 2)] + [(0, 2), (1, 2)]
+
+        # WHEN
+        with pytest.raises(NoValidAssignment) as e:
+            assign_targets([0, 1, 2, 3], exclusions, rng=random.Random(5))
+
+        # THEN
+        assert str(e.value) == "3 participants (0, 1, 2) may only draw 2 others (0, 1)"
+
+    def test_too_few_participants(self):
+        with pytest.raises(NoValidAssignment):
+            assign_targets([1])
+
+    def test_duplicate_participants(self):
+        with pytest.raises(ValueError):
+            assign_targets([1, 2, 2])
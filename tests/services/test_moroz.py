@@ -1,11 +1,99 @@
+from unittest.mock import ANY
+
+import pytest
+from pydantic_extra_types.pendulum_dt import DateTime
+
+from src.models.room import Room
+from src.models.user import User
 from src.repositories.database import DatabaseRepository
+from src.services.moroz import Moroz
+from src.shared.exceptions import GameAlreadyStarted, NoValidAssignment, RoomTooSmall
 
 
 class TestMorozService:
+    @pytest.fixture
+    def moroz(self, database_repository_mock: DatabaseRepository) -> Moroz:
+        database_repository_mock.get_users_in_room.return_value = [  # type: ignore[attr-defined]
+            User(id=i, username=f"p{i}", name=f"P{i}") for i in range(4)
+        ]
+        database_repository_mock.get_target_history.return_value = []  # type: ignore[attr-defined]
+        database_repository_mock.lock_room.return_value = Room(  # type: ignore[attr-defined]
+            id="room", short_code=1234, manager_user_id=0
+        )
+        return Moroz(
+            database_repository=database_repository_mock,
+            max_rooms_managed_by_user=2,
+            min_players_to_start_game=3,
+        )
+
     def test_start_game_in_room(
         self,
+        moroz: Moroz,
         database_repository_mock: DatabaseRepository,
     ):
-        pass
+        # WHEN
+        pairs = moroz.start_game_in_room("room")
+
+        # THEN: everybody gives to somebody else and receives once
+        targets = {giver.id: receiver.id for giver, receiver in pairs}
+        assert sorted(targets) == sorted(targets.values()) == [0, 1, 2, 3]
+        assert all(g != r for g, r in targets.items())
+        database_repository_mock.start_game.assert_called_once_with(  # type: ignore[attr-defined]
+            room_id="room", user_target_pairs=list(targets.items()), started_dt=ANY
+        )
+
+    def test_start_game_in_too_small_room(
+        self, moroz: Moroz, database_repository_mock: DatabaseRepository
+    ):
+        database_repository_mock.get_users_in_room.return_value = []  # type: ignore[attr-defined]
+
+        with pytest.raises(RoomTooSmall):
+            moroz.start_game_in_room("room")
+
+    def test_start_started_room_left_by_players(
+        self, moroz: Moroz, database_repository_mock: DatabaseRepository
+    ):
+        # GIVEN: a started room which its players have left
+        room = database_repository_mock.lock_room.return_value  # type: ignore[attr-defined]
+        room.started_dt = DateTime.utcnow()
+        database_repository_mock.get_users_in_room.return_value = []  # type: ignore[attr-defined]
+
+        # WHEN / THEN: not reported as too small
+        with pytest.raises(GameAlreadyStarted):
+            moroz.start_game_in_room("room")
 
-    # TODO(test)
+    def test_past_targets_avoided(
+        self, moroz: Moroz, database_repository_mock: DatabaseRepository
+    ):
+        # GIVEN: everybody has drawn everybody but the next participant
+        database_repository_mock.get_target_history.return_value = [  # type: ignore[attr-defined]
+            (g, r) for g in range(4) for r in range(4) if r not in (g, (g + 1) % 4)
+        ]
+
+        # WHEN
+        pairs = moroz.start_game_in_room("room")
+
+        # THEN
+        assert {(g.id, r.id) for g, r in pairs} == {(0, 1), (1, 2), (2, 3), (3, 0)}
+
+    def test_unavoidable_past_targets_drawn_again(
+        self, moroz: Moroz, database_repository_mock: DatabaseRepository
+    ):
+        # GIVEN: everybody has drawn everybody
+        database_repository_mock.get_target_history.return_value = [  # type: ignore[attr-defined]
+            (g, r) for g in range(4) for r in range(4) if g != r
+        ]
+
+        # WHEN
+        pairs = moroz.start_game_in_room("room", exclusions=[(0, 1)])
+
+        # THEN: the history is ignored, but not the exclusions
+        assert len(pairs) == 4
+        assert (0, 1) not in {(g.id, r.id) for g, r in pairs}
+
+    def test_exclusions_leave_no_assignment(
+        self, moroz: Moroz, database_repository_mock: DatabaseRepository
+    ):
+        with pytest.raises(NoValidAssignment):
+            moroz.start_game_in_room("room", exclusions=[(0, 1), (0, 2), (0, 3)])
+        database_repository_mock.start_game.assert_not_called()  # type: ignore[attr-defined]
@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.repositories.database import DatabaseRepository
+from src.repositories.engine import create_database_engine
+from src.repositories.sqlite import SQLiteProfile
+from src.services.moroz import Moroz
+from src.shared.exceptions import (
+    GameAlreadyStarted,
+    NotInRoom,
+    RoomBusy,
+    RoomTooSmall,
+)
+
+THREADS = 200
+MANAGER_ID = 1
+
+
+@pytest.fixture
+def moroz(tmp_path):
+    engine = create_database_engine(
+        f"sqlite:///{tmp_path / 'room.db'}",
+        sqlite_profile=SQLiteProfile(),
+        pool_size=THREADS,
+    )
+    repo = DatabaseRepository(engine)
+    yield Moroz(
+        database_repository=repo,
+        max_rooms_managed_by_user=1,
+        min_players_to_start_game=2,
+    )
+    engine.dispose()
+
+
+class TestConcurrentRoomTransitions:
+    """Hammer one room from many threads at once.
+
+    Given:
+    - a room and 200 users, on a file SQLite database
+    When:
+    - at the same moment, most users join the room (a third of them
+      leave it right away) while a few "managers" keep trying to start it
+    Then:
+    - the game is started exactly once
+    - every member of the room has a target (nobody joined after the start)
+    - the targets are a permutation of the givers, who all had joined
+    """
+
+    def test_invariants_hold(self, moroz: Moroz):
+        # GIVEN
+        repo = moroz.database_repository
+        for user_id in range(MANAGER_ID, MANAGER_ID + THREADS + 1):
+            repo.create_user(id=user_id, username=None, name=f"User {user_id}")
+        room = moroz.create_room(created_by_user_id=MANAGER_ID)
+        barrier = threading.Barrier(THREADS)
+
+        def _start() -> str:
+            for _ in range(1000):
+                try:
+                    moroz.start_game_in_room(room.id)
+                    return "started"
+                except (RoomBusy, RoomTooSmall):
+                    time.sleep(0.001)
+                except GameAlreadyStarted:
+                    return "already started"
+            return "gave up"
+
+        def _join_and_leave(user_id: int) -> str:
+            try:
+                with moroz.unit_of_work():
+                    moroz.join_room_by_short_code(user_id, room.short_code)
+            except (GameAlreadyStarted, RoomBusy) as e:
+                return type(e).__name__
+            if user_id % 3 == 0:
+                try:
+                    moroz.leave_room(user_id)
+                    return "left"
+                except RoomBusy:
+                    pass
+            return "joined"
+
+        def _work(i: int) -> tuple[int, str]:
+            user_id = MANAGER_ID + 1 + i
+            barrier.wait()
+            # a few starters among the joiners
+            if i % 40 == 20:
+                return user_id, _start()
+            return user_id, _join_and_leave(user_id)
+
+        # WHEN
+        with ThreadPoolExecutor(THREADS) as pool:
+            outcomes = dict(pool.map(_work, range(THREADS)))
+
+        # THEN
+        counts = Counter(outcomes.values())
+        assert counts["started"] == 1, counts
+        assert counts["gave up"] == 0, counts
+        joined = {u for u, outcome in outcomes.items() if outcome in ("joined", "left")}
+        targets = {g.id: r.id for g, r in repo.get_targets_in_room(room.id)}
+        members = {u.id for u in repo.get_users_in_room(room.id)}
+        assert repo.get_room(room.id).game_started
+        assert members <= set(targets)
+        assert set(targets) <= joined
+        assert sorted(targets.values()) == sorted(targets)
+        assert all(giver != receiver for giver, receiver in targets.items())
+
+
+class TestConcurrentKicks:
+    """Kick players who are moving to another room at the same moment.
+
+    Given:
+    - rooms A and B of two managers, and 100 players in room A
+    When:
+    - at the same moment, every player leaves A to join B, and the manager
+      of A, who has not seen them leave, kicks them from A while they are
+      joining B (half of them) or once they have joined it (the others)
+    Then:
+    - every player ends up in B: nobody is kicked from a room other than A
+    """
+
+    PLAYERS = THREADS // 2
+
+    def test_kicked_only_from_the_room(self, moroz: Moroz):
+        # GIVEN
+        repo = moroz.database_repository
+        players = range(3, 3 + self.PLAYERS)
+        for user_id in [MANAGER_ID, MANAGER_ID + 1, *players]:
+            repo.create_user(id=user_id, username=None, name=f"User {user_id}")
+        room_a = moroz.create_room(created_by_user_id=MANAGER_ID)
+        room_b = moroz.create_room(created_by_user_id=MANAGER_ID + 1)
+        for user_id in players:
+            repo.join_room(user_id, room_a.id)
+        barrier = threading.Barrier(THREADS)
+        moved = {user_id: threading.Event() for user_id in players}
+
+        def _retry_busy(transition) -> str:
+            for _ in range(1000):
+                try:
+                    transition()
+                    return "done"
+                except NotInRoom:
+                    return "not in room"
+                except RoomBusy:
+                    time.sleep(0.001)
+            return "gave up"
+
+        def _move(user_id: int) -> str:
+            _retry_busy(lambda: moroz.leave_room(user_id))
+            if user_id % 2:
+                moved[user_id].set()
+
+            def _join():
+                with moroz.unit_of_work():
+                    moroz.join_room_by_short_code(user_id, room_b.short_code)
+
+            outcome = _retry_busy(_join)
+            moved[user_id].set()
+            return outcome
+
+        def _work(i: int) -> str:
+            user_id = players[i // 2]
+            barrier.wait()
+            if i % 2:
+                moved[user_id].wait()
+                return _retry_busy(lambda: moroz.kick_from_room(room_a.id, user_id))
+            return _move(user_id)
+
+        # WHEN
+        with ThreadPoolExecutor(THREADS) as pool:
+            outcomes = list(pool.map(_work, range(THREADS)))
+
+        # THEN
+        assert "gave up" not in outcomes
+        assert {u.id for u in repo.get_users_in_room(room_b.id)} == set(players)
+        assert repo.get_users_in_room(room_a.id) == []
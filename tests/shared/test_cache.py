@@ -0,0 +1,62 @@
+from src.shared.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_hit_and_miss(self):
+        cache: TTLCache[int, str] = TTLCache(max_size=10, ttl_seconds=60)
+        assert cache.get(1) is None
+        cache.put(1, "one")
+        assert cache.get(1) == "one"
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == 0.5
+        assert len(cache) == 1
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache: TTLCache[int, str] = TTLCache(max_size=10, ttl_seconds=60, clock=clock)
+        cache.put(1, "one")
+        clock.now = 59.9
+        assert cache.get(1) == "one"
+        clock.now = 60
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_evicted(self):
+        cache: TTLCache[int, str] = TTLCache(max_size=2, ttl_seconds=60)
+        cache.put(1, "one")
+        cache.put(2, "two")
+        cache.get(1)
+        cache.put(3, "three")
+        assert cache.get(2) is None
+        assert cache.get(1) == "one"
+        assert cache.get(3) == "three"
+
+    def test_invalidate(self):
+        cache: TTLCache[int, str] = TTLCache(max_size=2, ttl_seconds=60)
+        cache.put(1, "one")
+        cache.invalidate(1)
+        cache.invalidate(2)
+        assert cache.get(1) is None
+
+    def test_put_of_an_older_generation_dropped(self):
+        cache: TTLCache[int, str] = TTLCache(max_size=2, ttl_seconds=60)
+        generation = cache.generation
+        cache.invalidate(1)  # written while "one" was being read
+        cache.put(1, "one", generation=generation)
+        assert cache.get(1) is None
+        cache.put(1, "one", generation=cache.generation)
+        assert cache.get(1) == "one"
+
+    def test_disabled(self):
+        cache: TTLCache[int, str] = TTLCache(max_size=0, ttl_seconds=60)
+        cache.put(1, "one")
+        assert cache.get(1) is None
+        assert len(cache) == 0
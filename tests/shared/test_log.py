@@ -0,0 +1,30 @@
+import io
+import sys
+
+from loguru import logger
+
+from src.shared.log import setup_logging
+
+
+class _Unformattable:
+    def __str__(self) -> str:
+        raise AssertionError("formatted although the level is disabled")
+
+
+class TestSetupLogging:
+    def test_level_gated_and_lazy(self):
+        # GIVEN
+        sink = io.StringIO()
+        handler_id = setup_logging("INFO", sink=sink)
+        try:
+            # WHEN
+            logger.debug("Got {}", _Unformattable())
+            logger.info("Got {} users", 3)
+            logger.complete()
+        finally:
+            logger.remove(handler_id)
+            logger.add(sys.stderr)
+
+        # THEN
+        assert "Got 3 users" in sink.getvalue()
+        assert "DEBUG" not in sink.getvalue()
@@ -0,0 +1,111 @@
+import pytest
+import requests
+
+from src.shared.metrics import (
+    CONTENT_TYPE,
+    Counter,
+    CounterFunction,
+    Gauge,
+    Histogram,
+    Metric,
+    MetricsServer,
+    Registry,
+)
+
+
+class TestMetrics:
+    def test_counter(self):
+        # GIVEN
+        counter = Counter("errors", "Errors.", ["code"])
+        # WHEN
+        counter.inc(code="429")
+        counter.inc(2, code="429")
+        counter.inc(code="400")
+        # THEN
+        assert counter.value(code="429") == 3
+        assert counter.render() == (
+            "# HELP errors_total Errors.\n"
+            "# TYPE errors_total counter\n"
+            'errors_total{code="400"} 1\n'
+            'errors_total{code="429"} 3\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        # GIVEN
+        histogram = Histogram("latency", "Latency.", ["handler"], buckets=[0.1, 1])
+        # WHEN
+        for value in (0.0625, 0.5, 0.75, 3):
+            histogram.observe(value, handler="Join")
+        # THEN
+        assert histogram.count(handler="Join") == 4
+        assert histogram.render().splitlines()[2:] == [
+            'latency_bucket{handler="Join",le="0.1"} 1',
+            'latency_bucket{handler="Join",le="1"} 3',
+            'latency_bucket{handler="Join",le="+Inf"} 4',
+            'latency_sum{handler="Join"} 4.3125',
+            'latency_count{handler="Join"} 4',
+        ]
+
+    def test_histogram_time(self):
+        histogram = Histogram("latency", "Latency.", ["handler"])
+        with pytest.raises(RuntimeError), histogram.time(handler="Me"):
+            raise RuntimeError
+        assert histogram.count(handler="Me") == 1
+
+    def test_label_values_escaped(self):
+        counter = Counter("errors", "Errors.", ["reason"])
+        counter.inc(reason='a "quoted"\\\n')
+        assert 'errors_total{reason="a \\"quoted\\"\\\\\\n"} 1' in counter.render()
+
+    def test_metric_without_samples(self):
+        with pytest.raises(TypeError):
+            Metric("errors", "Errors.")  # type: ignore[abstract]
+
+    def test_unknown_label_rejected(self):
+        counter = Counter("errors", "Errors.", ["code"])
+        with pytest.raises(ValueError):
+            counter.inc(method="sendMessage")
+
+    def test_gauge_read_on_render(self):
+        # GIVEN
+        pending = [1, 2]
+        registry = Registry()
+        registry.register(Gauge("pending", "Pending.", lambda: len(pending)))
+        # WHEN
+        pending.append(3)
+        # THEN
+        assert "pending 3\n" in registry.render()
+
+    def test_counter_read_on_render(self):
+        hits = [1]
+        counter = CounterFunction("hits", "Hits.", lambda: len(hits))
+        hits.append(2)
+        assert counter.render() == (
+            "# HELP hits_total Hits.\n# TYPE hits_total counter\nhits_total 2\n"
+        )
+
+
+class TestMetricsServer:
+    @pytest.fixture
+    def server(self):
+        registry = Registry()
+        registry.register(Counter("errors", "Errors.")).inc()
+        server = MetricsServer(registry, "127.0.0.1", 0)
+        server.start()
+        yield server
+        server.shutdown()
+
+    def test_metrics_served(self, server: MetricsServer):
+        # GIVEN
+        host, port = server.server_address
+        # WHEN
+        response = requests.get(f"http://{host}:{port}/metrics", timeout=5)
+        # THEN
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == CONTENT_TYPE
+        assert "errors_total 1\n" in response.text
+
+    def test_other_path_not_found(self, server: MetricsServer):
+        host, port = server.server_address
+        response = requests.get(f"http://{host}:{port}/", timeout=5)
+        assert response.status_code == 404
@@ -0,0 +1,101 @@
+import pytest
+
+from src.shared.rate_limit import Admission, TokenBucket, UserRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    def test_burst_up_to_capacity_then_wait(self):
+        bucket = TokenBucket(rate=2, capacity=2, clock=FakeClock())
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_refills_over_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, clock=clock)
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        clock.now = 1
+        assert bucket.try_acquire()
+
+    def test_pause(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=30, clock=clock)
+        bucket.pause(5)
+        assert bucket.reserve() == pytest.approx(5)
+        clock.now = 10
+        assert bucket.reserve() == 0
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestUserRateLimiter:
+    def test_users_have_their_own_bucket(self):
+        limiter = UserRateLimiter(rate=1, burst=2, clock=FakeClock())
+        assert limiter.admit(1) is Admission.ALLOWED
+        assert limiter.admit(1) is Admission.ALLOWED
+        assert limiter.admit(1) is Admission.REFUSED
+        assert limiter.admit(2) is Admission.ALLOWED
+
+    def test_refused_once_per_flood(self):
+        # GIVEN
+        clock = FakeClock()
+        limiter = UserRateLimiter(rate=1, burst=1, clock=clock)
+        # WHEN
+        admissions = [limiter.admit(1) for _ in range(4)]
+        clock.now = 1
+        admissions += [limiter.admit(1), limiter.admit(1)]
+        # THEN: the flood ends with the next allowed command
+        assert admissions == [
+            Admission.ALLOWED,
+            Admission.REFUSED,
+            Admission.DROPPED,
+            Admission.DROPPED,
+            Admission.ALLOWED,
+            Admission.REFUSED,
+        ]
+
+    def test_costs(self):
+        clock = FakeClock()
+        limiter = UserRateLimiter(rate=1, burst=4, clock=clock)
+        assert limiter.admit(1, cost=3) is Admission.ALLOWED
+        assert limiter.admit(1, cost=3) is Admission.REFUSED
+        assert limiter.admit(1, cost=0.5) is Admission.ALLOWED
+        clock.now = 4
+        # more than a full bucket costs a full bucket
+        assert limiter.admit(1, cost=10) is Admission.ALLOWED
+
+    def test_idle_users_forgotten(self):
+        # GIVEN
+        clock = FakeClock()
+        limiter = UserRateLimiter(rate=2, burst=4, max_users=2, clock=clock)
+        limiter.admit(1, cost=4)
+        limiter.admit(2)
+        # WHEN: user 1 stays idle until their bucket is full again
+        clock.now = 2
+        limiter.admit(3)
+        # THEN
+        assert len(limiter) == 2
+        assert limiter.admit(1, cost=4) is Admission.ALLOWED
+
+    def test_bounded(self):
+        limiter = UserRateLimiter(rate=1, burst=1, max_users=100, clock=FakeClock())
+        for user_id in range(1000):
+            limiter.admit(user_id)
+        assert len(limiter) == 100
+
+    @pytest.mark.parametrize("rate, burst", [(0, 1), (1, 0.5)])
+    def test_invalid(self, rate, burst):
+        with pytest.raises(ValueError):
+            UserRateLimiter(rate=rate, burst=burst)
@@ -0,0 +1,19 @@
+from itertools import count
+
+from src.shared.startup import StartupReport
+
+
+class TestStartupReport:
+    def test_phases_timed(self):
+        # GIVEN: a clock ticking one second per reading
+        report = StartupReport(clock=count().__next__)
+
+        # WHEN
+        with report.phase("imports"):
+            pass
+        with report.phase("wiring"):
+            pass
+
+        # THEN
+        assert report.phases == {"imports": 1, "wiring": 1}
+        assert str(report) == "Started in 5000 ms (imports 1000 ms, wiring 1000 ms)"
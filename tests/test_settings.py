@@ -0,0 +1,39 @@
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from src.settings import Settings
+
+
+def _settings(**kwargs: Any) -> Settings:
+    return Settings(
+        bot_token="123:TEST",
+        database_url="sqlite://",
+        max_rooms_managed_by_user=1,
+        **kwargs,
+    )
+
+
+class TestWebhookMode:
+    def test_secret_token_required(self):
+        with pytest.raises(ValidationError, match="WEBHOOK_SECRET_TOKEN is required"):
+            _settings(
+                bot_mode="webhook",
+                webhook_url="https://bot.example.com/webhook",
+            )
+
+    def test_url_required(self):
+        with pytest.raises(ValidationError, match="WEBHOOK_URL is required"):
+            _settings(bot_mode="webhook", webhook_secret_token="s3cret")
+
+    def test_webhook_mode(self):
+        settings = _settings(
+            bot_mode="webhook",
+            webhook_url="https://bot.example.com/webhook",
+            webhook_secret_token="s3cret",
+        )
+        assert settings.webhook_secret_token == "s3cret"
+
+    def test_polling_mode_needs_no_secret(self):
+        assert _settings().webhook_secret_token is None
@@ -1,4 +1,10 @@
 import re
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Any
+
+from src.repositories.query_stats import QueryStats, track_queries
 
 
 class Regex:
@@ -10,3 +16,25 @@ class Regex:
 
     def __repr__(self):
         return f"<RegexMatcher {self.pattern.pattern!r}>"
+
+
+class ImmediateExecutor(Executor):
+    """Runs every submitted call right away, on the submitting thread."""
+
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:  # noqa: BLE001 - the future holds what it raised
+            future.set_exception(e)
+        return future
+
+
+@contextmanager
+def assert_query_budget(max_statements: int) -> Iterator[QueryStats]:
+    """Fail if the block executes more than `max_statements` SQL statements."""
+    with track_queries("query budget", log=False) as stats:
+        yield stats
+    assert (
+        stats.statements <= max_statements
+    ), f"Query budget of {max_statements} statements exceeded: {stats}"